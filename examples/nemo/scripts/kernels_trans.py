@@ -56,6 +56,12 @@ routine) then the script moves a level down the tree and then repeats
 the process of attempting to create the largest possible Kernel
 region.
 
+By default, data movement is left to the compiler's managed-memory
+support. If ``EXPLICIT_DATA_MOVEMENT`` is set then each routine is
+instead enclosed within an OpenACC data region whose clauses, together
+with the 'update' directives required around the code that remains on
+the CPU, are determined by PSyclone.
+
 '''
 
 from __future__ import print_function
@@ -78,8 +84,13 @@ PGI_VERSION = 1940  # i.e. 19.4
 # Get the PSyclone transformations we will use
 ACC_KERN_TRANS = TransInfo().get_trans_name('ACCKernelsTrans')
 ACC_LOOP_TRANS = TransInfo().get_trans_name('ACCLoopTrans')
+ACC_ROUTINE_DATA_TRANS = TransInfo().get_trans_name('ACCRoutineDataTrans')
 PROFILE_TRANS = ProfileTrans()
 
+# Whether or not to add explicit OpenACC data movement rather than rely
+# on managed memory
+EXPLICIT_DATA_MOVEMENT = False
+
 # Whether or not to automatically add profiling calls around
 # un-accelerated regions
 _AUTO_PROFILE = True
@@ -679,8 +690,9 @@ def try_kernels_trans(nodes):
 
 def trans(psy):
     '''A PSyclone-script compliant transformation function. Applies
-    OpenACC 'kernels' directives to NEMO code. (Data movement is
-    assumed to be handled through PGI's managed-memory functionality.)
+    OpenACC 'kernels' directives to NEMO code. (Unless
+    EXPLICIT_DATA_MOVEMENT is set, data movement is assumed to be handled
+    through PGI's managed-memory functionality.)
 
     :param psy: The PSy layer object to apply transformations to.
     :type psy: :py:class:`psyclone.psyGen.PSy`
@@ -705,6 +717,12 @@ def trans(psy):
         if invoke.name.lower() not in ACC_IGNORE:
             print("Transforming invoke {0}:".format(invoke.name))
             add_kernels(sched.children)
+            if EXPLICIT_DATA_MOVEMENT:
+                try:
+                    ACC_ROUTINE_DATA_TRANS.apply(sched)
+                except TransformationError as err:
+                    print("Explicit data movement not added to routine "
+                          "{0}: {1}".format(invoke.name, str(err.value)))
         else:
             print("Addition of OpenACC to routine {0} disabled!".
                   format(invoke.name.lower()))
@@ -64,7 +64,9 @@ _FILE_NAME = "psyclone.cfg"
 # single = If any given kernel (within a single Application) is transformed
 #          more than once then the same transformation must always be
 #          applied and only one version of the transformed kernel is created.
-VALID_KERNEL_NAMING_SCHEMES = ["multiple", "single"]
+# hash = Every transformed kernel is named after a hash of its code so that
+#        identical transformed kernels share a single file.
+VALID_KERNEL_NAMING_SCHEMES = ["multiple", "single", "hash"]
 
 # pylint: disable=too-many-lines
 
@@ -128,6 +130,18 @@ class Config(object):
     # The list of valid PSyData class prefixes
     _valid_psy_data_prefixes = []
 
+    # The supported strategies for reproducible OpenMP reductions. With
+    # "padded" each thread accumulates into its own (padded) array element
+    # and these are summed serially. With "tree" the iterations are split
+    # into fixed-size blocks whose partial results are combined in a
+    # fixed-order pairwise tree, so that the result does not depend on the
+    # number of threads.
+    _supported_reprod_strategies = ["padded", "tree"]
+
+    # The default strategy and block size for reproducible reductions.
+    _default_reprod_strategy = "padded"
+    _default_reprod_block_size = 1024
+
     @staticmethod
     def get(do_not_load_file=False):
         '''Static function that if necessary creates and returns the singleton
@@ -201,6 +215,13 @@ class Config(object):
         # reproducible reductions are created.
         self._reprod_pad_size = None
 
+        # The strategy to use for reproducible reductions.
+        self._reprod_reduction_strategy = None
+
+        # The number of iterations in each block when reproducible
+        # reductions use the "tree" strategy.
+        self._reprod_block_size = None
+
         # Where to write transformed kernels - set at runtime.
         self._kernel_output_dir = None
 
@@ -325,6 +346,29 @@ class Config(object):
                 "error while parsing REPROD_PAD_SIZE: {0}".format(str(err)),
                 config=self)
 
+        self._reprod_reduction_strategy = self._config['DEFAULT'].get(
+            'REPROD_REDUCTION_STRATEGY',
+            Config._default_reprod_strategy).lower()
+        if self._reprod_reduction_strategy not in \
+           Config._supported_reprod_strategies:
+            raise ConfigurationError(
+                "REPROD_REDUCTION_STRATEGY must be one of {0} but got "
+                "'{1}'.".format(Config._supported_reprod_strategies,
+                                self._reprod_reduction_strategy),
+                config=self)
+
+        try:
+            self._reprod_block_size = self._config['DEFAULT'].getint(
+                'REPROD_BLOCK_SIZE', Config._default_reprod_block_size)
+        except ValueError as err:
+            raise ConfigurationError(
+                "error while parsing REPROD_BLOCK_SIZE: {0}".format(str(err)),
+                config=self)
+        if self._reprod_block_size < 1:
+            raise ConfigurationError(
+                "REPROD_BLOCK_SIZE must be a positive integer but got "
+                "'{0}'.".format(self._reprod_block_size), config=self)
+
         if 'PSYIR_ROOT_NAME' not in self._config['DEFAULT']:
             # Use the default name if no default is specified for the
             # root name.
@@ -581,6 +625,27 @@ class Config(object):
         '''
         return self._reprod_pad_size
 
+    @property
+    def reprod_reduction_strategy(self):
+        '''
+        Getter for the strategy used for reproducible OpenMP reductions.
+
+        :returns: the strategy, "padded" or "tree".
+        :rtype: str
+        '''
+        return self._reprod_reduction_strategy
+
+    @property
+    def reprod_block_size(self):
+        '''
+        Getter for the number of loop iterations in each block of a
+        reproducible OpenMP reduction that uses the "tree" strategy.
+
+        :returns: block size (no. of loop iterations).
+        :rtype: int
+        '''
+        return self._reprod_block_size
+
     @property
     def psyir_root_name(self):
         '''
@@ -847,6 +912,8 @@ class DynConfig(APISpecificConfig):
         self._compute_annexed_dofs = None
         # Initialise run_time_checks setting
         self._run_time_checks = None
+        # Initialise setting for sharing basis-function arrays between invokes
+        self._share_basis_functions = False
         # Initialise LFRic datatypes' default kinds (precisions) settings
         self._supported_fortran_datatypes = []
         self._default_kind = {}
@@ -900,6 +967,18 @@ class DynConfig(APISpecificConfig):
                     .format(section.name, config.filename, str(err)),
                     config=self._config), err)
 
+            # Parse (optional) setting for sharing basis/diff-basis arrays
+            # between invokes
+            try:
+                self._share_basis_functions = section.getboolean(
+                    "share_basis_functions", fallback=False)
+            except ValueError as err:
+                six.raise_from(ConfigurationError(
+                    "Error while parsing SHARE_BASIS_FUNCTIONS in the '[{0}]' "
+                    "section of the configuration file '{1}': {2}."
+                    .format(section.name, config.filename, str(err)),
+                    config=self._config), err)
+
             # Parse setting for the supported Fortran datatypes. No
             # need to check whether the keyword is found as it is
             # mandatory (and therefore already checked).
@@ -994,6 +1073,20 @@ class DynConfig(APISpecificConfig):
         '''
         return self._run_time_checks
 
+    @property
+    def share_basis_functions(self):
+        '''
+        Getter for whether or not the basis/diff-basis function arrays
+        required by invokes are held at PSy-module level so that they
+        can be re-used by subsequent invokes (rather than being
+        re-computed by each of them).
+
+        :returns: true if basis-function arrays are shared between invokes.
+        :rtype: bool
+
+        '''
+        return self._share_basis_functions
+
     @property
     def supported_fortran_datatypes(self):
         '''
@@ -72,15 +72,28 @@ class GOceanExtractNode(ExtractNode):
         (``prefix_PSyDataType``) - a "_" will be added automatically. \
         It defaults to "extract", which is set in the base class if \
         not overwritten in the options dictionary.
+    :param options["tune_local_size"]: if set, the driver program times \
+        the OpenCL version of each kernel in the region with each of the \
+        given candidate local sizes and appends the fastest one to the \
+        tuning file (see the 'tuning_file' option of OCLTrans).
+    :type options["tune_local_size"]: list of int
 
     '''
+    # The file to which the tuning driver appends the best local size of
+    # each kernel.
+    _tuning_file = "local_size_tuning.txt"
+    # The number of times each kernel is launched with each local size.
+    _tuning_repetitions = 10
+
     def __init__(self, ast=None, children=None, parent=None, options=None):
         super(GOceanExtractNode, self).__init__(ast=ast, children=children,
                                                 parent=parent, options=options)
         if options:
             self._create_driver = options.get("create_driver", False)
+            self._tune_local_size = options.get("tune_local_size", None)
         else:
             self._create_driver = False
+            self._tune_local_size = None
 
     @property
     def dag_name(self):
@@ -229,7 +242,8 @@ class GOceanExtractNode(ExtractNode):
             # to handle the kind property better and not rely on
             # a hard-coded value.
             decl = DeclGen(prog, "real", [local_name], kind="8",
-                           dimension=":,:", allocatable=True)
+                           dimension=":,:", allocatable=True,
+                           target=bool(self._tune_local_size))
             prog.add(decl)
             is_input = var_name in input_list
             is_output = var_name in output_list
@@ -275,7 +289,8 @@ class GOceanExtractNode(ExtractNode):
                                        post_suffix))
                 prog.add(call)
                 decl = DeclGen(prog, "real", [local_name], kind="8",
-                               dimension=":,:", allocatable=True)
+                               dimension=":,:", allocatable=True,
+                               target=bool(self._tune_local_size))
                 prog.add(decl)
                 alloc = AllocateGen(prog, [var_name],
                                     mold="{0}".format(local_name +
@@ -290,6 +305,16 @@ class GOceanExtractNode(ExtractNode):
                 assign = AssignGen(prog, local_name, "0.0d0")
                 prog.add(assign)
 
+        if self._tune_local_size:
+            # Instead of re-creating the region, time the OpenCL version of
+            # each of its kernels with the candidate local sizes
+            self._add_tuning_code(module, prog, sym_table, rename_variable)
+            code = str(module.root)
+            with open("driver-{0}-{1}.f90".
+                      format(module_name, region_name), "w") as out:
+                out.write(code)
+            return
+
         # Now add the region that was extracted here:
         prog.add(CommentGen(prog, ""))
         prog.add(CommentGen(prog, " RegionStart"))
@@ -362,6 +387,292 @@ class GOceanExtractNode(ExtractNode):
                   format(module_name, region_name), "w") as out:
             out.write(code)
 
+    # -------------------------------------------------------------------------
+    def _add_tuning_code(self, module, prog, sym_table, rename_variable):
+        # pylint: disable=too-many-locals, too-many-statements
+        '''This function adds the code that tunes the OpenCL local size of
+        the kernels in the extracted region to the driver. The arrays read
+        by the driver are copied into OpenCL buffers and each kernel is
+        launched over all points of its grid, with the iteration boundaries
+        set so that its stencils stay inside the arrays. The fastest of the
+        candidate local sizes of each kernel is appended to the tuning file.
+        Since the existing OpenCL kernels require the work-group size they
+        have been generated with, the OpenCL source of the kernels (without
+        a required work-group size) is written to "driver-MODULE-REGION.cl",
+        which must be used as the FORTCL_KERNELS_FILE of the driver.
+
+        :param module: the f2pygen module of the driver.
+        :type module: :py:class:`psyclone.f2pygen.ModuleGen`
+        :param prog: the f2pygen subroutine of the driver.
+        :type prog: :py:class:`psyclone.f2pygen.SubroutineGen`
+        :param sym_table: the symbol table used to create unique names in \
+            the driver.
+        :type sym_table: :py:class:`psyclone.psyir.symbols.SymbolTable`
+        :param rename_variable: maps the name of each variable in the \
+            original program to its unique name in the driver.
+        :type rename_variable: dict of str: str
+
+        :raises GenerationError: if a kernel does not have its iteration \
+            boundaries as arguments.
+        :raises GenerationError: if a kernel has a scalar argument that is \
+            not an iteration boundary.
+        '''
+        from psyclone.errors import GenerationError
+        from psyclone.f2pygen import AssignGen, CallGen, CharDeclGen, \
+            CommentGen, DeclGen, UseGen
+        from psyclone.gocean1p0 import GOKern
+        from psyclone.psyGen import InvokeSchedule
+        from psyclone.psyir.backend.opencl import OpenCLWriter
+
+        kernels = self.psy_data_body.walk(GOKern)
+        invoke_symtab = self.ancestor(InvokeSchedule).symbol_table
+        module_name, region_name = self.region_identifier
+
+        prog.add(UseGen(prog, name="fortcl", only=True,
+                        funcnames=["ocl_env_init", "add_kernels",
+                                   "get_kernel_by_name", "get_cmd_queues",
+                                   "create_rw_buffer"]))
+        prog.add(UseGen(prog, name="clfortran"))
+        prog.add(UseGen(prog, name="iso_c_binding"))
+        names = sym_table.new_symbol("kernel_names").name
+        prog.add(CharDeclGen(prog, length="30", entity_decls=[
+            "{0}({1})".format(names, len(kernels))]))
+        queues = sym_table.new_symbol("cmd_queues").name
+        prog.add(DeclGen(prog, datatype="integer", kind="c_intptr_t",
+                         pointer=True, entity_decls=[queues + "(:)"]))
+        size_in_bytes = sym_table.new_symbol("size_in_bytes").name
+        prog.add(DeclGen(prog, datatype="integer", kind="c_size_t",
+                         entity_decls=[size_in_bytes]))
+        ierr = sym_table.new_symbol("ierr").name
+        prog.add(DeclGen(prog, datatype="integer", entity_decls=[ierr]))
+        best = sym_table.new_symbol("best_local_size").name
+        prog.add(DeclGen(prog, datatype="integer", entity_decls=[
+            "{0}({1})".format(best, len(kernels))]))
+        tune_routine, write_routine = self._add_tuning_routines(
+            module, sym_table, kernels)
+
+        prog.add(CommentGen(prog, ""))
+        prog.add(CommentGen(prog, " Tune the OpenCL local size of the "
+                                  "kernels in the region"))
+        prog.add(CommentGen(prog, ""))
+        prog.add(CallGen(prog, "ocl_env_init",
+                         ["1", "1", ".False.", ".False."]))
+        for idx, kern in enumerate(kernels):
+            prog.add(AssignGen(prog, lhs="{0}({1})".format(names, idx + 1),
+                               rhs="\"{0}\"".format(kern.name)))
+        prog.add(CallGen(prog, "add_kernels", [str(len(kernels)), names]))
+        prog.add(AssignGen(prog, lhs=queues, rhs="get_cmd_queues()",
+                           pointer=True))
+
+        candidates = "(/{0}/)".format(
+            ", ".join(str(size) for size in self._tune_local_size))
+        buffers = {}
+        ocl_code = ""
+        for idx, kern in enumerate(kernels):
+            boundaries = []
+            for boundary in ["xstart", "xstop", "ystart", "ystop"]:
+                try:
+                    boundaries.append(invoke_symtab.lookup_with_tag(
+                        boundary + "_" + kern.name).name)
+                except KeyError:
+                    raise GenerationError(
+                        "Cannot tune the OpenCL local size of kernel '{0}' "
+                        "because its iteration boundaries are not kernel "
+                        "arguments. Make sure to apply the "
+                        "GOMoveIterationBoundariesInsideKernelTrans before "
+                        "creating the tuning driver.".format(kern.name))
+
+            # The grid is given by the first field and the (0-indexed)
+            # boundaries leave a margin of the largest stencil depth
+            grid = kern.arguments.find_grid_access()
+            grid_array = rename_variable.get(grid.name, grid.name)
+            depth = max([arg.stencil.depth(i, j)
+                         for arg in kern.arguments.args
+                         if arg.argument_type == "field"
+                         for i in [-1, 0, 1] for j in [-1, 0, 1]
+                         if (i, j) != (0, 0)] + [0])
+            bounds = [str(depth),
+                      "SIZE({0}, 1) - {1}".format(grid_array, depth + 1),
+                      str(depth),
+                      "SIZE({0}, 2) - {1}".format(grid_array, depth + 1)]
+
+            prog.add(CommentGen(prog, " Kernel {0}".format(kern.name)))
+            kernel_obj = sym_table.new_symbol("kernel_" + kern.name).name
+            prog.add(DeclGen(prog, datatype="integer", kind="c_intptr_t",
+                             target=True, entity_decls=[kernel_obj]))
+            prog.add(AssignGen(
+                prog, lhs=kernel_obj,
+                rhs="get_kernel_by_name(\"{0}\")".format(kern.name)))
+
+            for position, arg in enumerate(kern.arguments.args):
+                if arg.argument_type == "scalar":
+                    if arg.name not in boundaries:
+                        raise GenerationError(
+                            "Cannot tune the OpenCL local size of kernel "
+                            "'{0}' because the driver does not support its "
+                            "scalar argument '{1}' (TODO #644)."
+                            "".format(kern.name, arg.name))
+                    value = sym_table.new_symbol(
+                        kern.name + "_" + arg.name).name
+                    prog.add(DeclGen(prog, datatype="integer", target=True,
+                                     entity_decls=[value]))
+                    prog.add(AssignGen(
+                        prog, lhs=value,
+                        rhs=bounds[boundaries.index(arg.name)]))
+                else:
+                    if arg.argument_type == "field":
+                        var_name = arg.name
+                    else:
+                        var_name = arg.dereference(grid.name)
+                    local_name = var_name[var_name.rfind("%")+1:]
+                    local_name = rename_variable.get(local_name, local_name)
+                    if local_name not in buffers:
+                        buffers[local_name] = self._add_tuning_buffer(
+                            prog, sym_table, local_name, queues,
+                            size_in_bytes, ierr)
+                    value = buffers[local_name]
+                prog.add(AssignGen(
+                    prog, lhs=ierr,
+                    rhs="clSetKernelArg({0}, {1}, C_SIZEOF({2}), C_LOC({2}))"
+                    "".format(kernel_obj, position, value)))
+
+            prog.add(CallGen(prog, tune_routine, [
+                kernel_obj, "SIZE({0}, 1)".format(grid_array),
+                "SIZE({0}, 2)".format(grid_array), candidates,
+                "{0}({1})".format(best, idx + 1)]))
+            ocl_code += OpenCLWriter()(kern.get_kernel_schedule())
+
+        prog.add(CallGen(prog, write_routine, [best]))
+
+        with open("driver-{0}-{1}.cl".format(module_name, region_name),
+                  "w") as out:
+            out.write(ocl_code)
+
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def _add_tuning_buffer(prog, sym_table, local_name, queues,
+                           size_in_bytes, ierr):
+        # pylint: disable=too-many-arguments
+        '''This function adds the code that creates an OpenCL buffer for
+        an array of the tuning driver and writes the array into it.
+
+        :param prog: the f2pygen subroutine of the driver.
+        :type prog: :py:class:`psyclone.f2pygen.SubroutineGen`
+        :param sym_table: the symbol table used to create unique names in \
+            the driver.
+        :type sym_table: :py:class:`psyclone.psyir.symbols.SymbolTable`
+        :param str local_name: the name of the array in the driver.
+        :param str queues: the name of the list of OpenCL command queues.
+        :param str size_in_bytes: the name of the buffer-size variable.
+        :param str ierr: the name of the OpenCL error-code variable.
+
+        :returns: the name of the variable that holds the buffer.
+        :rtype: str
+        '''
+        from psyclone.f2pygen import AssignGen, DeclGen
+        buffer_name = sym_table.new_symbol(local_name + "_device").name
+        prog.add(DeclGen(prog, datatype="integer", kind="c_intptr_t",
+                         target=True, entity_decls=[buffer_name]))
+        prog.add(AssignGen(
+            prog, lhs=size_in_bytes,
+            rhs="INT(SIZE({0}), 8) * C_SIZEOF({0}(1,1))".format(local_name)))
+        prog.add(AssignGen(
+            prog, lhs=buffer_name,
+            rhs="create_rw_buffer({0})".format(size_in_bytes)))
+        prog.add(AssignGen(
+            prog, lhs=ierr,
+            rhs="clEnqueueWriteBuffer({0}(1), {1}, CL_TRUE, 0_8, {2}, "
+            "C_LOC({3}), 0, C_NULL_PTR, C_NULL_PTR)".format(
+                queues, buffer_name, size_in_bytes, local_name)))
+        return buffer_name
+
+    # -------------------------------------------------------------------------
+    def _add_tuning_routines(self, module, sym_table, kernels):
+        '''This function adds the subroutines that time an OpenCL kernel
+        with each of the candidate local sizes and that append the best
+        local size of each kernel to the tuning file to the driver module.
+
+        :param module: the f2pygen module of the driver.
+        :type module: :py:class:`psyclone.f2pygen.ModuleGen`
+        :param sym_table: the symbol table used to create unique names in \
+            the driver.
+        :type sym_table: :py:class:`psyclone.psyir.symbols.SymbolTable`
+        :param kernels: the kernels in the extracted region.
+        :type kernels: list of :py:class:`psyclone.gocean1p0.GOKern`
+
+        :returns: the names of the timing and the writing subroutines.
+        :rtype: (str, str)
+        '''
+        from psyclone.f2pygen import PSyIRGen
+        from psyclone.psyir.frontend.fortran import FortranReader
+
+        tune_code = '''
+        subroutine tune_local_size(kernel, nx, ny, candidates, best_size)
+            use iso_c_binding, only: c_intptr_t, c_size_t, c_loc, c_null_ptr
+            use clfortran
+            use fortcl, only: get_cmd_queues
+            integer(kind=c_intptr_t), target, intent(in) :: kernel
+            integer, intent(in) :: nx, ny
+            integer, dimension(:), intent(in) :: candidates
+            integer, intent(out) :: best_size
+            integer(kind=c_size_t), target :: globalsize(2), localsize(2)
+            integer(kind=c_intptr_t), pointer :: cmd_queues(:)
+            integer :: ierr, idx, rep
+            integer(kind=8) :: clock_start, clock_end, best_time
+
+            cmd_queues => get_cmd_queues()
+            globalsize = (/nx, ny/)
+            best_size = 0
+            best_time = huge(best_time)
+            do idx = 1, size(candidates)
+                ! The global size must be a multiple of the local size
+                if (mod(nx, candidates(idx)) == 0) then
+                    localsize = (/candidates(idx), 1/)
+                    ! Launch the kernel once before timing it
+                    ierr = clEnqueueNDRangeKernel(cmd_queues(1), kernel, 2, &
+                        C_NULL_PTR, C_LOC(globalsize), C_LOC(localsize), 0, &
+                        C_NULL_PTR, C_NULL_PTR)
+                    ierr = clFinish(cmd_queues(1))
+                    call system_clock(clock_start)
+                    do rep = 1, {0}
+                        ierr = clEnqueueNDRangeKernel(cmd_queues(1), kernel, &
+                            2, C_NULL_PTR, C_LOC(globalsize), &
+                            C_LOC(localsize), 0, C_NULL_PTR, C_NULL_PTR)
+                    end do
+                    ierr = clFinish(cmd_queues(1))
+                    call system_clock(clock_end)
+                    if (clock_end - clock_start < best_time) then
+                        best_time = clock_end - clock_start
+                        best_size = candidates(idx)
+                    end if
+                end if
+            end do
+        end subroutine tune_local_size
+        '''.format(self._tuning_repetitions)
+
+        writes = "\n".join(
+            "write(tuning_unit, \"(A, 1X, I0)\") \"{0}\", best_sizes({1})"
+            "".format(kern.name, idx + 1) for idx, kern in enumerate(kernels))
+        write_code = '''
+        subroutine write_local_size_tuning(best_sizes)
+            integer, dimension(:), intent(in) :: best_sizes
+            integer, parameter :: tuning_unit = 57
+            open(unit=tuning_unit, file="{0}", position="append")
+            {1}
+            close(tuning_unit)
+        end subroutine write_local_size_tuning
+        '''.format(self._tuning_file, writes)
+
+        fortran_reader = FortranReader()
+        names = []
+        for code, root_name in [(tune_code, "tune_local_size"),
+                                (write_code, "write_local_size_tuning")]:
+            subroutine = fortran_reader.psyir_from_source(code)
+            subroutine.name = sym_table.new_symbol(root_name).name
+            module.add(PSyIRGen(module, subroutine))
+            names.append(subroutine.name)
+        return tuple(names)
+
 
 # For AutoAPI documentation generation
 __all__ = ['GOceanExtractNode']
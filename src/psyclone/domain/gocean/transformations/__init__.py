@@ -44,10 +44,15 @@ from psyclone.domain.gocean.transformations. \
     GOMoveIterationBoundariesInsideKernelTrans
 from psyclone.domain.gocean.transformations.gocean_loop_fuse_trans \
     import GOceanLoopFuseTrans
+from psyclone.domain.gocean.transformations. \
+    gocean_opencl_kernel_fuse_trans import GOOpenCLKernelFuseTrans
+from psyclone.domain.gocean.transformations.gocean_loop_tiling_2d_trans \
+    import GOceanLoopTiling2DTrans
 
 # The entities in the __all__ list are made available to import directly from
 # this package e.g.:
 # from psyclone.domain.gocean.transformations import GOceanExtractTrans
 
 __all__ = ['GOceanExtractTrans', 'GOMoveIterationBoundariesInsideKernelTrans',
-           'GOceanLoopFuseTrans']
+           'GOceanLoopFuseTrans', 'GOOpenCLKernelFuseTrans',
+           'GOceanLoopTiling2DTrans']
@@ -90,9 +90,16 @@ class GOceanExtractTrans(ExtractTrans):
             changes the region names) and to the GOceanExtractNode (where it \
             changes the name of the created output files and the name of the \
             driver program).
+        :param options["tune_local_size"]: the candidate OpenCL local \
+            sizes. If set, the driver program tunes the OpenCL local size \
+            of each kernel in the region instead of re-running the region. \
+            This flag is forwarded to the GOceanExtractNode.
+        :type options["tune_local_size"]: list of int
 
         :raises TransformationError: if transformation is applied to an \
             inner Loop without its parent outer Loop.
+        :raises TransformationError: if the candidate local sizes are not \
+            a list of positive integers or no driver is created.
         '''
 
         # First check constraints on Nodes in the node_list inherited from
@@ -111,6 +118,20 @@ class GOceanExtractTrans(ExtractTrans):
                     "inner Loop without its ancestor outer Loop is not "
                     "allowed.".format(str(self.name)))
 
+        if options and "tune_local_size" in options:
+            candidates = options["tune_local_size"]
+            if not (isinstance(candidates, list) and candidates and
+                    all(isinstance(size, int) and size > 0
+                        for size in candidates)):
+                raise TransformationError(
+                    "Error in {0}: the 'tune_local_size' option must be a "
+                    "list of positive integers but got '{1}'."
+                    "".format(self.name, candidates))
+            if not options.get("create_driver"):
+                raise TransformationError(
+                    "Error in {0}: the 'tune_local_size' option requires "
+                    "the 'create_driver' option.".format(self.name))
+
     def apply(self, nodes, options=None):
         # pylint: disable=arguments-differ
         '''Apply this transformation to a subset of the nodes within a
@@ -141,6 +162,10 @@ class GOceanExtractTrans(ExtractTrans):
             location name followed by a local name. The pair of strings \
             should uniquely identify a region unless aggregate information \
             is required (and is supported by the runtime library).
+        :param options["tune_local_size"]: the candidate OpenCL local \
+            sizes. If set, the driver program tunes the OpenCL local size \
+            of each kernel in the region instead of re-running the region.
+        :type options["tune_local_size"]: list of int
 
         :returns: Tuple of the modified schedule and a record of the \
                   transformation.
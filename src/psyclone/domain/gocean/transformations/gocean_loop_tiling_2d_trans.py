@@ -0,0 +1,233 @@
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2021, Science and Technology Facilities Council.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+
+'''This module contains the GOceanLoopTiling2DTrans transformation.'''
+
+from psyclone.gocean1p0 import GOLoop
+from psyclone.psyGen import InvokeSchedule
+from psyclone.psyir.nodes import Literal
+from psyclone.psyir.symbols import DataSymbol, INTEGER_TYPE
+from psyclone.psyir.transformations import LoopTrans, TransformationError
+from psyclone.undoredo import Memento
+
+
+class GOceanLoopTiling2DTrans(LoopTrans):
+    '''
+    Tiles (cache-blocks) a GOcean loop nest, i.e. an outer GOLoop over
+    'j' that contains exactly one inner GOLoop over 'i'. For example:
+
+    .. code-block:: fortran
+
+        DO j = jstart, jstop
+          DO i = istart, istop
+            CALL kernel(i, j, ...)
+
+    becomes:
+
+    .. code-block:: fortran
+
+        DO j_tile = jstart, jstop, tilesize_j
+          DO i_tile = istart, istop, tilesize_i
+            DO j = j_tile, MIN(j_tile + tilesize_j - 1, jstop)
+              DO i = i_tile, MIN(i_tile + tilesize_i - 1, istop)
+                CALL kernel(i, j, ...)
+
+    The loops over the tiles are GOLoops that iterate over the same
+    iteration space as the original loops, and the loops within a tile
+    keep deriving the end of the iteration space from it, so the tiling
+    is correct for any iteration space, grid offset and (constant) loop
+    bounds. The outer loop over the tiles can then be parallelised, e.g.
+    with the GOceanOMPParallelLoopTrans:
+
+    >>> from psyclone.domain.gocean.transformations import \\
+    ...     GOceanLoopTiling2DTrans
+    >>> from psyclone.transformations import GOceanOMPParallelLoopTrans
+    >>> schedule = psy.invokes.get('invoke_0').schedule
+    >>> GOceanLoopTiling2DTrans().apply(schedule.children[0],
+    ...                                 {"tilesize": 64})
+    >>> GOceanOMPParallelLoopTrans().apply(schedule.children[0])
+    >>> schedule.view()
+
+    '''
+    def __str__(self):
+        return "Tile a GOcean loop nest over 2D tiles"
+
+    @staticmethod
+    def _tile_sizes(options):
+        '''
+        :param options: a dictionary with options for transformations.
+        :type options: dict of str:values or None
+
+        :returns: the tile sizes in the 'i' and the 'j' dimension.
+        :rtype: 2-tuple of int
+
+        '''
+        if not options:
+            options = {}
+        tilesize = options.get("tilesize", 32)
+        return (options.get("tilesize_i", tilesize),
+                options.get("tilesize_j", tilesize))
+
+    def validate(self, node, options=None):
+        '''
+        Checks that the supplied node is a GOcean loop nest that can be
+        tiled with the given options.
+
+        :param node: the outer loop of the loop nest to tile.
+        :type node: :py:class:`psyclone.gocean1p0.GOLoop`
+        :param options: a dictionary with options for transformations.
+        :type options: dict of str:values or None
+        :param int options["tilesize"]: the size of the tiles in both \\
+            dimensions (default 32).
+        :param int options["tilesize_i"]: the size of the tiles in the \\
+            inner ('i') dimension (default options["tilesize"]).
+        :param int options["tilesize_j"]: the size of the tiles in the \\
+            outer ('j') dimension (default options["tilesize"]).
+
+        :raises TransformationError: if the supplied node is not an outer \\
+            GOLoop.
+        :raises TransformationError: if the loop does not contain exactly \\
+            one inner GOLoop.
+        :raises TransformationError: if either loop is already tiled.
+        :raises TransformationError: if the loop nest is in an OpenCL \\
+            InvokeSchedule.
+        :raises TransformationError: if a tile size is not a positive \\
+            integer.
+
+        '''
+        super(GOceanLoopTiling2DTrans, self).validate(node, options=options)
+
+        if not isinstance(node, GOLoop) or node.loop_type != "outer":
+            raise TransformationError(
+                "Error in {0} transformation. The supplied node must be an "
+                "outer GOLoop but got '{1}'."
+                "".format(self.name, node.node_str(colour=False)))
+
+        body = node.loop_body.children
+        if len(body) != 1 or not isinstance(body[0], GOLoop) or \
+                body[0].loop_type != "inner":
+            raise TransformationError(
+                "Error in {0} transformation. The supplied loop must contain "
+                "exactly one inner GOLoop but found {1}."
+                "".format(self.name, [type(child).__name__
+                                      for child in body]))
+
+        if node.tile or body[0].tile:
+            raise TransformationError(
+                "Error in {0} transformation. The supplied loop nest is "
+                "already tiled.".format(self.name))
+
+        invoke = node.ancestor(InvokeSchedule)
+        if invoke and invoke.opencl:
+            raise TransformationError(
+                "Error in {0} transformation. Loops are not generated for an "
+                "OpenCL InvokeSchedule so they cannot be tiled."
+                "".format(self.name))
+
+        for key in ["tilesize", "tilesize_i", "tilesize_j"]:
+            if options and key in options:
+                value = options[key]
+                if not isinstance(value, int) or isinstance(value, bool) \
+                        or value < 1:
+                    raise TransformationError(
+                        "Error in {0} transformation. The '{1}' option must "
+                        "be a positive integer but got '{2}'."
+                        "".format(self.name, key, value))
+
+    def apply(self, node, options=None):
+        '''
+        Tiles the GOcean loop nest that starts with the supplied outer loop.
+        The loop variables of the loops over the tiles are shared by all
+        tiled loop nests of the Invoke.
+
+        :param node: the outer loop of the loop nest to tile.
+        :type node: :py:class:`psyclone.gocean1p0.GOLoop`
+        :param options: a dictionary with options for transformations.
+        :type options: dict of str:values or None
+        :param int options["tilesize"]: the size of the tiles in both \\
+            dimensions (default 32).
+        :param int options["tilesize_i"]: the size of the tiles in the \\
+            inner ('i') dimension (default options["tilesize"]).
+        :param int options["tilesize_j"]: the size of the tiles in the \\
+            outer ('j') dimension (default options["tilesize"]).
+
+        :returns: 2-tuple of new schedule and memento of transform.
+        :rtype: (:py:class:`psyclone.gocean1p0.GOInvokeSchedule`, \\
+                 :py:class:`psyclone.undoredo.Memento`)
+
+        '''
+        self.validate(node, options=options)
+        tilesize_i, tilesize_j = self._tile_sizes(options)
+
+        schedule = node.root
+        keep = Memento(schedule, self, [node])
+
+        outer = node
+        inner = outer.loop_body[0]
+        parent = outer.parent
+        position = outer.position
+
+        symtab = outer.scope.symbol_table
+        j_tile = symtab.symbol_from_tag(
+            "noncontiguous_tile_kidx", root_name="j_tile",
+            symbol_type=DataSymbol, datatype=INTEGER_TYPE)
+        i_tile = symtab.symbol_from_tag(
+            "contiguous_tile_kidx", root_name="i_tile",
+            symbol_type=DataSymbol, datatype=INTEGER_TYPE)
+
+        # Create the loops over the tiles. They iterate over the same
+        # iteration space as the original loops.
+        outer_tile = GOLoop(parent=parent, loop_type="outer")
+        inner_tile = GOLoop(parent=outer_tile.loop_body, loop_type="inner")
+        outer_tile.loop_body.addchild(inner_tile)
+        for tile_loop, loop, variable, size in [
+                (outer_tile, outer, j_tile, tilesize_j),
+                (inner_tile, inner, i_tile, tilesize_i)]:
+            tile_loop.variable = variable
+            tile_loop.field_space = loop.field_space
+            tile_loop.iteration_space = loop.iteration_space
+            tile_loop.field_name = loop.field_name
+            tile_loop.step_expr = Literal(str(size), INTEGER_TYPE)
+
+        # The original loops now iterate over the points of a tile
+        outer.tile = (j_tile, tilesize_j)
+        inner.tile = (i_tile, tilesize_i)
+        inner_tile.loop_body.addchild(outer.detach())
+        parent.children.insert(position, outer_tile)
+
+        return schedule, keep
+
+
+# For automatic documentation generation
+__all__ = ["GOceanLoopTiling2DTrans"]
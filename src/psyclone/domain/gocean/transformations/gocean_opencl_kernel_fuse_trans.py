@@ -0,0 +1,448 @@
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2021, Science and Technology Facilities Council.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+
+'''This module contains the GOOpenCLKernelFuseTrans.'''
+
+import copy
+
+from psyclone.core.access_type import AccessType
+from psyclone.domain.gocean.transformations.gocean_loop_fuse_trans import \
+    GOceanLoopFuseTrans
+from psyclone.gocean1p0 import GOKern, GOLoop
+from psyclone.psyGen import Transformation
+from psyclone.psyir.nodes import ArrayReference, Assignment, Reference, \
+    Return
+from psyclone.psyir.symbols import ArgumentInterface, DataSymbol, \
+    RoutineSymbol, ScalarType
+from psyclone.psyir.transformations import TransformationError
+from psyclone.undoredo import Memento
+
+
+class GOOpenCLKernelFuseTrans(Transformation):
+    ''' Fuses two adjacent GOcean kernels into a single kernel so that
+    the OpenCL PSy layer launches one OpenCL kernel instead of two. The
+    body of the second kernel is appended to the body of the first one
+    and the loop nest of the second kernel is removed. For example:
+
+    .. code-block:: fortran
+
+        call invoke(copy(voldfld, vfld), copy(vfld, voldfld))
+
+    results in a single ``field_copy_field_copy_code`` OpenCL kernel.
+
+    A field that is written by the first kernel (with a single, pointwise
+    assignment) and read by the second one is kept in a private variable
+    so that the second kernel does not re-read it from global memory. The
+    field is still written to global memory because it is visible to the
+    Algorithm layer.
+
+    The kernels must be the only statements in loop nests that are
+    adjacent and have the same iteration space, and there must be no
+    dependence between different grid points: a field written by one of
+    the kernels may only be accessed pointwise by the other one (as given
+    by the stencil metadata of the kernels). Since the transformation
+    concatenates the kernel bodies, it must be applied before the
+    ``GOMoveIterationBoundariesInsideKernelTrans`` transformation. The
+    fused kernel can only be generated as OpenCL (see ``OCLTrans``).
+
+    >>> from psyclone.domain.gocean.transformations import \\
+    ...     GOOpenCLKernelFuseTrans
+    >>> kernels = schedule.coded_kernels()
+    >>> GOOpenCLKernelFuseTrans().apply(kernels[0], kernels[1])
+
+    '''
+    def __str__(self):
+        return "Fuse two adjacent GOcean kernels into a single OpenCL kernel."
+
+    @property
+    def name(self):
+        '''Returns the name of this transformation as a string.'''
+        return "GOOpenCLKernelFuseTrans"
+
+    @staticmethod
+    def _loop_nest(kern):
+        '''
+        :param kern: the kernel whose loop nest is returned.
+        :type kern: :py:class:`psyclone.gocean1p0.GOKern`
+
+        :returns: the outer and inner loops of the given kernel or None \
+            if the kernel is not the only statement in a GOcean loop nest.
+        :rtype: 2-tuple of :py:class:`psyclone.gocean1p0.GOLoop` or NoneType
+        '''
+        inner = kern.parent.parent if kern.parent else None
+        if not (isinstance(inner, GOLoop) and inner.loop_type == "inner" and
+                len(inner.loop_body.children) == 1):
+            return None
+        outer = inner.parent.parent
+        if not (isinstance(outer, GOLoop) and outer.loop_type == "outer" and
+                len(outer.loop_body.children) == 1):
+            return None
+        return outer, inner
+
+    @staticmethod
+    def _is_written(arg):
+        '''
+        :param arg: a kernel argument.
+        :type arg: :py:class:`psyclone.psyGen.Argument`
+
+        :returns: whether the kernel writes to the argument.
+        :rtype: bool
+        '''
+        return arg.access in AccessType.all_write_accesses()
+
+    def validate(self, node1, node2, options=None):
+        # pylint: disable=arguments-differ, too-many-branches
+        '''Ensure that it is valid to apply this transformation to the
+        supplied kernels.
+
+        :param node1: the first of the two kernels to fuse.
+        :type node1: :py:class:`psyclone.gocean1p0.GOKern`
+        :param node2: the kernel that immediately follows node1.
+        :type node2: :py:class:`psyclone.gocean1p0.GOKern`
+        :param options: a dictionary with options for transformations.
+        :type options: dict of string:values or None
+
+        :raises TransformationError: if either node is not a GOKern.
+        :raises TransformationError: if either kernel is not the only \
+            statement in a GOcean loop nest.
+        :raises TransformationError: if the loop nests are not adjacent \
+            or do not have the same iteration space.
+        :raises TransformationError: if either kernel contains a Return \
+            statement.
+        :raises TransformationError: if either kernel writes to a scalar.
+        :raises TransformationError: if a field written by one of the \
+            kernels is accessed with a stencil by the other one.
+        :raises TransformationError: if the second kernel uses a symbol \
+            that is not an argument or a local variable and that is not \
+            available in the first kernel.
+
+        '''
+        for node in [node1, node2]:
+            if not isinstance(node, GOKern):
+                raise TransformationError(
+                    "Error in {0} transformation. This transformation can "
+                    "only be applied to 'GOKern' nodes, but found '{1}'."
+                    "".format(self.name, type(node).__name__))
+            if not self._loop_nest(node):
+                raise TransformationError(
+                    "Error in {0} transformation. Kernel '{1}' must be the "
+                    "only statement in a GOcean loop nest.".format(
+                        self.name, node.name))
+        outer1, inner1 = self._loop_nest(node1)
+        outer2, inner2 = self._loop_nest(node2)
+
+        # The loop nests must be adjacent and iterate over the same points
+        GOceanLoopFuseTrans().validate(outer1, outer2)
+        if outer2.position != outer1.position + 1:
+            raise TransformationError(
+                "Error in {0} transformation. Kernel '{1}' must immediately "
+                "precede kernel '{2}'.".format(self.name, node1.name,
+                                               node2.name))
+        if (inner1.field_space != inner2.field_space or
+                inner1.iteration_space != inner2.iteration_space or
+                outer1.iteration_space != outer2.iteration_space):
+            raise TransformationError(
+                "Error in {0} transformation. Cannot fuse kernels '{1}' and "
+                "'{2}' because their loops have different iteration spaces."
+                "".format(self.name, node1.name, node2.name))
+
+        for node in [node1, node2]:
+            for arg in node.arguments.args:
+                if arg.argument_type == "scalar" and self._is_written(arg):
+                    raise TransformationError(
+                        "Error in {0} transformation. Kernel '{1}' writes to "
+                        "the scalar argument '{2}' but reductions are not "
+                        "supported.".format(self.name, node.name, arg.name))
+        for node in [node1, node2]:
+            if node.get_kernel_schedule().walk(Return):
+                raise TransformationError(
+                    "Error in {0} transformation. Kernel '{1}' contains a "
+                    "Return statement. Note that this transformation must "
+                    "be applied before the GOMoveIterationBoundariesInside"
+                    "KernelTrans transformation.".format(self.name,
+                                                         node.name))
+
+        # A field written by one kernel may only be accessed pointwise by
+        # the other, otherwise a work-item could access a grid point that
+        # another work-item has not yet updated.
+        fields1 = [arg for arg in node1.arguments.args
+                   if arg.argument_type == "field"]
+        fields2 = [arg for arg in node2.arguments.args
+                   if arg.argument_type == "field"]
+        for arg1 in fields1:
+            for arg2 in fields2:
+                if arg1.name != arg2.name:
+                    continue
+                if ((self._is_written(arg1) and arg2.stencil.has_stencil) or
+                        (self._is_written(arg2) and
+                         arg1.stencil.has_stencil)):
+                    raise TransformationError(
+                        "Error in {0} transformation. Cannot fuse kernels "
+                        "'{1}' and '{2}' because field '{3}' is written by "
+                        "one of them and accessed with a stencil by the "
+                        "other.".format(self.name, node1.name, node2.name,
+                                        arg1.name))
+
+        # Any other symbol used by the second kernel must already be
+        # available in the first one (e.g. precision symbols).
+        table1 = node1.get_kernel_schedule().symbol_table
+        table2 = node2.get_kernel_schedule().symbol_table
+        for symbol in table2.symbols:
+            if isinstance(symbol, RoutineSymbol) and \
+                    symbol.name.lower() == node2.name.lower():
+                continue
+            if symbol.is_argument or (isinstance(symbol, DataSymbol) and
+                                      symbol.is_local):
+                continue
+            if symbol.name not in table1:
+                raise TransformationError(
+                    "Error in {0} transformation. Kernel '{1}' uses the "
+                    "symbol '{2}' which is not available in kernel '{3}'."
+                    "".format(self.name, node2.name, symbol.name,
+                              node1.name))
+
+    @staticmethod
+    def _fused_name(name1, name2):
+        '''
+        :param str name1: name of the first kernel.
+        :param str name2: name of the second kernel.
+
+        :returns: the name of the fused kernel, following the PSyclone \
+            convention of ending in "_code" if the first kernel does.
+        :rtype: str
+        '''
+        suffix = ""
+        if name1.lower().endswith("_code"):
+            suffix = name1[-5:]
+            name1 = name1[:-5]
+        if name2.lower().endswith("_code"):
+            name2 = name2[:-5]
+        return name1 + "_" + name2 + suffix
+
+    @staticmethod
+    def _merge_argument(arg1, arg2):
+        '''
+        Update the access and stencil of a kernel argument of the first
+        kernel to account for the access of the same field or grid
+        property by the second kernel.
+
+        :param arg1: the argument of the fused (first) kernel.
+        :type arg1: :py:class:`psyclone.psyGen.Argument`
+        :param arg2: the same argument of the second kernel.
+        :type arg2: :py:class:`psyclone.psyGen.Argument`
+        '''
+        # If the first kernel writes the field then the fused kernel does
+        # too (before any read), otherwise any differing access becomes a
+        # read-write.
+        if arg1.access != AccessType.WRITE and arg1.access != arg2.access:
+            arg1.access = AccessType.READWRITE
+        if arg1.argument_type != "field" or not arg2.stencil.has_stencil:
+            return
+        # The stencil of the fused kernel is the union of both stencils
+        # pylint: disable=protected-access
+        stencil = copy.deepcopy(arg1.stencil)
+        for idx0 in [-1, 0, 1]:
+            for idx1 in [-1, 0, 1]:
+                stencil._stencil[idx0+1][idx1+1] = max(
+                    arg1.stencil.depth(idx0, idx1),
+                    arg2.stencil.depth(idx0, idx1))
+        stencil._has_stencil = True
+        descriptor = copy.copy(arg1._arg)
+        descriptor._stencil = stencil
+        arg1._arg = descriptor
+
+    def apply(self, node1, node2, options=None):
+        # pylint: disable=arguments-differ, too-many-locals
+        '''Apply this transformation to the supplied kernels.
+
+        :param node1: the first of the two kernels to fuse.
+        :type node1: :py:class:`psyclone.gocean1p0.GOKern`
+        :param node2: the kernel that immediately follows node1.
+        :type node2: :py:class:`psyclone.gocean1p0.GOKern`
+        :param options: a dictionary with options for transformations.
+        :type options: dict of string:values or None
+
+        :returns: 2-tuple of new schedule and memento of transform.
+        :rtype: (:py:class:`psyclone.gocean1p0.GOInvokeSchedule`, \
+                 :py:class:`psyclone.undoredo.Memento`)
+
+        '''
+        self.validate(node1, node2, options)
+
+        schedule = node1.root
+        keep = Memento(schedule, self, [node1, node2])
+
+        ksched1 = node1.get_kernel_schedule()
+        ksched2 = node2.get_kernel_schedule()
+        table1 = ksched1.symbol_table
+        table2 = ksched2.symbol_table
+
+        # Map the symbols of the second kernel to symbols of the first one
+        indices = table1.iteration_indices
+        data_arguments = table1.data_arguments
+        symbol_map = dict(zip(table2.iteration_indices, indices))
+        args1 = list(node1.arguments.args)
+        new_arguments = []
+        for arg2, sym2 in zip(node2.arguments.args, table2.data_arguments):
+            for arg1, sym1 in zip(args1, data_arguments + new_arguments):
+                if arg1.name == arg2.name and \
+                        arg1.argument_type == arg2.argument_type:
+                    symbol_map[sym2] = sym1
+                    self._merge_argument(arg1, arg2)
+                    break
+            else:
+                symbol_map[sym2] = table1.new_symbol(
+                    sym2.name, symbol_type=DataSymbol, datatype=sym2.datatype,
+                    interface=ArgumentInterface(sym2.interface.access))
+                new_arguments.append(symbol_map[sym2])
+                args1.append(arg2)
+        for sym2 in table2.local_datasymbols:
+            new_symbol = table1.new_symbol(sym2.name, symbol_type=DataSymbol,
+                                           datatype=sym2.datatype)
+            new_symbol.copy_properties(sym2)
+            if sym2.constant_value is not None:
+                new_symbol.constant_value = sym2.constant_value.copy()
+            symbol_map[sym2] = new_symbol
+        for sym2 in table2.symbols:
+            if sym2 not in symbol_map and sym2.name in table1:
+                symbol_map[sym2] = table1.lookup(sym2.name)
+
+        body2 = ksched2.pop_all_children()
+        for stmt in body2:
+            for ref in stmt.walk(Reference):
+                if ref.symbol in symbol_map:
+                    ref.symbol = symbol_map[ref.symbol]
+
+        # Keep the fields that the first kernel passes to the second one in
+        # private variables.
+        for arg1, sym1 in zip(node1.arguments.args, data_arguments):
+            if arg1.argument_type != "field" or not self._is_written(arg1):
+                continue
+            private = self._forward_field(ksched1, sym1, indices, body2)
+            if private:
+                for ref in self._pointwise_refs(body2, sym1, indices):
+                    ref.replace_with(Reference(private))
+
+        ksched1.children.extend(body2)
+        table1.specify_argument_list(indices + data_arguments +
+                                     new_arguments)
+
+        # Update the kernel call
+        for arg in args1[len(node1.arguments.args):]:
+            # pylint: disable=protected-access
+            arg._call = node1
+            node1.arguments.args.append(arg)
+        # pylint: disable=protected-access
+        node1.arguments._raw_arg_list = []
+        new_name = self._fused_name(node1.name, node2.name)
+        node1.name = new_name
+        ksched1.name = new_name
+        node1._fused = True
+
+        self._loop_nest(node2)[0].detach()
+
+        return schedule, keep
+
+    @staticmethod
+    def _pointwise_refs(statements, symbol, indices):
+        '''
+        :param statements: the statements to search.
+        :type statements: list of :py:class:`psyclone.psyir.nodes.Node`
+        :param symbol: the array symbol.
+        :type symbol: :py:class:`psyclone.psyir.symbols.DataSymbol`
+        :param indices: the iteration index symbols of the kernel.
+        :type indices: list of :py:class:`psyclone.psyir.symbols.DataSymbol`
+
+        :returns: the references to the given array at the grid point \
+            (i, j) of the kernel in the given statements.
+        :rtype: list of :py:class:`psyclone.psyir.nodes.ArrayReference`
+        '''
+        def is_index(node, index):
+            ''' Whether node is a plain reference to the given index. '''
+            return (isinstance(node, Reference) and
+                    not isinstance(node, ArrayReference) and
+                    node.symbol is index)
+
+        refs = []
+        for stmt in statements:
+            for ref in stmt.walk(ArrayReference):
+                if ref.symbol is symbol and len(ref.indices) == 2 and \
+                        all(is_index(idx, index) for idx, index in
+                            zip(ref.indices, indices)):
+                    refs.append(ref)
+        return refs
+
+    def _forward_field(self, ksched, symbol, indices, body2):
+        '''
+        If the given field is assigned once, at the grid point of the
+        kernel, in the top level of the given kernel and is not written
+        by the statements of the second kernel, store its value in a new
+        private variable as well as in the field.
+
+        :param ksched: the schedule of the first kernel.
+        :type ksched: :py:class:`psyclone.gocean1p0.GOKernelSchedule`
+        :param symbol: the symbol of the field.
+        :type symbol: :py:class:`psyclone.psyir.symbols.DataSymbol`
+        :param indices: the iteration index symbols of the kernel.
+        :type indices: list of :py:class:`psyclone.psyir.symbols.DataSymbol`
+        :param body2: the statements of the second kernel.
+        :type body2: list of :py:class:`psyclone.psyir.nodes.Node`
+
+        :returns: the private variable holding the value of the field or \
+            None if the field cannot be kept in a private variable.
+        :rtype: :py:class:`psyclone.psyir.symbols.DataSymbol` or NoneType
+        '''
+        writes = [assign for assign in ksched.walk(Assignment)
+                  if assign.lhs.symbol is symbol]
+        for stmt in body2:
+            writes.extend([assign for assign in stmt.walk(Assignment)
+                           if assign.lhs.symbol is symbol])
+        if len(writes) != 1 or writes[0].parent is not ksched or \
+                not self._pointwise_refs([writes[0].lhs], symbol, indices):
+            return None
+        if not self._pointwise_refs(body2, symbol, indices):
+            return None
+        assign = writes[0]
+        private = ksched.symbol_table.new_symbol(
+            symbol.name + "_private", symbol_type=DataSymbol,
+            datatype=ScalarType(symbol.datatype.intrinsic,
+                                symbol.datatype.precision))
+        ksched.children.insert(assign.position, Assignment.create(
+            Reference(private), assign.rhs.detach()))
+        assign.addchild(Reference(private))
+        return private
+
+
+# For Sphinx AutoAPI documentation generation
+__all__ = ['GOOpenCLKernelFuseTrans']
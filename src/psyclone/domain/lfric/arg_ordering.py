@@ -178,6 +178,10 @@ class ArgOrdering(object):
         # applying a CMA operator or doing a CMA matrix-matrix calculation
         if self._kern.cma_operation not in ["apply", "matrix-matrix"]:
             self.mesh_height(var_accesses=var_accesses)
+        # Pass the number of columns in the current block if this kernel
+        # has been transformed to process a block of columns per call
+        if self._kern.cell_block_size:
+            self.cell_block(var_accesses=var_accesses)
         # Pass the number of cells in the mesh if this kernel has a
         # LMA operator argument
         # TODO this code should replace the code that currently includes
@@ -368,6 +372,20 @@ class ArgOrdering(object):
 
         '''
 
+    @abc.abstractmethod
+    def cell_block(self, var_accesses=None):
+        '''Add the number of columns in the current block of cells to the
+        argument list (for kernels that have been transformed to process
+        several columns per call) and if supplied stores this access in
+        var_accesses.
+
+        :param var_accesses: optional VariablesAccessInfo instance to store \
+            the information about variable accesses.
+        :type var_accesses: \
+            :py:class:`psyclone.core.access_info.VariablesAccessInfo`
+
+        '''
+
     @abc.abstractmethod
     def mesh_ncell2d(self, var_accesses=None):
         '''Add the number of columns in the mesh to the argument list and if
@@ -69,6 +69,7 @@ class KernCallArgList(ArgOrdering):
         self._nlayers_positions = []
         self._nqp_positions = []
         self._ndf_positions = []
+        self._dofmap_positions = []
         # Keep a reference to the Invoke SymbolTable as a shortcut
         self._symtab = self._kern.ancestor(psyGen.InvokeSchedule).symbol_table
 
@@ -131,6 +132,19 @@ class KernCallArgList(ArgOrdering):
         self.append(nlayers_name, var_accesses)
         self._nlayers_positions.append(self.num_args)
 
+    def cell_block(self, var_accesses=None):
+        '''Add the number of columns in the current block of cells to the
+        argument list and if supplied stores this access in var_accesses.
+
+        :param var_accesses: optional VariablesAccessInfo instance to store \
+            the information about variable accesses.
+        :type var_accesses: \
+            :py:class:`psyclone.core.access_info.VariablesAccessInfo`
+
+        '''
+        ncell_block_name = self._symtab.symbol_from_tag("ncell_block").name
+        self.append(ncell_block_name, var_accesses)
+
     # TODO uncomment this method when ensuring we only pass ncell3d once
     # to any given kernel.
     # def mesh_ncell3d(self):
@@ -419,11 +433,23 @@ class KernCallArgList(ArgOrdering):
             # pass the whole dofmap.
             self.append("{0}".format(map_name),
                         var_accesses, var_access_name=map_name)
+        elif self._kern.cell_block_size:
+            # Pass the (contiguous) dofmaps for the block of cell columns
+            ncell_block_name = self._symtab.symbol_from_tag(
+                "ncell_block").name
+            cell_ref = self._cell_ref_name(var_accesses)
+            if var_accesses is not None:
+                var_accesses.add_access(Signature(ncell_block_name),
+                                        AccessType.READ, self._kern)
+            self.append("{0}(:,{1}:{1}+{2}-1)".format(map_name, cell_ref,
+                                                      ncell_block_name),
+                        var_accesses, var_access_name=map_name)
         else:
             # Pass the dofmap for the cell column
             self.append("{0}(:,{1})".format(map_name,
                                             self._cell_ref_name(var_accesses)),
                         var_accesses, var_access_name=map_name)
+        self._dofmap_positions.append(self.num_args)
 
     def fs_intergrid(self, function_space, var_accesses=None):
         '''Add function-space related arguments for an intergrid kernel.
@@ -680,6 +706,22 @@ class KernCallArgList(ArgOrdering):
                 "before the ndf_positions() method")
         return self._ndf_positions
 
+    @property
+    def dofmap_positions(self):
+        ''':returns: the position(s) in the argument list of the \
+            variable(s) that pass the dofmap for each function space. The \
+            generate method must be called first.
+        :rtype: list of int.
+
+        :raises InternalError: if the generate() method has not been called.
+
+        '''
+        if not self._generate_called:
+            raise InternalError(
+                "KernCallArgList: the generate() method should be called "
+                "before the dofmap_positions() method")
+        return self._dofmap_positions
+
     def _cell_ref_name(self, var_accesses=None):
         '''Utility routine which determines whether to return the cell value
         or the colourmap lookup value. If supplied it also stores this access
@@ -97,6 +97,18 @@ class KernStubArgList(ArgOrdering):
         '''
         self.append("nlayers", var_accesses)
 
+    def cell_block(self, var_accesses=None):
+        '''Add the number of columns in the current block of cells to the
+        argument list and if supplied stores this access in var_accesses.
+
+        :param var_accesses: optional VariablesAccessInfo instance to store \
+            the information about variable accesses.
+        :type var_accesses: \
+            :py:class:`psyclone.core.access_info.VariablesAccessInfo`
+
+        '''
+        self.append("ncell_block", var_accesses)
+
     def mesh_ncell2d(self, var_accesses=None):
         '''Add the number of columns in the mesh to the argument list and if
         supplied stores this access in var_accesses.
@@ -103,6 +103,9 @@ class KernelInterface(ArgOrdering):
         super(KernelInterface, self).__init__(kern)
         self._symbol_table = SymbolTable()
         self._arglist = []
+        # The number of columns in a block of cells (only set if the
+        # kernel processes a block of columns per call)
+        self._ncell_block_symbol = None
 
     def generate(self, var_accesses=None):
         '''Call the generate base class then add the argument list as it can't
@@ -167,6 +170,24 @@ class KernelInterface(ArgOrdering):
             interface=self._read_access)
         self._arglist.append(symbol)
 
+    def cell_block(self, var_accesses=None):
+        '''Create an LFRic number-of-cells-in-block object and add it to
+        the symbol table and argument list. Any dofmaps subsequently
+        created are dimensioned by this quantity.
+
+        :param var_accesses: an unused optional argument that stores \
+            information about variable accesses.
+        :type var_accesses: :\
+            py:class:`psyclone.core.access_info.VariablesAccessInfo`
+
+        '''
+        symbol = self._symbol_table.symbol_from_tag(
+            "ncell_block",
+            symbol_type=lfric_psyir.NumberOfCellsInBlockDataSymbol,
+            interface=self._read_access)
+        self._ncell_block_symbol = symbol
+        self._arglist.append(symbol)
+
     def mesh_ncell2d(self, var_accesses=None):
         '''Not implemented.
 
@@ -464,10 +485,19 @@ class KernelInterface(ArgOrdering):
             symbol_type=lfric_psyir.NumberOfDofsDataSymbol,
             interface=self._read_access)
 
-        dofmap_symbol = self._symbol_table.symbol_from_tag(
-            "dofmap_{0}".format(fs_name), fs=fs_name,
-            symbol_type=lfric_psyir.DofMapDataSymbol,
-            dims=[Reference(ndf_symbol)], interface=self._read_access)
+        if self._ncell_block_symbol:
+            # The kernel is passed the dofmaps for a block of columns
+            dofmap_symbol = self._symbol_table.symbol_from_tag(
+                "dofmap_{0}".format(fs_name), fs=fs_name,
+                symbol_type=lfric_psyir.DofMapBlockDataSymbol,
+                dims=[Reference(ndf_symbol),
+                      Reference(self._ncell_block_symbol)],
+                interface=self._read_access)
+        else:
+            dofmap_symbol = self._symbol_table.symbol_from_tag(
+                "dofmap_{0}".format(fs_name), fs=fs_name,
+                symbol_type=lfric_psyir.DofMapDataSymbol,
+                dims=[Reference(ndf_symbol)], interface=self._read_access)
         self._arglist.append(dofmap_symbol)
 
     def banded_dofmap(self, function_space, var_accesses=None):
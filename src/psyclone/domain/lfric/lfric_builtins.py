@@ -331,6 +331,17 @@ class LFRicBuiltIn(BuiltIn):
         '''
         return False
 
+    @property
+    def cell_block_size(self):
+        '''
+        Built-ins iterate over dofs rather than blocks of cell columns.
+
+        :returns: None
+        :rtype: NoneType
+
+        '''
+        return None
+
     @property
     def fs_descriptors(self):
         '''
@@ -144,6 +144,7 @@ SPECIFIC_SCALAR_DATATYPES = [
     Scalar("cell position", "lfric integer scalar", []),
     Scalar("mesh height", "lfric integer scalar", []),
     Scalar("number of cells", "lfric integer scalar", []),
+    Scalar("number of cells in block", "lfric integer scalar", []),
     Scalar("number of dofs", "lfric integer scalar", ["fs"]),
     Scalar("number of unique dofs", "lfric integer scalar", ["fs"]),
     Scalar("number of faces", "lfric integer scalar", []),
@@ -220,6 +221,8 @@ ARRAY_DATATYPES = [
           ["number of dofs", "number of dofs", "number of cells"],
           ["fs_from", "fs_to"]),
     Array("dof map", "lfric integer scalar", ["number of dofs"], ["fs"]),
+    Array("dof map block", "lfric integer scalar",
+          ["number of dofs", "number of cells in block"], ["fs"]),
     Array("basis function qr xyoz", "lfric real scalar",
           [LfricDimension, "number of dofs",
            "number of qr points in xy",
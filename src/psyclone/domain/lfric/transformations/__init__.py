@@ -45,6 +45,8 @@ from psyclone.domain.lfric.transformations.lfric_invokecall_trans \
     import LFRicInvokeCallTrans
 from psyclone.domain.lfric.transformations.lfric_alg_trans \
     import LFRicAlgTrans
+from psyclone.domain.lfric.transformations.lfric_column_block_trans \
+    import LFRicColumnBlockTrans
 
 # The entities in the __all__ list are made available to import directly from
 # this package e.g.:
@@ -53,4 +55,5 @@ from psyclone.domain.lfric.transformations.lfric_alg_trans \
 __all__ = ['LFRicExtractTrans',
            'LFRicLoopFuseTrans',
            'LFRicInvokeCallTrans',
-           'LFRicAlgTrans']
+           'LFRicAlgTrans',
+           'LFRicColumnBlockTrans']
@@ -0,0 +1,308 @@
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2021, Science and Technology Facilities Council.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+
+'''This module provides the LFRic-specific column-blocking transformation.
+'''
+
+from psyclone.domain.lfric import KernCallArgList
+from psyclone.dynamo0p3 import DynKern, DynLoop
+from psyclone.psyGen import Transformation
+from psyclone.psyir.nodes import ArrayReference, Literal, Loop, Reference, \
+    Return
+from psyclone.psyir.symbols import ArgumentInterface, ArrayType, DataSymbol, \
+    INTEGER_TYPE, ScalarType
+from psyclone.psyir.transformations import TransformationError
+from psyclone.undoredo import Memento
+
+
+class LFRicColumnBlockTrans(Transformation):
+    '''Modifies a loop over cell columns so that each call to the kernel(s)
+    it contains processes a block of (up to) `block_size` consecutive
+    columns rather than a single column. The loop over cells is given a
+    step of `block_size` and the kernels are passed the number of columns
+    in the current block together with the (contiguous) dofmaps for all of
+    the columns in the block. The body of each kernel is wrapped in a loop
+    over the columns of the block. This exposes more independent work
+    within a single kernel call and gives the compiler the opportunity to
+    vectorise across columns (e.g. when the loop over columns is moved
+    inside the loop over layers). For example:
+
+    >>> from psyclone.parse.algorithm import parse
+    >>> from psyclone.psyGen import PSyFactory
+    >>>
+    >>> API = "dynamo0.3"
+    >>> FILENAME = "alg.x90"
+    >>> ast, invokeInfo = parse(FILENAME, api=API)
+    >>> psy = PSyFactory(API, distributed_memory=False).create(invoke_info)
+    >>> schedule = psy.invokes.get('invoke_0').schedule
+    >>>
+    >>> from psyclone.domain.lfric.transformations import \\
+    ...     LFRicColumnBlockTrans
+    >>> btrans = LFRicColumnBlockTrans()
+    >>> btrans.apply(schedule.children[0], {"block_size": 8})
+    >>> schedule.view()
+
+    Since the loop over cells is blocked, this transformation cannot be
+    applied to coloured loops (for which consecutive cells do not have
+    consecutive dofmaps). The kernels must have been parsed into PSyIR
+    successfully as they are modified and then written to the kernel
+    output directory.
+
+    '''
+    def __str__(self):
+        return ("Make each kernel call in a loop over cells process a block "
+                "of consecutive cell columns")
+
+    @property
+    def name(self):
+        '''
+        :returns: the name of this transformation as a string.
+        :rtype: str
+        '''
+        return "LFRicColumnBlockTrans"
+
+    def validate(self, node, options=None):
+        '''Checks that it is valid to apply this transformation to the
+        supplied loop.
+
+        :param node: the loop over cells to transform.
+        :type node: :py:class:`psyclone.dynamo0p3.DynLoop`
+        :param options: a dictionary with options for transformations.
+        :type options: dictionary of string:values or None
+        :param int options["block_size"]: the maximum number of columns \\
+            processed by each kernel call. Defaults to 4.
+
+        :raises TransformationError: if the supplied node is not a DynLoop.
+        :raises TransformationError: if the loop is not over cells or is \\
+            coloured.
+        :raises TransformationError: if the block size is not an integer \\
+            greater than one.
+        :raises TransformationError: if the loop body contains anything \\
+            other than calls to user-supplied kernels.
+        :raises TransformationError: if a kernel has already been blocked.
+        :raises TransformationError: if a kernel does not operate on cell \\
+            columns or requires arguments that depend on the cell (e.g. \\
+            operators, stencils or mesh properties).
+        :raises TransformationError: if a kernel contains a Return \\
+            statement or uses a dofmap other than by indexing it.
+
+        '''
+        # pylint: disable=too-many-branches
+        if not isinstance(node, DynLoop):
+            raise TransformationError(
+                "Error in {0} transformation: the supplied node must be a "
+                "DynLoop but got '{1}'.".format(self.name,
+                                                type(node).__name__))
+        if node.loop_type != "":
+            raise TransformationError(
+                "Error in {0} transformation: only loops over cells can be "
+                "blocked but this loop has a loop type of '{1}'.".format(
+                    self.name, node.loop_type))
+        if not options:
+            options = {}
+        block_size = options.get("block_size", 4)
+        if (not isinstance(block_size, int) or isinstance(block_size, bool)
+                or block_size < 2):
+            raise TransformationError(
+                "Error in {0} transformation: the 'block_size' option must be "
+                "an integer greater than one but got '{1}'.".format(
+                    self.name, block_size))
+
+        for child in node.loop_body.children:
+            if not isinstance(child, DynKern):
+                raise TransformationError(
+                    "Error in {0} transformation: the loop body must only "
+                    "contain calls to user-supplied kernels but found "
+                    "'{1}'.".format(self.name, type(child).__name__))
+            self._validate_kernel(child)
+
+    def _validate_kernel(self, kernel):
+        '''Checks that the supplied kernel can be transformed to process a
+        block of columns.
+
+        :param kernel: the kernel to check.
+        :type kernel: :py:class:`psyclone.dynamo0p3.DynKern`
+
+        :raises TransformationError: if the kernel cannot be blocked.
+
+        '''
+        if kernel.cell_block_size:
+            raise TransformationError(
+                "Error in {0} transformation: kernel '{1}' already processes "
+                "blocks of {2} columns.".format(self.name, kernel.name,
+                                                kernel.cell_block_size))
+        if kernel.iterates_over != "cell_column":
+            raise TransformationError(
+                "Error in {0} transformation: only kernels that operate on "
+                "a single cell column can be blocked but kernel '{1}' "
+                "operates on '{2}'.".format(self.name, kernel.name,
+                                            kernel.iterates_over))
+        # Any argument that is passed for the current cell (rather than
+        # via the dofmap) prevents blocking.
+        if (kernel.arguments.has_operator() or kernel.is_intergrid or
+                kernel.cma_operation or kernel.mesh.properties or
+                any(arg.stencil for arg in kernel.arguments.args)):
+            raise TransformationError(
+                "Error in {0} transformation: kernel '{1}' requires "
+                "arguments (operators, stencils, inter-grid or mesh "
+                "properties) that are specific to a single cell column "
+                "and so cannot be blocked.".format(self.name, kernel.name))
+        try:
+            kernel_schedule = kernel.get_kernel_schedule()
+        except NotImplementedError as err:
+            raise TransformationError(
+                "Error in {0} transformation: failed to create the PSyIR "
+                "of kernel '{1}': {2}".format(self.name, kernel.name,
+                                              str(err)))
+        if kernel_schedule.walk(Return):
+            raise TransformationError(
+                "Error in {0} transformation: kernel '{1}' contains a "
+                "Return statement.".format(self.name, kernel.name))
+        for symbol in self._dofmap_symbols(kernel):
+            if not (symbol.is_array and len(symbol.shape) == 1):
+                raise TransformationError(
+                    "Error in {0} transformation: expected dofmap argument "
+                    "'{1}' of kernel '{2}' to be a rank-1 array.".format(
+                        self.name, symbol.name, kernel.name))
+            for ref in kernel_schedule.walk(Reference):
+                if ref.symbol is symbol and not (
+                        isinstance(ref, ArrayReference) and
+                        len(ref.children) == 1):
+                    raise TransformationError(
+                        "Error in {0} transformation: dofmap argument '{1}' "
+                        "of kernel '{2}' must only be accessed by indexing "
+                        "a single element.".format(self.name, symbol.name,
+                                                   kernel.name))
+
+    @staticmethod
+    def _dofmap_symbols(kernel):
+        '''
+        :param kernel: an LFRic kernel that processes a single column.
+        :type kernel: :py:class:`psyclone.dynamo0p3.DynKern`
+
+        :returns: the nlayers argument symbol and the dofmap argument \\
+            symbols of the kernel code.
+        :rtype: list of :py:class:`psyclone.psyir.symbols.DataSymbol`
+
+        '''
+        arg_list_info = KernCallArgList(kernel)
+        arg_list_info.generate()
+        kern_args = kernel.get_kernel_schedule().symbol_table.argument_list
+        return [kern_args[position-1] for position in
+                arg_list_info.dofmap_positions]
+
+    def apply(self, node, options=None):
+        '''Blocks the supplied loop over cells and modifies the kernel(s)
+        it contains so that each call processes up to `block_size` columns.
+
+        :param node: the loop over cells to transform.
+        :type node: :py:class:`psyclone.dynamo0p3.DynLoop`
+        :param options: a dictionary with options for transformations.
+        :type options: dictionary of string:values or None
+        :param int options["block_size"]: the maximum number of columns \\
+            processed by each kernel call. Defaults to 4.
+
+        :returns: tuple of the modified schedule and a record of the \\
+                  transformation.
+        :rtype: (:py:class:`psyclone.psyir.nodes.Schedule`, \\
+                :py:class:`psyclone.undoredo.Memento`)
+
+        '''
+        self.validate(node, options)
+        if not options:
+            options = {}
+        block_size = options.get("block_size", 4)
+
+        keep = Memento(node.root, self, [node])
+
+        for kernel in node.loop_body.children:
+            self._block_kernel(kernel)
+            kernel.cell_block_size = block_size
+            kernel.modified = True
+
+        node.step_expr = Literal(str(block_size), INTEGER_TYPE)
+
+        return node.root, keep
+
+    def _block_kernel(self, kernel):
+        '''Modifies the PSyIR of the supplied kernel so that it processes a
+        block of columns: a 'ncell_block' argument is added after
+        'nlayers', the dofmaps gain a second dimension of extent
+        'ncell_block' and the kernel body is wrapped in a loop over the
+        columns of the block.
+
+        :param kernel: the kernel to modify.
+        :type kernel: :py:class:`psyclone.dynamo0p3.DynKern`
+
+        '''
+        arg_list_info = KernCallArgList(kernel)
+        arg_list_info.generate()
+        kernel_schedule = kernel.get_kernel_schedule()
+        symbol_table = kernel_schedule.symbol_table
+        kern_args = symbol_table.argument_list
+        nlayers = kern_args[arg_list_info.nlayers_positions[0]-1]
+        dofmaps = [kern_args[position-1] for position in
+                   arg_list_info.dofmap_positions]
+
+        # The number of columns in the block is a new argument that
+        # immediately follows nlayers.
+        ncell_block = DataSymbol(
+            symbol_table.next_available_name("ncell_block"),
+            nlayers.datatype,
+            interface=ArgumentInterface(ArgumentInterface.Access.READ))
+        symbol_table.add(ncell_block)
+        position = kern_args.index(nlayers) + 1
+        symbol_table.specify_argument_list(
+            kern_args[:position] + [ncell_block] + kern_args[position:])
+        column = symbol_table.new_symbol(
+            "column", symbol_type=DataSymbol, datatype=nlayers.datatype)
+
+        for dofmap in dofmaps:
+            dofmap.datatype = ArrayType(
+                ScalarType(dofmap.datatype.intrinsic,
+                           dofmap.datatype.precision),
+                dofmap.shape + [Reference(ncell_block)])
+        for ref in kernel_schedule.walk(ArrayReference):
+            if ref.symbol in dofmaps:
+                ref.addchild(Reference(column, parent=ref))
+
+        body = kernel_schedule.pop_all_children()
+        kernel_schedule.addchild(
+            Loop.create(column, Literal("1", INTEGER_TYPE),
+                        Reference(ncell_block), Literal("1", INTEGER_TYPE),
+                        body))
+
+
+# For automatic documentation generation
+__all__ = ["LFRicColumnBlockTrans"]
@@ -111,6 +111,8 @@ class LFRicLoopFuseTrans(LoopFuseTrans):
                                      not the same.
         :raises TransformationError: if the halo-depth indices of two loops \
                                      are not the same.
+        :raises TransformationError: if the loops process different numbers \
+                                     of cell columns per kernel call.
         :raises TransformationError: if each loop already contains a reduction.
         :raises TransformationError: if the first loop has a reduction and \
                                      the second loop reads the result of \
@@ -208,7 +210,18 @@ class LFRicLoopFuseTrans(LoopFuseTrans):
                 format(self.name, node1.upper_bound_halo_depth,
                        node2.upper_bound_halo_depth))
 
-        # 5) Check for reductions
+        # 5) Check that both loops process the same number of cell
+        # columns per kernel call
+        block_sizes = set(kern.cell_block_size for kern in
+                          node1.kernels() + node2.kernels())
+        if len(block_sizes) > 1:
+            raise TransformationError(
+                "Error in {0} transformation: The loops process different "
+                "numbers of cell columns per kernel call (cell-block "
+                "sizes). Found {1}.".format(
+                    self.name, sorted(block_sizes, key=str)))
+
+        # 6) Check for reductions
         arg_types = const.VALID_SCALAR_NAMES
         all_reductions = AccessType.get_valid_reduction_modes()
         node1_red_args = node1.args_filter(arg_types=arg_types,
@@ -47,12 +47,16 @@ from psyclone.domain.nemo.transformations.create_nemo_psy_trans \
     import CreateNemoPSyTrans
 from psyclone.domain.nemo.transformations.nemo_allarrayrange2loop_trans \
     import NemoAllArrayRange2LoopTrans
+from psyclone.domain.nemo.transformations.nemo_array_contraction_trans \
+    import NemoArrayContractionTrans
 from psyclone.domain.nemo.transformations.nemo_arrayrange2loop_trans \
     import NemoArrayRange2LoopTrans
 from psyclone.domain.nemo.transformations.nemo_loop_fuse \
     import NemoLoopFuseTrans
 from psyclone.domain.nemo.transformations.nemo_outerarrayrange2loop_trans \
     import NemoOuterArrayRange2LoopTrans
+from psyclone.domain.nemo.transformations.nemo_routine_loop_fuse_trans \
+    import NemoRoutineLoopFuseTrans
 
 # The entities in the __all__ list are made available to import directly from
 # this package e.g.:
@@ -63,6 +67,8 @@ __all__ = ['CreateNemoInvokeScheduleTrans',
            'CreateNemoLoopTrans',
            'CreateNemoPSyTrans',
            'NemoAllArrayRange2LoopTrans',
+           'NemoArrayContractionTrans',
            'NemoArrayRange2LoopTrans',
            'NemoLoopFuseTrans',
-           'NemoOuterArrayRange2LoopTrans']
+           'NemoOuterArrayRange2LoopTrans',
+           'NemoRoutineLoopFuseTrans']
@@ -0,0 +1,270 @@
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2021, Science and Technology Facilities Council.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+
+'''This module contains a transformation that contracts the local work
+arrays of a NEMO routine whose values never live longer than one iteration
+of the loops that use them.
+'''
+
+from __future__ import absolute_import
+
+from fparser.two import Fortran2003
+from fparser.two.utils import walk
+
+from psyclone.psyGen import Transformation
+from psyclone.psyir.nodes import ArrayReference, Call, CodeBlock, Loop, \
+    Reference, Routine
+from psyclone.psyir.symbols import ArrayType, ScalarType
+from psyclone.psyir.transformations.transformation_error \
+    import TransformationError
+
+
+class NemoArrayContractionTrans(Transformation):
+    '''Contracts the local arrays of a routine that are only used within
+    one iteration of the loops that access them. This is typically the
+    case for the work arrays of NEMO once array-range assignments have been
+    converted into loops (see :py:class:`NemoAllArrayRange2LoopTrans`) and
+    the resulting loops have been fused (see
+    :py:class:`NemoRoutineLoopFuseTrans`). For example:
+
+    .. code-block:: fortran
+
+      real, dimension(jpi,jpj,jpk) :: zwx
+      do jk = 1, jpk
+        do jj = 1, jpj
+          do ji = 1, jpi
+            zwx(ji,jj,jk) = a(ji,jj,jk) + 1.0
+            b(ji,jj,jk) = zwx(ji,jj,jk) * zwx(ji,jj,jk)
+          end do
+        end do
+      end do
+
+    becomes
+
+    .. code-block:: fortran
+
+      real :: zwx
+      do jk = 1, jpk
+        do jj = 1, jpj
+          do ji = 1, jpi
+            zwx = a(ji,jj,jk) + 1.0
+            b(ji,jj,jk) = zwx * zwx
+          end do
+        end do
+      end do
+
+    A dimension of an array is removed if it is always indexed by the
+    variable of a loop that encloses all accesses to the array. An array
+    is only contracted if every loop that encloses all of its accesses
+    indexes one of its dimensions in this way, since each slice of the
+    array is then only used in a single iteration. The array must be a
+    local, explicit-shape array of an intrinsic type that is not accessed
+    as a whole, in a CodeBlock or as an actual argument of a Call. If
+    all dimensions are removed the array becomes a scalar, otherwise it
+    becomes an array of lower rank.
+
+    '''
+    def __init__(self):
+        super(NemoArrayContractionTrans, self).__init__()
+        self._contracted_arrays = []
+
+    def __str__(self):
+        return ("Contract the local arrays of a routine that are only used "
+                "within one loop iteration")
+
+    @property
+    def name(self):
+        '''
+        :returns: the name of the transformation.
+        :rtype: str
+
+        '''
+        return type(self).__name__
+
+    @property
+    def contracted_arrays(self):
+        '''
+        :returns: the names of the arrays contracted by the last call of \
+            apply().
+        :rtype: list of str
+
+        '''
+        return self._contracted_arrays
+
+    def validate(self, node, options=None):
+        '''Checks that the supplied node is a Routine.
+
+        :param node: the routine whose local arrays are to be contracted.
+        :type node: :py:class:`psyclone.psyir.nodes.Routine`
+        :param options: a dictionary with options for transformations. \
+            No options are used in this transformation.
+        :type options: dict of string:values or None
+
+        :raises TransformationError: if the supplied node is not a Routine.
+
+        '''
+        if not isinstance(node, Routine):
+            raise TransformationError(
+                "Error in {0} transformation. The supplied node should be a "
+                "PSyIR Routine but found '{1}'.".format(
+                    self.name, type(node).__name__))
+
+    def apply(self, node, options=None):
+        '''Contracts all local arrays of the supplied routine that are only
+        used within one iteration of the loops that access them. The
+        declaration of each contracted array is updated in the symbol
+        table of the routine.
+
+        :param node: the routine whose local arrays are to be contracted.
+        :type node: :py:class:`psyclone.psyir.nodes.Routine`
+        :param options: a dictionary with options for transformations. \
+            No options are used in this transformation.
+        :type options: dict of string:values or None
+
+        '''
+        self.validate(node, options)
+        self._contracted_arrays = []
+
+        # The names of all variables used in CodeBlocks
+        codeblock_names = set()
+        for codeblock in node.walk(CodeBlock):
+            for name in walk(codeblock.get_ast_nodes, Fortran2003.Name):
+                codeblock_names.add(str(name).lower())
+
+        for symbol in node.symbol_table.local_datasymbols:
+            if symbol.name.lower() in codeblock_names:
+                continue
+            dims = self._contractable_dimensions(node, symbol)
+            if dims:
+                self._contract(node, symbol, dims)
+                self._contracted_arrays.append(symbol.name)
+
+    @staticmethod
+    def _contractable_dimensions(routine, symbol):
+        '''Determines whether the supplied array can be contracted and, if
+        so, which of its dimensions can be removed.
+
+        :param routine: the routine containing all accesses to the array.
+        :type routine: :py:class:`psyclone.psyir.nodes.Routine`
+        :param symbol: the local symbol to check.
+        :type symbol: :py:class:`psyclone.psyir.symbols.DataSymbol`
+
+        :returns: the (0-based) indices of the dimensions to remove or an \
+            empty list if the array cannot be contracted.
+        :rtype: list of int
+
+        '''
+        datatype = symbol.datatype
+        if not isinstance(datatype, ArrayType) or symbol.is_constant or \
+           not isinstance(datatype.intrinsic, ScalarType.Intrinsic) or \
+           any(isinstance(extent, ArrayType.Extent)
+               for extent in datatype.shape):
+            return []
+
+        refs = [ref for ref in routine.walk(Reference)
+                if ref.symbol is symbol]
+        if not refs:
+            return []
+        for ref in refs:
+            if not isinstance(ref, ArrayReference) or \
+               len(ref.indices) != len(datatype.shape) or \
+               isinstance(ref.parent, Call):
+                return []
+
+        # The loops that enclose all accesses to the array
+        common_loops = None
+        for ref in refs:
+            loops = []
+            loop = ref.ancestor(Loop)
+            while loop:
+                loops.append(loop)
+                loop = loop.ancestor(Loop)
+            if common_loops is None:
+                common_loops = loops
+            else:
+                common_loops = [loop for loop in common_loops
+                                if any(loop is other for other in loops)]
+        if not common_loops:
+            return []
+
+        # Each of these loops must index a dimension of every access with
+        # its loop variable only
+        dims = []
+        for loop in common_loops:
+            for dim in range(len(datatype.shape)):
+                if all(isinstance(ref.indices[dim], Reference) and
+                       not isinstance(ref.indices[dim], ArrayReference) and
+                       ref.indices[dim].symbol is loop.variable
+                       for ref in refs):
+                    if dim not in dims:
+                        dims.append(dim)
+                    break
+            else:
+                return []
+        return sorted(dims)
+
+    @staticmethod
+    def _contract(routine, symbol, dims):
+        '''Removes the supplied dimensions from the declaration of the
+        supplied array and from all accesses to it.
+
+        :param routine: the routine containing all accesses to the array.
+        :type routine: :py:class:`psyclone.psyir.nodes.Routine`
+        :param symbol: the array to contract.
+        :type symbol: :py:class:`psyclone.psyir.symbols.DataSymbol`
+        :param dims: the (0-based) indices of the dimensions to remove.
+        :type dims: list of int
+
+        '''
+        datatype = symbol.datatype
+        kept = [dim for dim in range(len(datatype.shape)) if dim not in dims]
+        element_type = ScalarType(datatype.intrinsic, datatype.precision)
+        if kept:
+            symbol.datatype = ArrayType(
+                element_type, [datatype.shape[dim].copy() for dim in kept])
+        else:
+            symbol.datatype = element_type
+
+        for ref in [ref for ref in routine.walk(ArrayReference)
+                    if ref.symbol is symbol]:
+            if kept:
+                new_ref = ArrayReference.create(
+                    symbol, [ref.indices[dim].copy() for dim in kept])
+            else:
+                new_ref = Reference(symbol)
+            ref.replace_with(new_ref)
+
+
+# For automatic documentation generation
+__all__ = ["NemoArrayContractionTrans"]
@@ -0,0 +1,246 @@
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2021, Science and Technology Facilities Council.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+
+'''This module contains a transformation that fuses all adjacent loops
+that can be fused in a NEMO routine.
+'''
+
+from __future__ import absolute_import
+
+from psyclone.core import VariablesAccessInfo
+from psyclone.domain.nemo.transformations.nemo_loop_fuse import \
+    NemoLoopFuseTrans
+from psyclone.psyGen import Transformation
+from psyclone.psyir.backend.fortran import FortranWriter
+from psyclone.psyir.nodes import Call, CodeBlock, Loop, Routine, Schedule
+from psyclone.psyir.symbols import DataSymbol
+from psyclone.psyir.tools.dependency_tools import DependencyTools
+from psyclone.psyir.transformations.transformation_error \
+    import TransformationError
+
+
+class NemoRoutineLoopFuseTrans(Transformation):
+    '''Fuses the loops of a whole routine. Every Schedule in the routine
+    is searched for chains of adjacent loops and each loop of a chain is
+    fused (using :py:class:`NemoLoopFuseTrans`) with the loop that
+    follows it for as long as this is valid. The bodies of the fused
+    loops are then processed in the same way, so that nested loops are
+    fused as well. For example:
+
+    >>> from psyclone.domain.nemo.transformations import \
+            NemoRoutineLoopFuseTrans
+    >>> trans = NemoRoutineLoopFuseTrans()
+    >>> trans.apply(schedule)
+    >>> for decision in trans.fusion_decisions:
+    >>>     print(decision)
+
+    Two loops are only fused if they have the same bounds and loop
+    variable and if all arrays that are written in either of them are
+    accessed with the same index expression in the dimension indexed by
+    the loop variable (as checked by
+    `DependencyTools.is_array_parallelisable`). Loops containing a
+    CodeBlock or a Call are never fused since their variable accesses
+    are not known.
+
+    '''
+    def __init__(self):
+        super(NemoRoutineLoopFuseTrans, self).__init__()
+        self._fusion_decisions = []
+
+    def __str__(self):
+        return "Fuse all adjacent loops of a routine that can be fused"
+
+    @property
+    def name(self):
+        '''
+        :returns: the name of the transformation.
+        :rtype: str
+
+        '''
+        return type(self).__name__
+
+    @property
+    def fusion_decisions(self):
+        '''
+        :returns: a description of each pair of adjacent loops that was \
+            considered by the last call of apply() and of whether or not \
+            they were fused.
+        :rtype: list of str
+
+        '''
+        return self._fusion_decisions
+
+    def validate(self, node, options=None):
+        '''Checks that the supplied node is a Routine.
+
+        :param node: the routine whose loops are to be fused.
+        :type node: :py:class:`psyclone.psyir.nodes.Routine`
+        :param options: a dictionary with options for transformations. \
+            No options are used in this transformation.
+        :type options: dict of string:values or None
+
+        :raises TransformationError: if the supplied node is not a Routine.
+
+        '''
+        if not isinstance(node, Routine):
+            raise TransformationError(
+                "Error in {0} transformation. The supplied node should be a "
+                "PSyIR Routine but found '{1}'.".format(
+                    self.name, type(node).__name__))
+
+    def apply(self, node, options=None):
+        '''Fuses all adjacent loops of the supplied routine that can be
+        fused. The description of each fusion decision is stored and
+        can be obtained from the `fusion_decisions` property.
+
+        :param node: the routine whose loops are to be fused.
+        :type node: :py:class:`psyclone.psyir.nodes.Routine`
+        :param options: a dictionary with options for transformations. \
+            No options are used in this transformation.
+        :type options: dict of string:values or None
+
+        '''
+        self.validate(node, options)
+        self._fusion_decisions = []
+        self._fuse_schedule(node)
+
+    def _fuse_schedule(self, schedule):
+        '''Fuses the chains of adjacent loops in the supplied Schedule and
+        then processes all Schedules nested within it.
+
+        :param schedule: the Schedule to process.
+        :type schedule: :py:class:`psyclone.psyir.nodes.Schedule`
+
+        '''
+        idx = 0
+        while idx < len(schedule.children) - 1:
+            loop1 = schedule.children[idx]
+            loop2 = schedule.children[idx + 1]
+            if isinstance(loop1, Loop) and isinstance(loop2, Loop):
+                description = "'{0}' and '{1}'".format(
+                    self._loop_header(loop1), self._loop_header(loop2))
+                try:
+                    self._fuse(loop1, loop2)
+                except TransformationError as err:
+                    self._fusion_decisions.append(
+                        "Not fused {0}: {1}".format(description,
+                                                    str(err.value)))
+                else:
+                    self._fusion_decisions.append(
+                        "Fused {0}.".format(description))
+                    # Try to fuse the next loop with the fused loop
+                    continue
+            idx += 1
+
+        for child in schedule.children:
+            for sub_schedule in child.children:
+                if isinstance(sub_schedule, Schedule):
+                    self._fuse_schedule(sub_schedule)
+
+    @staticmethod
+    def _loop_header(loop):
+        '''
+        :param loop: a loop.
+        :type loop: :py:class:`psyclone.psyir.nodes.Loop`
+
+        :returns: the Fortran DO statement of the supplied loop.
+        :rtype: str
+
+        '''
+        writer = FortranWriter()
+        return "do {0} = {1}, {2}, {3}".format(
+            loop.variable.name, writer(loop.start_expr),
+            writer(loop.stop_expr), writer(loop.step_expr))
+
+    @staticmethod
+    def _fuse(loop1, loop2):
+        '''Fuses the two supplied adjacent loops if this is valid.
+
+        :param loop1: the first loop.
+        :type loop1: :py:class:`psyclone.psyir.nodes.Loop`
+        :param loop2: the loop that follows the first loop.
+        :type loop2: :py:class:`psyclone.psyir.nodes.Loop`
+
+        :raises TransformationError: if either loop contains a CodeBlock \
+            or a Call.
+        :raises TransformationError: if an array written in either loop \
+            is accessed as a whole or with different indices in the \
+            dimension indexed by the loop variable.
+
+        '''
+        for loop in [loop1, loop2]:
+            if loop.walk((CodeBlock, Call)):
+                raise TransformationError(
+                    "The loop over '{0}' contains a CodeBlock or a Call."
+                    "".format(loop.variable.name))
+
+        # Check that no iteration of the fused loop uses a value of an
+        # array that is computed in a later iteration of the first loop.
+        # This is done before NemoLoopFuseTrans.validate(), which does not
+        # support arrays that are accessed as a whole.
+        loop_var = loop1.variable.name
+        vars1 = VariablesAccessInfo(loop1)
+        vars2 = VariablesAccessInfo(loop2)
+        all_vars = VariablesAccessInfo([loop1, loop2])
+        symbol_table = loop1.scope.symbol_table
+        dep_tools = DependencyTools()
+        for signature in set(vars1).intersection(vars2):
+            var_info = all_vars[signature]
+            if str(signature) == loop_var or var_info.is_read_only():
+                continue
+            try:
+                symbol = symbol_table.lookup(str(signature))
+            except KeyError:
+                symbol = None
+            if isinstance(symbol, DataSymbol):
+                is_array = symbol.is_array
+            else:
+                is_array = var_info[0].indices is not None
+            if not is_array:
+                continue
+            if any(access.indices is None for access in
+                   var_info.all_accesses) or \
+               not dep_tools.is_array_parallelisable(loop_var, var_info):
+                raise TransformationError(
+                    "Array '{0}' is written in one of the loops and not "
+                    "always accessed with the same index in the dimension "
+                    "indexed by '{1}'.".format(str(signature), loop_var))
+
+        fuse = NemoLoopFuseTrans()
+        fuse.validate(loop1, loop2)
+        fuse.apply(loop1, loop2)
+
+
+# For automatic documentation generation
+__all__ = ["NemoRoutineLoopFuseTrans"]
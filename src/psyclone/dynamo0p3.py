@@ -4480,23 +4480,201 @@ class DynBasisFunctions(DynCollection):
                                kind=api_config.default_kind["integer"],
                                entity_decls=var_dims))
 
+        # If the basis arrays are shared between invokes then they are
+        # declared at module level and are only (re-)computed if they
+        # have not been computed for the current function space(s) and
+        # quadrature object.
+        if api_config.share_basis_functions:
+            guards = self._shared_basis_guards(parent, basis_arrays)
+            decl_parent = parent.parent
+        else:
+            guards = None
+            decl_parent = parent
+
         basis_declarations = []
         for basis in basis_arrays:
-            parent.add(
-                AllocateGen(parent,
+            alloc_parent = guards[basis] if guards else parent
+            alloc_parent.add(
+                AllocateGen(alloc_parent,
                             basis+"("+", ".join(basis_arrays[basis])+")"))
             basis_declarations.append(
                 basis+"("+",".join([":"]*len(basis_arrays[basis]))+")")
 
         # declare the basis function arrays
         if basis_declarations:
-            parent.add(DeclGen(parent, datatype="real",
-                               kind=api_config.default_kind["real"],
-                               allocatable=True,
-                               entity_decls=basis_declarations))
+            if guards is not None:
+                self._check_shared_declarations(decl_parent,
+                                                basis_declarations)
+            decl_parent.add(DeclGen(decl_parent, datatype="real",
+                                    kind=api_config.default_kind["real"],
+                                    allocatable=True,
+                                    entity_decls=basis_declarations))
 
         # Compute the values for any basis arrays
-        self._compute_basis_fns(parent)
+        self._compute_basis_fns(parent, guards)
+
+        if guards:
+            # Record the function space(s) and quadrature object for which
+            # each shared basis array has now been computed
+            for basis, keys in self._shared_basis_keys().items():
+                for (name, value, rank) in keys:
+                    guards[basis].add(AssignGen(guards[basis], lhs=name,
+                                                rhs=value,
+                                                pointer=rank is not None))
+
+    def _shared_basis_keys(self):
+        '''
+        Constructs the quantities that identify the function space(s)
+        and quadrature object for which each basis/diff-basis array
+        has been computed. These are used when the basis arrays are
+        shared between invokes (see the SHARE_BASIS_FUNCTIONS
+        configuration option).
+
+        :returns: for each basis array (indexed by name), a list of \
+            3-tuples holding the name of the module variable storing \
+            a key, the PSy-layer expression for its current value and \
+            either the rank of the key if it is a pointer (to the \
+            weights of the quadrature object) or None if it is a \
+            function-space ID.
+        :rtype: :py:class:`collections.OrderedDict` of str: \
+            list of (str, str, int or NoneType)
+
+        '''
+        const = LFRicConstants()
+        keys = OrderedDict()
+        for basis_fn in self._basis_fns:
+            basis_name = ("gh_basis" if basis_fn["type"] == "basis" else
+                          "gh_diff_basis")
+            arg = basis_fn["arg"]
+            fs_id = "{0}%{1}%get_id()".format(
+                arg.proxy_name_indexed, arg.ref_name(basis_fn["fspace"]))
+            if basis_fn["shape"] in const.VALID_QUADRATURE_SHAPES:
+                op_name = basis_fn["fspace"].get_operator_name(
+                    basis_name, qr_var=basis_fn["qr_var"])
+                qr_type = basis_fn["shape"].split("_")[-1]
+                weights = self._symbol_table.symbol_from_tag(
+                    self.qr_weight_vars[qr_type][0] + "_" +
+                    basis_fn["qr_var"]).name
+                if op_name not in keys:
+                    rank = 1 if qr_type == "xyoz" else 2
+                    keys[op_name] = [(op_name + "_fs_id", fs_id, None),
+                                     (op_name + "_weights", weights, rank)]
+            else:
+                for space in basis_fn["nodal_fspaces"]:
+                    op_name = basis_fn["fspace"].get_operator_name(
+                        basis_name, on_space=space)
+                    if op_name in keys:
+                        continue
+                    target_arg = [
+                        target[1] for target in self._eval_targets.values()
+                        if target[0].mangled_name == space.mangled_name][0]
+                    target_id = "{0}%{1}%get_id()".format(
+                        target_arg.proxy_name_indexed,
+                        target_arg.ref_name(space))
+                    keys[op_name] = [
+                        (op_name + "_fs_id", fs_id, None),
+                        (op_name + "_target_fs_id", target_id, None)]
+        return keys
+
+    @staticmethod
+    def _check_shared_declarations(module, entity_decls):
+        '''
+        Checks that the supplied declarations of module variables used to
+        share basis/diff-basis arrays between invokes do not conflict with
+        the existing declarations (by another invoke) of variables with the
+        same names. This happens if two invokes use quadrature objects with
+        the same name but different shapes.
+
+        :param module: the PSy-layer module in the f2pygen AST.
+        :type module: :py:class:`psyclone.f2pygen.ModuleGen`
+        :param entity_decls: the declarations of the module variables.
+        :type entity_decls: list of str
+
+        :raises GenerationError: if a variable is already declared in the \
+            module with a different rank or initialisation.
+
+        '''
+        def name_of(decl):
+            ''' The (lower-case) variable name in a declaration. '''
+            return decl.split("(")[0].split("=")[0].strip().lower()
+
+        existing = {}
+        for child in module.children:
+            if isinstance(child, DeclGen):
+                for decl in child.root.entity_decls:
+                    existing[name_of(decl)] = decl
+        for decl in entity_decls:
+            other = existing.get(name_of(decl))
+            if other is not None and \
+                    other.replace(" ", "").lower() != \
+                    decl.replace(" ", "").lower():
+                raise GenerationError(
+                    "The basis/diff-basis arrays are shared between invokes "
+                    "(SHARE_BASIS_FUNCTIONS) but the module variable '{0}' "
+                    "is required as both '{1}' and '{2}'. Quadrature objects "
+                    "of different shapes must have different names.".format(
+                        name_of(decl), other, decl))
+
+    def _shared_basis_guards(self, parent, basis_arrays):
+        '''
+        Declares the module variables that record the function space(s)
+        and quadrature object for which each shared basis/diff-basis
+        array was last computed and creates, for each array, the
+        IF block within which it is (re-)allocated and computed if it
+        is not allocated or was computed for different function spaces
+        or a different quadrature object.
+
+        :param parent: the node in the f2pygen AST (an invoke \
+            subroutine) to which to add the IF blocks.
+        :type parent: :py:class:`psyclone.f2pygen.SubroutineGen`
+        :param basis_arrays: the dimensions of each basis array, \
+            indexed by name.
+        :type basis_arrays: dict of str: list of str
+
+        :returns: the IF block for each basis array, indexed by name.
+        :rtype: dict of str: :py:class:`psyclone.f2pygen.IfThenGen`
+
+        '''
+        api_config = Config.get().api_conf("dynamo0.3")
+        module = parent.parent
+        keys = self._shared_basis_keys()
+        guards = OrderedDict()
+        if basis_arrays:
+            parent.add(CommentGen(parent, ""))
+            parent.add(CommentGen(parent, " (Re-)compute any basis/diff-basis "
+                                  "arrays not already computed for these "
+                                  "function spaces and quadrature"))
+            parent.add(CommentGen(parent, ""))
+        id_decls = []
+        weights_decls = []
+        for basis in basis_arrays:
+            conditions = [".NOT. ALLOCATED({0})".format(basis)]
+            for (name, value, rank) in keys[basis]:
+                if rank:
+                    weights_decls.append("{0}({1}) => null()".format(
+                        name, ",".join([":"]*rank)))
+                    conditions.append(
+                        ".NOT. ASSOCIATED({0}, {1})".format(name, value))
+                else:
+                    id_decls.append(name)
+                    conditions.append("{0} /= {1}".format(name, value))
+            guard = IfThenGen(parent, " .OR. ".join(conditions))
+            parent.add(guard)
+            dealloc = IfThenGen(guard, "ALLOCATED({0})".format(basis))
+            guard.add(dealloc)
+            dealloc.add(DeallocateGen(dealloc, [basis]))
+            guards[basis] = guard
+        self._check_shared_declarations(module, weights_decls)
+        if id_decls:
+            module.add(DeclGen(module, datatype="integer",
+                               kind=api_config.default_kind["integer"],
+                               entity_decls=id_decls,
+                               initial_values=["0"]*len(id_decls)))
+        if weights_decls:
+            module.add(DeclGen(module, datatype="real", pointer=True,
+                               kind=api_config.default_kind["real"],
+                               entity_decls=weights_decls))
+        return guards
 
     def _basis_fn_declns(self):
         '''
@@ -4753,7 +4931,7 @@ class DynBasisFunctions(DynCollection):
                               lhs=qr_var+"_"+qr_arg_name,
                               rhs=proxy_name+"%"+qr_var))
 
-    def _compute_basis_fns(self, parent):
+    def _compute_basis_fns(self, parent, guards=None):
         '''
         Generates the necessary Fortran to compute the values of
         any basis/diff-basis arrays required
@@ -4761,6 +4939,10 @@ class DynBasisFunctions(DynCollection):
         :param parent: Node in the f2pygen AST which will be the parent
                        of the assignments created in this routine
         :type parent: :py:class:`psyclone.f2pygen.SubroutineGen`
+        :param guards: optional nodes in the f2pygen AST (indexed by \
+            basis-array name) to which to add the computation of each \
+            basis array instead of `parent`.
+        :type guards: dict of str: :py:class:`psyclone.f2pygen.IfThenGen`
 
         '''
         # pylint: disable=too-many-locals
@@ -4770,7 +4952,7 @@ class DynBasisFunctions(DynCollection):
         loop_var_list = set()
         op_name_list = []
         # add calls to compute the values of any basis arrays
-        if self._basis_fns:
+        if self._basis_fns and not guards:
             parent.add(CommentGen(parent, ""))
             parent.add(CommentGen(parent, " Compute basis/diff-basis arrays"))
             parent.add(CommentGen(parent, ""))
@@ -4807,8 +4989,9 @@ class DynBasisFunctions(DynCollection):
                         first_dim, basis_fn["fspace"].ndf_name, op_name]
 
                 # insert the basis array call
-                parent.add(
-                    CallGen(parent,
+                call_parent = guards[op_name] if guards else parent
+                call_parent.add(
+                    CallGen(call_parent,
                             name=basis_fn["qr_var"]+"%compute_function",
                             args=args))
             elif basis_fn["shape"].lower() == "gh_evaluator":
@@ -4826,9 +5009,10 @@ class DynBasisFunctions(DynCollection):
                     loop_var_list.add(nodal_loop_var)
 
                     # Loop over dofs of target function space
+                    loop_parent = guards[op_name] if guards else parent
                     nodal_dof_loop = DoGen(
-                        parent, nodal_loop_var, "1", space.ndf_name)
-                    parent.add(nodal_dof_loop)
+                        loop_parent, nodal_loop_var, "1", space.ndf_name)
+                    loop_parent.add(nodal_dof_loop)
 
                     dof_loop_var = "df_" + basis_fn["fspace"].mangled_name
                     loop_var_list.add(dof_loop_var)
@@ -4866,6 +5050,10 @@ class DynBasisFunctions(DynCollection):
         :raises InternalError: if an unrecognised type of basis function \
                                is encountered.
         '''
+        if Config.get().api_conf("dynamo0.3").share_basis_functions:
+            # Shared basis arrays are kept for use by subsequent invokes
+            return
+
         if self._basis_fns:
             # deallocate all allocated basis function arrays
             parent.add(CommentGen(parent, ""))
@@ -5266,9 +5454,11 @@ class DynInvoke(Invoke):
 
         # Initialise all quantities required by this PSy routine (invoke)
 
-        if self.schedule.reductions(reprod=True):
-            # We have at least one reproducible reduction so we need
-            # to know the number of OpenMP threads
+        if self.schedule.reductions(reprod=True) and \
+           Config.get().reprod_reduction_strategy == "padded":
+            # We have at least one reproducible reduction with a partial
+            # result per thread so we need to know the number of OpenMP
+            # threads
             omp_function_name = "omp_get_max_threads"
             tag = "omp_num_threads"
             nthreads_name = \
@@ -7330,6 +7520,10 @@ class DynKern(CodedKern):
         self._reference_element = None
         # The mesh properties required by this kernel
         self._mesh_properties = None
+        # The number of cell columns processed by each call to this kernel
+        # (None unless the kernel has been transformed to process a block
+        # of columns per call)
+        self._cell_block_size = None
         # Initialise kinds (precisions) of all kernel arguments (start
         # with 'real' and 'integer' kinds)
         api_config = Config.get().api_conf("dynamo0.3")
@@ -7701,10 +7895,41 @@ class DynKern(CodedKern):
         '''
         return self._mesh_properties
 
+    @property
+    def cell_block_size(self):
+        '''
+        :returns: the maximum number of cell columns processed by each \
+                  call to this kernel or None if the kernel processes a \
+                  single column per call.
+        :rtype: int or NoneType
+        '''
+        return self._cell_block_size
+
+    @cell_block_size.setter
+    def cell_block_size(self, value):
+        '''
+        :param value: the maximum number of cell columns to be processed \
+                      by each call to this kernel or None.
+        :type value: int or NoneType
+
+        :raises TypeError: if the supplied value is not a positive integer \
+                           or None.
+        '''
+        if value is not None and (not isinstance(value, int) or
+                                  isinstance(value, bool) or value < 1):
+            raise TypeError(
+                "The cell-block size of kernel '{0}' must be a positive "
+                "integer or None but got '{1}'.".format(self.name, value))
+        self._cell_block_size = value
+
     def local_vars(self):
         ''' Returns the names used by the Kernel that vary from one
         invocation to the next and therefore require privatisation
         when parallelised. '''
+        if self._cell_block_size:
+            # The number of columns in the current block
+            symtab = self.ancestor(InvokeSchedule).symbol_table
+            return [symtab.symbol_from_tag("ncell_block").name]
         return []
 
     @property
@@ -7862,6 +8087,20 @@ class DynKern(CodedKern):
                                           format(self._name))
             cell_index = "cell"
 
+        if self._cell_block_size:
+            # This kernel processes a block of columns per call. The last
+            # block may be shorter than the others.
+            ncell_block = self.ancestor(InvokeSchedule).symbol_table. \
+                symbol_from_tag("ncell_block").name
+            parent.add(DeclGen(parent, datatype="integer",
+                               kind=api_config.default_kind["integer"],
+                               entity_decls=[ncell_block]))
+            parent.add(AssignGen(
+                parent, lhs=ncell_block,
+                rhs="MIN({0}, {1} - {2} + 1)".format(
+                    self._cell_block_size, parent_loop.stop_expr.value,
+                    cell_index)))
+
         parent.add(CommentGen(parent, ""))
 
         super(DynKern, self).gen_code(parent)
@@ -139,7 +139,8 @@ class OMPDirective(Directive):
                          'parallel do').
     '''
     def __init__(self, root, line, position, dir_type):
-        self._types = ["parallel do", "parallel", "do", "master"]
+        self._types = ["parallel do", "parallel", "do", "master", "simd",
+                       "single", "task", "taskloop"]
         self._positions = ["begin", "end"]
 
         super(OMPDirective, self).__init__(root, line, position, dir_type)
@@ -161,7 +162,8 @@ class ACCDirective(Directive):
                          'loop').
     '''
     def __init__(self, root, line, position, dir_type):
-        self._types = ["parallel", "kernels", "enter data", "loop"]
+        self._types = ["parallel", "kernels", "enter data", "loop", "wait",
+                       "update"]
         self._positions = ["begin", "end"]
 
         super(ACCDirective, self).__init__(root, line, position, dir_type)
@@ -665,7 +667,10 @@ class DirectiveGen(BaseGen):
         if position == "end":
             my_comment.content += " end"
         my_comment.content += " " + directive_type
-        if content != "":
+        if content.startswith("("):
+            # An argument list (e.g. of "wait") follows the directive name
+            my_comment.content += content
+        elif content != "":
             my_comment.content += " " + content
 
         BaseGen.__init__(self, parent, my_comment)
@@ -49,6 +49,7 @@
 
 from __future__ import print_function
 import re
+from collections import OrderedDict
 import six
 from fparser.two.Fortran2003 import NoMatchError, Nonlabel_Do_Stmt
 from psyclone.configuration import Config, ConfigurationError
@@ -67,7 +68,7 @@ from psyclone.errors import GenerationError, InternalError
 from psyclone.psyir.symbols import SymbolTable, ScalarType, ArrayType, \
     INTEGER_TYPE, DataSymbol, ArgumentInterface, RoutineSymbol, \
     ContainerSymbol, DeferredType, TypeSymbol, UnresolvedInterface, \
-    REAL_TYPE, UnknownFortranType, LocalInterface
+    REAL_TYPE, UnknownFortranType, LocalInterface, BOOLEAN_TYPE
 from psyclone.psyir.frontend.fparser2 import Fparser2Reader
 from psyclone.psyir.frontend.fortran import FortranReader
 import psyclone.expression as expr
@@ -442,6 +443,50 @@ class GOInvokeSchedule(InvokeSchedule):
         will look them up from the field object for every loop '''
         self._const_loop_bounds = obj
 
+    def ocl_device_writes(self):
+        '''
+        Device-residency analysis for the OpenCL PSy layer. Within an invoke
+        the host data of a field only needs to be written to the device
+        once, before the first kernel that accesses it. No write is
+        needed at all if that first kernel only writes to the field
+        (GO_WRITE) and iterates over all points, since then every
+        element is overwritten on the device before it is read.
+        Similarly, the grid properties only need to be written before the
+        first kernel that uses a grid array.
+
+        :returns: for each coded kernel in this schedule, the names of the \
+            fields whose data must be written to the device and whether \
+            the grid buffers must be written before it.
+        :rtype: :py:class:`collections.OrderedDict` of \
+            :py:class:`psyclone.gocean1p0.GOKern` -> (list of str, bool)
+        '''
+        seen_fields = set()
+        grid_written = False
+        writes = OrderedDict()
+        for kern in self.coded_kernels():
+            # Collect the accesses of each field that is not already on
+            # the device (a field may be passed to a kernel more than once)
+            accesses = OrderedDict()
+            write_grid = False
+            for arg in kern.arguments.args:
+                if arg.argument_type == "field":
+                    if arg.name not in seen_fields:
+                        accesses.setdefault(arg.name, []).append(arg.access)
+                elif (arg.argument_type == "grid_property" and
+                      not arg.is_scalar and not grid_written):
+                    write_grid = True
+            covers_all_points = kern.iterates_over.lower() == "go_all_pts"
+            fields = []
+            for name, access_list in accesses.items():
+                seen_fields.add(name)
+                if covers_all_points and \
+                        all(acc == AccessType.WRITE for acc in access_list):
+                    continue
+                fields.append(name)
+            grid_written = grid_written or write_grid
+            writes[kern] = (fields, write_grid)
+        return writes
+
 
 # pylint: disable=too-many-instance-attributes
 class GOLoop(Loop):
@@ -489,6 +534,11 @@ class GOLoop(Loop):
                 suggested_name, tag, symbol_type=DataSymbol,
                 datatype=INTEGER_TYPE)
 
+        # If this loop iterates over the points of a single tile (see
+        # GOceanLoopTiling2DTrans), the loop variable of the enclosing
+        # loop over the tiles and the tile size.
+        self._tile = None
+
         # Pre-initialise the Loop children  # TODO: See issue #440
         self.addchild(Literal("NOT_INITIALISED", INTEGER_TYPE,
                               parent=self))  # start
@@ -500,6 +550,44 @@ class GOLoop(Loop):
         if not GOLoop._bounds_lookup:
             GOLoop.setup_bounds()
 
+    # -------------------------------------------------------------------------
+    @property
+    def tile(self):
+        '''
+        :returns: the loop variable of the loop over the tiles that this \
+            loop iterates within and the size of the tiles, or None if \
+            this loop is not tiled.
+        :rtype: (:py:class:`psyclone.psyir.symbols.DataSymbol`, int) or \
+            NoneType
+        '''
+        return self._tile
+
+    @tile.setter
+    def tile(self, value):
+        '''
+        Makes this loop iterate over the points of the current tile of an
+        enclosing loop over tiles: the loop starts at the loop variable of
+        the loop over tiles and stops at the end of the tile or at the end
+        of the iteration space, whichever comes first.
+
+        :param value: the loop variable of the loop over tiles and the \
+            tile size, or None to remove the tiling of this loop.
+        :type value: (:py:class:`psyclone.psyir.symbols.DataSymbol`, int) \
+            or NoneType
+
+        :raises TypeError: if the supplied value is not None or a tuple of \
+            a DataSymbol and a positive integer.
+        '''
+        if value is not None:
+            if not (isinstance(value, tuple) and len(value) == 2 and
+                    isinstance(value[0], DataSymbol) and
+                    isinstance(value[1], int) and value[1] > 0):
+                raise TypeError(
+                    "The tile of a GOLoop must be None or a tuple of a "
+                    "DataSymbol and a positive integer but got '{0}'."
+                    "".format(value))
+        self._tile = value
+
     # -------------------------------------------------------------------------
     def _halo_read_access(self, arg):
         '''Determines whether the supplied argument has (or might have) its
@@ -768,10 +856,31 @@ class GOLoop(Loop):
         return StructureReference.create(fld_sym, members[1:])
 
     # -------------------------------------------------------------------------
-    # pylint: disable=too-many-branches
     def upper_bound(self):
-        ''' Creates the PSyIR of the upper bound of this loop.
-        This takes the field type and usage of const_loop_bounds
+        ''' Creates the PSyIR of the upper bound of this loop. If this loop
+        is tiled, this is the end of the current tile, limited by the upper
+        bound of the iteration space, i.e. MIN(tile + size - 1, stop).
+
+        :returns: the PSyIR for the upper bound of this loop.
+        :rtype: :py:class:`psyclone.psyir.nodes.Node`
+
+        '''
+        stop = self._iteration_space_upper_bound()
+        if not self._tile:
+            return stop
+
+        variable, size = self._tile
+        tile_stop = BinaryOperation.create(
+            BinaryOperation.Operator.ADD, Reference(variable),
+            Literal(str(size - 1), INTEGER_TYPE))
+        return BinaryOperation.create(BinaryOperation.Operator.MIN,
+                                      tile_stop, stop.copy())
+
+    # -------------------------------------------------------------------------
+    # pylint: disable=too-many-branches
+    def _iteration_space_upper_bound(self):
+        ''' Creates the PSyIR of the upper bound of the iteration space of
+        this loop. This takes the field type and usage of const_loop_bounds
         into account. In the case of const_loop_bounds it will be
         using the data in GOLoop._bounds_lookup to find the appropriate
         indices depending on offset, field type, and iteration space.
@@ -870,10 +979,16 @@ class GOLoop(Loop):
         "{stop}+1" will become "istop+1" (or "jstop+1" depending on
         loop type).
 
+        If this loop is tiled, the lower bound is the loop variable of the
+        enclosing loop over tiles.
+
         :returns: root of PSyIR sub-tree describing this lower bound.
         :rtype: :py:class:`psyclone.psyir.nodes.Node`
 
         '''
+        if self._tile:
+            return Reference(self._tile[0], parent=self)
+
         schedule = self.ancestor(GOInvokeSchedule)
         if schedule.const_loop_bounds:
             index_offset = ""
@@ -1087,6 +1202,9 @@ class GOKern(CodedKern):
         # pylint happy
         self._name = ""
         self._index_offset = ""
+        # Whether this kernel is the result of fusing kernels with the
+        # GOOpenCLKernelFuseTrans transformation.
+        self._fused = False
 
     @staticmethod
     def _format_access(var_name, var_value, depth):
@@ -1222,6 +1340,12 @@ class GOKern(CodedKern):
             self.rename_and_write()
             self.gen_ocl(parent)
         else:
+            if self._fused:
+                raise GenerationError(
+                    "Kernel '{0}' has been created by the "
+                    "GOOpenCLKernelFuseTrans transformation and can only be "
+                    "generated as OpenCL (use the OCLTrans transformation)."
+                    "".format(self.name))
             super(GOKern, self).gen_code(parent)
 
     def gen_ocl(self, parent):
@@ -1244,10 +1368,9 @@ class GOKern(CodedKern):
         # call is also inserted because in some platforms (e.g. Xiling FPGA)
         # knowing which arguments each kernel is going to use allows the write
         # operation to place the data into the appropriate memory bank.
-        # This will create duplicate write operation for fields that are
-        # repeated in multiple kernels, but the performance penalty is small
-        # because it just happens during the first iteration.
-        # TODO #1134: Explore removing duplicated write operations.
+        # Each field is only written once per invoke (before the first
+        # kernel that needs its data) and only if it is not already on the
+        # device, e.g. because a previous invoke has used it.
         ft_block = self.ancestor(InvokeSchedule)._first_time_block
         self.gen_ocl_buffers_initialisation(ft_block)
         self.gen_ocl_set_args_call(ft_block)
@@ -1325,6 +1448,11 @@ class GOKern(CodedKern):
                 parent, "check_status",
                 ["'Errors before {0} launch'".format(self.name), flag]))
 
+        # The events (if any) that order this kernel after the kernels it
+        # depends upon on other command queues
+        num_events, wait_list, completion_event = \
+            self.ancestor(InvokeSchedule).opencl_wait_arguments(self, parent)
+
         args = ", ".join([
             # OpenCL Command Queue
             cmd_queue,
@@ -1339,11 +1467,11 @@ class GOKern(CodedKern):
             # Local work size
             "C_LOC({0})".format(local_size),
             # Number of events in wait list
-            "0",
+            num_events,
             # Event wait list that need to be completed before this kernel
-            cnull,
+            wait_list,
             # Event that identifies this kernel completion
-            cnull])
+            completion_event])
         parent.add(AssignGen(parent, lhs=flag,
                              rhs="clEnqueueNDRangeKernel({0})".format(args)))
         parent.add(CommentGen(parent, ""))
@@ -1516,9 +1644,19 @@ class GOKern(CodedKern):
         while module.parent:
             module = module.parent
 
+        # Fields (and grid) whose host data must be written to the device
+        # before this kernel. Their residency is recorded before their
+        # buffers are initialised, so that the data is only written if it
+        # is not already on the device (e.g. from a previous invoke).
+        write_fields, write_grid = \
+            self.ancestor(InvokeSchedule).ocl_device_writes()[self]
+
         # Traverse all arguments and make sure the buffers are initialised
         for arg in self._arguments.args:
             if arg.argument_type == "field":
+                if arg.name in write_fields:
+                    self._gen_ocl_residency_flag(
+                        parent, arg.name, arg.name + "%data_on_device")
                 # Get the init_buffer routine and insert a call for this field
                 init_buf = self.gen_ocl_initialise_buffer(module)
                 field = symtab.lookup(arg.name)
@@ -1532,6 +1670,20 @@ class GOKern(CodedKern):
                 # Get the grid init_buffer routine and insert a call
                 init_buf = self.gen_ocl_initialise_grid_buffers(module)
                 field = symtab.lookup(self._arguments.find_grid_access().name)
+                if write_grid:
+                    # The grid buffers are created together, so checking
+                    # the first integer array is enough (as done by the
+                    # grid initialisation routine itself).
+                    api_config = Config.get().api_conf("gocean1.0")
+                    int_array = [
+                        prop.fortran.format(field.name) for key, prop in
+                        api_config.grid_properties.items() if
+                        key != "go_grid_data" and prop.type == "array" and
+                        prop.intrinsic_type == "integer"][0]
+                    self._gen_ocl_residency_flag(
+                        parent, "grid",
+                        "C_ASSOCIATED({0}_device)".format(int_array))
+                    write_grid = False
                 call = Call.create(init_buf, [Reference(field)])
 
                 # TODO #1134: Currently we convert back the PSyIR to f2pygen
@@ -1555,27 +1707,71 @@ class GOKern(CodedKern):
                     parent.add(DeclGen(parent, datatype="integer",
                                        kind="c_intptr_t", entity_decls=[name]))
 
+    def _gen_ocl_residency_flag(self, parent, name, on_device):
+        '''
+        Generate the f2pygen AST for the declaration and assignment of a
+        logical variable that records whether the data of the given field
+        (or grid) is already on the device.
+
+        :param parent: parent subroutine in f2pygen AST of generated code.
+        :type parent: :py:class:`psyclone.f2pygen.SubroutineGen`
+        :param str name: name of the field (or "grid").
+        :param str on_device: Fortran expression that is true when the \
+            data is already on the device.
+        '''
+        symtab = self.scope.symbol_table
+        tag = "ocl_on_device_" + name
+        try:
+            flag = symtab.lookup_with_tag(tag).name
+        except KeyError:
+            flag = symtab.new_symbol(name + "_on_device", tag=tag,
+                                     symbol_type=DataSymbol,
+                                     datatype=BOOLEAN_TYPE).name
+            parent.add(DeclGen(parent, datatype="logical",
+                               entity_decls=[flag]))
+        parent.add(AssignGen(parent, lhs=flag, rhs=on_device))
+
+    def _gen_ocl_guarded_write(self, parent, name, call):
+        '''
+        Add the given write call to the f2pygen AST, guarded so that it is
+        only executed if the data was not already on the device.
+
+        :param parent: parent subroutine in f2pygen AST of generated code.
+        :type parent: :py:class:`psyclone.f2pygen.SubroutineGen`
+        :param str name: name of the field (or "grid").
+        :param call: the call that writes the data to the device.
+        :type call: :py:class:`psyclone.psyir.nodes.Call`
+        '''
+        flag = self.scope.symbol_table.lookup_with_tag(
+            "ocl_on_device_" + name).name
+        guard = IfThenGen(parent, ".NOT. " + flag)
+        parent.add(guard)
+        # TODO #1134: Currently we convert back the PSyIR to f2pygen
+        # but when using the PSyIR backend this will be removed.
+        guard.add(PSyIRGen(guard, call))
+
     def gen_ocl_buffers_initial_write(self, parent):
         # pylint: disable=too-many-locals
         '''
         Generate the f2pygen AST for the code to write the initial data into
-        the device.
+        the device. Only the data that the device-residency analysis (see
+        :py:meth:`psyclone.gocean1p0.GOInvokeSchedule.ocl_device_writes`)
+        requires before this kernel is written, and only if it was not
+        already on the device when the invoke was first called.
 
         :param parent: parent subroutine in f2pygen AST of generated code.
         :type parent: :py:class:`psyclone.f2pygen.SubroutineGen`
         '''
         symtab = self.scope.symbol_table
-        there_is_a_grid_buffer = False
-        for arg in self._arguments.args:
-            if arg.argument_type == "field":
-                # Insert call to write_to_device method
-                call = Call.create(
-                    RoutineSymbol(arg.name+"%write_to_device()"), [])
-                parent.add(PSyIRGen(parent, call))
-            elif arg.argument_type == "grid_property" and not arg.is_scalar:
-                there_is_a_grid_buffer = True
-
-        if there_is_a_grid_buffer:
+        write_fields, write_grid = \
+            self.ancestor(InvokeSchedule).ocl_device_writes()[self]
+        for name in write_fields:
+            # Insert call to write_to_device method
+            call = Call.create(
+                RoutineSymbol(name+"%write_to_device()"), [])
+            self._gen_ocl_guarded_write(parent, name, call)
+
+        if write_grid:
             module = parent
             while module.parent:
                 module = module.parent
@@ -1584,7 +1780,7 @@ class GOKern(CodedKern):
             # Insert grid writing call
             field = symtab.lookup(self._arguments.find_grid_access().name)
             call = Call.create(grid_write_routine, [Reference(field)])
-            parent.add(PSyIRGen(parent, call))
+            self._gen_ocl_guarded_write(parent, "grid", call)
 
     def gen_ocl_set_args_call(self, parent):
         '''
@@ -2098,6 +2294,32 @@ class GOKern(CodedKern):
 
         return symtab.lookup_with_tag("ocl_write_func")
 
+    def opencl_local_memory_tiles(self):
+        '''
+        Uses the stencil metadata of the kernel to find the read-only fields
+        which access neighbouring points. These can be cooperatively loaded
+        into OpenCL __local memory by each work-group so that the neighbour
+        values are read from global memory only once.
+
+        :returns: the stencil depth in each dimension of the kernel arrays \
+            that can be loaded into OpenCL __local memory.
+        :rtype: :py:class:`collections.OrderedDict` of str: (int, int)
+        '''
+        tiles = OrderedDict()
+        data_arguments = self.get_kernel_schedule().symbol_table.data_arguments
+        for arg, symbol in zip(self.arguments.args, data_arguments):
+            if arg.argument_type != "field" or \
+                    arg.access != AccessType.READ or \
+                    not arg.stencil.has_stencil:
+                continue
+            depth1 = max(arg.stencil.depth(i, j) for i in [-1, 1]
+                         for j in [-1, 0, 1])
+            depth2 = max(arg.stencil.depth(i, j) for i in [-1, 0, 1]
+                         for j in [-1, 1])
+            if depth1 or depth2:
+                tiles[symbol.name] = (depth1, depth2)
+        return tiles
+
     def get_kernel_schedule(self):
         '''
         Returns a PSyIR Schedule representing the GOcean kernel code.
@@ -44,6 +44,7 @@
 from __future__ import print_function, absolute_import
 from collections import OrderedDict
 import abc
+import hashlib
 import six
 from fparser.two import Fortran2003
 from psyclone.configuration import Config
@@ -309,6 +310,11 @@ class Invokes(object):
         self._psy = psy
         self.invoke_map = {}
         self.invoke_list = []
+        # The kernel files written and the index of each kernel-output
+        # directory used while generating the code for these invokes (see
+        # `CodedKern.rename_and_write`). They are reset by gen_code.
+        self.written_kernel_files = set()
+        self.kernel_dir_index = {}
         for idx, alg_invocation in enumerate(alg_calls):
             my_invoke = invoke_cls(alg_invocation, idx, self)
             self.invoke_map[my_invoke.name] = my_invoke
@@ -360,6 +366,10 @@ class Invokes(object):
                 "for all the invokes which needs certain OpenCL options to "
                 "match between invokes. Found '{0}' with unmatching values "
                 "between invokes.".format(option_name))
+        # The kernel-output directory may have changed since any previous
+        # generation so start with empty caches.
+        self.written_kernel_files = set()
+        self.kernel_dir_index = {}
         opencl_kernels = []
         opencl_num_queues = 1
         generate_ocl_init = False
@@ -396,12 +406,12 @@ class Invokes(object):
 
                 # openCL_num_queues must be the maximum number from any invoke
                 for kern in isch.coded_kernels():
+                    # Compute the maximum number of command queues that
+                    # will be needed.
+                    opencl_num_queues = max(
+                        opencl_num_queues,
+                        kern.opencl_options['queue_number'])
                     if kern.name not in opencl_kernels:
-                        # Compute the maximum number of command queues that
-                        # will be needed.
-                        opencl_num_queues = max(
-                            opencl_num_queues,
-                            kern.opencl_options['queue_number'])
                         opencl_kernels.append(kern.name)
                         kern.gen_arg_setter_code(parent)
             invoke.gen_code(parent)
@@ -918,12 +928,18 @@ class InvokeSchedule(Routine):
         # InvokeSchedule opencl_options default values
         self._opencl_options = {"end_barrier": True,
                                 "enable_profiling": False,
-                                "out_of_order": False}
+                                "out_of_order": False,
+                                "multi_queue": False}
 
         # This reference will store during gen_code() the block of code that
         # is executed only on the first iteration of the invoke.
         self._first_time_block = None
 
+        # This will store during gen_code() the OpenCL events that each
+        # kernel must wait for when kernels are spread over multiple
+        # command queues (see the 'multi_queue' OpenCL option).
+        self._opencl_event_waits = None
+
     @property
     def symbol_table(self):
         '''
@@ -942,7 +958,7 @@ class InvokeSchedule(Routine):
 
         '''
         valid_opencl_options = ['end_barrier', 'enable_profiling',
-                                'out_of_order']
+                                'out_of_order', 'multi_queue']
 
         # Validate that the options given are supported and store them
         for key, value in options.items():
@@ -967,6 +983,79 @@ class InvokeSchedule(Routine):
         '''
         return self._opencl_options[key]
 
+    def kernel_dependencies(self):
+        '''
+        Uses the data dependences of the kernel field arguments to find,
+        for each (coded) kernel in this InvokeSchedule, the preceding
+        kernels that must have completed before it may start. These are
+        the kernels that access a field that it also accesses and where
+        at least one of the two accesses is a write.
+
+        :returns: the preceding kernels upon which each kernel depends \
+            (in schedule order).
+        :rtype: :py:class:`collections.OrderedDict` of \
+            :py:class:`psyclone.psyGen.CodedKern`: \
+            list of :py:class:`psyclone.psyGen.CodedKern`
+
+        '''
+        kernels = self.coded_kernels()
+        dependencies = OrderedDict((kern, []) for kern in kernels)
+        for kern in kernels:
+            for arg in kern.arguments.args:
+                if arg.argument_type != "field":
+                    continue
+                # The following arguments with a read-after-write, a
+                # write-after-read or a write-after-write dependence
+                following = (arg.forward_read_dependencies() +
+                             arg.forward_write_dependencies())
+                next_arg = arg.forward_dependence()
+                if next_arg:
+                    following.append(next_arg)
+                for farg in following:
+                    if farg.call in dependencies and \
+                       kern not in dependencies[farg.call]:
+                        dependencies[farg.call].append(kern)
+        return dependencies
+
+    def opencl_event_waits(self):
+        '''
+        Computes the OpenCL events that each kernel must wait for when the
+        kernels of this InvokeSchedule are enqueued on (in-order) command
+        queues given by their 'queue_number' OpenCL option. Event 0 is a
+        marker enqueued on the first queue at the start of the invoke and
+        event i (> 0) identifies the completion of the i-th kernel. A kernel
+        only waits for the kernels it depends upon that are on a different
+        queue (those on the same queue have already completed) and for
+        the start marker if it is on a queue other than the first and does
+        not depend on any other kernel.
+
+        :returns: the events that each kernel must wait for and the \
+            events identifying the last kernel on each queue other than \
+            the first.
+        :rtype: 2-tuple of (:py:class:`collections.OrderedDict` of \
+            :py:class:`psyclone.psyGen.CodedKern`: list of int, list of int)
+
+        '''
+        dependencies = self.kernel_dependencies()
+        event_index = {}
+        waits = OrderedDict()
+        last_on_queue = {}
+        for index, (kern, preceding) in enumerate(dependencies.items()):
+            event_index[kern] = index + 1
+            queue = kern.opencl_options['queue_number']
+            if preceding:
+                waits[kern] = [
+                    event_index[pre] for pre in preceding
+                    if pre.opencl_options['queue_number'] != queue]
+            elif queue != 1:
+                waits[kern] = [0]
+            else:
+                waits[kern] = []
+            last_on_queue[queue] = index + 1
+        last_events = [last_on_queue[queue] for queue in
+                       sorted(last_on_queue) if queue != 1]
+        return waits, last_events
+
     @property
     def invoke(self):
         return self._invoke
@@ -1106,9 +1195,19 @@ class InvokeSchedule(Routine):
                         if_first, lhs=kernel,
                         rhs='get_kernel_by_name("{0}")'.format(kern.name)))
 
+        if self._opencl and self._opencl_options['multi_queue']:
+            self._gen_opencl_events_start(parent)
+
         for entity in self._children:
             entity.gen_code(parent)
 
+        if self._opencl and self._opencl_options['multi_queue'] and \
+           not self._opencl_options['end_barrier']:
+            # Rather than blocking, make the first command queue (which is
+            # used for the data transfers) wait for the last kernel on each
+            # of the other queues.
+            self._gen_opencl_events_end(parent)
+
         if self.opencl and self._opencl_options['end_barrier']:
 
             parent.add(CommentGen(parent,
@@ -1126,12 +1225,171 @@ class InvokeSchedule(Routine):
                               rhs="clFinish({0}({1}))".format(qlist,
                                                               queue_number)))
 
+        if self._opencl_event_waits is not None:
+            self._gen_opencl_events_release(parent)
+            self._opencl_event_waits = None
+
         # Restore symbol table (with a protected access attribute change)
         # pylint: disable=protected-access
         self._symbol_table = symbol_table_before_gen
         self.parent._symbol_table = psy_symbol_table_before_gen
         # pylint: enable=protected-access
 
+    def _gen_opencl_events_start(self, parent):
+        '''
+        Declares the OpenCL events used to order the kernels of this
+        InvokeSchedule when they are spread over multiple command queues
+        and, if required, enqueues the marker on the first queue that
+        kernels on other queues without preceding dependences wait for.
+        The events required by each kernel are stored so that they can
+        be used when generating the kernel launch.
+
+        :param parent: the f2pygen node to which to add content.
+        :type parent: :py:class:`psyclone.f2pygen.SubroutineGen`
+
+        '''
+        from psyclone.f2pygen import DeclGen, AssignGen
+        waits, last_events = self.opencl_event_waits()
+        if self._opencl_options['end_barrier']:
+            # All of the queues are finished at the end of the invoke
+            last_events = []
+        used = set(last_events)
+        for events in waits.values():
+            used.update(events)
+        if not used:
+            # No kernel has to wait for a kernel on another queue
+            return
+        self._opencl_event_waits = (waits, last_events, used)
+        events = self.symbol_table.new_symbol(
+            "kernel_events", symbol_type=DataSymbol,
+            datatype=ArrayType(INTEGER_TYPE, [len(waits) + 1]),
+            tag="opencl_events").name
+        parent.add(DeclGen(parent, datatype="integer", kind="c_intptr_t",
+                           target=True, entity_decls=[
+                               "{0}(0:{1})".format(events, len(waits))]))
+        max_waits = max([len(last_events)] +
+                        [len(evts) for evts in waits.values()])
+        if max_waits > 1:
+            wait_list = self.symbol_table.new_symbol(
+                "wait_list", symbol_type=DataSymbol,
+                datatype=ArrayType(INTEGER_TYPE, [max_waits]),
+                tag="opencl_wait_list").name
+            parent.add(DeclGen(parent, datatype="integer", kind="c_intptr_t",
+                               target=True, entity_decls=[
+                                   "{0}({1})".format(wait_list, max_waits)]))
+        if 0 in used:
+            qlist = self.symbol_table.lookup_with_tag("opencl_cmd_queues").name
+            flag = self.symbol_table.lookup_with_tag("opencl_error").name
+            parent.add(CommentGen(
+                parent, " Kernels on other queues without preceding "
+                "dependences wait for any work"))
+            parent.add(CommentGen(
+                parent, " (e.g. data transfers) already enqueued on the "
+                "first queue"))
+            parent.add(AssignGen(
+                parent, lhs=flag,
+                rhs="clEnqueueMarkerWithWaitList({0}(1), 0, C_NULL_PTR, "
+                "C_LOC({1}(0)))".format(qlist, events)))
+
+    def opencl_wait_arguments(self, kern, parent):
+        '''
+        Provides the OpenCL event-related arguments of the launch of the
+        supplied kernel, adding code to set-up the list of events to wait
+        for to the supplied parent if more than one is required.
+
+        :param kern: the kernel being launched.
+        :type kern: :py:class:`psyclone.psyGen.CodedKern`
+        :param parent: the f2pygen node to which to add content.
+        :type parent: :py:class:`psyclone.f2pygen.SubroutineGen`
+
+        :returns: the number of events in the wait list, the wait list and \
+            the event that identifies the kernel completion.
+        :rtype: 3-tuple of str
+
+        '''
+        if self._opencl_event_waits is None:
+            return "0", "C_NULL_PTR", "C_NULL_PTR"
+        waits, _, used = self._opencl_event_waits
+        events = self.symbol_table.lookup_with_tag("opencl_events").name
+        index = list(waits.keys()).index(kern) + 1
+        completion = "C_NULL_PTR"
+        if index in used:
+            completion = "C_LOC({0}({1}))".format(events, index)
+        return (str(len(waits[kern])),
+                self._gen_opencl_wait_list(waits[kern], parent),
+                completion)
+
+    def _gen_opencl_wait_list(self, wait_events, parent):
+        '''
+        :param wait_events: the indices of the events to wait for.
+        :type wait_events: list of int
+        :param parent: the f2pygen node to which to add any code required \
+            to set-up the list of events.
+        :type parent: :py:class:`psyclone.f2pygen.SubroutineGen`
+
+        :returns: the (C pointer to the) list of events to wait for.
+        :rtype: str
+
+        '''
+        from psyclone.f2pygen import AssignGen
+        events = self.symbol_table.lookup_with_tag("opencl_events").name
+        if not wait_events:
+            return "C_NULL_PTR"
+        if len(wait_events) == 1:
+            return "C_LOC({0}({1}))".format(events, wait_events[0])
+        wait_list = self.symbol_table.lookup_with_tag("opencl_wait_list").name
+        parent.add(AssignGen(
+            parent, lhs="{0}(1:{1})".format(wait_list, len(wait_events)),
+            rhs="(/" + ", ".join("{0}({1})".format(events, idx)
+                                 for idx in wait_events) + "/)"))
+        return "C_LOC({0})".format(wait_list)
+
+    def _gen_opencl_events_end(self, parent):
+        '''
+        Enqueues a barrier on the first command queue that waits for the
+        last kernel on each of the other queues. Any subsequent data
+        transfer (which uses the first queue) is thus ordered after all
+        of the kernels in this InvokeSchedule without the host blocking.
+
+        :param parent: the f2pygen node to which to add content.
+        :type parent: :py:class:`psyclone.f2pygen.SubroutineGen`
+
+        '''
+        from psyclone.f2pygen import AssignGen
+        if self._opencl_event_waits is None:
+            return
+        _, last_events, _ = self._opencl_event_waits
+        if not last_events:
+            return
+        qlist = self.symbol_table.lookup_with_tag("opencl_cmd_queues").name
+        flag = self.symbol_table.lookup_with_tag("opencl_error").name
+        parent.add(CommentGen(parent, " Order subsequent work on the first "
+                              "queue after the kernels on the other queues"))
+        wait_list = self._gen_opencl_wait_list(last_events, parent)
+        parent.add(AssignGen(
+            parent, lhs=flag,
+            rhs="clEnqueueBarrierWithWaitList({0}(1), {1}, {2}, C_NULL_PTR)"
+            .format(qlist, len(last_events), wait_list)))
+
+    def _gen_opencl_events_release(self, parent):
+        '''
+        Releases the OpenCL events created by this InvokeSchedule. (OpenCL
+        keeps them alive until the commands that wait for them have been
+        executed.)
+
+        :param parent: the f2pygen node to which to add content.
+        :type parent: :py:class:`psyclone.f2pygen.SubroutineGen`
+
+        '''
+        from psyclone.f2pygen import AssignGen
+        _, _, used = self._opencl_event_waits
+        events = self.symbol_table.lookup_with_tag("opencl_events").name
+        flag = self.symbol_table.lookup_with_tag("opencl_error").name
+        for index in sorted(used):
+            parent.add(AssignGen(
+                parent, lhs=flag,
+                rhs="clReleaseEvent({0}({1}))".format(events, index)))
+
     @property
     def opencl(self):
         '''
@@ -1388,6 +1646,107 @@ class ACCDirective(Directive):
                     type(self).__name__))
 
 
+class ACCAsyncMixin(object):
+    '''
+    Mixin class for the OpenACC directives that support the 'async' and
+    'wait' clauses. Without these clauses the operations of a directive
+    are performed synchronously (on the default queue).
+
+    :param int async_queue: the queue on which the operations of the \
+        directive are to be performed asynchronously or None.
+    :param wait_queues: the queues that must have completed before the \
+        operations of the directive are started (an empty list waits for \
+        all queues) or None.
+    :type wait_queues: list of int or NoneType
+
+    '''
+    def __init__(self, async_queue=None, wait_queues=None):
+        self.async_queue = async_queue
+        self.wait_queues = wait_queues
+
+    @staticmethod
+    def _check_queue(queue):
+        '''
+        :param int queue: an OpenACC queue number.
+
+        :raises TypeError: if the supplied queue is not an int.
+        :raises ValueError: if the supplied queue is negative.
+
+        '''
+        if not isinstance(queue, int) or isinstance(queue, bool):
+            raise TypeError(
+                "An OpenACC queue must be specified as an int but got "
+                "'{0}'.".format(type(queue).__name__))
+        if queue < 0:
+            raise ValueError(
+                "An OpenACC queue must be a non-negative integer but got "
+                "'{0}'.".format(queue))
+
+    @property
+    def async_queue(self):
+        '''
+        :returns: the queue on which the operations of this directive are \
+                  performed asynchronously or None.
+        :rtype: int or NoneType
+        '''
+        return self._async_queue
+
+    @async_queue.setter
+    def async_queue(self, queue):
+        '''
+        :param queue: the queue on which the operations of this directive \
+                      are to be performed asynchronously or None.
+        :type queue: int or NoneType
+        '''
+        if queue is not None:
+            self._check_queue(queue)
+        self._async_queue = queue
+
+    @property
+    def wait_queues(self):
+        '''
+        :returns: the queues that must have completed before the \
+                  operations of this directive start or None.
+        :rtype: list of int or NoneType
+        '''
+        return self._wait_queues
+
+    @wait_queues.setter
+    def wait_queues(self, queues):
+        '''
+        :param queues: the queues that must have completed before the \
+                       operations of this directive start or None.
+        :type queues: list of int or NoneType
+
+        :raises TypeError: if queues is not None or a list.
+        '''
+        if queues is not None:
+            if not isinstance(queues, list):
+                raise TypeError(
+                    "The queues to wait for must be supplied as a list but "
+                    "got '{0}'.".format(type(queues).__name__))
+            for queue in queues:
+                self._check_queue(queue)
+            queues = queues[:]
+        self._wait_queues = queues
+
+    def _async_clauses(self):
+        '''
+        :returns: the 'async' and 'wait' clauses of this directive.
+        :rtype: list of str
+        '''
+        clauses = []
+        if self._async_queue is not None:
+            clauses.append("async({0})".format(self._async_queue))
+        if self._wait_queues is not None:
+            if self._wait_queues:
+                clauses.append("wait({0})".format(
+                    ",".join(str(queue) for queue in self._wait_queues)))
+            else:
+                clauses.append("wait")
+        return clauses
+
+
 @six.add_metaclass(abc.ABCMeta)
 class ACCEnterDataDirective(ACCDirective):
     '''
@@ -1487,14 +1846,30 @@ class ACCEnterDataDirective(ACCDirective):
         '''
 
 
-class ACCParallelDirective(ACCDirective):
+class ACCParallelDirective(ACCAsyncMixin, ACCDirective):
     '''
     Class representing the !$ACC PARALLEL directive of OpenACC
     in the PSyIR. By default it includes the 'DEFAULT(PRESENT)' clause which
     means this node must either come after an EnterDataDirective or within
     a DataDirective.
 
+    :param children: the PSyIR nodes to be enclosed in the parallel region.
+    :type children: list of :py:class:`psyclone.psyir.nodes.Node`
+    :param parent: the parent of this node in the PSyIR.
+    :type parent: :py:class:`psyclone.psyir.nodes.Node`
+    :param int async_queue: the queue on which to execute the region \
+        asynchronously or None.
+    :param wait_queues: the queues to wait for before starting the region \
+        or None.
+    :type wait_queues: list of int or NoneType
+
     '''
+    def __init__(self, children=None, parent=None, async_queue=None,
+                 wait_queues=None):
+        ACCDirective.__init__(self, children=children, parent=parent)
+        ACCAsyncMixin.__init__(self, async_queue=async_queue,
+                               wait_queues=wait_queues)
+
     def node_str(self, colour=True):
         '''
         Returns the name of this node with appropriate control codes
@@ -1559,7 +1934,9 @@ class ACCParallelDirective(ACCDirective):
         '''
         self.validate_global_constraints()
 
-        parent.add(DirectiveGen(parent, *self.begin_string().split()))
+        words = self.begin_string().split()
+        parent.add(DirectiveGen(parent, words[0], words[1], words[2],
+                                " ".join(words[3:])))
 
         for child in self.children:
             child.gen_code(parent)
@@ -1577,12 +1954,12 @@ class ACCParallelDirective(ACCDirective):
         :rtype: str
 
         '''
-        # pylint: disable=no-self-use
         # "default(present)" means that the compiler is to assume that
         # all data required by the parallel region is already present
         # on the device. If we've made a mistake and it isn't present
         # then we'll get a run-time error.
-        return "acc begin parallel default(present)"
+        return " ".join(["acc begin parallel default(present)"] +
+                        self._async_clauses())
 
     def end_string(self):
         '''
@@ -1652,7 +2029,8 @@ class ACCParallelDirective(ACCDirective):
         and end of this parallel region.
         '''
         self.validate_global_constraints()
-        self._add_region(start_text="PARALLEL", end_text="END PARALLEL",
+        start_text = " ".join(["PARALLEL"] + self._async_clauses()).upper()
+        self._add_region(start_text=start_text, end_text="END PARALLEL",
                          data_movement="present")
 
 
@@ -1885,7 +2263,9 @@ class OMPParallelDirective(OMPDirective):
         private_list = self._get_private_list()
 
         reprod_red_call_list = self.reductions(reprod=True)
-        if reprod_red_call_list:
+        # The "padded" strategy accumulates into an array element per thread
+        padded = Config.get().reprod_reduction_strategy == "padded"
+        if reprod_red_call_list and padded:
             # we will use a private thread index variable
             thread_idx = self.scope.symbol_table.\
                 lookup_with_tag("omp_thread_index").name
@@ -1926,7 +2306,7 @@ class OMPParallelDirective(OMPDirective):
                                 "default(shared), private({0})".
                                 format(private_str)))
 
-        if reprod_red_call_list:
+        if reprod_red_call_list and padded:
             # add in a local thread index
             parent.add(UseGen(parent, name="omp_lib", only=True,
                               funcnames=["omp_get_thread_num"]))
@@ -1946,8 +2326,12 @@ class OMPParallelDirective(OMPDirective):
 
         if reprod_red_call_list:
             parent.add(CommentGen(parent, ""))
-            parent.add(CommentGen(parent, " sum the partial results "
-                                  "sequentially"))
+            if padded:
+                parent.add(CommentGen(parent, " sum the partial results "
+                                      "sequentially"))
+            else:
+                parent.add(CommentGen(parent, " combine the partial results "
+                                      "in a fixed-order pairwise tree"))
             parent.add(CommentGen(parent, ""))
             for call in reprod_red_call_list:
                 call.reduction_sum_loop(parent)
@@ -2006,6 +2390,15 @@ class OMPParallelDirective(OMPDirective):
                         "name is not set.".format(call.name))
                 result.add(variable_name.lower())
 
+        # Inside OpenMP tasks the arguments of the kernels must be shared
+        # as they may be accessed by kernels in several tasks. Inlined
+        # kernels have no arguments.
+        kernel_args = set()
+        if self.walk((OMPTaskDirective, OMPTaskloopDirective)):
+            kernel_args = set(arg.name.lower() for call in self.kernels()
+                              if not isinstance(call, InlinedKern)
+                              for arg in call.args)
+
         # Now determine scalar variables that must be private:
         var_accesses = VariablesAccessInfo()
         self.reference_accesses(var_accesses)
@@ -2015,6 +2408,9 @@ class OMPParallelDirective(OMPDirective):
             if accesses[0].indices is not None:
                 continue
 
+            if str(signature).lower() in kernel_args:
+                continue
+
             # If a variable is only accessed once, it is either an error
             # or a shared variable - anyway it is not private
             if len(accesses) == 1:
@@ -2097,10 +2493,14 @@ class OMPDoDirective(OMPDirective):
     :param str omp_schedule: the OpenMP schedule to use.
     :param bool reprod: whether or not to generate code for run-reproducible \
                         OpenMP reductions.
+    :param int collapse: the number of tightly-nested loops to which \
+                         this directive applies or None.
+    :param bool nowait: whether or not to skip the implied barrier at \
+                        the end of the loop.
 
     '''
     def __init__(self, children=None, parent=None, omp_schedule="static",
-                 reprod=None):
+                 reprod=None, collapse=None, nowait=False):
 
         if children is None:
             children = []
@@ -2111,6 +2511,8 @@ class OMPDoDirective(OMPDirective):
             self._reprod = reprod
 
         self._omp_schedule = omp_schedule
+        self._collapse = collapse
+        self._nowait = nowait
 
         # Call the init method of the base class once we've stored
         # the OpenMP schedule
@@ -2140,7 +2542,9 @@ class OMPDoDirective(OMPDirective):
             reprod = "[reprod={0}]".format(self._reprod)
         else:
             reprod = ""
-        return "{0}[OMP do]{1}".format(self.coloured_name(colour), reprod)
+        nowait = "[nowait]" if self._nowait else ""
+        return "{0}[OMP do]{1}{2}".format(self.coloured_name(colour), reprod,
+                                          nowait)
 
     def _reduction_string(self):
         ''' Return the OMP reduction information as a string '''
@@ -2157,6 +2561,68 @@ class OMPDoDirective(OMPDirective):
         ''' returns whether reprod has been set for this object or not '''
         return self._reprod
 
+    @property
+    def omp_schedule(self):
+        '''
+        :returns: the OpenMP schedule used by this directive.
+        :rtype: str
+        '''
+        return self._omp_schedule
+
+    @property
+    def collapse(self):
+        '''
+        :returns: the number of nested loops to collapse or None.
+        :rtype: int or NoneType
+        '''
+        return self._collapse
+
+    @property
+    def nowait(self):
+        '''
+        :returns: whether or not the implied barrier at the end of the \
+                  loop is skipped.
+        :rtype: bool
+        '''
+        return self._nowait
+
+    @nowait.setter
+    def nowait(self, value):
+        '''
+        :param bool value: whether or not to skip the implied barrier at \
+                           the end of the loop.
+
+        :raises TypeError: if the supplied value is not a bool.
+        :raises GenerationError: if an attempt is made to add a nowait \
+                                 clause to an OpenMP parallel do.
+        '''
+        if not isinstance(value, bool):
+            raise TypeError(
+                "The nowait property of an OMPDoDirective must be a bool "
+                "but got '{0}'.".format(type(value).__name__))
+        if value and isinstance(self, OMPParallelDoDirective):
+            raise GenerationError(
+                "An OpenMP PARALLEL DO cannot have a nowait clause because "
+                "the end of the parallel region is always a barrier.")
+        self._nowait = value
+
+    def _schedule_string(self):
+        '''
+        :returns: the schedule clause and, if required, the collapse \
+                  clause of this directive.
+        :rtype: str
+        '''
+        schedule = self._omp_schedule
+        if self._reprod and self.reductions() and \
+           Config.get().reprod_reduction_strategy == "tree":
+            # Each block of iterations of a reproducible reduction must be
+            # executed, in order, by a single thread.
+            schedule = "static,{0}".format(Config.get().reprod_block_size)
+        clauses = "schedule({0})".format(schedule)
+        if self._collapse:
+            clauses += ", collapse({0})".format(self._collapse)
+        return clauses
+
     def validate_global_constraints(self):
         '''
         Perform validation checks that can only be done at code-generation
@@ -2200,8 +2666,7 @@ class OMPDoDirective(OMPDirective):
         # As we're an orphaned loop we don't specify the scope
         # of any variables so we don't have to generate the
         # list of private variables
-        options = "schedule({0})".format(self._omp_schedule) + \
-                  local_reduction_string
+        options = self._schedule_string() + local_reduction_string
         parent.add(DirectiveGen(parent, "omp", "begin", "do", options))
 
         for child in self.children:
@@ -2209,7 +2674,8 @@ class OMPDoDirective(OMPDirective):
 
         # make sure the directive occurs straight after the loop body
         position = parent.previous_loop()
-        parent.add(DirectiveGen(parent, "omp", "end", "do", ""),
+        parent.add(DirectiveGen(parent, "omp", "end", "do",
+                                "nowait" if self._nowait else ""),
                    position=["after", position])
 
     def begin_string(self):
@@ -2221,18 +2687,19 @@ class OMPDoDirective(OMPDirective):
         :rtype: str
 
         '''
-        return "omp do schedule({0})".format(self._omp_schedule)
+        return "omp do " + self._schedule_string()
 
     def end_string(self):
         '''Returns the end (or closing) statement of this directive, i.e.
-        "omp end do". The visitor is responsible for adding the
+        "omp end do [nowait]". The visitor is responsible for adding the
         correct directive beginning (e.g. "!$").
 
         :returns: the end statement for this directive.
         :rtype: str
 
         '''
-        # pylint: disable=no-self-use
+        if self._nowait:
+            return "omp end do nowait"
         return "omp end do"
 
     def update(self):
@@ -2253,21 +2720,35 @@ class OMPDoDirective(OMPDirective):
                 "but this Node has {0} children: {1}".
                 format(len(self.dir_body.children), self.dir_body.children))
 
-        self._add_region(start_text="do schedule({0})".format(
-            self._omp_schedule), end_text="end do")
+        end_text = "end do nowait" if self._nowait else "end do"
+        self._add_region(start_text="do " + self._schedule_string(),
+                         end_text=end_text)
 
 
 class OMPParallelDoDirective(OMPParallelDirective, OMPDoDirective):
-    ''' Class for the !$OMP PARALLEL DO directive. This inherits from
-        both OMPParallelDirective (because it creates a new OpenMP
-        thread-parallel region) and OMPDoDirective (because it
-        causes a loop to be parallelised). '''
+    '''
+    Class for the !$OMP PARALLEL DO directive. This inherits from
+    both OMPParallelDirective (because it creates a new OpenMP
+    thread-parallel region) and OMPDoDirective (because it
+    causes a loop to be parallelised).
+
+    :param list children: list of Nodes that are children of this Node.
+    :param parent: the Node in the AST that has this directive as a child.
+    :type parent: :py:class:`psyclone.psyir.nodes.Node`
+    :param str omp_schedule: the OpenMP schedule to use.
+    :param int collapse: the number of tightly-nested loops to which \
+                         this directive applies or None.
 
-    def __init__(self, children=[], parent=None, omp_schedule="static"):
+    '''
+    def __init__(self, children=[], parent=None, omp_schedule="static",
+                 collapse=None):
+        # Reproducible reductions are not supported for a parallel do
         OMPDoDirective.__init__(self,
                                 children=children,
                                 parent=parent,
-                                omp_schedule=omp_schedule)
+                                omp_schedule=omp_schedule,
+                                reprod=False,
+                                collapse=collapse)
 
     @property
     def dag_name(self):
@@ -2300,9 +2781,8 @@ class OMPParallelDoDirective(OMPParallelDirective, OMPDoDirective):
         zero_reduction_variables(calls, parent)
         private_str = ",".join(self._get_private_list())
         parent.add(DirectiveGen(parent, "omp", "begin", "parallel do",
-                                "default(shared), private({0}), "
-                                "schedule({1})".
-                                format(private_str, self._omp_schedule) +
+                                "default(shared), private({0}), {1}".
+                                format(private_str, self._schedule_string()) +
                                 self._reduction_string()))
         for child in self.children:
             child.gen_code(parent)
@@ -2312,6 +2792,30 @@ class OMPParallelDoDirective(OMPParallelDirective, OMPDoDirective):
         parent.add(DirectiveGen(parent, "omp", "end", "parallel do", ""),
                    position=["after", position])
 
+    def begin_string(self):
+        '''Returns the beginning statement of this directive, i.e.
+        "omp parallel do ...". The visitor is responsible for adding the
+        correct directive beginning (e.g. "!$").
+
+        :returns: the opening statement of this directive.
+        :rtype: str
+
+        '''
+        return "omp parallel do default(shared), private({0}), {1}".format(
+            ",".join(self._get_private_list()), self._schedule_string())
+
+    def end_string(self):
+        '''Returns the end (or closing) statement of this directive, i.e.
+        "omp end parallel do". The visitor is responsible for adding the
+        correct directive beginning (e.g. "!$").
+
+        :returns: the end statement for this directive.
+        :rtype: str
+
+        '''
+        # pylint: disable=no-self-use
+        return "omp end parallel do"
+
     def update(self):
         '''
         Updates the fparser2 AST by inserting nodes for this OpenMP
@@ -2331,42 +2835,78 @@ class OMPParallelDoDirective(OMPParallelDirective, OMPDoDirective):
 
         self._add_region(
             start_text="parallel do default(shared), private({0}), "
-            "schedule({1})".format(",".join(self._get_private_list()),
-                                   self._omp_schedule),
+            "{1}".format(",".join(self._get_private_list()),
+                         self._schedule_string()),
             end_text="end parallel do")
 
 
-class GlobalSum(Statement):
+class OMPSimdDirective(OMPDirective):
     '''
-    Generic Global Sum class which can be added to and manipulated
-    in, a schedule.
+    Class representing an OpenMP SIMD directive in the PSyIR. It states
+    that the iterations of the enclosed loop (nest) may be executed
+    concurrently using SIMD instructions. Unlike the other OpenMP loop
+    directives it does not need to be inside a parallel region.
 
-    :param scalar: the scalar that the global sum is stored into
-    :type scalar: :py:class:`psyclone.dynamo0p3.DynKernelArgument`
-    :param parent: optional parent (default None) of this object
-    :type parent: :py:class:`psyclone.psyGen.node`
+    :param list children: list of Nodes that are children of this Node.
+    :param parent: the Node in the AST that has this directive as a child.
+    :type parent: :py:class:`psyclone.psyir.nodes.Node`
+    :param int collapse: the number of tightly-nested loops to which this \
+        directive applies or None.
+    :param int simdlen: the preferred number of iterations to execute \
+        concurrently or None.
+    :param aligned: the names of the arrays that are asserted to be \
+        aligned in an 'aligned' clause or None.
+    :type aligned: list of str or NoneType
+    :param int alignment: the alignment (in bytes) of the arrays in \
+        'aligned' or None to use the default alignment of the \
+        implementation.
 
     '''
-    # Textual description of the node.
-    _children_valid_format = "<LeafNode>"
-    _text_name = "GlobalSum"
-    _colour = "cyan"
+    def __init__(self, children=None, parent=None, collapse=None,
+                 simdlen=None, aligned=None, alignment=None):
+        if children is None:
+            children = []
+        self._collapse = collapse
+        self._simdlen = simdlen
+        self._aligned = aligned
+        self._alignment = alignment
+        super(OMPSimdDirective, self).__init__(children=children,
+                                               parent=parent)
 
-    def __init__(self, scalar, parent=None):
-        Node.__init__(self, children=[], parent=parent)
-        import copy
-        self._scalar = copy.copy(scalar)
-        if scalar:
-            # Update scalar values appropriately
-            # Here "readwrite" denotes how the class GlobalSum
-            # accesses/updates a scalar
-            self._scalar.access = AccessType.READWRITE
-            self._scalar.call = self
+    @property
+    def collapse(self):
+        '''
+        :returns: the number of nested loops to which this directive \
+            applies or None.
+        :rtype: int or NoneType
+        '''
+        return self._collapse
 
     @property
-    def scalar(self):
-        ''' Return the scalar field that this global sum acts on '''
-        return self._scalar
+    def simdlen(self):
+        '''
+        :returns: the preferred number of concurrent iterations or None.
+        :rtype: int or NoneType
+        '''
+        return self._simdlen
+
+    @property
+    def aligned(self):
+        '''
+        :returns: the names of the arrays that are asserted to be aligned \
+            or None.
+        :rtype: list of str or NoneType
+        '''
+        return self._aligned
+
+    @property
+    def alignment(self):
+        '''
+        :returns: the alignment (in bytes) of the arrays that are asserted \
+            to be aligned or None.
+        :rtype: int or NoneType
+        '''
+        return self._alignment
 
     @property
     def dag_name(self):
@@ -2374,17 +2914,12 @@ class GlobalSum(Statement):
         :returns: the name to use in the DAG for this node.
         :rtype: str
         '''
-        return "globalsum({0})_".format(self._scalar.name) + str(self.position)
-
-    @property
-    def args(self):
-        ''' Return the list of arguments associated with this node. Override
-        the base method and simply return our argument.'''
-        return [self._scalar]
+        _, position = self._find_position(self.ancestor(Routine))
+        return "OMP_simd_" + str(position)
 
     def node_str(self, colour=True):
         '''
-        Returns a text description of this node with (optional) control codes
+        Returns the name of this node with (optional) control codes
         to generate coloured output in a terminal that supports it.
 
         :param bool colour: whether or not to include colour control codes.
@@ -2392,60 +2927,656 @@ class GlobalSum(Statement):
         :returns: description of this node, possibly coloured.
         :rtype: str
         '''
-        return "{0}[scalar='{1}']".format(self.coloured_name(colour),
-                                          self._scalar.name)
+        return self.coloured_name(colour) + "[OMP simd]"
 
-    def __str__(self):
-        return self.node_str(False)
+    def _get_private_list(self):
+        '''
+        Returns the scalar variables that are written before they are read
+        in every iteration and must therefore be private to each SIMD lane.
+        The loop variables are excluded since OpenMP already makes them
+        private.
 
+        :returns: the names of the private variables.
+        :rtype: list of str
+        '''
+        loop_vars = [loop.variable.name.lower()
+                     for loop in self.walk(Loop)]
+        var_accesses = VariablesAccessInfo()
+        self.dir_body.reference_accesses(var_accesses)
+        result = set()
+        for signature in var_accesses.all_signatures:
+            name = str(signature).lower()
+            accesses = var_accesses[signature].all_accesses
+            # Ignore the loop variables, arrays and structure members
+            if name in loop_vars or "%" in name or \
+                    accesses[0].indices is not None:
+                continue
+            if accesses[0].access_type == AccessType.WRITE:
+                result.add(name)
+        return sorted(result)
 
-class HaloExchange(Statement):
-    '''
-    Generic Halo Exchange class which can be added to and
-    manipulated in, a schedule.
+    def _clauses(self):
+        '''
+        :returns: the clauses of this directive.
+        :rtype: list of str
+        '''
+        clauses = []
+        if self._collapse:
+            clauses.append("collapse({0})".format(self._collapse))
+        if self._simdlen:
+            clauses.append("simdlen({0})".format(self._simdlen))
+        private = self._get_private_list()
+        if private:
+            clauses.append("private({0})".format(",".join(private)))
+        if self._aligned:
+            aligned = ",".join(self._aligned)
+            if self._alignment:
+                aligned += ":{0}".format(self._alignment)
+            clauses.append("aligned({0})".format(aligned))
+        return clauses
 
-    :param field: the field that this halo exchange will act on
-    :type field: :py:class:`psyclone.dynamo0p3.DynKernelArgument`
-    :param check_dirty: optional argument default True indicating whether \
-                        this halo exchange should be subject to a run-time \
-                        check for clean/dirty halos.
-    :type check_dirty: bool
-    :param vector_index: optional vector index (default None) to identify \
-                         which index of a vector field this halo exchange is \
-                         responsible for.
-    :type vector_index: int
-    :param parent: optional parent (default None) of this object
-    :type parent: :py:class:`psyclone.psyGen.node`
+    def gen_code(self, parent):
+        '''
+        Generate the f2pygen AST entries in the Schedule for this OpenMP
+        simd directive.
 
-    '''
-    # Textual description of the node.
-    _children_valid_format = "<LeafNode>"
-    _text_name = "HaloExchange"
-    _colour = "blue"
+        :param parent: the parent Node in the Schedule to which to add our \
+                       content.
+        :type parent: sub-class of :py:class:`psyclone.f2pygen.BaseGen`
 
-    def __init__(self, field, check_dirty=True,
-                 vector_index=None, parent=None):
-        Node.__init__(self, children=[], parent=parent)
-        import copy
-        self._field = copy.copy(field)
-        if field:
-            # Update fields values appropriately
-            # Here "readwrite" denotes how the class HaloExchange
-            # accesses a field rather than the field's continuity
-            self._field.access = AccessType.READWRITE
-            self._field.call = self
-        self._halo_type = None
-        self._halo_depth = None
-        self._check_dirty = check_dirty
-        self._vector_index = vector_index
+        '''
+        parent.add(DirectiveGen(parent, "omp", "begin", "simd",
+                                ", ".join(self._clauses())))
 
-    @property
-    def vector_index(self):
-        '''If the field is a vector then return the vector index associated
-        with this halo exchange. Otherwise return None'''
-        return self._vector_index
+        for child in self.children:
+            child.gen_code(parent)
 
-    @property
+        # make sure the directive occurs straight after the loop body
+        position = parent.previous_loop()
+        parent.add(DirectiveGen(parent, "omp", "end", "simd", ""),
+                   position=["after", position])
+
+    def begin_string(self):
+        '''Returns the beginning statement of this directive, i.e.
+        "omp simd ...". The visitor is responsible for adding the
+        correct directive beginning (e.g. "!$").
+
+        :returns: the beginning statement for this directive.
+        :rtype: str
+
+        '''
+        clauses = self._clauses()
+        if clauses:
+            return "omp simd " + ", ".join(clauses)
+        return "omp simd"
+
+    def end_string(self):
+        '''Returns the end (or closing) statement of this directive, i.e.
+        "omp end simd". The visitor is responsible for adding the
+        correct directive beginning (e.g. "!$").
+
+        :returns: the end statement for this directive.
+        :rtype: str
+
+        '''
+        # pylint: disable=no-self-use
+        return "omp end simd"
+
+    def update(self):
+        '''
+        Updates the fparser2 AST by inserting nodes for this OpenMP simd.
+
+        :raises GenerationError: if the existing AST doesn't have the \
+                                 correct structure to permit the insertion \
+                                 of the OpenMP simd.
+        '''
+        if len(self.dir_body.children) != 1:
+            raise GenerationError(
+                "An OpenMP SIMD can only be applied to a single loop "
+                "but this Node has {0} children: {1}".
+                format(len(self.dir_body.children), self.dir_body.children))
+
+        self._add_region(start_text=self.begin_string()[len("omp "):],
+                         end_text="end simd")
+
+
+class OMPSingleDirective(OMPDirective):
+    '''
+    Class representing an OpenMP SINGLE directive in the PSyIR. The
+    enclosed nodes are executed by only one of the threads of the
+    enclosing parallel region. This is used to have a single thread
+    create the OpenMP tasks that are then executed by all threads.
+
+    :param list children: list of Nodes that are children of this Node.
+    :param parent: the Node in the AST that has this directive as a child.
+    :type parent: :py:class:`psyclone.psyir.nodes.Node`
+    :param bool nowait: whether or not to skip the implied barrier at \
+        the end of the region.
+
+    '''
+    def __init__(self, children=None, parent=None, nowait=False):
+        if children is None:
+            children = []
+        self._nowait = nowait
+        super(OMPSingleDirective, self).__init__(children=children,
+                                                 parent=parent)
+
+    @property
+    def nowait(self):
+        '''
+        :returns: whether or not the implied barrier at the end of the \
+            region is skipped.
+        :rtype: bool
+        '''
+        return self._nowait
+
+    @property
+    def dag_name(self):
+        '''
+        :returns: the name to use in the DAG for this node.
+        :rtype: str
+        '''
+        _, position = self._find_position(self.ancestor(Routine))
+        return "OMP_single_" + str(position)
+
+    def node_str(self, colour=True):
+        '''
+        Returns the name of this node with (optional) control codes
+        to generate coloured output in a terminal that supports it.
+
+        :param bool colour: whether or not to include colour control codes.
+
+        :returns: description of this node, possibly coloured.
+        :rtype: str
+        '''
+        return self.coloured_name(colour) + "[OMP single]"
+
+    def validate_global_constraints(self):
+        '''
+        Perform validation checks that can only be done at code-generation
+        time.
+
+        :raises GenerationError: if this OMPSingleDirective is not \
+            enclosed within some OpenMP parallel region.
+
+        '''
+        if not self.ancestor(OMPParallelDirective,
+                             excluding=OMPParallelDoDirective):
+            raise GenerationError(
+                "OMPSingleDirective must be inside an OMP parallel region "
+                "but could not find an ancestor OMPParallelDirective node")
+
+        super(OMPSingleDirective, self).validate_global_constraints()
+
+    def gen_code(self, parent):
+        '''
+        Generate the f2pygen AST entries in the Schedule for this OpenMP
+        single directive.
+
+        :param parent: the parent Node in the Schedule to which to add our \
+                       content.
+        :type parent: sub-class of :py:class:`psyclone.f2pygen.BaseGen`
+
+        '''
+        self.validate_global_constraints()
+
+        parent.add(DirectiveGen(parent, "omp", "begin", "single", ""))
+        for child in self.children:
+            child.gen_code(parent)
+        parent.add(DirectiveGen(parent, "omp", "end", "single",
+                                "nowait" if self._nowait else ""))
+
+    def begin_string(self):
+        '''Returns the beginning statement of this directive, i.e.
+        "omp single". The visitor is responsible for adding the
+        correct directive beginning (e.g. "!$").
+
+        :returns: the beginning statement for this directive.
+        :rtype: str
+
+        '''
+        # pylint: disable=no-self-use
+        return "omp single"
+
+    def end_string(self):
+        '''Returns the end (or closing) statement of this directive, i.e.
+        "omp end single". The visitor is responsible for adding the
+        correct directive beginning (e.g. "!$").
+
+        :returns: the end statement for this directive.
+        :rtype: str
+
+        '''
+        if self._nowait:
+            return "omp end single nowait"
+        return "omp end single"
+
+    def update(self):
+        '''
+        Updates the fparser2 AST by inserting nodes for this OpenMP single
+        region.
+
+        '''
+        self.validate_global_constraints()
+        self._add_region(start_text="single",
+                         end_text=self.end_string()[len("omp "):])
+
+
+class OMPTaskDirective(OMPDirective):
+    '''
+    Class representing an OpenMP TASK directive in the PSyIR. The enclosed
+    nodes (typically a kernel loop or a halo exchange) are executed as a
+    single task. The 'depend' clauses of the task are derived from the
+    accesses to the arguments of the enclosed nodes so that the OpenMP
+    runtime preserves the order of dependent tasks while independent
+    tasks may run concurrently.
+
+    :param list children: list of Nodes that are children of this Node.
+    :param parent: the Node in the AST that has this directive as a child.
+    :type parent: :py:class:`psyclone.psyir.nodes.Node`
+
+    '''
+    @property
+    def dag_name(self):
+        '''
+        :returns: the name to use in the DAG for this node.
+        :rtype: str
+        '''
+        _, position = self._find_position(self.ancestor(Routine))
+        return "OMP_task_" + str(position)
+
+    def node_str(self, colour=True):
+        '''
+        Returns the name of this node with (optional) control codes
+        to generate coloured output in a terminal that supports it.
+
+        :param bool colour: whether or not to include colour control codes.
+
+        :returns: description of this node, possibly coloured.
+        :rtype: str
+        '''
+        return self.coloured_name(colour) + "[OMP task]"
+
+    def get_dependences(self):
+        '''
+        Works out the variables on which this task depends from the
+        arguments of the enclosed kernels, halo exchanges and global
+        sums. Arguments that are only read give an 'in' dependence,
+        arguments that are only written give an 'out' dependence and all
+        others (including increments and reductions) give an 'inout'
+        dependence. Literal arguments and grid properties are ignored.
+
+        :returns: the sorted names of the variables for each of the \
+            'in', 'out' and 'inout' dependence types.
+        :rtype: dict of str: list of str
+
+        '''
+        accesses = OrderedDict()
+        for child in self.dir_body.children:
+            for arg in child.args:
+                if arg.argument_type == "grid_property" or \
+                        arg.is_literal:
+                    continue
+                accesses.setdefault(arg.name, set()).add(arg.access)
+        dependences = {"in": [], "out": [], "inout": []}
+        for name, access_set in accesses.items():
+            if access_set == set([AccessType.READ]):
+                dependences["in"].append(name)
+            elif access_set == set([AccessType.WRITE]):
+                dependences["out"].append(name)
+            else:
+                dependences["inout"].append(name)
+        for names in dependences.values():
+            names.sort()
+        return dependences
+
+    def _depend_string(self):
+        '''
+        :returns: the depend clauses of this task.
+        :rtype: str
+        '''
+        dependences = self.get_dependences()
+        return ", ".join("depend({0}: {1})".format(
+            dep_type, ",".join(dependences[dep_type]))
+                         for dep_type in ["in", "out", "inout"]
+                         if dependences[dep_type])
+
+    def validate_global_constraints(self):
+        '''
+        Perform validation checks that can only be done at code-generation
+        time.
+
+        :raises GenerationError: if this OMPTaskDirective is not enclosed \
+            within some OpenMP parallel region.
+
+        '''
+        if not self.ancestor(OMPParallelDirective,
+                             excluding=OMPParallelDoDirective):
+            raise GenerationError(
+                "OMPTaskDirective must be inside an OMP parallel region but "
+                "could not find an ancestor OMPParallelDirective node")
+
+        super(OMPTaskDirective, self).validate_global_constraints()
+
+    def gen_code(self, parent):
+        '''
+        Generate the f2pygen AST entries in the Schedule for this OpenMP
+        task directive.
+
+        :param parent: the parent Node in the Schedule to which to add our \
+                       content.
+        :type parent: sub-class of :py:class:`psyclone.f2pygen.BaseGen`
+
+        '''
+        self.validate_global_constraints()
+
+        parent.add(DirectiveGen(parent, "omp", "begin", "task",
+                                self._depend_string()))
+        for child in self.children:
+            child.gen_code(parent)
+        parent.add(DirectiveGen(parent, "omp", "end", "task", ""))
+
+    def begin_string(self):
+        '''Returns the beginning statement of this directive, i.e.
+        "omp task ...". The visitor is responsible for adding the
+        correct directive beginning (e.g. "!$").
+
+        :returns: the beginning statement for this directive.
+        :rtype: str
+
+        '''
+        depend_str = self._depend_string()
+        if depend_str:
+            return "omp task " + depend_str
+        return "omp task"
+
+    def end_string(self):
+        '''Returns the end (or closing) statement of this directive, i.e.
+        "omp end task". The visitor is responsible for adding the
+        correct directive beginning (e.g. "!$").
+
+        :returns: the end statement for this directive.
+        :rtype: str
+
+        '''
+        # pylint: disable=no-self-use
+        return "omp end task"
+
+
+class OMPTaskloopDirective(OMPDirective):
+    '''
+    Class representing an OpenMP TASKLOOP directive in the PSyIR. The
+    iterations of the enclosed loop are divided into tasks. The
+    directive must be encountered by a single thread of a parallel
+    region (i.e. be within an OMPSingleDirective).
+
+    :param list children: list of Nodes that are children of this Node.
+    :param parent: the Node in the AST that has this directive as a child.
+    :type parent: :py:class:`psyclone.psyir.nodes.Node`
+    :param int grainsize: the minimum number of loop iterations per task \
+        or None.
+    :param int num_tasks: the number of tasks to create or None.
+
+    :raises GenerationError: if both grainsize and num_tasks are supplied.
+
+    '''
+    def __init__(self, children=None, parent=None, grainsize=None,
+                 num_tasks=None):
+        if children is None:
+            children = []
+        if grainsize and num_tasks:
+            raise GenerationError(
+                "An OpenMP TASKLOOP can have a 'grainsize' or a 'num_tasks' "
+                "clause but not both.")
+        self._grainsize = grainsize
+        self._num_tasks = num_tasks
+        super(OMPTaskloopDirective, self).__init__(children=children,
+                                                   parent=parent)
+
+    @property
+    def grainsize(self):
+        '''
+        :returns: the minimum number of loop iterations per task or None.
+        :rtype: int or NoneType
+        '''
+        return self._grainsize
+
+    @property
+    def num_tasks(self):
+        '''
+        :returns: the number of tasks to create or None.
+        :rtype: int or NoneType
+        '''
+        return self._num_tasks
+
+    @property
+    def dag_name(self):
+        '''
+        :returns: the name to use in the DAG for this node.
+        :rtype: str
+        '''
+        _, position = self._find_position(self.ancestor(Routine))
+        return "OMP_taskloop_" + str(position)
+
+    def node_str(self, colour=True):
+        '''
+        Returns the name of this node with (optional) control codes
+        to generate coloured output in a terminal that supports it.
+
+        :param bool colour: whether or not to include colour control codes.
+
+        :returns: description of this node, possibly coloured.
+        :rtype: str
+        '''
+        return self.coloured_name(colour) + "[OMP taskloop]"
+
+    def _clauses_string(self):
+        '''
+        :returns: the clauses of this directive.
+        :rtype: str
+        '''
+        if self._grainsize:
+            return "grainsize({0})".format(self._grainsize)
+        if self._num_tasks:
+            return "num_tasks({0})".format(self._num_tasks)
+        return ""
+
+    def validate_global_constraints(self):
+        '''
+        Perform validation checks that can only be done at code-generation
+        time.
+
+        :raises GenerationError: if this OMPTaskloopDirective is not \
+            enclosed within an OpenMP single region inside some OpenMP \
+            parallel region.
+
+        '''
+        if not self.ancestor(OMPSingleDirective):
+            raise GenerationError(
+                "OMPTaskloopDirective must be inside an OMP single region "
+                "but could not find an ancestor OMPSingleDirective node")
+
+        super(OMPTaskloopDirective, self).validate_global_constraints()
+
+    def gen_code(self, parent):
+        '''
+        Generate the f2pygen AST entries in the Schedule for this OpenMP
+        taskloop directive.
+
+        :param parent: the parent Node in the Schedule to which to add our \
+                       content.
+        :type parent: sub-class of :py:class:`psyclone.f2pygen.BaseGen`
+
+        '''
+        self.validate_global_constraints()
+
+        parent.add(DirectiveGen(parent, "omp", "begin", "taskloop",
+                                self._clauses_string()))
+        for child in self.children:
+            child.gen_code(parent)
+
+        # make sure the directive occurs straight after the loop body
+        position = parent.previous_loop()
+        parent.add(DirectiveGen(parent, "omp", "end", "taskloop", ""),
+                   position=["after", position])
+
+    def begin_string(self):
+        '''Returns the beginning statement of this directive, i.e.
+        "omp taskloop ...". The visitor is responsible for adding the
+        correct directive beginning (e.g. "!$").
+
+        :returns: the beginning statement for this directive.
+        :rtype: str
+
+        '''
+        clauses = self._clauses_string()
+        if clauses:
+            return "omp taskloop " + clauses
+        return "omp taskloop"
+
+    def end_string(self):
+        '''Returns the end (or closing) statement of this directive, i.e.
+        "omp end taskloop". The visitor is responsible for adding the
+        correct directive beginning (e.g. "!$").
+
+        :returns: the end statement for this directive.
+        :rtype: str
+
+        '''
+        # pylint: disable=no-self-use
+        return "omp end taskloop"
+
+    def update(self):
+        '''
+        Updates the fparser2 AST by inserting nodes for this OpenMP
+        taskloop.
+
+        :raises GenerationError: if the existing AST doesn't have the \
+                                 correct structure to permit the insertion \
+                                 of the OpenMP taskloop.
+        '''
+        self.validate_global_constraints()
+
+        if len(self.dir_body.children) != 1:
+            raise GenerationError(
+                "An OpenMP TASKLOOP can only be applied to a single loop "
+                "but this Node has {0} children: {1}".
+                format(len(self.dir_body.children), self.dir_body.children))
+
+        self._add_region(start_text=self.begin_string()[len("omp "):],
+                         end_text="end taskloop")
+
+
+class GlobalSum(Statement):
+    '''
+    Generic Global Sum class which can be added to and manipulated
+    in, a schedule.
+
+    :param scalar: the scalar that the global sum is stored into
+    :type scalar: :py:class:`psyclone.dynamo0p3.DynKernelArgument`
+    :param parent: optional parent (default None) of this object
+    :type parent: :py:class:`psyclone.psyGen.node`
+
+    '''
+    # Textual description of the node.
+    _children_valid_format = "<LeafNode>"
+    _text_name = "GlobalSum"
+    _colour = "cyan"
+
+    def __init__(self, scalar, parent=None):
+        Node.__init__(self, children=[], parent=parent)
+        import copy
+        self._scalar = copy.copy(scalar)
+        if scalar:
+            # Update scalar values appropriately
+            # Here "readwrite" denotes how the class GlobalSum
+            # accesses/updates a scalar
+            self._scalar.access = AccessType.READWRITE
+            self._scalar.call = self
+
+    @property
+    def scalar(self):
+        ''' Return the scalar field that this global sum acts on '''
+        return self._scalar
+
+    @property
+    def dag_name(self):
+        '''
+        :returns: the name to use in the DAG for this node.
+        :rtype: str
+        '''
+        return "globalsum({0})_".format(self._scalar.name) + str(self.position)
+
+    @property
+    def args(self):
+        ''' Return the list of arguments associated with this node. Override
+        the base method and simply return our argument.'''
+        return [self._scalar]
+
+    def node_str(self, colour=True):
+        '''
+        Returns a text description of this node with (optional) control codes
+        to generate coloured output in a terminal that supports it.
+
+        :param bool colour: whether or not to include colour control codes.
+
+        :returns: description of this node, possibly coloured.
+        :rtype: str
+        '''
+        return "{0}[scalar='{1}']".format(self.coloured_name(colour),
+                                          self._scalar.name)
+
+    def __str__(self):
+        return self.node_str(False)
+
+
+class HaloExchange(Statement):
+    '''
+    Generic Halo Exchange class which can be added to and
+    manipulated in, a schedule.
+
+    :param field: the field that this halo exchange will act on
+    :type field: :py:class:`psyclone.dynamo0p3.DynKernelArgument`
+    :param check_dirty: optional argument default True indicating whether \
+                        this halo exchange should be subject to a run-time \
+                        check for clean/dirty halos.
+    :type check_dirty: bool
+    :param vector_index: optional vector index (default None) to identify \
+                         which index of a vector field this halo exchange is \
+                         responsible for.
+    :type vector_index: int
+    :param parent: optional parent (default None) of this object
+    :type parent: :py:class:`psyclone.psyGen.node`
+
+    '''
+    # Textual description of the node.
+    _children_valid_format = "<LeafNode>"
+    _text_name = "HaloExchange"
+    _colour = "blue"
+
+    def __init__(self, field, check_dirty=True,
+                 vector_index=None, parent=None):
+        Node.__init__(self, children=[], parent=parent)
+        import copy
+        self._field = copy.copy(field)
+        if field:
+            # Update fields values appropriately
+            # Here "readwrite" denotes how the class HaloExchange
+            # accesses a field rather than the field's continuity
+            self._field.access = AccessType.READWRITE
+            self._field.call = self
+        self._halo_type = None
+        self._halo_depth = None
+        self._check_dirty = check_dirty
+        self._vector_index = vector_index
+
+    @property
+    def vector_index(self):
+        '''If the field is a vector then return the vector index associated
+        with this halo exchange. Otherwise return None'''
+        return self._vector_index
+
+    @property
     def halo_depth(self):
         ''' Return the depth of the halo exchange '''
         return self._halo_depth
@@ -2730,8 +3861,20 @@ class Kern(Statement):
                                entity_decls=[local_var_name],
                                allocatable=True, kind=kind_type,
                                dimension=":,:"))
-            nthreads = \
-                self.scope.symbol_table.lookup_with_tag("omp_num_threads").name
+            if Config.get().reprod_reduction_strategy == "tree":
+                # There is a partial result for each block of iterations
+                # of the enclosing loop.
+                nthreads = self._reduction_nblocks_name()
+                parent.add(DeclGen(parent, datatype="integer",
+                                   entity_decls=[nthreads]))
+                # pylint: disable=protected-access
+                upper_bound = self.ancestor(Loop)._upper_bound_fortran()
+                parent.add(AssignGen(parent, lhs=nthreads,
+                                     rhs=self._reduction_block(upper_bound)),
+                           position=position)
+            else:
+                nthreads = self.scope.symbol_table.lookup_with_tag(
+                    "omp_num_threads").name
             if Config.get().reprod_pad_size < 1:
                 raise GenerationError(
                     "REPROD_PAD_SIZE in {0} should be a positive "
@@ -2755,7 +3898,7 @@ class Kern(Statement):
                                  LFRicBuiltIn.
 
         '''
-        from psyclone.f2pygen import DoGen, AssignGen, DeallocateGen
+        from psyclone.f2pygen import DoGen, AssignGen, DeallocateGen, DeclGen
         var_name = self._reduction_arg.name
         local_var_name = self.local_reduction_name
         local_var_ref = self._reduction_ref(var_name)
@@ -2771,27 +3914,90 @@ class Kern(Statement):
                 format(reduction_access.api_specific_name(),
                        api_strings)), err)
         symtab = self.root.symbol_table
-        thread_idx = symtab.lookup_with_tag("omp_thread_index").name
-        nthreads = symtab.lookup_with_tag("omp_num_threads").name
-        do_loop = DoGen(parent, thread_idx, "1", nthreads)
-        do_loop.add(AssignGen(do_loop, lhs=var_name, rhs=var_name +
-                              reduction_operator + local_var_ref))
-        parent.add(do_loop)
+        if Config.get().reprod_reduction_strategy == "tree":
+            # Combine the partial results of neighbouring blocks, then of
+            # neighbouring pairs of blocks and so on, leaving the result in
+            # the first block. The order only depends on the number of
+            # blocks, not on the number of threads.
+            nblocks = self._reduction_nblocks_name()
+            level = symtab.symbol_from_tag("reprod_level", "red_level").name
+            block = symtab.symbol_from_tag("reprod_block", "red_block").name
+            parent.add(DeclGen(parent, datatype="integer",
+                               entity_decls=[level, block]))
+            stride = "2**({0}-1)".format(level)
+            level_loop = DoGen(parent, level, "1",
+                               "bit_size({0})-leadz({0}-1)".format(nblocks))
+            block_loop = DoGen(level_loop, block, "1",
+                               "{0}-{1}".format(nblocks, stride),
+                               "2**{0}".format(level))
+            block_loop.add(AssignGen(
+                block_loop, lhs="{0}(1,{1})".format(local_var_name, block),
+                rhs="{0}(1,{1}){2}{0}(1,{1}+{3})".format(
+                    local_var_name, block, reduction_operator, stride)))
+            level_loop.add(block_loop)
+            parent.add(level_loop)
+            parent.add(AssignGen(parent, lhs=var_name, rhs=var_name +
+                                 reduction_operator + local_var_name +
+                                 "(1,1)"))
+        else:
+            thread_idx = symtab.lookup_with_tag("omp_thread_index").name
+            nthreads = symtab.lookup_with_tag("omp_num_threads").name
+            do_loop = DoGen(parent, thread_idx, "1", nthreads)
+            do_loop.add(AssignGen(do_loop, lhs=var_name, rhs=var_name +
+                                  reduction_operator + local_var_ref))
+            parent.add(do_loop)
         parent.add(DeallocateGen(parent, local_var_name))
 
+    def _reduction_nblocks_name(self):
+        '''
+        :returns: the name of the variable holding the number of blocks of \
+                  iterations for the "tree" strategy of reproducible \
+                  reductions.
+        :rtype: str
+        '''
+        tag = "reprod_nblocks_" + self._reduction_arg.name
+        return self.ancestor(InvokeSchedule).symbol_table.symbol_from_tag(
+            tag, "nblocks_" + self._reduction_arg.name).name
+
+    def _reduction_block(self, iteration):
+        '''
+        For the "tree" strategy of reproducible reductions the iterations of
+        the loop enclosing this kernel are divided into blocks of
+        REPROD_BLOCK_SIZE iterations, each of which has its own partial
+        result.
+
+        :param str iteration: the Fortran expression for an iteration of \
+                              the enclosing loop.
+
+        :returns: the Fortran expression for the (1-based) block that \
+                  contains the supplied iteration.
+        :rtype: str
+        '''
+        # pylint: disable=protected-access
+        lower_bound = self.ancestor(Loop)._lower_bound_fortran()
+        if not lower_bound.isdigit():
+            lower_bound = "(" + lower_bound + ")"
+        return "({0}-{1})/{2}+1".format(iteration, lower_bound,
+                                        Config.get().reprod_block_size)
+
     def _reduction_ref(self, name):
         '''Return the name unchanged if OpenMP is set to be unreproducible, as
         we will be using the OpenMP reduction clause. Otherwise we
         will be computing the reduction ourselves and therefore need
         to store values into a (padded) array separately for each
-        thread.
+        thread (or, with the "tree" strategy, for each block of
+        iterations).
 
         :param str name: original name of the variable to be reduced.
 
         '''
         symtab = self.scope.symbol_table
         if self.reprod_reduction:
-            idx_name = symtab.lookup_with_tag("omp_thread_index").name
+            if Config.get().reprod_reduction_strategy == "tree":
+                idx_name = self._reduction_block(
+                    self.ancestor(Loop).variable.name)
+            else:
+                idx_name = symtab.lookup_with_tag("omp_thread_index").name
             local_name = symtab.symbol_from_tag(name, "l_" + name).name
             return local_name + "(1," + idx_name + ")"
         return name
@@ -2895,10 +4101,14 @@ class CodedKern(Kern):
         self._kern_schedule = None  # PSyIR schedule for the kernel
         # Whether or not this kernel has been transformed
         self._modified = False
+        # The key identifying how this kernel has been specialised (e.g.
+        # by Dynamo0p3KernelConstTrans) or None
+        self._specialisation = None
         # Whether or not to in-line this kernel into the module containing
         # the PSy layer
         self._module_inline = False
-        self._opencl_options = {'local_size': 64, 'queue_number': 1}
+        self._opencl_options = {'local_size': 64, 'queue_number': 1,
+                                'local_memory': False}
         if check and len(call.ktype.arg_descriptors) != len(call.args):
             raise GenerationError(
                 "error: In kernel '{0}' the number of arguments specified "
@@ -2943,7 +4153,8 @@ class CodedKern(Kern):
         :type options: dictionary of <string>:<value>
 
         '''
-        valid_opencl_kernel_options = ['local_size', 'queue_number']
+        valid_opencl_kernel_options = ['local_size', 'queue_number',
+                                       'local_memory']
 
         # Validate that the options given are supported
         for key, value in options.items():
@@ -2958,6 +4169,11 @@ class CodedKern(Kern):
                         raise TypeError(
                             "CodedKern OpenCL option 'queue_number' should be "
                             "an integer.")
+                if key == "local_memory":
+                    if not isinstance(value, bool):
+                        raise TypeError(
+                            "CodedKern OpenCL option 'local_memory' should be "
+                            "a boolean.")
             else:
                 raise AttributeError(
                     "CodedKern does not support the OpenCL option '{0}'. "
@@ -2966,6 +4182,16 @@ class CodedKern(Kern):
 
             self._opencl_options[key] = value
 
+    def opencl_local_memory_tiles(self):
+        # pylint: disable=no-self-use
+        '''
+        :returns: the stencil depth in each dimension of the kernel arrays \
+            that can be loaded into OpenCL __local memory when the \
+            'local_memory' OpenCL option is set. By default there are none.
+        :rtype: :py:class:`collections.OrderedDict` of str: (int, int)
+        '''
+        return OrderedDict()
+
     def __str__(self):
         return "kern call: " + self._name
 
@@ -3202,6 +4428,11 @@ class CodedKern(Kern):
         case a check is performed that the transformed kernel already
         present is identical to the one that we would otherwise write
         to file. If this is not the case then we raise a GenerationError.)
+        If config.kernel_naming is "hash" then the kernel is named after a
+        hash of its transformed code so that identical transformed kernels
+        share the same file, which is only written once.
+        Kernels that have only been specialised (see `specialisation`) are
+        named after their specialisation irrespective of the naming scheme.
 
         :raises GenerationError: if config.kernel_naming == "single" and a \
                                  different, transformed version of this \
@@ -3211,102 +4442,289 @@ class CodedKern(Kern):
 
         '''
         import os
-        from psyclone.line_length import FortLineLength
 
         # If this kernel has not been transformed we do nothing
         if not self.modified and not self.ancestor(InvokeSchedule).opencl:
             return
 
-        # Remove any "_mod" if the file follows the PSyclone naming convention
-        orig_mod_name = self.module_name[:]
-        if orig_mod_name.lower().endswith("_mod"):
-            old_base_name = orig_mod_name[:-4]
-        else:
-            old_base_name = orig_mod_name[:]
+        # Remove any "_mod" if the file follows the PSyclone naming convention
+        orig_mod_name = self.module_name[:]
+        if orig_mod_name.lower().endswith("_mod"):
+            old_base_name = orig_mod_name[:-4]
+        else:
+            old_base_name = orig_mod_name[:]
+
+        # GOcean OpenCL needs to differentiate between kernels generated
+        # from the same module file, so we include the kernelname into the
+        # output filename.
+        # TODO: Issue 499, this works as an OpenCL quickfix but it needs
+        # to be generalized and be consistent with the '--kernel-renaming'
+        # conventions.
+        kern_suffix = ""
+        if self.ancestor(InvokeSchedule).opencl:
+            if self.name.lower().endswith("_code"):
+                kern_suffix = "_" + self.name[:-5]
+            else:
+                kern_suffix = "_" + self.name
+            extension = ".cl"
+        else:
+            extension = "_mod.f90"
+
+        if self._specialisation and not self.ancestor(InvokeSchedule).opencl:
+            self._rename_and_write_hashed(old_base_name, extension,
+                                          self._specialisation_digest())
+            return
+        if Config.get().kernel_naming == "hash":
+            # Hash the code before it is re-named so that identical
+            # transformed kernels are given the same name.
+            digest = hashlib.md5(
+                self._transformed_code().encode()).hexdigest()
+            self._rename_and_write_hashed(old_base_name + kern_suffix,
+                                          extension, digest)
+            return
+
+        # We could create a hash of a string built from the name of the
+        # Algorithm (module), the name/position of the Invoke and the
+        # index of this kernel within that Invoke. However, that creates
+        # a very long name so we simply ensure that kernel names are unique
+        # within the user-supplied kernel-output directory. To avoid probing
+        # the filesystem for every possible name, the "multiple" scheme
+        # starts from the first index not known to be in use.
+        if Config.get().kernel_naming == "single":
+            name_idx = -1
+        else:
+            name_idx = self._first_free_index(old_base_name + kern_suffix,
+                                              extension) - 1
+        fdesc = None
+        while not fdesc:
+            name_idx += 1
+            new_suffix = kern_suffix + "_{0}".format(name_idx)
+            new_name = old_base_name + new_suffix + extension
+
+            try:
+                # Atomically attempt to open the new kernel file (in case
+                # this is part of a parallel build)
+                fdesc = os.open(
+                    os.path.join(Config.get().kernel_output_dir, new_name),
+                    os.O_CREAT | os.O_WRONLY | os.O_EXCL)
+            except (OSError, IOError):
+                # The os.O_CREATE and os.O_EXCL flags in combination mean
+                # that open() raises an error if the file exists
+                if Config.get().kernel_naming == "single":
+                    # If the kernel-renaming scheme is such that we only ever
+                    # create one copy of a transformed kernel then we're done
+                    break
+                continue
+        if Config.get().kernel_naming == "multiple":
+            # Record that this index is now in use
+            self._output_caches()[1].setdefault(
+                Config.get().kernel_output_dir, {})[
+                    old_base_name + kern_suffix + extension] = name_idx + 1
+
+        # Use the suffix we have determined to rename all relevant quantities
+        # within the AST of the kernel code.
+        # We can't rename OpenCL kernels as the Invoke set_args functions
+        # have already been generated. The link to an specific kernel
+        # implementation is delayed to run-time in OpenCL. (e.g. FortCL has
+        # the  FORTCL_KERNELS_FILE environment variable)
+        if not self.ancestor(InvokeSchedule).opencl:
+            if self._kern_schedule:
+                # A PSyIR kernel schedule has been created. This means
+                # that the PSyIR has been modified and will be used to
+                # generate modified kernel code. Therefore the PSyIR
+                # should be modified rather than the parse tree. This
+                # if test, and the associated else, are only required
+                # whilst old style (direct fp2) transformations still
+                # exist - #490.
+
+                # Rename PSyIR module and kernel names.
+                self._rename_psyir(new_suffix)
+            else:
+                self._rename_ast(new_suffix)
+
+        # Kernel is now self-consistent so unset the modified flag
+        self.modified = False
+
+        # If this kernel is being module in-lined then we do not need to
+        # write it to file.
+        if self.module_inline:
+            # TODO #1013: However, the file is already created (opened) and
+            # currently this file is needed for the name versioning, so this
+            # will create an unnecessary file.
+            os.close(fdesc)
+            return
+
+        new_kern_code = self._transformed_code()
+
+        if not fdesc:
+            # If we've not got a file descriptor at this point then that's
+            # because the file already exists and the kernel-naming scheme
+            # ("single") means we're not creating a new one.
+            # Check that what we've got is the same as what's in the file
+            with open(os.path.join(Config.get().kernel_output_dir,
+                                   new_name), "r") as ffile:
+                kern_code = ffile.read()
+                if kern_code != new_kern_code:
+                    raise GenerationError(
+                        "A transformed version of this Kernel '{0}' already "
+                        "exists in the kernel-output directory ({1}) but is "
+                        "not the same as the current, transformed kernel and "
+                        "the kernel-renaming scheme is set to '{2}'. (If you "
+                        "wish to generate a new, unique kernel for every "
+                        "kernel that is transformed then use "
+                        "'--kernel-renaming multiple'.)".
+                        format(self._module_name+".f90",
+                               Config.get().kernel_output_dir,
+                               Config.get().kernel_naming))
+        else:
+            # Write the modified AST out to file
+            os.write(fdesc, new_kern_code.encode())
+            # Close the new kernel file
+            os.close(fdesc)
+
+    def _output_caches(self):
+        '''
+        Returns the caches used when writing transformed kernels. They are
+        stored in the Invokes object whose code is being generated so that
+        they only last for one generation of the PSy layer. If this kernel
+        is not part of an Invoke then new (empty) caches are returned.
+
+        :returns: the paths of the kernel files that have been written by \
+            the current generation and the index of each kernel-output \
+            directory (mapping each directory to a dictionary of the first \
+            free integer suffix for each kernel file name).
+        :rtype: 2-tuple of (set of str, dict of str: dict of str: int)
+
+        '''
+        schedule = self.ancestor(InvokeSchedule)
+        invoke = schedule.invoke if schedule else None
+        invokes = invoke.invokes if invoke else None
+        if not invokes:
+            return set(), {}
+        return invokes.written_kernel_files, invokes.kernel_dir_index
+
+    def _first_free_index(self, base_name, extension):
+        '''
+        Uses an index of the kernel-output directory to find the first
+        integer suffix that has not been used for a kernel with the
+        supplied base name. The index is created from a single listing of
+        the directory the first time it is required during the generation
+        of the PSy layer and is then kept up to date by `rename_and_write`,
+        so name allocation does not have to probe the filesystem for every
+        existing version of a kernel. Since other processes may be writing
+        to the same directory, the returned index is only a starting point
+        for the (atomic) creation of a file.
+
+        :param str base_name: the name of the kernel file without the \
+                              integer suffix or extension.
+        :param str extension: the extension of the kernel file.
+
+        :returns: the first index not known to be in use.
+        :rtype: int
+
+        '''
+        import os
+        import re
+        kernel_dir_index = self._output_caches()[1]
+        kernel_dir = Config.get().kernel_output_dir
+        if kernel_dir not in kernel_dir_index:
+            dir_index = {}
+            pattern = re.compile(r"^(.+)_(\d+)(_mod\.f90|\.cl)$")
+            for fname in os.listdir(kernel_dir):
+                match = pattern.match(fname)
+                if match:
+                    key = match.group(1) + match.group(3)
+                    dir_index[key] = max(dir_index.get(key, 0),
+                                         int(match.group(2)) + 1)
+            kernel_dir_index[kernel_dir] = dir_index
+        return kernel_dir_index[kernel_dir].get(base_name + extension, 0)
+
+    def _specialisation_digest(self):
+        '''
+        :returns: a hash of the specialisation key of this kernel, the \
+                  original kernel source and the PSyclone version.
+        :rtype: str
+        '''
+        from psyclone.version import __VERSION__
+        hasher = hashlib.md5()
+        for item in [repr(self._specialisation), __VERSION__,
+                     self._module_code.tofortran()]:
+            hasher.update(item.encode())
+        return hasher.hexdigest()
+
+    def _rename_and_write_hashed(self, base_name, extension, digest):
+        '''
+        Renames this kernel and writes it to a file whose name is derived
+        from the supplied hash. This is used for kernels that have only
+        been specialised (in which case the hash is of the specialisation
+        key) and for the "hash" kernel-naming scheme (in which case it is
+        of the transformed code). Kernels with the same hash (in this or in
+        any later PSyclone run using the same kernel-output directory)
+        share a single file which is only generated and written once.
 
-        # We could create a hash of a string built from the name of the
-        # Algorithm (module), the name/position of the Invoke and the
-        # index of this kernel within that Invoke. However, that creates
-        # a very long name so we simply ensure that kernel names are unique
-        # within the user-supplied kernel-output directory.
-        name_idx = -1
-        fdesc = None
-        while not fdesc:
-            name_idx += 1
-            new_suffix = ""
-
-            # GOcean OpenCL needs to differentiate between kernels generated
-            # from the same module file, so we include the kernelname into the
-            # output filename.
-            # TODO: Issue 499, this works as an OpenCL quickfix but it needs
-            # to be generalized and be consistent with the '--kernel-renaming'
-            # conventions.
-            if self.ancestor(InvokeSchedule).opencl:
-                if self.name.lower().endswith("_code"):
-                    new_suffix += "_" + self.name[:-5]
-                else:
-                    new_suffix += "_" + self.name
+        :param str base_name: the start of the name of the kernel file.
+        :param str extension: the extension of the kernel file.
+        :param str digest: the hexadecimal hash identifying the kernel.
 
-            new_suffix += "_{0}".format(name_idx)
+        :raises GenerationError: if the file for this kernel already \
+            exists but contains different code.
 
-            # Choose file extension
-            if self.ancestor(InvokeSchedule).opencl:
-                new_name = old_base_name + new_suffix + ".cl"
-            else:
-                new_name = old_base_name + new_suffix + "_mod.f90"
+        '''
+        import os
 
-            try:
-                # Atomically attempt to open the new kernel file (in case
-                # this is part of a parallel build)
-                fdesc = os.open(
-                    os.path.join(Config.get().kernel_output_dir, new_name),
-                    os.O_CREAT | os.O_WRONLY | os.O_EXCL)
-            except (OSError, IOError):
-                # The os.O_CREATE and os.O_EXCL flags in combination mean
-                # that open() raises an error if the file exists
-                if Config.get().kernel_naming == "single":
-                    # If the kernel-renaming scheme is such that we only ever
-                    # create one copy of a transformed kernel then we're done
-                    break
-                continue
+        new_suffix = "_" + digest[:10]
+        filepath = os.path.join(Config.get().kernel_output_dir,
+                                base_name + new_suffix + extension)
 
-        # Use the suffix we have determined to rename all relevant quantities
-        # within the AST of the kernel code.
-        # We can't rename OpenCL kernels as the Invoke set_args functions
-        # have already been generated. The link to an specific kernel
-        # implementation is delayed to run-time in OpenCL. (e.g. FortCL has
-        # the  FORTCL_KERNELS_FILE environment variable)
+        # OpenCL kernels can't be renamed (see `rename_and_write`)
         if not self.ancestor(InvokeSchedule).opencl:
             if self._kern_schedule:
-                # A PSyIR kernel schedule has been created. This means
-                # that the PSyIR has been modified and will be used to
-                # generate modified kernel code. Therefore the PSyIR
-                # should be modified rather than the parse tree. This
-                # if test, and the associated else, are only required
-                # whilst old style (direct fp2) transformations still
-                # exist - #490.
-
-                # Rename PSyIR module and kernel names.
                 self._rename_psyir(new_suffix)
             else:
                 self._rename_ast(new_suffix)
-
-        # Kernel is now self-consistent so unset the modified flag
         self.modified = False
 
-        # If this kernel is being module in-lined then we do not need to
-        # write it to file.
-        if self.module_inline:
-            # TODO #1013: However, the file is already created (opened) and
-            # currently this file is needed for the name versioning, so this
-            # will create an unnecessary file.
-            os.close(fdesc)
+        written_files = self._output_caches()[0]
+        if self.module_inline or filepath in written_files:
+            # Either no file is required or this kernel has already been
+            # written during the current generation of the PSy layer.
             return
 
+        new_kern_code = self._transformed_code()
+        try:
+            # Atomically attempt to create the file (in case this is part
+            # of a parallel build)
+            fdesc = os.open(filepath, os.O_CREAT | os.O_WRONLY | os.O_EXCL)
+        except (OSError, IOError):
+            # The file already exists (e.g. from a previous run) so check
+            # that it is the same as the code we would write.
+            with open(filepath, "r") as ffile:
+                if ffile.read() != new_kern_code:
+                    raise GenerationError(
+                        "A version of Kernel '{0}' with the same hash "
+                        "already exists in the kernel-output directory ({1}) "
+                        "but is not the same as the current, transformed "
+                        "kernel.".format(self.name,
+                                         Config.get().kernel_output_dir))
+        else:
+            os.write(fdesc, new_kern_code.encode())
+            os.close(fdesc)
+        written_files.add(filepath)
+
+    def _transformed_code(self):
+        '''
+        :returns: the code of this (transformed) kernel.
+        :rtype: str
+        '''
+        from psyclone.line_length import FortLineLength
         if self.ancestor(InvokeSchedule).opencl:
             from psyclone.psyir.backend.opencl import OpenCLWriter
+            local_memory = None
+            if self._opencl_options['local_memory']:
+                local_memory = self.opencl_local_memory_tiles()
             ocl_writer = OpenCLWriter(
-                kernels_local_size=self._opencl_options['local_size'])
+                kernels_local_size=self._opencl_options['local_size'],
+                kernels_local_memory=local_memory)
             new_kern_code = ocl_writer(self.get_kernel_schedule())
         elif self._kern_schedule:
             # A PSyIR kernel schedule has been created. This means
@@ -3333,32 +4751,7 @@ class CodedKern(Kern):
             # limited.
             fll = FortLineLength()
             new_kern_code = fll.process(str(self.ast))
-
-        if not fdesc:
-            # If we've not got a file descriptor at this point then that's
-            # because the file already exists and the kernel-naming scheme
-            # ("single") means we're not creating a new one.
-            # Check that what we've got is the same as what's in the file
-            with open(os.path.join(Config.get().kernel_output_dir,
-                                   new_name), "r") as ffile:
-                kern_code = ffile.read()
-                if kern_code != new_kern_code:
-                    raise GenerationError(
-                        "A transformed version of this Kernel '{0}' already "
-                        "exists in the kernel-output directory ({1}) but is "
-                        "not the same as the current, transformed kernel and "
-                        "the kernel-renaming scheme is set to '{2}'. (If you "
-                        "wish to generate a new, unique kernel for every "
-                        "kernel that is transformed then use "
-                        "'--kernel-renaming multiple'.)".
-                        format(self._module_name+".f90",
-                               Config.get().kernel_output_dir,
-                               Config.get().kernel_naming))
-        else:
-            # Write the modified AST out to file
-            os.write(fdesc, new_kern_code.encode())
-            # Close the new kernel file
-            os.close(fdesc)
+        return new_kern_code
 
     def _rename_psyir(self, suffix):
         '''Rename the PSyIR module and kernel names by adding the supplied
@@ -3483,12 +4876,45 @@ class CodedKern(Kern):
     @modified.setter
     def modified(self, value):
         '''
-        Setter for whether or not this kernel has been modified.
+        Setter for whether or not this kernel has been modified. Flagging
+        the kernel as modified discards any specialisation key as the
+        kernel may no longer be identical to others with the same key.
 
         :param bool value: True if kernel modified, False otherwise.
         '''
+        if value:
+            self._specialisation = None
         self._modified = value
 
+    @property
+    def specialisation(self):
+        '''
+        :returns: the key identifying how this kernel has been \
+            specialised (e.g. the constant values substituted by \
+            Dynamo0p3KernelConstTrans) or None if it has not been \
+            specialised or has been otherwise modified.
+        :rtype: tuple or NoneType
+        '''
+        return self._specialisation
+
+    @specialisation.setter
+    def specialisation(self, key):
+        '''
+        Setter for the specialisation key of this kernel. Kernels with
+        the same key are identical once transformed and therefore share
+        the same generated module (see `rename_and_write`).
+
+        :param key: the key describing the specialisation or None.
+        :type key: tuple or NoneType
+
+        :raises TypeError: if the key is not a tuple or None.
+        '''
+        if key is not None and not isinstance(key, tuple):
+            raise TypeError(
+                "The specialisation key of a kernel must be a tuple or None "
+                "but found '{0}'.".format(type(key).__name__))
+        self._specialisation = key
+
 
 class InlinedKern(Kern):
     '''A class representing a kernel that is inlined. This is used by
@@ -4464,7 +5890,7 @@ class DummyTransformation(Transformation):
         return None, None
 
 
-class ACCKernelsDirective(ACCDirective):
+class ACCKernelsDirective(ACCAsyncMixin, ACCDirective):
     '''
     Class representing the !$ACC KERNELS directive in the PSyIR.
 
@@ -4476,13 +5902,20 @@ class ACCKernelsDirective(ACCDirective):
     :type parent: sub-class of :py:class:`psyclone.psyir.nodes.Node`
     :param bool default_present: whether or not to add the "default(present)" \
                                  clause to the kernels directive.
+    :param int async_queue: the queue on which to execute the region \
+        asynchronously or None.
+    :param wait_queues: the queues to wait for before starting the region \
+        or None.
+    :type wait_queues: list of int or NoneType
 
     :raises NotImplementedError: if default_present is False.
 
     '''
-    def __init__(self, children=None, parent=None, default_present=True):
-        super(ACCKernelsDirective, self).__init__(children=children,
-                                                  parent=parent)
+    def __init__(self, children=None, parent=None, default_present=True,
+                 async_queue=None, wait_queues=None):
+        ACCDirective.__init__(self, children=children, parent=parent)
+        ACCAsyncMixin.__init__(self, async_queue=async_queue,
+                               wait_queues=wait_queues)
         self._default_present = default_present
 
     @property
@@ -4519,8 +5952,9 @@ class ACCKernelsDirective(ACCDirective):
 
         # We re-use the 'begin_string' method but must skip the leading 'acc'
         # that it includes.
-        parent.add(DirectiveGen(parent, "acc", "begin",
-                                *self.begin_string().split()[1:]))
+        words = self.begin_string().split()
+        parent.add(DirectiveGen(parent, "acc", "begin", words[1],
+                                " ".join(words[2:])))
         for child in self.children:
             child.gen_code(parent)
         parent.add(DirectiveGen(parent, *self.end_string().split()))
@@ -4555,10 +5989,10 @@ class ACCKernelsDirective(ACCDirective):
         :rtype: str
 
         '''
-        result = "acc kernels"
+        clauses = ["acc kernels"]
         if self._default_present:
-            result += " default(present)"
-        return result
+            clauses.append("default(present)")
+        return " ".join(clauses + self._async_clauses())
 
     def end_string(self):
         '''
@@ -4587,16 +6021,86 @@ class ACCKernelsDirective(ACCDirective):
         data_movement = None
         if self._default_present:
             data_movement = "present"
-        self._add_region(start_text="KERNELS", end_text="END KERNELS",
+        start_text = " ".join(["KERNELS"] + self._async_clauses()).upper()
+        self._add_region(start_text=start_text, end_text="END KERNELS",
                          data_movement=data_movement)
 
 
-class ACCDataDirective(ACCDirective):
+class ACCDataDirective(ACCAsyncMixin, ACCDirective):
     '''
     Class representing the !$ACC DATA ... !$ACC END DATA directive
     in the PSyIR.
 
+    :param children: the PSyIR nodes to be enclosed in the data region.
+    :type children: list of :py:class:`psyclone.psyir.nodes.Node`
+    :param parent: the parent of this node in the PSyIR.
+    :type parent: :py:class:`psyclone.psyir.nodes.Node`
+    :param int async_queue: the queue on which to perform the data \
+        movement asynchronously or None.
+    :param wait_queues: the queues to wait for before starting the data \
+        movement or None.
+    :type wait_queues: list of int or NoneType
+    :param clauses: the data clauses of the region, mapping each clause \
+        (e.g. "copyin") to the names of the variables it applies to, or \
+        None if the clauses are to be determined from the accesses within \
+        the region.
+    :type clauses: dict of str: list of str or NoneType
+
     '''
+    # The data clauses that may be specified explicitly, in the order in
+    # which they are output.
+    _VALID_CLAUSES = ["copyin", "copyout", "copy", "create", "present"]
+
+    def __init__(self, children=None, parent=None, async_queue=None,
+                 wait_queues=None, clauses=None):
+        ACCDirective.__init__(self, children=children, parent=parent)
+        ACCAsyncMixin.__init__(self, async_queue=async_queue,
+                               wait_queues=wait_queues)
+        self.clauses = clauses
+
+    @property
+    def clauses(self):
+        '''
+        :returns: the explicitly-specified data clauses of this region or \
+                  None if they are determined from the accesses within it.
+        :rtype: dict of str: list of str or NoneType
+        '''
+        return self._clauses
+
+    @clauses.setter
+    def clauses(self, clauses):
+        '''
+        :param clauses: the data clauses of this region, mapping each \
+            clause to the names of the variables it applies to, or None.
+        :type clauses: dict of str: list of str or NoneType
+
+        :raises TypeError: if clauses is not None or a dict.
+        :raises ValueError: if any of the clauses is not supported.
+        '''
+        if clauses is not None:
+            if not isinstance(clauses, dict):
+                raise TypeError(
+                    "The clauses of an OpenACC data region must be supplied "
+                    "as a dict but got '{0}'.".format(type(clauses).__name__))
+            for clause in clauses:
+                if clause not in self._VALID_CLAUSES:
+                    raise ValueError(
+                        "The clauses of an OpenACC data region must be one "
+                        "of {0} but got '{1}'.".format(self._VALID_CLAUSES,
+                                                       clause))
+            clauses = dict((clause, list(names)) for clause, names in
+                           clauses.items() if names)
+        self._clauses = clauses
+
+    def _explicit_clauses(self):
+        '''
+        :returns: the explicitly-specified data clauses, e.g. \
+                  "copyin(a,b)", in a fixed order.
+        :rtype: list of str
+        '''
+        return ["{0}({1})".format(clause, ",".join(self._clauses[clause]))
+                for clause in self._VALID_CLAUSES if clause in self._clauses]
+
     @property
     def dag_name(self):
         '''
@@ -4637,8 +6141,16 @@ class ACCDataDirective(ACCDirective):
 
         '''
         self.validate_global_constraints()
-        self._add_region(start_text="DATA", end_text="END DATA",
-                         data_movement="analyse")
+        start_text = " ".join(["DATA"] + self._async_clauses()).upper()
+        if self._clauses is not None:
+            for clause in self._VALID_CLAUSES:
+                if clause in self._clauses:
+                    start_text += " {0}({1})".format(
+                        clause.upper(), ",".join(self._clauses[clause]))
+            self._add_region(start_text=start_text, end_text="END DATA")
+        else:
+            self._add_region(start_text=start_text, end_text="END DATA",
+                             data_movement="analyse")
 
     def begin_string(self):
         '''Returns the beginning statement of this directive, i.e.
@@ -4654,6 +6166,10 @@ class ACCDataDirective(ACCDirective):
         '''
         result = "acc data"
 
+        if self._clauses is not None:
+            return " ".join([result] + self._explicit_clauses() +
+                            self._async_clauses())
+
         struct_accesses = self.walk(StructureReference)
         if struct_accesses:
             # TODO #1028. Dependence analysis does not yet work for structure
@@ -4706,7 +6222,7 @@ class ACCDataDirective(ACCDirective):
             str_readwrites = [str(sig) for sig in readwrites_list]
             result += " copy({0})".format(",".join(str_readwrites))
 
-        return result
+        return " ".join([result] + self._async_clauses())
 
     def end_string(self):
         '''
@@ -4718,12 +6234,271 @@ class ACCDataDirective(ACCDirective):
         return "acc end data"
 
 
+class ACCStandaloneDirective(ACCDirective):
+    '''
+    Base class for the OpenACC directives that are not associated with a
+    region of code (e.g. !$ACC WAIT) and therefore have no children.
+
+    '''
+    def end_string(self):
+        '''
+        :returns: the (empty) end statement as this is a stand-alone \
+                  directive.
+        :rtype: str
+        '''
+        # pylint: disable=no-self-use
+        return ""
+
+    def update(self):
+        '''
+        Updates the fparser2 AST by inserting this directive after the
+        parse tree of the preceding node (or before that of the following
+        node if this directive is the first in its Schedule).
+
+        :raises GenerationError: if there is no sibling node with which to \
+                                 locate this directive in the parse tree.
+
+        '''
+        from fparser.common.readfortran import FortranStringReader
+        from fparser.two.Fortran2003 import Comment
+
+        self.validate_global_constraints()
+        if self.ast:
+            return
+
+        siblings = self.parent.children
+        offset = 1
+        content_ast = None
+        if self.position > 0:
+            previous = siblings[self.position - 1]
+            content_ast = previous.ast_end or previous.ast
+        if not content_ast:
+            offset = 0
+            for sibling in siblings[self.position + 1:]:
+                asts = [node.ast for node in sibling.walk(Node) if node.ast]
+                if asts:
+                    content_ast = asts[0]
+                    break
+        if not content_ast:
+            raise GenerationError(
+                "Cannot add the OpenACC directive '{0}' to the parse tree "
+                "as there is no other node in its Schedule.".format(
+                    self.begin_string()))
+
+        fp_parent = content_ast.parent
+        index = object_index(fp_parent.content, content_ast)
+        # Only the directive and clause names are capitalised, not the
+        # arguments of the final clause.
+        head, bracket, tail = self.begin_string()[len("acc "):].partition("(")
+        text = "!$ACC " + head.upper() + bracket + tail
+        directive = Comment(FortranStringReader(text, ignore_comments=False))
+        directive.parent = fp_parent
+        fp_parent.content.insert(index + offset, directive)
+        self.ast = directive
+
+
+class ACCWaitDirective(ACCStandaloneDirective):
+    '''
+    Class representing the stand-alone !$ACC WAIT directive in the PSyIR.
+    The host waits for the operations on the specified asynchronous
+    queues (or on all queues) to complete.
+
+    :param wait_queues: the queues to wait for or None to wait for all \
+                        queues.
+    :type wait_queues: list of int or NoneType
+    :param parent: the parent of this node in the PSyIR.
+    :type parent: :py:class:`psyclone.psyir.nodes.Node`
+
+    '''
+    def __init__(self, wait_queues=None, parent=None):
+        super(ACCWaitDirective, self).__init__(parent=parent)
+        if wait_queues is not None:
+            for queue in wait_queues:
+                # pylint: disable=protected-access
+                ACCAsyncMixin._check_queue(queue)
+            wait_queues = wait_queues[:]
+        self._wait_queues = wait_queues
+
+    @property
+    def wait_queues(self):
+        '''
+        :returns: the queues to wait for or None if all queues are waited \
+                  for.
+        :rtype: list of int or NoneType
+        '''
+        return self._wait_queues
+
+    @property
+    def dag_name(self):
+        '''
+        :returns: the name to use in a dag for this node.
+        :rtype: str
+        '''
+        _, position = self._find_position(self.ancestor(Routine))
+        return "ACC_wait_" + str(position)
+
+    def node_str(self, colour=True):
+        ''' Returns the name of this node with (optional) control codes
+        to generate coloured output in a terminal that supports it.
+
+        :param bool colour: whether or not to include colour control codes.
+
+        :returns: description of this node, possibly coloured.
+        :rtype: str
+        '''
+        return self.coloured_name(colour) + "[ACC wait]"
+
+    def _queues_string(self):
+        '''
+        :returns: the list of queues to wait for (in parentheses) or an \
+                  empty string.
+        :rtype: str
+        '''
+        if not self._wait_queues:
+            return ""
+        return "({0})".format(",".join(str(queue) for queue in
+                                       self._wait_queues))
+
+    def gen_code(self, parent):
+        '''
+        Generate the f2pygen AST entries in the Schedule for this
+        OpenACC wait directive.
+
+        :param parent: the parent Node in the Schedule to which to add this \
+                       content.
+        :type parent: sub-class of :py:class:`psyclone.f2pygen.BaseGen`
+
+        '''
+        self.validate_global_constraints()
+        parent.add(DirectiveGen(parent, "acc", "begin", "wait",
+                                self._queues_string()))
+
+    def begin_string(self):
+        '''Returns the statement of this directive, i.e. "acc wait" plus
+        any queues. The backend is responsible for adding the correct
+        directive beginning (e.g. "!$").
+
+        :returns: the statement for this directive.
+        :rtype: str
+
+        '''
+        return "acc wait" + self._queues_string()
+
+
+class ACCUpdateDirective(ACCStandaloneDirective):
+    '''
+    Class representing the stand-alone !$ACC UPDATE directive in the PSyIR.
+    This copies the current values of the specified variables from the
+    accelerator to the host ("host") or from the host to the accelerator
+    ("device").
+
+    :param str direction: the direction of the update, "host" or "device".
+    :param names: the names of the variables to update.
+    :type names: list of str
+    :param parent: the parent of this node in the PSyIR.
+    :type parent: :py:class:`psyclone.psyir.nodes.Node`
+
+    :raises ValueError: if the direction is not "host" or "device".
+    :raises TypeError: if names is not a non-empty list of str.
+
+    '''
+    _VALID_DIRECTIONS = ["host", "device"]
+
+    def __init__(self, direction, names, parent=None):
+        super(ACCUpdateDirective, self).__init__(parent=parent)
+        if direction not in self._VALID_DIRECTIONS:
+            raise ValueError(
+                "The direction of an OpenACC update must be one of {0} but "
+                "got '{1}'.".format(self._VALID_DIRECTIONS, direction))
+        if not (isinstance(names, list) and names and
+                all(isinstance(name, six.string_types) for name in names)):
+            raise TypeError(
+                "The variables to update must be supplied as a non-empty "
+                "list of str but got '{0}'.".format(names))
+        self._direction = direction
+        self._names = names[:]
+
+    @property
+    def direction(self):
+        '''
+        :returns: the direction of the update, "host" or "device".
+        :rtype: str
+        '''
+        return self._direction
+
+    @property
+    def names(self):
+        '''
+        :returns: the names of the variables that are updated.
+        :rtype: list of str
+        '''
+        return self._names[:]
+
+    @property
+    def dag_name(self):
+        '''
+        :returns: the name to use in a dag for this node.
+        :rtype: str
+        '''
+        _, position = self._find_position(self.ancestor(Routine))
+        return "ACC_update_" + str(position)
+
+    def node_str(self, colour=True):
+        ''' Returns the name of this node with (optional) control codes
+        to generate coloured output in a terminal that supports it.
+
+        :param bool colour: whether or not to include colour control codes.
+
+        :returns: description of this node, possibly coloured.
+        :rtype: str
+        '''
+        return self.coloured_name(colour) + "[ACC update {0}]".format(
+            self._direction)
+
+    def _clause(self):
+        '''
+        :returns: the clause specifying the direction and the variables of \
+                  this update, e.g. "host(a,b)".
+        :rtype: str
+        '''
+        return "{0}({1})".format(self._direction, ",".join(self._names))
+
+    def gen_code(self, parent):
+        '''
+        Generate the f2pygen AST entries in the Schedule for this
+        OpenACC update directive.
+
+        :param parent: the parent Node in the Schedule to which to add this \
+                       content.
+        :type parent: sub-class of :py:class:`psyclone.f2pygen.BaseGen`
+
+        '''
+        self.validate_global_constraints()
+        parent.add(DirectiveGen(parent, "acc", "begin", "update",
+                                self._clause()))
+
+    def begin_string(self):
+        '''Returns the statement of this directive, e.g.
+        "acc update host(a,b)". The backend is responsible for adding the
+        correct directive beginning (e.g. "!$").
+
+        :returns: the statement for this directive.
+        :rtype: str
+
+        '''
+        return "acc update " + self._clause()
+
+
 # For Sphinx AutoAPI documentation generation
 __all__ = ['PSyFactory', 'PSy', 'Invokes', 'Invoke', 'InvokeSchedule',
            'Directive', 'ACCDirective', 'ACCEnterDataDirective',
            'ACCParallelDirective', 'ACCLoopDirective', 'OMPDirective',
            'OMPParallelDirective', 'OMPDoDirective', 'OMPParallelDoDirective',
+           'OMPSimdDirective', 'OMPSingleDirective', 'OMPTaskDirective',
+           'OMPTaskloopDirective',
            'GlobalSum', 'HaloExchange', 'Kern', 'CodedKern', 'InlinedKern',
            'BuiltIn', 'Arguments', 'DataAccess', 'Argument', 'KernelArgument',
            'TransInfo', 'Transformation', 'DummyTransformation',
-           'ACCKernelsDirective', 'ACCDataDirective']
+           'ACCKernelsDirective', 'ACCDataDirective', 'ACCAsyncMixin',
+           'ACCWaitDirective', 'ACCStandaloneDirective',
+           'ACCUpdateDirective']
@@ -458,3 +458,35 @@ class CWriter(PSyIRVisitor):
         self._depth -= 1
         result_list.append("}\n")
         return "".join(result_list)
+
+    def ompsimddirective_node(self, node):
+        '''This method is called when an OMPSimdDirective instance is found
+        in the PSyIR tree. The pragma must immediately precede the loop it
+        applies to, so (unlike other OpenMP directives) the enclosed loop
+        is not put in a separate block.
+
+        :param node: an OMPSimdDirective PSyIR node.
+        :type node: :py:class:`psyclone.psyGen.OMPSimdDirective`
+
+        :returns: the C code as a string.
+        :rtype: str
+
+        '''
+        result_list = ["#pragma {0}\n".format(node.begin_string())]
+        for child in node.dir_body:
+            result_list.append(self._visit(child))
+        return "".join(result_list)
+
+    def omptaskloopdirective_node(self, node):
+        '''This method is called when an OMPTaskloopDirective instance is
+        found in the PSyIR tree. As for an OMPSimdDirective, the pragma
+        must immediately precede the loop it applies to.
+
+        :param node: an OMPTaskloopDirective PSyIR node.
+        :type node: :py:class:`psyclone.psyGen.OMPTaskloopDirective`
+
+        :returns: the C code as a string.
+        :rtype: str
+
+        '''
+        return self.ompsimddirective_node(node)
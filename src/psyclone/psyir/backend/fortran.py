@@ -663,7 +663,24 @@ class FortranWriter(PSyIRVisitor):
                 "table contains argument(s): '{0}'."
                 "".format([symbol.name for symbol in
                            symbol_table.argument_datasymbols]))
-        for symbol in symbol_table.argument_datasymbols:
+        # An array argument whose extents depend upon another argument
+        # must be declared after that argument.
+        pending = list(symbol_table.argument_datasymbols)
+        while pending:
+            for symbol in pending:
+                dependencies = []
+                if symbol.is_array:
+                    for dim in symbol.shape:
+                        if isinstance(dim, DataNode):
+                            dependencies.extend(
+                                ref.symbol for ref in dim.walk(Reference))
+                if not any(dep in pending for dep in dependencies
+                           if dep is not symbol):
+                    break
+            else:
+                # Circular dependency - keep the original ordering
+                symbol = pending[0]
+            pending.remove(symbol)
             declarations += self.gen_vardecl(symbol)
 
         # 2: Local variable declarations
@@ -40,7 +40,9 @@ OpenCL code from PSyIR nodes.
 '''
 
 from psyclone.psyir.backend.visitor import VisitorError
-from psyclone.psyir.backend.c import CWriter
+from psyclone.psyir.backend.c import CWriter, TYPE_MAP_TO_C
+from psyclone.psyir.nodes import Assignment, ArrayReference, \
+    BinaryOperation, Literal, Reference
 from psyclone.psyir.symbols import ScalarType
 
 
@@ -60,13 +62,24 @@ class OpenCLWriter(CWriter):
     start with. This is an optional argument that defaults to 0.
     :param int kernel_local_size: uses the given local_size when generating \
     OpenCL kernels.
+    :param kernels_local_memory: maps the names of read-only 2D kernel \
+    arguments to the depth of their stencil in each dimension. Each \
+    work-group cooperatively loads a tile of these arrays (including the \
+    halo cells) into __local memory and the stencil accesses then read \
+    from this tile. This is an optional argument that defaults to None \
+    (all arrays are accessed in global memory).
+    :type kernels_local_memory: dict of str: (int, int) or NoneType
 
     :raises TypeError: if kernel_local_size is not an integer.
     :raises ValueError: if kernel_local_size is not positive.
+    :raises TypeError: if kernels_local_memory is not a dict.
+    :raises ValueError: if the stencil depths in kernels_local_memory are \
+    not a pair of non-negative integers.
 
     '''
     def __init__(self, skip_nodes=False, indent_string="  ",
-                 initial_indent_depth=0, kernels_local_size=1):
+                 initial_indent_depth=0, kernels_local_size=1,
+                 kernels_local_memory=None):
 
         super(OpenCLWriter, self).__init__(
             skip_nodes, indent_string, initial_indent_depth)
@@ -83,6 +96,27 @@ class OpenCLWriter(CWriter):
 
         self._kernels_local_size = kernels_local_size
 
+        if kernels_local_memory is None:
+            kernels_local_memory = {}
+        if not isinstance(kernels_local_memory, dict):
+            raise TypeError(
+                "kernels_local_memory should be a dict but found '{0}'."
+                "".format(type(kernels_local_memory).__name__))
+        for name, depths in kernels_local_memory.items():
+            if not (isinstance(depths, tuple) and len(depths) == 2 and
+                    all(isinstance(depth, int) and depth >= 0
+                        for depth in depths)):
+                raise ValueError(
+                    "kernels_local_memory should map each array name to a "
+                    "pair of non-negative stencil depths but found {0} for "
+                    "'{1}'.".format(depths, name))
+
+        self._kernels_local_memory = kernels_local_memory
+        # Information about the __local memory tiles of the kernel that is
+        # currently being generated, indexed by array name.
+        self._tiles = {}
+        self._tile_indices = []
+
     def gen_id_variable(self, symbol, dimension_index):
         '''
         Generate the declaration and initialisation of a variable identifying
@@ -172,6 +206,163 @@ class OpenCLWriter(CWriter):
             code += str(dim - 1) + ");\n"
         return code
 
+    def gen_local_memory_tiles(self, node):
+        '''
+        Generate the declaration of the __local memory tiles of the arrays
+        given in the kernels_local_memory parameter and the code that
+        cooperatively loads them. Each work-group iterates over
+        `kernels_local_size` points of the first dimension and a single
+        point of the second dimension, so each tile holds this block of
+        points plus the halo cells needed by the stencil accesses. Tile
+        cells outside the array bounds are not loaded. The load is
+        followed by a barrier and therefore it must be generated before
+        any statement of the kernel body (which may return early).
+
+        :param node: the KernelSchedule being generated.
+        :type node: :py:class:`psyclone.psyir.nodes.KernelSchedule`
+
+        :returns: OpenCL code that declares and loads the local memory tiles.
+        :rtype: str
+
+        :raises VisitorError: if an array is not a 2D data argument of the \
+            kernel or if the kernel writes to it.
+        :raises VisitorError: if the name of a variable needed by the \
+            generated code clashes with another symbol name.
+        '''
+        self._tiles = {}
+        if not self._kernels_local_memory:
+            return ""
+
+        symtab = node.symbol_table
+        data_args = {symbol.name.lower(): symbol
+                     for symbol in symtab.data_arguments}
+        written = set(assign.lhs.name.lower() for assign in
+                      node.walk(Assignment)
+                      if isinstance(assign.lhs, ArrayReference))
+        index = symtab.iteration_indices[0].name
+        local_id = index + "_local"
+
+        names = [local_id, "tile_i", "tile_j", "tile_gi", "tile_gj"]
+        names.extend(name + "_tile" for name in self._kernels_local_memory)
+        for varname in names:
+            if varname in symtab:
+                raise VisitorError(
+                    "Unable to declare the variable '{0}' to access the "
+                    "local memory tiles because the Symbol Table already "
+                    "contains a symbol with the same name.".format(varname))
+
+        code = self._nindent + "int {0} = get_local_id(0);\n".format(local_id)
+        for name, (depth1, depth2) in self._kernels_local_memory.items():
+            symbol = data_args.get(name.lower())
+            if not symbol or len(symbol.shape) != 2:
+                raise VisitorError(
+                    "Cannot load '{0}' into local memory because it is not "
+                    "a 2D array argument of kernel '{1}'."
+                    "".format(name, node.name))
+            if name.lower() in written:
+                raise VisitorError(
+                    "Cannot load '{0}' into local memory because it is "
+                    "written to by kernel '{1}'.".format(name, node.name))
+            width = self._kernels_local_size + 2 * depth1
+            rows = 1 + 2 * depth2
+            tile = symbol.name + "_tile"
+            self._tiles[symbol.name.lower()] = (tile, width, depth1, depth2)
+
+            code += self._nindent + "__local {0} {1}[{2}];\n".format(
+                TYPE_MAP_TO_C[symbol.datatype.intrinsic], tile, width * rows)
+            code += self._nindent + \
+                "for (int tile_j = 0; tile_j < {0}; tile_j++) {{\n" \
+                "".format(rows)
+            self._depth += 1
+            code += self._nindent + \
+                "for (int tile_i = {0}; tile_i < {1}; tile_i += {2}) {{\n" \
+                "".format(local_id, width, self._kernels_local_size)
+            self._depth += 1
+            code += self._nindent + \
+                "int tile_gi = {0} - {1} - {2} + tile_i;\n".format(
+                    index, local_id, depth1)
+            code += self._nindent + \
+                "int tile_gj = {0} - {1} + tile_j;\n".format(
+                    symtab.iteration_indices[1].name, depth2)
+            code += self._nindent + \
+                "if (tile_gi >= 0 && tile_gi < {0}LEN1 && tile_gj >= 0 && " \
+                "tile_gj < {0}LEN2) {{\n".format(symbol.name)
+            self._depth += 1
+            code += self._nindent + \
+                "{0}[tile_j * {1} + tile_i] = {2}[tile_gj * {2}LEN1 + " \
+                "tile_gi];\n".format(tile, width, symbol.name)
+            for _ in range(3):
+                self._depth -= 1
+                code += self._nindent + "}\n"
+
+        code += self._nindent + "barrier(CLK_LOCAL_MEM_FENCE);\n"
+        self._tile_indices = [symbol.name for symbol in
+                              symtab.iteration_indices] + [local_id]
+        return code
+
+    @staticmethod
+    def _index_offset(expr, index):
+        '''
+        :param expr: an array-index expression.
+        :type expr: :py:class:`psyclone.psyir.nodes.Node`
+        :param str index: the name of an iteration index.
+
+        :returns: the constant offset of the expression relative to the \
+            given index or None if it is not of the form index, index + n, \
+            n + index or index - n.
+        :rtype: int or NoneType
+        '''
+        def is_index(node):
+            return (isinstance(node, Reference) and
+                    not isinstance(node, ArrayReference) and
+                    node.name.lower() == index.lower())
+
+        def is_integer(node):
+            return (isinstance(node, Literal) and
+                    node.datatype.intrinsic == ScalarType.Intrinsic.INTEGER)
+
+        if is_index(expr):
+            return 0
+        if not isinstance(expr, BinaryOperation):
+            return None
+        lhs, rhs = expr.children
+        if expr.operator == BinaryOperation.Operator.ADD:
+            if is_index(lhs) and is_integer(rhs):
+                return int(rhs.value)
+            if is_integer(lhs) and is_index(rhs):
+                return int(lhs.value)
+        if expr.operator == BinaryOperation.Operator.SUB and \
+                is_index(lhs) and is_integer(rhs):
+            return -int(rhs.value)
+        return None
+
+    def arrayreference_node(self, node):
+        '''This method is called when an ArrayReference instance is found
+        in the PSyIR tree. Accesses to an array that has been loaded into a
+        local memory tile are redirected to the tile if they are within the
+        stencil depth of the current point. Otherwise the array is accessed
+        in global memory.
+
+        :param node: An Array PSyIR node.
+        :type node: :py:class:`psyclone.psyir.nodes.ArrayReference`
+
+        :returns: The OpenCL code as a string.
+        :rtype: str
+
+        '''
+        tile_info = self._tiles.get(node.name.lower())
+        if tile_info and len(node.children) == 2:
+            tile, width, depth1, depth2 = tile_info
+            index1, index2, local_id = self._tile_indices
+            offset1 = self._index_offset(node.children[0], index1)
+            offset2 = self._index_offset(node.children[1], index2)
+            if offset1 is not None and offset2 is not None and \
+                    abs(offset1) <= depth1 and abs(offset2) <= depth2:
+                return "{0}[{1} + {2}]".format(
+                    tile, (depth2 + offset2) * width + depth1 + offset1,
+                    local_id)
+        return super(OpenCLWriter, self).arrayreference_node(node)
+
     def kernelschedule_node(self, node):
         '''This method is called when a KernelSchedule instance is found in
         the PSyIR tree.
@@ -241,9 +432,13 @@ class OpenCLWriter(CWriter):
         for index, symbol in enumerate(symtab.iteration_indices):
             code += self.gen_id_variable(symbol, index)
 
+        # Load the local memory tiles
+        code += self.gen_local_memory_tiles(node)
+
         # Generate kernel body
         for child in node.children:
             code += self._visit(child)
+        self._tiles = {}
 
         # Close kernel definition
         self._depth -= 1
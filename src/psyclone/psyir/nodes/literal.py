@@ -146,5 +146,8 @@ class Literal(DataNode):
         :return: if the self has the same results as other.
         :type: bool
         '''
-
-        return self.value == other.value
+        if not super(Literal, self).math_equal(other):
+            return False
+        return self.value == other.value and \
+            self.datatype.intrinsic == other.datatype.intrinsic and \
+            self.datatype.precision == other.datatype.precision
@@ -100,6 +100,17 @@ class Member(Node):
         '''
         return self.coloured_name(colour) + "[name:'" + self.name + "']"
 
+    def math_equal(self, other):
+        ''':param other: the node to compare self with.
+        :type other: py:class:`psyclone.psyir.nodes.Node`
+
+        :returns: True if the self has the same results as other.
+        :rtype: bool
+        '''
+        if not super(Member, self).math_equal(other):
+            return False
+        return self.name == other.name
+
     def __str__(self):
         return self.node_str(False)
 
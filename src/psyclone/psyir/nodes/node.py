@@ -1139,12 +1139,14 @@ class Node(object):
         return call_reduction_list
 
     def is_openmp_parallel(self):
-        ''':returns: True if this Node is within an OpenMP parallel region.
+        ''':returns: True if this Node is within an OpenMP parallel region \
+            (and not within an OpenMP task inside that region, since a \
+            task is executed by a single thread).
 
         '''
-        from psyclone.psyGen import OMPParallelDirective
-        omp_dir = self.ancestor(OMPParallelDirective)
-        if omp_dir:
+        from psyclone.psyGen import OMPParallelDirective, OMPTaskDirective
+        omp_dir = self.ancestor((OMPParallelDirective, OMPTaskDirective))
+        if isinstance(omp_dir, OMPParallelDirective):
             return True
         return False
 
@@ -105,6 +105,17 @@ class Operation(DataNode):
         return self.coloured_name(colour) + \
             "[operator:'" + self._operator.name + "']"
 
+    def math_equal(self, other):
+        ''':param other: the node to compare self with.
+        :type other: py:class:`psyclone.psyir.nodes.Node`
+
+        :returns: True if the self has the same results as other.
+        :rtype: bool
+        '''
+        if not super(Operation, self).math_equal(other):
+            return False
+        return self.operator == other.operator
+
     def __str__(self):
         result = self.node_str(False) + "\n"
         for entity in self._children:
@@ -0,0 +1,155 @@
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2021, Science and Technology Facilities Council.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+
+'''This module contains utilities for querying PSyIR expressions that are
+needed by transformations which create new temporaries.
+'''
+
+from __future__ import absolute_import
+
+from psyclone.psyir.nodes import ArrayReference, BinaryOperation, Literal, \
+    NaryOperation, Range, Reference, UnaryOperation
+from psyclone.psyir.symbols import ArrayType, DataSymbol, ScalarType
+
+# Operators that return a (default) logical result
+_BOOLEAN_OPERATORS = [
+    BinaryOperation.Operator.EQ, BinaryOperation.Operator.NE,
+    BinaryOperation.Operator.GT, BinaryOperation.Operator.LT,
+    BinaryOperation.Operator.GE, BinaryOperation.Operator.LE,
+    BinaryOperation.Operator.AND, BinaryOperation.Operator.OR,
+    UnaryOperation.Operator.NOT]
+# Operators that return a default integer result
+_INTEGER_OPERATORS = [
+    BinaryOperation.Operator.SIZE, BinaryOperation.Operator.LBOUND,
+    BinaryOperation.Operator.UBOUND, UnaryOperation.Operator.INT,
+    UnaryOperation.Operator.NINT, UnaryOperation.Operator.CEIL]
+# Operators whose result has the type of their argument(s)
+_ARITHMETIC_OPERATORS = [
+    UnaryOperation.Operator.MINUS, UnaryOperation.Operator.PLUS,
+    UnaryOperation.Operator.SQRT, UnaryOperation.Operator.EXP,
+    UnaryOperation.Operator.LOG, UnaryOperation.Operator.LOG10,
+    UnaryOperation.Operator.COS, UnaryOperation.Operator.SIN,
+    UnaryOperation.Operator.TAN, UnaryOperation.Operator.ACOS,
+    UnaryOperation.Operator.ASIN, UnaryOperation.Operator.ATAN,
+    UnaryOperation.Operator.ABS,
+    BinaryOperation.Operator.ADD, BinaryOperation.Operator.SUB,
+    BinaryOperation.Operator.MUL, BinaryOperation.Operator.DIV,
+    BinaryOperation.Operator.REM, BinaryOperation.Operator.POW,
+    BinaryOperation.Operator.SIGN, BinaryOperation.Operator.MIN,
+    BinaryOperation.Operator.MAX, NaryOperation.Operator.MIN,
+    NaryOperation.Operator.MAX]
+
+
+def get_expression_datatype(expression):
+    '''Determines the type of the scalar value of the supplied expression
+    from the types of the symbols and literals it contains (following the
+    Fortran rules for mixed-mode arithmetic).
+
+    :param expression: the expression to examine.
+    :type expression: :py:class:`psyclone.psyir.nodes.DataNode`
+
+    :returns: the type of the expression or None if the expression is not \
+        a scalar of an intrinsic type or its type (e.g. its precision) \
+        cannot be determined.
+    :rtype: :py:class:`psyclone.psyir.symbols.ScalarType` or NoneType
+
+    '''
+    # pylint: disable=too-many-return-statements, unidiomatic-typecheck
+    if isinstance(expression, Literal):
+        if isinstance(expression.datatype, ScalarType):
+            return expression.datatype
+        return None
+
+    if type(expression) in (Reference, ArrayReference) and \
+       not isinstance(expression.symbol, DataSymbol):
+        return None
+
+    if type(expression) is Reference:
+        if isinstance(expression.symbol.datatype, ScalarType):
+            return expression.symbol.datatype
+        return None
+
+    if type(expression) is ArrayReference:
+        datatype = expression.symbol.datatype
+        if not isinstance(datatype, ArrayType) or \
+           not isinstance(datatype.intrinsic, ScalarType.Intrinsic) or \
+           any(isinstance(index, Range) for index in expression.indices):
+            return None
+        return ScalarType(datatype.intrinsic, datatype.precision)
+
+    if not isinstance(expression,
+                      (UnaryOperation, BinaryOperation, NaryOperation)):
+        return None
+
+    if expression.operator in _BOOLEAN_OPERATORS:
+        return ScalarType(ScalarType.Intrinsic.BOOLEAN,
+                          ScalarType.Precision.UNDEFINED)
+    if expression.operator in _INTEGER_OPERATORS:
+        return ScalarType(ScalarType.Intrinsic.INTEGER,
+                          ScalarType.Precision.UNDEFINED)
+    if expression.operator == UnaryOperation.Operator.REAL:
+        return ScalarType(ScalarType.Intrinsic.REAL,
+                          ScalarType.Precision.UNDEFINED)
+    if expression.operator not in _ARITHMETIC_OPERATORS:
+        return None
+
+    # The result of an arithmetic operation is real if any argument is
+    # real. Its precision is that of the arguments of the result type
+    # (which must all be the same or undefined).
+    arg_types = [get_expression_datatype(child)
+                 for child in expression.children]
+    if None in arg_types:
+        return None
+    intrinsics = set(arg_type.intrinsic for arg_type in arg_types)
+    if intrinsics == set([ScalarType.Intrinsic.INTEGER]):
+        intrinsic = ScalarType.Intrinsic.INTEGER
+    elif intrinsics.issubset([ScalarType.Intrinsic.INTEGER,
+                              ScalarType.Intrinsic.REAL]):
+        intrinsic = ScalarType.Intrinsic.REAL
+    else:
+        return None
+    precision = ScalarType.Precision.UNDEFINED
+    for arg_type in arg_types:
+        if arg_type.intrinsic != intrinsic or \
+           arg_type.precision == ScalarType.Precision.UNDEFINED:
+            continue
+        if precision == ScalarType.Precision.UNDEFINED:
+            precision = arg_type.precision
+        elif arg_type.precision != precision:
+            return None
+    return ScalarType(intrinsic, precision)
+
+
+# For AutoAPI documentation generation
+__all__ = ["get_expression_datatype"]
@@ -40,9 +40,17 @@
 transformations and base classes.
 '''
 
+from psyclone.psyir.transformations.common_subexpression_elimination_trans \
+    import CommonSubexpressionEliminationTrans
 from psyclone.psyir.transformations.extract_trans import ExtractTrans
 from psyclone.psyir.transformations.loop_trans import LoopTrans
 from psyclone.psyir.transformations.loop_fuse_trans import LoopFuseTrans
+from psyclone.psyir.transformations.loop_invariant_code_motion_trans import \
+    LoopInvariantCodeMotionTrans
+from psyclone.psyir.transformations.loop_unroll_trans import \
+    LoopUnrollTrans
+from psyclone.psyir.transformations.loop_unroll_and_jam_trans import \
+    LoopUnrollAndJamTrans
 from psyclone.psyir.transformations.nan_test_trans import NanTestTrans
 from psyclone.psyir.transformations.profile_trans import ProfileTrans
 from psyclone.psyir.transformations.psy_data_trans import PSyDataTrans
@@ -57,6 +65,8 @@ from psyclone.psyir.transformations.intrinsics.min2code_trans import \
     Min2CodeTrans
 from psyclone.psyir.transformations.intrinsics.sign2code_trans import \
     Sign2CodeTrans
+from psyclone.psyir.transformations.intrinsics.strength_reduction_trans \
+    import StrengthReductionTrans
 from psyclone.psyir.transformations.arrayrange2loop_trans import \
     ArrayRange2LoopTrans
 from psyclone.psyir.transformations.fold_conditional_return_expressions_trans \
@@ -67,7 +77,8 @@ from psyclone.psyir.transformations.transformation_error \
 # this package e.g.:
 # from psyclone.psyir.transformations import ExtractTrans
 
-__all__ = ['ExtractTrans',
+__all__ = ['CommonSubexpressionEliminationTrans',
+           'ExtractTrans',
            'NanTestTrans',
            'ProfileTrans',
            'PSyDataTrans',
@@ -76,9 +87,13 @@ __all__ = ['ExtractTrans',
            'Abs2CodeTrans',
            'LoopTrans',
            'LoopFuseTrans',
+           'LoopInvariantCodeMotionTrans',
+           'LoopUnrollTrans',
+           'LoopUnrollAndJamTrans',
            'Matmul2CodeTrans',
            'Min2CodeTrans',
            'Sign2CodeTrans',
+           'StrengthReductionTrans',
            'TransformationError',
            'ArrayRange2LoopTrans',
            'FoldConditionalReturnExpressionsTrans']
@@ -0,0 +1,280 @@
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2021, Science and Technology Facilities Council.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+
+'''This module contains the CommonSubexpressionEliminationTrans
+transformation.
+'''
+
+from __future__ import absolute_import
+
+from psyclone.core import VariablesAccessInfo
+from psyclone.psyGen import Transformation
+from psyclone.psyir.nodes import Assignment, BinaryOperation, Call, \
+    CodeBlock, Literal, Member, Node, Operation, Reference, Schedule
+from psyclone.psyir.symbols import DataSymbol
+from psyclone.psyir.tools.expression_tools import get_expression_datatype
+from psyclone.psyir.transformations.transformation_error import \
+    TransformationError
+
+# The operators for which BinaryOperation.math_equal accepts swapped
+# operands. Their operands are ordered when computing the key of an
+# expression so that expressions that are math_equal have the same key.
+_COMMUTATIVE_OPERATORS = [
+    BinaryOperation.Operator.ADD, BinaryOperation.Operator.MUL,
+    BinaryOperation.Operator.AND, BinaryOperation.Operator.OR,
+    BinaryOperation.Operator.EQ]
+
+
+class CommonSubexpressionEliminationTrans(Transformation):
+    '''Replaces the expressions that are evaluated more than once within a
+    basic block (a sequence of assignments within a Schedule) by a scalar
+    temporary that is computed once. For example:
+
+    .. code-block:: fortran
+
+      a(ji,jj) = b(ji,jj) * (rdt / e3t(ji,jj)) + c(ji,jj)
+      d(ji,jj) = c(ji,jj) * (rdt / e3t(ji,jj))
+
+    becomes
+
+    .. code-block:: fortran
+
+      cse_tmp = rdt / e3t(ji,jj)
+      a(ji,jj) = b(ji,jj) * cse_tmp + c(ji,jj)
+      d(ji,jj) = c(ji,jj) * cse_tmp
+
+    The transformation is applied to all basic blocks in the supplied
+    Schedule and in any Schedule nested within it. Two occurrences of an
+    operation are considered the same if they are ``math_equal`` and none
+    of the variables they access is written in between. To avoid
+    comparing all pairs of expressions, candidates are first grouped by a
+    key that is computed bottom-up from the structure of each expression.
+    Only operations that access at least one variable and whose type can
+    be determined are replaced (see
+    :py:func:`psyclone.psyir.tools.get_expression_datatype`), and the
+    largest common expressions take precedence over the expressions they
+    contain.
+
+    Note that, as in the rest of PSyclone, it is assumed that different
+    variables do not alias each other.
+
+    >>> from psyclone.psyir.transformations import \
+            CommonSubexpressionEliminationTrans
+    >>> trans = CommonSubexpressionEliminationTrans()
+    >>> trans.apply(routine)
+
+    '''
+    def __str__(self):
+        return ("Replace the repeated expressions in the basic blocks of a "
+                "Schedule by temporaries")
+
+    @property
+    def name(self):
+        '''
+        :returns: the name of this transformation.
+        :rtype: str
+        '''
+        return "CommonSubexpressionEliminationTrans"
+
+    def validate(self, node, options=None):
+        '''Checks that the supplied node is a Schedule.
+
+        :param node: the schedule to transform.
+        :type node: :py:class:`psyclone.psyir.nodes.Schedule`
+        :param options: a dictionary with options for transformations.
+        :type options: dict of string:values or None
+
+        :raises TransformationError: if the node is not a Schedule.
+
+        '''
+        if not isinstance(node, Schedule):
+            raise TransformationError(
+                "Error in {0} transformation. This transformation can only "
+                "be applied to a 'Schedule' but found '{1}'."
+                "".format(self.name, type(node).__name__))
+
+    def apply(self, node, options=None):
+        '''Replaces the common subexpressions in all basic blocks of the
+        supplied Schedule (and of any Schedule within it) by temporaries.
+
+        :param node: the schedule to transform.
+        :type node: :py:class:`psyclone.psyir.nodes.Schedule`
+        :param options: a dictionary with options for transformations.
+        :type options: dict of string:values or None
+
+        '''
+        self.validate(node, options)
+
+        for schedule in node.walk(Schedule):
+            block = []
+            for statement in schedule.children[:]:
+                if isinstance(statement, Assignment):
+                    block.append(statement)
+                else:
+                    self._eliminate(block)
+                    block = []
+            self._eliminate(block)
+
+    def _eliminate(self, block):
+        '''Replaces the common subexpressions of a basic block by
+        temporaries.
+
+        :param block: the consecutive assignments of a basic block.
+        :type block: list of :py:class:`psyclone.psyir.nodes.Assignment`
+
+        '''
+        if not block:
+            return
+        # Each group is a list of occurrences of the same expression for
+        # which none of the accessed variables is modified in between,
+        # stored together with the names of these variables. The groups
+        # that can still be extended are stored in a dictionary indexed by
+        # the key of the expression.
+        open_groups = {}
+        groups = []
+        for statement in block:
+            keys = {}
+            for expression in self._candidates(statement, keys):
+                bucket = open_groups.setdefault(keys[id(expression)], [])
+                for names, group in bucket:
+                    if group[0].math_equal(expression):
+                        group.append(expression)
+                        break
+                else:
+                    group = [expression]
+                    bucket.append((_names(expression), group))
+                    groups.append(group)
+
+            # Close all groups whose expression accesses a variable that is
+            # written by this statement.
+            accesses = VariablesAccessInfo(statement)
+            written = set(_root_name(signature) for signature in
+                          accesses.all_signatures
+                          if accesses.is_written(signature))
+            for bucket in open_groups.values():
+                bucket[:] = [(names, group) for names, group in bucket
+                             if not written & names]
+
+        # Replace the largest expressions first. The occurrences of smaller
+        # expressions that were part of them are no longer in the tree.
+        root = block[0].root
+        groups.sort(key=lambda group: len(group[0].walk(Node)), reverse=True)
+        symbol_table = block[0].scope.symbol_table
+        for group in groups:
+            live = [expression for expression in group
+                    if expression.root is root]
+            if len(live) < 2:
+                continue
+            symbol = symbol_table.new_symbol(
+                "cse_tmp", symbol_type=DataSymbol,
+                datatype=get_expression_datatype(live[0]))
+            statement = live[0].ancestor(Assignment)
+            statement.parent.children.insert(
+                statement.position,
+                Assignment.create(Reference(symbol), live[0].copy()))
+            for expression in live:
+                expression.replace_with(Reference(symbol))
+
+    @staticmethod
+    def _candidates(statement, keys):
+        '''Computes the key of every node within the supplied statement and
+        returns the operations in it that can be replaced by a temporary.
+        The key of a node is a hash of its type, its operator, name or value
+        and the keys of its children, so that nodes that are ``math_equal``
+        have the same key.
+
+        :param statement: the statement to examine.
+        :type statement: :py:class:`psyclone.psyir.nodes.Assignment`
+        :param keys: the dictionary (indexed by the id of a node) in which \
+            to store the key of every node.
+        :type keys: dict of int: int
+
+        :returns: the candidate operations in the statement.
+        :rtype: list of :py:class:`psyclone.psyir.nodes.Operation`
+
+        '''
+        candidates = []
+        # Process the nodes in reverse order so that the keys of all
+        # children are known when a node is processed.
+        for node in reversed(statement.walk(Node)):
+            child_keys = [keys[id(child)] for child in node.children]
+            parts = [type(node).__name__]
+            if isinstance(node, Operation):
+                parts.append(node.operator)
+                if node.operator in _COMMUTATIVE_OPERATORS:
+                    child_keys.sort()
+            elif isinstance(node, Literal):
+                parts.append(node.value)
+            elif isinstance(node, (Reference, Member)):
+                parts.append(node.name)
+            keys[id(node)] = hash(tuple(parts + child_keys))
+
+            if isinstance(node, Operation) and \
+               not node.walk((CodeBlock, Call)) and \
+               node.walk(Reference) and \
+               get_expression_datatype(node) is not None:
+                candidates.append(node)
+        # Return the candidates in execution order
+        candidates.reverse()
+        return candidates
+
+
+def _root_name(signature):
+    '''
+    :param signature: the signature of a variable access.
+    :type signature: :py:class:`psyclone.core.Signature`
+
+    :returns: the name of the variable (i.e. of the outermost structure for \
+        an access to a component of a structure).
+    :rtype: str
+
+    '''
+    return str(signature).split("%")[0]
+
+
+def _names(expression):
+    '''
+    :param expression: the expression to examine.
+    :type expression: :py:class:`psyclone.psyir.nodes.DataNode`
+
+    :returns: the names of the variables accessed in the expression.
+    :rtype: set of str
+
+    '''
+    return set(_root_name(signature) for signature in
+               VariablesAccessInfo(expression).all_signatures)
+
+
+# For AutoAPI documentation generation
+__all__ = ["CommonSubexpressionEliminationTrans"]
@@ -0,0 +1,316 @@
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2021, Science and Technology Facilities Council.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+
+'''Module providing a transformation that replaces intrinsic power and
+division operations by cheaper operations.
+
+'''
+from __future__ import absolute_import
+
+import six
+
+from psyclone.core import VariablesAccessInfo
+from psyclone.psyGen import Transformation
+from psyclone.psyir.backend.fortran import FortranWriter
+from psyclone.psyir.nodes import Assignment, BinaryOperation, Call, \
+    CodeBlock, IfBlock, Literal, Loop, Reference, Schedule
+from psyclone.psyir.symbols import DataSymbol, ScalarType
+from psyclone.psyir.tools.expression_tools import get_expression_datatype
+from psyclone.psyir.transformations.transformation_error import \
+    TransformationError
+
+
+class StrengthReductionTrans(Transformation):
+    '''Provides a transformation that reduces the strength of the power and
+    division operations in a Schedule or Loop:
+
+    1. a power of a variable or literal with an integer literal exponent
+       between 2 and the value of the 'max_power' option (default 4) is
+       replaced by repeated multiplications, e.g. ``x**3`` becomes
+       ``x * x * x``.
+    2. within every loop, a real division by a loop-invariant expression
+       (i.e. one which accesses at least one variable and none of whose
+       variables is written in the loop) is replaced by a multiplication
+       with its reciprocal, which is computed in a new temporary before
+       the loop. Divisions by the same expression share a temporary.
+       For example:
+
+       .. code-block:: fortran
+
+         do ji = 1, jpi
+           a(ji) = b(ji) / e3t(jj)
+         end do
+
+       becomes
+
+       .. code-block:: fortran
+
+         reciprocal = 1.0_wp / e3t(jj)
+         do ji = 1, jpi
+           a(ji) = b(ji) * reciprocal
+         end do
+
+    Since they change the rounding of the results, powers of real values
+    with an exponent larger than 2 and the replacement of divisions are
+    only performed if the 'relaxed_fp' option is True. Divisions within
+    an IfBlock are never replaced, since the denominator may only be
+    valid when the condition holds. Note that the reciprocal is computed
+    even if the loop executes no iterations. A description of every
+    rewrite performed by the last call of apply() can be obtained from
+    the `rewrites` property.
+
+    >>> from psyclone.psyir.transformations import StrengthReductionTrans
+    >>> trans = StrengthReductionTrans()
+    >>> trans.apply(kernel_schedule, {"relaxed_fp": True})
+    >>> for rewrite in trans.rewrites:
+    >>>     print(rewrite)
+
+    '''
+    def __init__(self):
+        super(StrengthReductionTrans, self).__init__()
+        self._rewrites = []
+
+    def __str__(self):
+        return ("Replace intrinsic power and division operations by cheaper "
+                "operations")
+
+    @property
+    def name(self):
+        '''
+        :returns: the name of this transformation.
+        :rtype: str
+        '''
+        return "StrengthReductionTrans"
+
+    @property
+    def rewrites(self):
+        '''
+        :returns: a description of each rewrite performed by the last call \
+            of apply().
+        :rtype: list of str
+        '''
+        return self._rewrites
+
+    def validate(self, node, options=None):
+        '''Checks that the supplied node and options are valid for this
+        transformation.
+
+        :param node: the region in which to replace operations.
+        :type node: :py:class:`psyclone.psyir.nodes.Schedule` or \
+            :py:class:`psyclone.psyir.nodes.Loop`
+        :param options: a dictionary with options for transformations.
+        :type options: dict of string:values or None
+        :param bool options["relaxed_fp"]: whether rewrites that change \
+            the rounding of real results are allowed (default False).
+        :param int options["max_power"]: the largest exponent for which \
+            a power is replaced by multiplications (default 4).
+
+        :raises TransformationError: if the node is not a Schedule or Loop.
+        :raises TransformationError: if the 'relaxed_fp' option is not a \
+            bool.
+        :raises TransformationError: if the 'max_power' option is not a \
+            positive integer.
+
+        '''
+        if not isinstance(node, (Schedule, Loop)):
+            raise TransformationError(
+                "Error in {0} transformation. This transformation can only "
+                "be applied to a 'Schedule' or a 'Loop' but found '{1}'."
+                "".format(self.name, type(node).__name__))
+        if not options:
+            options = {}
+        relaxed_fp = options.get("relaxed_fp", False)
+        if not isinstance(relaxed_fp, bool):
+            raise TransformationError(
+                "Error in {0} transformation. The 'relaxed_fp' option must "
+                "be a bool but found '{1}'."
+                "".format(self.name, type(relaxed_fp).__name__))
+        max_power = options.get("max_power", 4)
+        if not isinstance(max_power, six.integer_types) or \
+           isinstance(max_power, bool) or max_power < 1:
+            raise TransformationError(
+                "Error in {0} transformation. The 'max_power' option must be "
+                "a positive integer but found '{1}'."
+                "".format(self.name, max_power))
+
+    def apply(self, node, options=None):
+        '''Replaces the power and division operations in the supplied
+        Schedule or Loop. See the class description for details.
+
+        :param node: the region in which to replace operations.
+        :type node: :py:class:`psyclone.psyir.nodes.Schedule` or \
+            :py:class:`psyclone.psyir.nodes.Loop`
+        :param options: a dictionary with options for transformations.
+        :type options: dict of string:values or None
+        :param bool options["relaxed_fp"]: whether rewrites that change \
+            the rounding of real results are allowed (default False).
+        :param int options["max_power"]: the largest exponent for which \
+            a power is replaced by multiplications (default 4).
+
+        '''
+        self.validate(node, options)
+        if not options:
+            options = {}
+        relaxed_fp = options.get("relaxed_fp", False)
+        max_power = options.get("max_power", 4)
+
+        self._rewrites = []
+        writer = FortranWriter()
+        for operation in node.walk(BinaryOperation):
+            if operation.operator == BinaryOperation.Operator.POW:
+                self._reduce_power(operation, max_power, relaxed_fp, writer)
+        if relaxed_fp:
+            for loop in node.walk(Loop):
+                self._hoist_reciprocals(loop, writer)
+
+    def _reduce_power(self, operation, max_power, relaxed_fp, writer):
+        '''Replaces the supplied power operation by multiplications if its
+        base is a variable or a literal and its exponent is a suitable
+        integer literal.
+
+        :param operation: the power operation.
+        :type operation: :py:class:`psyclone.psyir.nodes.BinaryOperation`
+        :param int max_power: the largest exponent to replace.
+        :param bool relaxed_fp: whether the rounding of real results may \
+            change.
+        :param writer: the writer used to describe the rewrite.
+        :type writer: :py:class:`psyclone.psyir.backend.fortran.FortranWriter`
+
+        '''
+        base, exponent = operation.children
+        if not isinstance(base, (Reference, Literal)) or \
+           not isinstance(exponent, Literal) or \
+           exponent.datatype.intrinsic != ScalarType.Intrinsic.INTEGER:
+            return
+        power = int(exponent.value)
+        if power < 2 or power > max_power:
+            return
+        base_type = get_expression_datatype(base)
+        if power > 2 and not relaxed_fp and (
+                base_type is None or
+                base_type.intrinsic != ScalarType.Intrinsic.INTEGER):
+            # A product of more than two real values is rounded more than
+            # once.
+            return
+
+        product = base.copy()
+        for _ in range(power - 1):
+            product = BinaryOperation.create(BinaryOperation.Operator.MUL,
+                                             product, base.copy())
+        self._rewrites.append("Replaced '{0}' by '{1}'.".format(
+            writer(operation), writer(product)))
+        operation.replace_with(product)
+
+    def _hoist_reciprocals(self, loop, writer):
+        '''Replaces the divisions by loop-invariant expressions within the
+        supplied loop by multiplications with reciprocals that are computed
+        before the loop.
+
+        :param loop: the loop to transform.
+        :type loop: :py:class:`psyclone.psyir.nodes.Loop`
+        :param writer: the writer used to describe the rewrites.
+        :type writer: :py:class:`psyclone.psyir.backend.fortran.FortranWriter`
+
+        '''
+        if loop.walk((CodeBlock, Call)):
+            # The variables that are modified in the loop are not known
+            return
+        var_accesses = VariablesAccessInfo(loop)
+        written = set(str(signature).split("%")[0] for signature in
+                      var_accesses.all_signatures
+                      if var_accesses.is_written(signature))
+
+        divisions = []
+        self._find_divisions(loop.loop_body, divisions)
+        symbol_table = loop.scope.symbol_table
+        reciprocals = []
+        # Replace the innermost divisions first so that a division within
+        # the numerator of another one is not lost.
+        for division in reversed(divisions):
+            denominator = division.children[1]
+            datatype = get_expression_datatype(denominator)
+            signatures = VariablesAccessInfo(denominator).all_signatures
+            if not signatures or datatype is None or \
+               datatype.intrinsic != ScalarType.Intrinsic.REAL or \
+               get_expression_datatype(division) is None or \
+               any(str(signature).split("%")[0] in written
+                   for signature in signatures):
+                continue
+
+            for previous, symbol in reciprocals:
+                if previous.math_equal(denominator):
+                    break
+            else:
+                symbol = symbol_table.new_symbol(
+                    "reciprocal", symbol_type=DataSymbol, datatype=datatype)
+                loop.parent.children.insert(loop.position, Assignment.create(
+                    Reference(symbol),
+                    BinaryOperation.create(BinaryOperation.Operator.DIV,
+                                           Literal("1.0", datatype),
+                                           denominator.copy())))
+                reciprocals.append((denominator, symbol))
+
+            product = BinaryOperation.create(
+                BinaryOperation.Operator.MUL, division.children[0].copy(),
+                Reference(symbol))
+            self._rewrites.append(
+                "Replaced '{0}' by '{1}' with the reciprocal computed before "
+                "the loop over '{2}'.".format(writer(division),
+                                              writer(product),
+                                              loop.variable.name))
+            division.replace_with(product)
+
+    def _find_divisions(self, node, divisions):
+        '''Adds the division operations within the supplied node (in
+        execution order) to the supplied list, excluding those within an
+        IfBlock.
+
+        :param node: the node to search.
+        :type node: :py:class:`psyclone.psyir.nodes.Node`
+        :param divisions: the divisions found so far.
+        :type divisions: \
+            list of :py:class:`psyclone.psyir.nodes.BinaryOperation`
+
+        '''
+        for child in node.children:
+            if isinstance(child, IfBlock):
+                continue
+            if isinstance(child, BinaryOperation) and \
+               child.operator == BinaryOperation.Operator.DIV:
+                divisions.append(child)
+            self._find_divisions(child, divisions)
+
+
+# For AutoAPI documentation generation
+__all__ = ["StrengthReductionTrans"]
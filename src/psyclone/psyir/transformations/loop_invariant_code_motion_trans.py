@@ -0,0 +1,202 @@
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2021, Science and Technology Facilities Council.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+
+'''This module contains the LoopInvariantCodeMotionTrans transformation.
+'''
+
+from __future__ import absolute_import
+
+from psyclone.core import VariablesAccessInfo
+from psyclone.psyir.nodes import Assignment, Call, CodeBlock, IfBlock, \
+    Operation, Reference
+from psyclone.psyir.symbols import DataSymbol
+from psyclone.psyir.tools.expression_tools import get_expression_datatype
+from psyclone.psyir.transformations.loop_trans import LoopTrans
+from psyclone.psyir.transformations.transformation_error import \
+    TransformationError
+
+
+class LoopInvariantCodeMotionTrans(LoopTrans):
+    '''Hoists the expressions in the body of a loop that have the same value
+    in every iteration into scalar temporaries that are computed before the
+    loop. For example:
+
+    .. code-block:: fortran
+
+      do ji = 1, jpi
+        a(ji,jj) = b(ji,jj) * (1.0_wp / e3t(jj,jk)) + rdt * c(ji,jj)
+      end do
+
+    becomes
+
+    .. code-block:: fortran
+
+      licm_tmp = 1.0_wp / e3t(jj,jk)
+      do ji = 1, jpi
+        a(ji,jj) = b(ji,jj) * licm_tmp + rdt * c(ji,jj)
+      end do
+
+    An expression is invariant if none of the variables it accesses (as
+    reported by :py:class:`psyclone.core.VariablesAccessInfo`) is written
+    in the loop. Only operations (which are all free of side effects in
+    the PSyIR) that contain at least one reference are hoisted. The
+    largest invariant expressions are hoisted and identical expressions
+    share a temporary. Expressions inside an IfBlock within the loop are
+    not hoisted since they may not be safe to evaluate in every
+    iteration. The temporaries are created with
+    :py:meth:`psyclone.psyir.symbols.SymbolTable.new_symbol` in the symbol
+    table of the scope that contains the loop, and an expression is only
+    hoisted if its type can be determined (see
+    :py:func:`psyclone.psyir.tools.get_expression_datatype`).
+
+    Note that the hoisted expressions are evaluated even if the loop
+    executes no iterations. This transformation will have no effect when
+    using the NEMO API until it is updated to use the PSyIR back-ends to
+    generate code (see #435).
+
+    >>> from psyclone.psyir.transformations import \
+            LoopInvariantCodeMotionTrans
+    >>> trans = LoopInvariantCodeMotionTrans()
+    >>> for loop in schedule.walk(Loop):
+    >>>     trans.apply(loop)
+
+    '''
+    def __str__(self):
+        return ("Hoist the loop-invariant expressions of a loop into "
+                "temporaries computed before the loop")
+
+    def validate(self, node, options=None):
+        '''Checks that the supplied node is a loop that can be transformed.
+
+        :param node: the loop to transform.
+        :type node: :py:class:`psyclone.psyir.nodes.Loop`
+        :param options: a dictionary with options for transformations.
+        :type options: dict of string:values or None
+
+        :raises TransformationError: if the loop contains a CodeBlock or a \
+            Call, whose variable accesses are not known.
+
+        '''
+        super(LoopInvariantCodeMotionTrans, self).validate(node,
+                                                           options=options)
+        # Search inside kernels (e.g. the inlined kernels of NEMO) too
+        if node.walk((CodeBlock, Call)):
+            raise TransformationError(
+                "Error in {0} transformation. The loop contains a CodeBlock "
+                "or a Call so the variables it modifies are not known."
+                "".format(self.name))
+
+    def apply(self, node, options=None):
+        '''Hoists the loop-invariant expressions of the supplied loop into
+        scalar temporaries that are assigned immediately before the loop.
+
+        :param node: the loop to transform.
+        :type node: :py:class:`psyclone.psyir.nodes.Loop`
+        :param options: a dictionary with options for transformations.
+        :type options: dict of string:values or None
+
+        '''
+        self.validate(node, options)
+
+        # The names of all variables that are written in the loop. Any
+        # write to part of a structure or array is considered to modify
+        # all of it.
+        var_accesses = VariablesAccessInfo(node)
+        written = set(str(signature).split("%")[0] for signature in
+                      var_accesses.all_signatures
+                      if var_accesses.is_written(signature))
+
+        expressions = []
+        self._find_invariant_expressions(node.loop_body, written, expressions)
+
+        symbol_table = node.scope.symbol_table
+        hoisted = []
+        for expression in expressions:
+            for previous, symbol in hoisted:
+                if previous.math_equal(expression):
+                    break
+            else:
+                symbol = symbol_table.new_symbol(
+                    "licm_tmp", symbol_type=DataSymbol,
+                    datatype=get_expression_datatype(expression))
+                node.parent.children.insert(
+                    node.position,
+                    Assignment.create(Reference(symbol), expression.copy()))
+                hoisted.append((expression, symbol))
+            expression.replace_with(Reference(symbol))
+
+    def _find_invariant_expressions(self, node, written, expressions):
+        '''Adds the largest loop-invariant expressions within the supplied
+        node (in execution order) to the supplied list.
+
+        :param node: the node to search.
+        :type node: :py:class:`psyclone.psyir.nodes.Node`
+        :param written: the names of the variables written in the loop.
+        :type written: set of str
+        :param expressions: the invariant expressions found so far.
+        :type expressions: list of :py:class:`psyclone.psyir.nodes.Operation`
+
+        '''
+        for child in node.children:
+            if isinstance(child, IfBlock):
+                continue
+            if isinstance(child, Operation) and \
+               self._is_invariant(child, written):
+                expressions.append(child)
+            else:
+                self._find_invariant_expressions(child, written, expressions)
+
+    @staticmethod
+    def _is_invariant(expression, written):
+        '''
+        :param expression: an expression in the loop.
+        :type expression: :py:class:`psyclone.psyir.nodes.Operation`
+        :param written: the names of the variables written in the loop.
+        :type written: set of str
+
+        :returns: whether the expression can be hoisted out of the loop.
+        :rtype: bool
+
+        '''
+        accesses = VariablesAccessInfo(expression)
+        if not accesses.all_signatures:
+            return False
+        for signature in accesses.all_signatures:
+            if str(signature).split("%")[0] in written:
+                return False
+        return get_expression_datatype(expression) is not None
+
+
+# For AutoAPI documentation generation
+__all__ = ["LoopInvariantCodeMotionTrans"]
@@ -0,0 +1,159 @@
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2021, Science and Technology Facilities Council.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+
+'''This module contains the LoopUnrollAndJamTrans transformation.
+'''
+
+from __future__ import absolute_import
+
+from psyclone.psyir.nodes import Loop, Reference
+from psyclone.psyir.tools.dependency_tools import DependencyTools
+from psyclone.psyir.transformations.loop_unroll_trans import \
+    LoopUnrollTrans
+from psyclone.psyir.transformations.transformation_error import \
+    TransformationError
+
+
+class LoopUnrollAndJamTrans(LoopUnrollTrans):
+    '''Unrolls the outer loop of a loop nest by the factor given in the
+    'unroll_factor' option (default 2) and fuses ('jams') the resulting
+    copies of the inner loop, so that values loaded in the inner loop can
+    be reused between consecutive iterations of the outer loop. The
+    remaining iterations of the outer loop are handled as in
+    :py:class:`psyclone.psyir.transformations.LoopUnrollTrans`. For
+    example:
+
+    .. code-block:: fortran
+
+      do jk = 1, jpk
+        do ji = 1, jpi
+          a(ji,jk) = b(ji,jk) + b(ji,jk+1)
+        end do
+      end do
+
+    becomes
+
+    .. code-block:: fortran
+
+      do jk = 1, jpk - 1, 2
+        do ji = 1, jpi
+          a(ji,jk) = b(ji,jk) + b(ji,jk+1)
+          a(ji,jk + 1) = b(ji,jk + 1) + b(ji,jk + 1 + 1)
+        end do
+      end do
+      do jk = jk, jpk, 1
+        do ji = 1, jpi
+          a(ji,jk) = b(ji,jk) + b(ji,jk+1)
+        end do
+      end do
+
+    The body of the outer loop must consist of a single loop whose bounds
+    do not depend on the outer loop variable. Since the iterations of
+    the two loops are executed in a different order, the outer loop
+    must not carry any dependence, which is checked with
+    :py:class:`psyclone.psyir.tools.dependency_tools.DependencyTools`.
+
+    >>> from psyclone.psyir.transformations import LoopUnrollAndJamTrans
+    >>> trans = LoopUnrollAndJamTrans()
+    >>> trans.apply(outer_loop, {"unroll_factor": 2})
+
+    '''
+    def __str__(self):
+        return "Unroll the outer loop of a loop nest and jam the inner loops"
+
+    def validate(self, node, options=None):
+        '''Checks that the supplied loop nest can be unrolled and jammed
+        with the supplied options.
+
+        :param node: the outer loop of the nest.
+        :type node: :py:class:`psyclone.psyir.nodes.Loop`
+        :param options: a dictionary with options for transformations.
+        :type options: dict of string:values or None
+        :param int options["unroll_factor"]: the number of copies of the \
+            inner loop body in the transformed nest (default 2).
+
+        :raises TransformationError: if the body of the loop is not a \
+            single loop.
+        :raises TransformationError: if the bounds of the inner loop depend \
+            on the variable of the outer loop.
+        :raises TransformationError: if the outer loop carries a dependence.
+
+        '''
+        super(LoopUnrollAndJamTrans, self).validate(node, options=options)
+
+        body = node.loop_body.children
+        if len(body) != 1 or not isinstance(body[0], Loop):
+            raise TransformationError(
+                "Error in {0} transformation. The body of the loop must "
+                "consist of a single loop but found {1}."
+                "".format(self.name,
+                          [type(child).__name__ for child in body]))
+
+        inner = body[0]
+        for bound in inner.children[0:3]:
+            for reference in bound.walk(Reference):
+                if reference.name == node.variable.name:
+                    raise TransformationError(
+                        "Error in {0} transformation. The bounds of the "
+                        "inner loop over '{1}' depend on the variable '{2}' "
+                        "of the outer loop.".format(
+                            self.name, inner.variable.name,
+                            node.variable.name))
+
+        dep_tools = DependencyTools(loop_types_to_parallelise=[
+            node.loop_type])
+        if not dep_tools.can_loop_be_parallelised(node,
+                                                  test_all_variables=True):
+            raise TransformationError(
+                "Error in {0} transformation. The iterations of the loop "
+                "over '{1}' can not be reordered: {2}".format(
+                    self.name, node.variable.name,
+                    " ".join(dep_tools.get_all_messages())))
+
+    @staticmethod
+    def _body(node):
+        '''
+        :param node: the outer loop of the nest.
+        :type node: :py:class:`psyclone.psyir.nodes.Loop`
+
+        :returns: the body of the inner loop, whose statements are \
+            replicated.
+        :rtype: :py:class:`psyclone.psyir.nodes.Schedule`
+
+        '''
+        return node.loop_body[0].loop_body
+
+
+# For AutoAPI documentation generation
+__all__ = ["LoopUnrollAndJamTrans"]
@@ -0,0 +1,283 @@
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2021, Science and Technology Facilities Council.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+
+'''This module contains the LoopUnrollTrans transformation.
+'''
+
+from __future__ import absolute_import
+
+import six
+
+from psyclone.psyGen import BuiltIn, CodedKern
+from psyclone.psyir.nodes import BinaryOperation, CodeBlock, Literal, \
+    Reference, UnaryOperation
+from psyclone.psyir.symbols import INTEGER_TYPE
+from psyclone.psyir.transformations.loop_trans import LoopTrans
+from psyclone.psyir.transformations.transformation_error import \
+    TransformationError
+
+
+class LoopUnrollTrans(LoopTrans):
+    '''Unrolls a loop by the factor given in the 'unroll_factor' option
+    (default 2). A loop with constant bounds is unrolled into a loop with
+    a larger step and, if the number of iterations is not a multiple of
+    the unroll factor, a remainder loop with constant bounds. Otherwise
+    a remainder loop that starts at the final value of the loop variable
+    of the unrolled loop handles the remaining iterations. For example:
+
+    .. code-block:: fortran
+
+      do jk = 1, jpk
+        a(jk) = b(jk) * c(jk)
+      end do
+
+    becomes
+
+    .. code-block:: fortran
+
+      do jk = 1, jpk - 1, 2
+        a(jk) = b(jk) * c(jk)
+        a(jk + 1) = b(jk + 1) * c(jk + 1)
+      end do
+      do jk = jk, jpk, 1
+        a(jk) = b(jk) * c(jk)
+      end do
+
+    The step of the loop must be an integer literal. Since the loop
+    body is only replicated, the order of the computations does not
+    change and the transformation is always valid. The loop must not
+    contain calls to kernels (the loops inside a kernel can be unrolled
+    by transforming its schedule, see
+    :py:meth:`psyclone.psyGen.CodedKern.get_kernel_schedule`) nor
+    CodeBlocks, since the uses of the loop variable within them cannot
+    be updated.
+
+    >>> from psyclone.psyir.transformations import LoopUnrollTrans
+    >>> trans = LoopUnrollTrans()
+    >>> trans.apply(loop, {"unroll_factor": 4})
+
+    '''
+    def __str__(self):
+        return "Unroll a loop"
+
+    def validate(self, node, options=None):
+        '''Checks that the supplied loop can be unrolled with the
+        supplied options.
+
+        :param node: the loop to unroll.
+        :type node: :py:class:`psyclone.psyir.nodes.Loop`
+        :param options: a dictionary with options for transformations.
+        :type options: dict of string:values or None
+        :param int options["unroll_factor"]: the number of copies of the \
+            loop body in the unrolled loop (default 2).
+
+        :raises TransformationError: if the unroll factor is not an \
+            integer larger than 1.
+        :raises TransformationError: if the step of the loop is not a \
+            non-zero integer constant.
+        :raises TransformationError: if the loop contains a kernel call or \
+            a CodeBlock.
+
+        '''
+        super(LoopUnrollTrans, self).validate(node, options=options)
+        if not options:
+            options = {}
+
+        factor = options.get("unroll_factor", 2)
+        if not isinstance(factor, six.integer_types) or \
+           isinstance(factor, bool) or factor < 2:
+            raise TransformationError(
+                "Error in {0} transformation. The 'unroll_factor' option "
+                "must be an integer larger than 1 but found '{1}'."
+                "".format(self.name, factor))
+
+        if not _integer_value(node.step_expr):
+            raise TransformationError(
+                "Error in {0} transformation. The step of the loop must be "
+                "a non-zero integer constant but found '{1}'."
+                "".format(self.name, type(node.step_expr).__name__))
+
+        invalid = node.loop_body.walk((CodedKern, BuiltIn, CodeBlock))
+        if invalid:
+            raise TransformationError(
+                "Error in {0} transformation. The loop contains a '{1}' "
+                "within which the loop variable can not be updated."
+                "".format(self.name, type(invalid[0]).__name__))
+
+    def apply(self, node, options=None):
+        '''Unrolls the supplied loop and adds a remainder loop after it if
+        required.
+
+        :param node: the loop to unroll.
+        :type node: :py:class:`psyclone.psyir.nodes.Loop`
+        :param options: a dictionary with options for transformations.
+        :type options: dict of string:values or None
+        :param int options["unroll_factor"]: the number of copies of the \
+            loop body in the unrolled loop (default 2).
+
+        '''
+        self.validate(node, options)
+        if not options:
+            options = {}
+        factor = options.get("unroll_factor", 2)
+        step = _integer_value(node.step_expr)
+
+        self._add_remainder_loop(node, step, factor)
+        self._replicate(self._body(node), node.variable, step, factor)
+
+    @staticmethod
+    def _body(node):
+        '''
+        :param node: the loop to unroll.
+        :type node: :py:class:`psyclone.psyir.nodes.Loop`
+
+        :returns: the schedule containing the statements to replicate.
+        :rtype: :py:class:`psyclone.psyir.nodes.Schedule`
+
+        '''
+        return node.loop_body
+
+    @staticmethod
+    def _add_remainder_loop(node, step, factor):
+        '''Changes the bounds and step of the supplied loop so that it
+        executes every factor-th iteration of the original loop as long as
+        all of the following factor - 1 iterations exist too, and adds a
+        copy of the original loop that executes the remaining iterations
+        after it if required.
+
+        :param node: the loop to modify.
+        :type node: :py:class:`psyclone.psyir.nodes.Loop`
+        :param int step: the step of the loop.
+        :param int factor: the unroll factor.
+
+        '''
+        remainder = node.copy()
+        first = _integer_value(node.start_expr)
+        last = _integer_value(node.stop_expr)
+        stop = node.stop_expr
+        if first is not None and last is not None:
+            # The number of iterations is known
+            iterations = max(0, (last - first + step) // step)
+            unrolled = iterations // factor * factor
+            stop.replace_with(
+                _integer_literal(first + (unrolled - factor) * step))
+            if unrolled < iterations:
+                remainder.start_expr.replace_with(
+                    _integer_literal(first + unrolled * step))
+            else:
+                remainder = None
+        else:
+            # The loop variable is defined as the first value that was not
+            # executed once the unrolled loop has finished.
+            offset = (factor - 1) * step
+            operator = BinaryOperation.Operator.SUB if offset > 0 else \
+                BinaryOperation.Operator.ADD
+            stop.replace_with(BinaryOperation.create(
+                operator, stop.copy(),
+                Literal(str(abs(offset)), INTEGER_TYPE)))
+            remainder.start_expr.replace_with(Reference(node.variable))
+        node.step_expr.replace_with(_integer_literal(factor * step))
+
+        if remainder:
+            node.parent.children.insert(node.position + 1, remainder)
+
+    @staticmethod
+    def _replicate(schedule, variable, step, factor):
+        '''Appends factor - 1 copies of the statements in the supplied
+        schedule, in which the loop variable of the supplied loop is
+        replaced by its value in the following iterations, to the
+        schedule.
+
+        :param schedule: the schedule containing the statements to copy.
+        :type schedule: :py:class:`psyclone.psyir.nodes.Schedule`
+        :param variable: the loop variable to update in the copies.
+        :type variable: :py:class:`psyclone.psyir.symbols.DataSymbol`
+        :param int step: the step of the original loop.
+        :param int factor: the unroll factor.
+
+        '''
+        statements = schedule.children[:]
+        for iteration in range(1, factor):
+            offset = iteration * step
+            for statement in statements:
+                new_statement = statement.copy()
+                for reference in new_statement.walk(Reference):
+                    # pylint: disable=unidiomatic-typecheck
+                    if type(reference) is Reference and \
+                       reference.name == variable.name:
+                        operator = BinaryOperation.Operator.ADD if \
+                            offset > 0 else BinaryOperation.Operator.SUB
+                        reference.replace_with(BinaryOperation.create(
+                            operator, Reference(variable),
+                            Literal(str(abs(offset)), INTEGER_TYPE)))
+                schedule.children.append(new_statement)
+
+
+def _integer_value(node):
+    '''
+    :param node: an expression.
+    :type node: :py:class:`psyclone.psyir.nodes.DataNode`
+
+    :returns: the value of the expression if it is an integer literal or \
+        the negation of one, None otherwise.
+    :rtype: int or NoneType
+
+    '''
+    sign = 1
+    if isinstance(node, UnaryOperation) and \
+       node.operator == UnaryOperation.Operator.MINUS:
+        sign = -1
+        node = node.children[0]
+    if isinstance(node, Literal) and \
+       node.datatype.intrinsic == INTEGER_TYPE.intrinsic:
+        return sign * int(node.value)
+    return None
+
+
+def _integer_literal(value):
+    '''
+    :param int value: an integer value.
+
+    :returns: an expression with the supplied value.
+    :rtype: :py:class:`psyclone.psyir.nodes.DataNode`
+
+    '''
+    if value < 0:
+        return UnaryOperation.create(UnaryOperation.Operator.MINUS,
+                                     Literal(str(-value), INTEGER_TYPE))
+    return Literal(str(value), INTEGER_TYPE)
+
+
+# For AutoAPI documentation generation
+__all__ = ["LoopUnrollTrans"]
@@ -62,6 +62,8 @@ DEFAULTSTUBAPI = dynamo0.3
 DISTRIBUTED_MEMORY = true
 REPRODUCIBLE_REDUCTIONS = false
 REPROD_PAD_SIZE = 8
+REPROD_REDUCTION_STRATEGY = tree
+REPROD_BLOCK_SIZE = 512
 VALID_PSY_DATA_PREFIXES = profile, extract
 OCL_DEVICES_PER_NODE = 1
 [dynamo0.3]
@@ -117,7 +119,8 @@ def bool_entry(request):
 
 
 @pytest.fixture(scope="module",
-                params=["REPROD_PAD_SIZE", "OCL_DEVICES_PER_NODE"])
+                params=["REPROD_PAD_SIZE", "REPROD_BLOCK_SIZE",
+                        "OCL_DEVICES_PER_NODE"])
 def int_entry(request):
     '''
     Parameterised fixture that returns the names of integer members of the
@@ -307,6 +310,10 @@ def test_read_values():
     pad = _config.reprod_pad_size
     assert isinstance(pad, int)
     assert pad == 8
+    # The strategy and block size for reproducible reductions take their
+    # default values as they are not in the config file
+    assert _config.reprod_reduction_strategy == "padded"
+    assert _config.reprod_block_size == 1024
     # The filename of the config file which was parsed to produce
     # the Config object
     assert _config.filename == str(TEST_CONFIG)
@@ -415,6 +422,32 @@ def test_not_int(int_entry, tmpdir):
             in str(err.value))
 
 
+def test_reprod_reduction_strategy(tmpdir):
+    ''' Check that the strategy and block size for reproducible reductions
+    are read from the config file and that invalid values are rejected.
+
+    '''
+    config_file = tmpdir.join("config")
+    _config = config(config_file, _CONFIG_CONTENT)
+    assert _config.reprod_reduction_strategy == "tree"
+    assert _config.reprod_block_size == 512
+
+    content = re.sub(r"^REPROD_REDUCTION_STRATEGY = .*$",
+                     "REPROD_REDUCTION_STRATEGY = kahan",
+                     _CONFIG_CONTENT, flags=re.MULTILINE)
+    with pytest.raises(ConfigurationError) as err:
+        config(config_file, content)
+    assert ("REPROD_REDUCTION_STRATEGY must be one of ['padded', 'tree'] but "
+            "got 'kahan'." in str(err.value))
+
+    content = re.sub(r"^REPROD_BLOCK_SIZE = .*$", "REPROD_BLOCK_SIZE = 0",
+                     _CONFIG_CONTENT, flags=re.MULTILINE)
+    with pytest.raises(ConfigurationError) as err:
+        config(config_file, content)
+    assert ("REPROD_BLOCK_SIZE must be a positive integer but got '0'."
+            in str(err.value))
+
+
 def test_broken_fmt(tmpdir):
     ''' Check the error if the formatting of the configuration file is
     wrong.
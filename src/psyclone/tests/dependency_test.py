@@ -456,6 +456,9 @@ def test_math_equal(parser):
                                     x = a(1,2)            ! 11
                                     x = i+j+k             ! 12
                                     x = j+i+k             ! 13
+                                    x = i*j               ! 14
+                                    x = 2                 ! 15
+                                    x = 2.0               ! 16
                                     end program test_prog
                                  ''')
     prog = parser(reader)
@@ -510,6 +513,16 @@ def test_math_equal(parser):
     exp12 = schedule[12].rhs
     assert exp12.math_equal(schedule[13].rhs)
 
+    # Same type of operation, but different operators: i+j and i*j
+    assert not exp5.math_equal(schedule[14].rhs)
+    assert not schedule[14].rhs.math_equal(exp5)
+
+    # Literals are only equal to literals of the same value and type
+    exp15 = schedule[15].rhs
+    assert not exp15.math_equal(exp0)
+    assert not exp15.math_equal(schedule[16].rhs)
+    assert exp15.math_equal(exp15.copy())
+
 
 @pytest.mark.xfail(reason="Limitation when using commutative law - #533")
 def test_math_equal_limitations(parser):
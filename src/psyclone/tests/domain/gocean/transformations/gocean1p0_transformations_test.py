@@ -53,11 +53,11 @@ from psyclone.gocean1p0 import GOLoop
 from psyclone.psyir.nodes import Loop
 from psyclone.psyir.transformations import LoopFuseTrans, LoopTrans, \
     TransformationError
-from psyclone.transformations import ACCKernelsTrans, GOConstLoopBoundsTrans, \
-    GOLoopSwapTrans, OMPParallelTrans, MoveTrans, \
+from psyclone.transformations import ACCAsyncTrans, ACCKernelsTrans, \
+    GOConstLoopBoundsTrans, GOLoopSwapTrans, OMPParallelTrans, MoveTrans, \
     GOceanOMPParallelLoopTrans, GOceanOMPLoopTrans, KernelModuleInlineTrans, \
     ACCParallelTrans, ACCEnterDataTrans, ACCDataTrans, ACCLoopTrans, \
-    OCLTrans, OMPLoopTrans
+    OCLTrans, OMPLoopTrans, OMPNowaitTrans, OMPTaskTrans, OMPTaskloopTrans
 from psyclone.tests.gocean1p0_build import GOcean1p0Build, GOcean1p0OpenCLBuild
 from psyclone.tests.utilities import count_lines, get_invoke, Compile
 
@@ -251,6 +251,168 @@ def test_omp_parallel_loop(tmpdir):
     assert GOcean1p0Build(tmpdir).code_compiles(psy)
 
 
+def test_omp_do_collapse(tmpdir):
+    ''' Test that an OMP DO with a collapse clause is generated correctly,
+    both when requested explicitly and when chosen by the 'auto_schedule'
+    option (the GOcean loop bounds are not known so the outer loop is
+    assumed to be long enough). '''
+    psy, invoke = get_invoke("single_invoke_three_kernels.f90", API, idx=0,
+                             dist_mem=False)
+    schedule = invoke.schedule
+    ompl = GOceanOMPLoopTrans()
+    ompr = OMPParallelTrans()
+    ompl.apply(schedule[0], {"collapse": 2})
+    ompl.apply(schedule[1], {"auto_schedule": True})
+    ompr.apply(schedule.children[0:2])
+
+    gen = str(psy.gen).lower()
+    expected = ("      !$omp do schedule(static), collapse(2)\n"
+                "      do j=cu_fld%internal%ystart,cu_fld%internal%ystop\n"
+                "        do i=cu_fld%internal%xstart,cu_fld%internal%xstop\n"
+                "          call compute_cu_code(i, j, cu_fld%data, "
+                "p_fld%data, u_fld%data)\n"
+                "        end do\n"
+                "      end do\n"
+                "      !$omp end do\n"
+                "      !$omp do schedule(static)\n")
+    assert expected in gen
+    assert GOcean1p0Build(tmpdir).code_compiles(psy)
+
+
+def test_omp_parallel_do_collapse(tmpdir):
+    ''' Test that an OMP PARALLEL DO with a collapse clause is generated
+    correctly, both when requested explicitly and when chosen by the
+    'auto_schedule' option. '''
+    psy, invoke = get_invoke("single_invoke_three_kernels.f90", API, idx=0,
+                             dist_mem=False)
+    schedule = invoke.schedule
+    omp = GOceanOMPParallelLoopTrans()
+    omp.apply(schedule[0], {"collapse": 2})
+    omp.apply(schedule[1], {"auto_schedule": True})
+    assert schedule[0].collapse == 2
+    assert schedule[1].collapse is None
+
+    gen = str(psy.gen).lower()
+    expected = ("      !$omp parallel do default(shared), private(i,j), "
+                "schedule(static), collapse(2)\n"
+                "      do j=cu_fld%internal%ystart,cu_fld%internal%ystop\n"
+                "        do i=cu_fld%internal%xstart,cu_fld%internal%xstop\n"
+                "          call compute_cu_code(i, j, cu_fld%data, "
+                "p_fld%data, u_fld%data)\n"
+                "        end do\n"
+                "      end do\n"
+                "      !$omp end parallel do\n"
+                "      !$omp parallel do default(shared), private(i,j), "
+                "schedule(static)\n")
+    assert expected in gen
+    assert GOcean1p0Build(tmpdir).code_compiles(psy)
+
+    # Check that we reject attempts to collapse more loops than we have
+    with pytest.raises(TransformationError) as err:
+        omp.apply(schedule[2], {"collapse": 3})
+    assert ("Cannot apply COLLAPSE(3) clause to a loop nest containing "
+            "only 2 loops" in str(err.value))
+
+
+def test_omp_nowait(tmpdir):
+    ''' Test that OMPNowaitTrans only removes the barrier at the end of
+    an OpenMP do loop when none of the following loops in the parallel
+    region depend on it. '''
+    psy, invoke = get_invoke("single_invoke_three_kernels_deps.f90", API,
+                             idx=0, dist_mem=False)
+    schedule = invoke.schedule
+    ompl = GOceanOMPLoopTrans()
+    for child in schedule.children:
+        ompl.apply(child)
+    OMPParallelTrans().apply(schedule.children)
+    # The third kernel reads the fields written by the first two so only
+    # the last loop (which is followed by the end of the parallel region)
+    # can have a nowait clause.
+    OMPNowaitTrans().apply(schedule[0])
+    assert [child.nowait for child in schedule[0].dir_body.children] == \
+        [False, False, True]
+
+    gen = str(psy.gen).lower()
+    assert gen.count("!$omp end do\n") == 2
+    assert ("        end do\n"
+            "      end do\n"
+            "      !$omp end do nowait\n"
+            "      !$omp end parallel\n" in gen)
+    assert GOcean1p0Build(tmpdir).code_compiles(psy)
+
+    # Without the dependences all of the barriers are removed
+    psy, invoke = get_invoke("single_invoke_three_kernels.f90", API,
+                             idx=0, dist_mem=False)
+    schedule = invoke.schedule
+    for child in schedule.children:
+        ompl.apply(child)
+    OMPParallelTrans().apply(schedule.children)
+    OMPNowaitTrans().apply(schedule[0])
+    gen = str(psy.gen).lower()
+    assert gen.count("!$omp end do nowait\n") == 3
+    assert GOcean1p0Build(tmpdir).code_compiles(psy)
+
+
+def test_omp_task(tmpdir):
+    ''' Test that the kernels of a GOcean invoke can be executed as OpenMP
+    tasks with dependences on the fields they access. '''
+    psy, invoke = get_invoke("single_invoke_three_kernels.f90", API, idx=0,
+                             dist_mem=False)
+    schedule = invoke.schedule
+    OMPTaskTrans().apply(schedule.children)
+
+    gen = str(psy.gen).lower()
+    expected = (
+        "      !$omp parallel default(shared), private(i,j)\n"
+        "      !$omp single\n"
+        "      !$omp task depend(in: p_fld,u_fld), depend(out: cu_fld)\n"
+        "      do j=cu_fld%internal%ystart,cu_fld%internal%ystop\n")
+    assert expected in gen
+    assert ("      !$omp task depend(in: p_fld,v_fld), depend(out: cv_fld)\n"
+            in gen)
+    expected = (
+        "      !$omp task depend(in: u_fld,unew_fld), depend(inout: "
+        "uold_fld)\n"
+        "      do j=1,size(uold_fld%data, 2)\n"
+        "        do i=1,size(uold_fld%data, 1)\n"
+        "          call time_smooth_code(i, j, u_fld%data, unew_fld%data, "
+        "uold_fld%data)\n"
+        "        end do\n"
+        "      end do\n"
+        "      !$omp end task\n"
+        "      !$omp end single\n"
+        "      !$omp end parallel\n")
+    assert expected in gen
+    assert GOcean1p0Build(tmpdir).code_compiles(psy)
+
+
+def test_omp_taskloop(tmpdir):
+    ''' Test that an OpenMP taskloop is generated correctly for a GOcean
+    loop. '''
+    psy, invoke = get_invoke("single_invoke_three_kernels.f90", API, idx=0,
+                             dist_mem=False)
+    schedule = invoke.schedule
+    OMPTaskloopTrans().apply(schedule[0], {"grainsize": 4})
+    OMPParallelTrans().apply(schedule[0])
+
+    gen = str(psy.gen).lower()
+    expected = (
+        "      !$omp parallel default(shared), private(i,j)\n"
+        "      !$omp single\n"
+        "      !$omp taskloop grainsize(4)\n"
+        "      do j=cu_fld%internal%ystart,cu_fld%internal%ystop\n"
+        "        do i=cu_fld%internal%xstart,cu_fld%internal%xstop\n"
+        "          call compute_cu_code(i, j, cu_fld%data, p_fld%data, "
+        "u_fld%data)\n"
+        "        end do\n"
+        "      end do\n"
+        "      !$omp end taskloop\n"
+        "      !$omp end single\n"
+        "      !$omp end parallel\n")
+    assert expected in gen
+    assert GOcean1p0Build(tmpdir).code_compiles(psy)
+
+
 def test_omp_region_with_wrong_arg_type():
     ''' Test that the OpenMP PARALLEL region transformation
         raises an appropriate error if passed something that is not
@@ -1573,6 +1735,30 @@ def test_acc_parallel_trans(tmpdir):
     assert GOcean1p0Build(tmpdir).code_compiles(psy)
 
 
+def test_acc_parallel_async(tmpdir):
+    ''' Test that ACCAsyncTrans executes independent OpenACC parallel
+    regions on different queues and that a region that reads the fields
+    written by two others waits for both of them. '''
+    psy, invoke = get_invoke("single_invoke_three_kernels_deps.f90", API,
+                             idx=0, dist_mem=False)
+    schedule = invoke.schedule
+    acct = ACCParallelTrans()
+    for child in schedule.children[:]:
+        acct.apply(child)
+    ACCEnterDataTrans().apply(schedule)
+    ACCAsyncTrans().apply(schedule)
+
+    code = str(psy.gen)
+    assert code.count("!$acc parallel default(present) async(1)\n") == 1
+    assert code.count("!$acc parallel default(present) async(2)\n") == 1
+    assert ("      !$acc end parallel\n"
+            "      !$acc parallel default(present) async(2) wait(1)\n"
+            in code)
+    assert ("      !$acc end parallel\n"
+            "      !$acc wait(1,2)\n" in code)
+    assert GOcean1p0Build(tmpdir).code_compiles(psy)
+
+
 def test_acc_incorrect_parallel_trans():
     '''Test that the acc transform can not be used to change
     the order of operations.'''
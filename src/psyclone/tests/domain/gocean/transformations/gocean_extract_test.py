@@ -731,3 +731,110 @@ def test_change_prefix(tmpdir, monkeypatch):
     with open(str(driver_name), "r") as driver_file:
         driver_code = driver_file.read()
     assert 'CALL NEW_psy_data%OpenRead("main", "update")' in driver_code
+
+
+# -----------------------------------------------------------------------------
+def test_tune_local_size_validation():
+    ''' Check that the 'tune_local_size' option of the extraction
+    transformation is validated. '''
+    etrans = GOceanExtractTrans()
+    _, invoke = get_invoke("single_invoke_three_kernels.f90",
+                           GOCEAN_API, idx=0, dist_mem=False)
+    schedule = invoke.schedule
+
+    for value in [3, [], [16, 0], [16, "32"]]:
+        with pytest.raises(TransformationError) as excinfo:
+            etrans.apply(schedule.children[0],
+                         {"create_driver": True, "tune_local_size": value})
+        assert ("the 'tune_local_size' option must be a list of positive "
+                "integers but got" in str(excinfo.value))
+
+    with pytest.raises(TransformationError) as excinfo:
+        etrans.apply(schedule.children[0], {"tune_local_size": [16, 32]})
+    assert ("the 'tune_local_size' option requires the 'create_driver' "
+            "option." in str(excinfo.value))
+
+
+# -----------------------------------------------------------------------------
+def test_tune_local_size_driver(tmpdir):
+    ''' Check that the 'tune_local_size' option creates a driver that times
+    the candidate OpenCL local sizes of each kernel and writes the best
+    one to the tuning file, and that the OpenCL source of the kernels is
+    written next to it. '''
+    from psyclone.domain.gocean.transformations import \
+        GOMoveIterationBoundariesInsideKernelTrans
+    from psyclone.gocean1p0 import GOKern
+    tmpdir.chdir()
+
+    psy, invoke = get_invoke("single_invoke_three_kernels.f90",
+                             GOCEAN_API, idx=0, dist_mem=False)
+    schedule = invoke.schedule
+    for kern in schedule.coded_kernels():
+        GOMoveIterationBoundariesInsideKernelTrans().apply(kern)
+
+    etrans = GOceanExtractTrans()
+    etrans.apply(schedule.children[:10],
+                 {"create_driver": True, "tune_local_size": [16, 32, 64]})
+    kernels = schedule.children[0].walk(GOKern)
+    assert len(kernels) == 2
+    # Generate the code so that the driver is created
+    str(psy.gen)
+
+    driver = tmpdir.join("driver-psy_single_invoke_three_kernels-"
+                         "invoke_0:r0.f90")
+    with open(str(driver), "r") as driver_file:
+        driver_code = driver_file.read()
+
+    assert "CALL ocl_env_init" in driver_code
+    assert "clSetKernelArg" in driver_code
+    assert "clEnqueueWriteBuffer" in driver_code
+    for idx, kern in enumerate(kernels):
+        assert ("CALL tune_local_size(kernel_{0}, SIZE(".format(kern.name)
+                in driver_code)
+        assert "best_local_size({0}))".format(idx+1) in driver_code
+        assert 'get_kernel_by_name("{0}")'.format(kern.name) in driver_code
+    assert "(/16, 32, 64/)" in driver_code
+    assert "CALL write_local_size_tuning(best_local_size)" in driver_code
+    assert "SUBROUTINE tune_local_size(" in driver_code
+    assert "SUBROUTINE write_local_size_tuning(" in driver_code
+    # The extracted region itself is not part of a tuning driver
+    assert "CALL compute_cu_code(" not in driver_code
+
+    ocl_file = tmpdir.join("driver-psy_single_invoke_three_kernels-"
+                           "invoke_0:r0.cl")
+    ocl_code = ocl_file.read()
+    for kern in kernels:
+        assert "__kernel void {0}(".format(kern.name) in ocl_code
+    assert "reqd_work_group_size" not in ocl_code
+
+
+# -----------------------------------------------------------------------------
+def test_tune_local_size_driver_errors(tmpdir):
+    ''' Check the errors raised when a tuning driver cannot be created. '''
+    from psyclone.domain.gocean.transformations import \
+        GOMoveIterationBoundariesInsideKernelTrans
+    from psyclone.errors import GenerationError
+    tmpdir.chdir()
+
+    # The iteration boundaries have not been moved into the kernel
+    psy, invoke = get_invoke("single_invoke_three_kernels.f90",
+                             GOCEAN_API, idx=0, dist_mem=False)
+    etrans = GOceanExtractTrans()
+    etrans.apply(invoke.schedule.children[0],
+                 {"create_driver": True, "tune_local_size": [16]})
+    with pytest.raises(GenerationError) as excinfo:
+        str(psy.gen)
+    assert ("because its iteration boundaries are not kernel arguments"
+            in str(excinfo.value))
+
+    # A kernel with a scalar argument
+    psy, invoke = get_invoke("single_invoke_scalar_float_arg.f90",
+                             GOCEAN_API, idx=0, dist_mem=False)
+    for kern in invoke.schedule.coded_kernels():
+        GOMoveIterationBoundariesInsideKernelTrans().apply(kern)
+    etrans.apply(invoke.schedule.children,
+                 {"create_driver": True, "tune_local_size": [16]})
+    with pytest.raises(GenerationError) as excinfo:
+        str(psy.gen)
+    assert ("does not support its scalar argument 'a_scalar' (TODO #644)."
+            in str(excinfo.value))
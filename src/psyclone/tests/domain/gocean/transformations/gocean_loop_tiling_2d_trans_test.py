@@ -0,0 +1,212 @@
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2021, Science and Technology Facilities Council.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+
+''' Module containing tests for the PSyclone GOceanLoopTiling2DTrans
+transformation.
+'''
+
+from __future__ import absolute_import
+import pytest
+from psyclone.configuration import Config
+from psyclone.domain.gocean.transformations import GOceanLoopTiling2DTrans
+from psyclone.gocean1p0 import GOLoop
+from psyclone.psyir.symbols import DataSymbol, INTEGER_TYPE
+from psyclone.psyir.transformations import TransformationError
+from psyclone.tests.gocean1p0_build import GOcean1p0Build
+from psyclone.tests.utilities import get_invoke
+from psyclone.transformations import GOConstLoopBoundsTrans, \
+    GOceanOMPParallelLoopTrans, OCLTrans
+
+API = "gocean1.0"
+
+
+@pytest.fixture(scope="module", autouse=True)
+def setup():
+    '''Make sure that all tests here use gocean1.0 as API.'''
+    Config.get().api = "gocean1.0"
+    yield()
+    Config._instance = None
+
+
+def test_description():
+    ''' Check that the transformation returns the expected strings. '''
+    trans = GOceanLoopTiling2DTrans()
+    assert trans.name == "GOceanLoopTiling2DTrans"
+    assert str(trans) == "Tile a GOcean loop nest over 2D tiles"
+
+
+def test_goloop_tile():
+    ''' Check the tile property of a GOLoop. '''
+    _, invoke = get_invoke("single_invoke_three_kernels.f90", API, idx=0,
+                           dist_mem=False)
+    loop = invoke.schedule.walk(GOLoop)[0]
+    assert loop.tile is None
+    symbol = DataSymbol("j_tile", INTEGER_TYPE)
+    loop.tile = (symbol, 16)
+    assert loop.tile == (symbol, 16)
+    loop.tile = None
+    assert loop.tile is None
+    for value in [16, (symbol, 0), ("j_tile", 16), (symbol, 16, 1)]:
+        with pytest.raises(TypeError) as err:
+            loop.tile = value
+        assert ("The tile of a GOLoop must be None or a tuple of a "
+                "DataSymbol and a positive integer but got" in str(err.value))
+
+
+def test_validate():
+    ''' Check that the transformation can only be applied to an untiled
+    GOcean loop nest and that the tile sizes are validated. '''
+    trans = GOceanLoopTiling2DTrans()
+    _, invoke = get_invoke("single_invoke_three_kernels.f90", API, idx=0,
+                           dist_mem=False)
+    sched = invoke.schedule
+    outer = sched.children[0]
+    inner = outer.loop_body[0]
+
+    with pytest.raises(TransformationError) as err:
+        trans.validate(inner)
+    assert ("The supplied node must be an outer GOLoop but got "
+            "'Loop[type='inner'" in str(err.value))
+
+    # Add a second statement to the outer loop
+    outer.loop_body.addchild(sched.children[1].detach())
+    with pytest.raises(TransformationError) as err:
+        trans.validate(outer)
+    assert ("The supplied loop must contain exactly one inner GOLoop but "
+            "found ['GOLoop', 'GOLoop']." in str(err.value))
+    sched.children.insert(1, outer.loop_body[1].detach())
+
+    for key in ["tilesize", "tilesize_i", "tilesize_j"]:
+        for value in [0, -4, "8", True]:
+            with pytest.raises(TransformationError) as err:
+                trans.validate(outer, {key: value})
+            assert ("The '{0}' option must be a positive integer but got "
+                    "'{1}'.".format(key, value) in str(err.value))
+
+    trans.apply(outer)
+    with pytest.raises(TransformationError) as err:
+        trans.validate(sched.children[0].loop_body[0].loop_body[0])
+    assert "The supplied loop nest is already tiled." in str(err.value)
+
+    OCLTrans().apply(sched)
+    with pytest.raises(TransformationError) as err:
+        trans.validate(sched.children[1])
+    assert ("Loops are not generated for an OpenCL InvokeSchedule so they "
+            "cannot be tiled." in str(err.value))
+
+
+def test_apply(tmpdir):
+    ''' Check the code that is generated for tiled loop nests. '''
+    trans = GOceanLoopTiling2DTrans()
+    psy, invoke = get_invoke("single_invoke_three_kernels.f90", API, idx=0,
+                             dist_mem=False)
+    sched = invoke.schedule
+    trans.apply(sched.children[0])
+    trans.apply(sched.children[1], {"tilesize": 64, "tilesize_i": 16})
+    # The loop over the tiles iterates over the original iteration space
+    tile_loop = sched.children[0]
+    assert isinstance(tile_loop, GOLoop)
+    assert tile_loop.loop_type == "outer"
+    assert tile_loop.tile is None
+    assert tile_loop.loop_body[0].loop_type == "inner"
+    assert tile_loop.field_space == "go_cu"
+    assert tile_loop.iteration_space == "go_internal_pts"
+    assert tile_loop.loop_body[0].loop_body[0].tile == \
+        (tile_loop.variable, 32)
+    code = str(psy.gen).lower()
+
+    # The variables of the loops over tiles are shared by both loop nests
+    assert code.count("integer j_tile\n") == 1
+    assert code.count("integer i_tile\n") == 1
+    assert ("      do j_tile=cu_fld%internal%ystart,cu_fld%internal%ystop,32\n"
+            "        do i_tile=cu_fld%internal%xstart,cu_fld%internal%xstop,"
+            "32\n"
+            "          do j=j_tile,min(j_tile + 31, cu_fld%internal%ystop)\n"
+            "            do i=i_tile,min(i_tile + 31, cu_fld%internal%xstop)\n"
+            "              call compute_cu_code(i, j, cu_fld%data, "
+            "p_fld%data, u_fld%data)\n" in code)
+    assert ("      do j_tile=cv_fld%internal%ystart,cv_fld%internal%ystop,64\n"
+            "        do i_tile=cv_fld%internal%xstart,cv_fld%internal%xstop,"
+            "16\n"
+            "          do j=j_tile,min(j_tile + 63, cv_fld%internal%ystop)\n"
+            "            do i=i_tile,min(i_tile + 15, cv_fld%internal%xstop)\n"
+            in code)
+    # The third loop nest is unchanged
+    assert "      do j=1,size(uold_fld%data, 2)\n" in code
+    assert GOcean1p0Build(tmpdir).code_compiles(psy)
+
+
+def test_apply_const_loop_bounds(tmpdir):
+    ''' Check that the tiled loops use the constant loop bounds, including
+    the bounds that depend on the grid offset and the iteration space. '''
+    trans = GOceanLoopTiling2DTrans()
+    psy, invoke = get_invoke("single_invoke_three_kernels.f90", API, idx=0,
+                             dist_mem=False)
+    sched = invoke.schedule
+    GOConstLoopBoundsTrans().apply(sched)
+    for loop in sched.children[:]:
+        trans.apply(loop, {"tilesize": 8})
+    code = str(psy.gen).lower()
+    assert ("      do j_tile=2,jstop,8\n"
+            "        do i_tile=2,istop+1,8\n"
+            "          do j=j_tile,min(j_tile + 7, jstop)\n"
+            "            do i=i_tile,min(i_tile + 7, istop+1)\n"
+            "              call compute_cu_code(" in code)
+    assert ("      do j_tile=2,jstop+1,8\n"
+            "        do i_tile=2,istop,8\n"
+            "          do j=j_tile,min(j_tile + 7, jstop+1)\n"
+            "            do i=i_tile,min(i_tile + 7, istop)\n"
+            "              call compute_cv_code(" in code)
+    assert ("      do j_tile=1,jstop+1,8\n"
+            "        do i_tile=1,istop+1,8\n"
+            "          do j=j_tile,min(j_tile + 7, jstop+1)\n"
+            "            do i=i_tile,min(i_tile + 7, istop+1)\n"
+            "              call time_smooth_code(" in code)
+    assert GOcean1p0Build(tmpdir).code_compiles(psy)
+
+
+def test_apply_omp(tmpdir):
+    ''' Check that the loop over the tiles can be parallelised with
+    OpenMP and that all loop variables are then private. '''
+    psy, invoke = get_invoke("single_invoke_three_kernels.f90", API, idx=0,
+                             dist_mem=False)
+    sched = invoke.schedule
+    GOceanLoopTiling2DTrans().apply(sched.children[0])
+    GOceanOMPParallelLoopTrans().apply(sched.children[0])
+    code = str(psy.gen).lower()
+    assert ("      !$omp parallel do default(shared), "
+            "private(i,i_tile,j,j_tile), schedule(static)\n"
+            "      do j_tile=cu_fld%internal%ystart,cu_fld%internal%ystop,32\n"
+            in code)
+    assert GOcean1p0Build(tmpdir).code_compiles(psy)
@@ -0,0 +1,264 @@
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2021, Science and Technology Facilities Council.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+
+''' Module containing tests for the PSyclone GOOpenCLKernelFuseTrans
+transformation.
+'''
+
+from __future__ import absolute_import
+import pytest
+from psyclone.configuration import Config
+from psyclone.core.access_type import AccessType
+from psyclone.domain.gocean.transformations import \
+    GOMoveIterationBoundariesInsideKernelTrans, GOOpenCLKernelFuseTrans, \
+    GOceanLoopFuseTrans
+from psyclone.errors import GenerationError
+from psyclone.psyir.backend.opencl import OpenCLWriter
+from psyclone.psyir.symbols import DataSymbol, REAL_TYPE
+from psyclone.psyir.transformations import TransformationError
+from psyclone.tests.gocean1p0_build import GOcean1p0OpenCLBuild
+from psyclone.tests.utilities import get_invoke
+from psyclone.transformations import OCLTrans
+
+API = "gocean1.0"
+
+
+@pytest.fixture(scope="module", autouse=True)
+def setup():
+    '''Make sure that all tests here use gocean1.0 as API.'''
+    Config.get().api = "gocean1.0"
+    yield()
+    Config._instance = None
+
+
+def test_description():
+    ''' Check that the transformation returns the expected strings. '''
+    trans = GOOpenCLKernelFuseTrans()
+    assert trans.name == "GOOpenCLKernelFuseTrans"
+    assert str(trans) == \
+        "Fuse two adjacent GOcean kernels into a single OpenCL kernel."
+
+
+def test_validate_structure():
+    ''' Check that the transformation can only be applied to two GOKerns
+    that are alone in adjacent loop nests over the same points. '''
+    trans = GOOpenCLKernelFuseTrans()
+    psy, _ = get_invoke("single_invoke_three_kernels_deps.f90", API,
+                        idx=0, dist_mem=False)
+    sched = psy.invokes.invoke_list[0].schedule
+    kernels = sched.coded_kernels()
+
+    with pytest.raises(TransformationError) as info:
+        trans.apply(kernels[0], None)
+    assert ("Error in GOOpenCLKernelFuseTrans transformation. This "
+            "transformation can only be applied to 'GOKern' nodes, but "
+            "found 'NoneType'." in str(info.value))
+
+    # The loop nests are over different grid-point types
+    with pytest.raises(TransformationError) as info:
+        trans.apply(kernels[0], kernels[1])
+    assert ("Cannot fuse loops that are over different grid-point types: "
+            "go_cu go_cv" in str(info.value))
+
+    # The loop nests are not adjacent
+    with pytest.raises(TransformationError) as info:
+        trans.apply(kernels[0], kernels[2])
+    assert "Nodes are not siblings who are next to each other" in \
+        str(info.value)
+
+    psy, _ = get_invoke("single_invoke_copy_write_first.f90", API,
+                        idx=0, dist_mem=False)
+    sched = psy.invokes.invoke_list[0].schedule
+    kernels = sched.coded_kernels()
+
+    # The kernels are in the wrong order
+    with pytest.raises(TransformationError) as info:
+        trans.apply(kernels[1], kernels[0])
+    assert ("Error in GOOpenCLKernelFuseTrans transformation. Kernel "
+            "'field_copy_code' must immediately precede kernel "
+            "'field_copy_code'." in str(info.value))
+
+    # The loop nests have different iteration spaces
+    sched.children[1].loop_body[0].iteration_space = "go_internal_pts"
+    with pytest.raises(TransformationError) as info:
+        trans.apply(kernels[0], kernels[1])
+    assert ("Cannot fuse kernels 'field_copy_code' and 'field_copy_code' "
+            "because their loops have different iteration spaces."
+            in str(info.value))
+    sched.children[1].loop_body[0].iteration_space = "go_all_pts"
+
+    # The kernels are no longer alone in their loop nests
+    GOceanLoopFuseTrans().apply(sched.children[0], sched.children[1])
+    with pytest.raises(TransformationError) as info:
+        trans.apply(kernels[0], kernels[1])
+    assert ("Error in GOOpenCLKernelFuseTrans transformation. Kernel "
+            "'field_copy_code' must be the only statement in a GOcean loop "
+            "nest." in str(info.value))
+
+
+def test_validate_kernels(monkeypatch):
+    ''' Check that the transformation rejects kernels that write to
+    scalars, contain Return statements, access with a stencil a field
+    written by the other kernel or use symbols that the first kernel does
+    not have. '''
+    trans = GOOpenCLKernelFuseTrans()
+    psy, _ = get_invoke("single_invoke_two_kernels_scalars.f90", API,
+                        idx=0, dist_mem=False)
+    sched = psy.invokes.invoke_list[0].schedule
+    kernels = sched.coded_kernels()
+    with pytest.raises(TransformationError) as info:
+        trans.apply(kernels[0], kernels[1])
+    assert ("Kernel 'bc_ssh_code' contains a Return statement. Note that "
+            "this transformation must be applied before the "
+            "GOMoveIterationBoundariesInsideKernelTrans transformation."
+            in str(info.value))
+    monkeypatch.setattr(kernels[1].arguments.args[1], "_access",
+                        AccessType.SUM)
+    with pytest.raises(TransformationError) as info:
+        trans.apply(kernels[0], kernels[1])
+    assert ("Kernel 'bc_ssh_value_code' writes to the scalar argument "
+            "'ncycle' but reductions are not supported." in str(info.value))
+
+    # compute_cu(cu_fld, p_fld, u_fld) followed by
+    # compute_cu(p_fld, cu_fld, u_fld) where p is accessed with a stencil
+    psy, _ = get_invoke("single_invoke_two_identical_kernels.f90", API,
+                        idx=0, dist_mem=False)
+    sched = psy.invokes.invoke_list[0].schedule
+    kernels = sched.coded_kernels()
+    with pytest.raises(TransformationError) as info:
+        trans.apply(kernels[0], kernels[1])
+    assert ("Cannot fuse kernels 'compute_cu_code' and 'compute_cu_code' "
+            "because field 'cu_fld' is written by one of them and accessed "
+            "with a stencil by the other." in str(info.value))
+
+    psy, _ = get_invoke("single_invoke_fuse_kernels.f90", API,
+                        idx=0, dist_mem=False)
+    sched = psy.invokes.invoke_list[0].schedule
+    kernels = sched.coded_kernels()
+    kernels[1].get_kernel_schedule().symbol_table.add(
+        DataSymbol("some_global", REAL_TYPE, interface=None))
+    monkeypatch.setattr(
+        kernels[1].get_kernel_schedule().symbol_table.lookup("some_global"),
+        "_interface", kernels[0].get_kernel_schedule().symbol_table.lookup(
+            "go_wp").interface)
+    with pytest.raises(TransformationError) as info:
+        trans.apply(kernels[0], kernels[1])
+    assert ("Kernel 'time_smooth_code' uses the symbol 'some_global' which "
+            "is not available in kernel 'time_smooth_code'."
+            in str(info.value))
+
+
+def test_apply_private():
+    ''' Check that two time_smooth kernels, where the second one reads the
+    field updated by the first one, are fused into a single kernel that
+    keeps the updated value in a private variable. '''
+    psy, _ = get_invoke("single_invoke_fuse_kernels.f90", API,
+                        idx=0, dist_mem=False)
+    sched = psy.invokes.invoke_list[0].schedule
+    kernels = sched.coded_kernels()
+    GOOpenCLKernelFuseTrans().apply(kernels[0], kernels[1])
+
+    # There is a single loop nest with the fused kernel
+    assert len(sched.children) == 1
+    kernel = sched.coded_kernels()[0]
+    assert kernel is kernels[0]
+    assert kernel.name == "time_smooth_time_smooth_code"
+    assert kernel.get_kernel_schedule().name == kernel.name
+    assert [arg.name for arg in kernel.arguments.args] == \
+        ["u_fld", "unew_fld", "uold_fld", "vold_fld"]
+    assert [arg.access for arg in kernel.arguments.args] == \
+        [AccessType.READ, AccessType.READ, AccessType.READWRITE,
+         AccessType.READWRITE]
+    assert kernel.arguments.args[3]._call is kernel
+
+    code = OpenCLWriter()(kernel.get_kernel_schedule())
+    assert ("__kernel void time_smooth_time_smooth_code(\n"
+            "  __global double * restrict field,\n"
+            "  __global double * restrict field_new,\n"
+            "  __global double * restrict field_old,\n"
+            "  __global double * restrict field_old_1\n"
+            "  ){\n"
+            "  double alpha;\n"
+            "  double alpha_1;\n"
+            "  double field_old_private;\n" in code)
+    assert ("  field_old_private = (field[j * fieldLEN1 + i] + (alpha * "
+            "((field_new[j * field_newLEN1 + i] - (2.0e0 * field[j * "
+            "fieldLEN1 + i])) + field_old[j * field_oldLEN1 + i])));\n"
+            "  field_old[j * field_oldLEN1 + i] = field_old_private;\n"
+            "  alpha_1 = 1.0e0;\n"
+            "  field_old_1[j * field_old_1LEN1 + i] = (field_old_private + "
+            "(alpha_1 * ((field_new[j * field_newLEN1 + i] - (2.0e0 * "
+            "field_old_private)) + field_old_1[j * field_old_1LEN1 + i])));\n"
+            in code)
+
+    # The fused kernel can only be generated as OpenCL
+    with pytest.raises(GenerationError) as info:
+        _ = psy.gen
+    assert ("Kernel 'time_smooth_time_smooth_code' has been created by the "
+            "GOOpenCLKernelFuseTrans transformation and can only be "
+            "generated as OpenCL" in str(info.value))
+
+
+def test_apply_stencil(kernel_outputdir):
+    ''' Check that the stencil accesses of a field read by both kernels are
+    merged and that the fused kernel is generated as a single OpenCL
+    kernel. '''
+    psy, _ = get_invoke("single_invoke_fuse_kernels.f90", API,
+                        idx=1, dist_mem=False)
+    sched = psy.invokes.invoke_list[1].schedule
+    kernels = sched.coded_kernels()
+    GOOpenCLKernelFuseTrans().apply(kernels[0], kernels[1])
+    kernel = sched.coded_kernels()[0]
+    assert [arg.name for arg in kernel.arguments.args] == \
+        ["cu_fld", "p_fld", "u_fld", "cv_fld", "v_fld"]
+    p_arg = kernel.arguments.args[1]
+    assert p_arg.access == AccessType.READ
+    assert p_arg.stencil.has_stencil
+    assert p_arg.stencil.depth(1, 0) == 1
+    assert p_arg.stencil.depth(-1, 0) == 0
+    # No private variable is needed as no field is passed between the
+    # kernels
+    ksched = kernel.get_kernel_schedule()
+    assert not [sym for sym in ksched.symbol_table.local_datasymbols
+                if sym.name.endswith("_private")]
+
+    GOMoveIterationBoundariesInsideKernelTrans().apply(kernel)
+    OCLTrans().apply(sched)
+    generated_code = str(psy.gen)
+    assert generated_code.count("clEnqueueNDRangeKernel") == 1
+    assert ("CALL compute_cu_compute_cu_code_set_args(kernel_compute_cu_"
+            "compute_cu_code, cu_fld_cl_mem, p_fld_cl_mem, u_fld_cl_mem, "
+            "cv_fld_cl_mem, v_fld_cl_mem, xstart - 1, xstop - 1, ystart - "
+            "1, ystop - 1)" in generated_code)
+    assert GOcean1p0OpenCLBuild(kernel_outputdir).code_compiles(psy)
@@ -175,6 +175,28 @@ def test_mesh_height():
     assert kernel_interface._arglist[-1] is symbol
 
 
+def test_cell_block():
+    '''Test that the KernelInterface class cell_block method adds the
+    expected type of Symbol to the symbol table and the _arglist list and
+    that any dofmaps subsequently created are dimensioned by it.
+
+    '''
+    kernel_interface = KernelInterface(None)
+    kernel_interface.cell_block()
+    symbol = kernel_interface._symbol_table.lookup("ncell_block")
+    assert isinstance(symbol, lfric_psyir.NumberOfCellsInBlockDataSymbol)
+    assert isinstance(symbol.interface, ArgumentInterface)
+    assert (symbol.interface.access ==
+            kernel_interface._read_access.access)
+    assert kernel_interface._arglist[-1] is symbol
+    kernel_interface.fs_compulsory_field(FunctionSpace("w3", None))
+    dofmap = kernel_interface._arglist[-1]
+    assert isinstance(dofmap, lfric_psyir.DofMapBlockDataSymbol)
+    assert len(dofmap.shape) == 2
+    assert dofmap.shape[0].symbol.name == "ndf_w3"
+    assert dofmap.shape[1].symbol is symbol
+
+
 @pytest.mark.xfail(reason="Issue #928: this callback is not yet implemented")
 def test_mesh_ncell2d():
     '''Test that the KernelInterface class mesh_ncell2d method adds the
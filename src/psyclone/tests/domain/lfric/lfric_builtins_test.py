@@ -409,6 +409,18 @@ def test_lfricbuiltin_cma(dist_mem):
     assert cma_type is None
 
 
+def test_lfricbuiltin_cell_block_size():
+    ''' Check that an LFRicBuiltIn returns None for the cell-block size
+    (because built-ins iterate over dofs). '''
+    _, invoke_info = parse(
+        os.path.join(BASE_PATH,
+                     "15.12.3_single_pointwise_builtin.f90"),
+        api=API)
+    psy = PSyFactory(API, distributed_memory=False).create(invoke_info)
+    kern = psy.invokes.invoke_list[0].schedule.children[0].loop_body[0]
+    assert kern.cell_block_size is None
+
+
 def test_lfricbuiltfactory_str():
     ''' Check that the str method of LFRicBuiltInCallFactory works as
     expected. '''
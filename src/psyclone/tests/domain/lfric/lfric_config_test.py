@@ -289,6 +289,28 @@ def test_run_time_checks():
     assert not api_config.run_time_checks
 
 
+def test_share_basis_functions(tmpdir):
+    '''Check that the (optional) SHARE_BASIS_FUNCTIONS setting defaults
+    to False if it is omitted, that it is read if present and that an
+    invalid value is rejected.
+
+    '''
+    config_file = tmpdir.join("config_dyn")
+    # _CONFIG_CONTENT does not contain this (optional) setting
+    test_config = config(config_file, _CONFIG_CONTENT)
+    assert not test_config.api_conf(TEST_API).share_basis_functions
+    Config._instance = None
+    test_config = config(config_file,
+                         _CONFIG_CONTENT + "SHARE_BASIS_FUNCTIONS = true\n")
+    assert test_config.api_conf(TEST_API).share_basis_functions
+    Config._instance = None
+    with pytest.raises(ConfigurationError) as err:
+        config(config_file,
+               _CONFIG_CONTENT + "SHARE_BASIS_FUNCTIONS = tree\n")
+    assert "Error while parsing SHARE_BASIS_FUNCTIONS" in str(err.value)
+    assert "Not a boolean: tree" in str(err.value)
+
+
 def test_num_any_space():
     ''' Check that we load the expected default ANY_SPACE value (10).
 
@@ -129,6 +129,8 @@ def test_scalar_literals():
      lfric_psyir.LfricIntegerScalarDataType),
     (lfric_psyir.NumberOfCellsDataType,
      lfric_psyir.LfricIntegerScalarDataType),
+    (lfric_psyir.NumberOfCellsInBlockDataType,
+     lfric_psyir.LfricIntegerScalarDataType),
     (lfric_psyir.NumberOfDofsDataType,
      lfric_psyir.LfricIntegerScalarDataType),
     (lfric_psyir.NumberOfUniqueDofsDataType,
@@ -161,6 +163,8 @@ def test_specific_scalar_types(data_type, generic_type):
      lfric_psyir.LfricIntegerScalarDataSymbol, {}),
     (lfric_psyir.NumberOfCellsDataSymbol,
      lfric_psyir.LfricIntegerScalarDataSymbol, {}),
+    (lfric_psyir.NumberOfCellsInBlockDataSymbol,
+     lfric_psyir.LfricIntegerScalarDataSymbol, {}),
     (lfric_psyir.NumberOfDofsDataSymbol,
      lfric_psyir.LfricIntegerScalarDataSymbol, {"fs": "w3"}),
     (lfric_psyir.NumberOfUniqueDofsDataSymbol,
@@ -243,6 +247,16 @@ def test_specific_scalar_symbols(symbol, generic_symbol, attribute_map):
               "ndofs", "w3",
               interface=ArgumentInterface(ArgumentInterface.Access.READ)))],
       {"fs": "w3"}),
+     (lfric_psyir.DofMapBlockDataType, lfric_psyir.DofMapBlockDataSymbol,
+      lfric_psyir.LfricIntegerScalarDataType,
+      [Reference(
+          lfric_psyir.NumberOfDofsDataSymbol(
+              "ndofs", "w3",
+              interface=ArgumentInterface(ArgumentInterface.Access.READ))),
+       Reference(lfric_psyir.NumberOfCellsInBlockDataSymbol(
+           "ncell_block",
+           interface=ArgumentInterface(ArgumentInterface.Access.READ)))],
+      {"fs": "w3"}),
      (lfric_psyir.BasisFunctionQrXyozDataType,
       lfric_psyir.BasisFunctionQrXyozDataSymbol,
       lfric_psyir.LfricRealScalarDataType,
@@ -46,7 +46,7 @@ import pytest
 from psyclone.configuration import Config
 from psyclone.core.access_type import AccessType
 from psyclone.domain.lfric.transformations import LFRicLoopFuseTrans
-from psyclone.dynamo0p3 import DynLoop
+from psyclone.dynamo0p3 import DynLoop, DynHaloExchange
 from psyclone.errors import GenerationError, InternalError
 from psyclone.psyGen import OMPDoDirective, InvokeSchedule, Directive, \
     GlobalSum, BuiltIn
@@ -64,8 +64,12 @@ from psyclone.transformations import OMPParallelTrans, \
     KernelModuleInlineTrans, \
     MoveTrans, \
     Dynamo0p3RedundantComputationTrans, \
+    Dynamo0p3AutoRedundantComputationTrans, \
     Dynamo0p3AsyncHaloExchangeTrans, \
-    Dynamo0p3KernelConstTrans
+    Dynamo0p3KernelConstTrans, \
+    OMPNowaitTrans, \
+    OMPTaskTrans, \
+    OMPTaskloopTrans
 
 
 # The version of the API that the tests in this file
@@ -448,6 +452,110 @@ def test_omp_colour_trans(tmpdir, dist_mem):
     assert LFRicBuild(tmpdir).code_compiles(psy)
 
 
+def test_omp_nowait_trans(tmpdir, dist_mem):
+    ''' Test that OMPNowaitTrans removes the barriers at the end of the
+    OpenMP do loops of an LFRic invoke when none of the following loops
+    in the parallel region read or write the data that they access, and
+    that the barrier is kept for a loop containing a reduction. '''
+    psy, invoke = get_invoke("15.14.1_multi_aX_plus_Y_builtin.f90",
+                             TEST_API, idx=0, dist_mem=dist_mem)
+    schedule = invoke.schedule
+    otrans = Dynamo0p3OMPLoopTrans()
+    for loop in schedule.loops():
+        otrans.apply(loop)
+    OMPParallelTrans().apply(schedule.children)
+    OMPNowaitTrans().apply(schedule[0])
+    # The first four loops write fields that are read by later loops (and
+    # the fourth writes f3 which is read by the first three) so only the
+    # last three loops can skip the barrier.
+    assert [child.nowait for child in schedule[0].dir_body.children] == \
+        [False, False, False, False, True, True, True]
+    code = str(psy.gen)
+    assert code.count("!$omp end do\n") == 4
+    assert code.count("!$omp end do nowait\n") == 3
+    assert LFRicBuild(tmpdir).code_compiles(psy)
+
+    psy, invoke = get_invoke("15.17.2_one_standard_builtin_one_reduction.f90",
+                             TEST_API, idx=0, dist_mem=False)
+    schedule = invoke.schedule
+    for loop in schedule.loops():
+        otrans.apply(loop)
+    OMPParallelTrans().apply(schedule.children)
+    OMPNowaitTrans().apply(schedule[0])
+    # The second loop reads f1 which is written by the first and the
+    # second performs a reduction
+    assert [child.nowait for child in schedule[0].dir_body.children] == \
+        [False, False]
+
+
+def test_omp_task_trans(tmpdir):
+    ''' Test that OMPTaskTrans executes the kernel loops and halo exchanges
+    of an invoke as OpenMP tasks with dependences on their arguments. A
+    kernel with an argument with INC access does not need colouring within
+    a task and the halos are marked as dirty by the thread executing the
+    task (rather than within an OpenMP master region). '''
+    psy, invoke = get_invoke("15.1.2_builtin_and_normal_kernel_invoke.f90",
+                             TEST_API, idx=0, dist_mem=True)
+    schedule = invoke.schedule
+    OMPTaskTrans().apply(schedule.children)
+    code = str(psy.gen)
+
+    assert ("      !$omp parallel default(shared), private(cell,df)\n"
+            "      !$omp single\n"
+            "      !$omp task depend(out: f5)\n"
+            "      DO df=1,f5_proxy%vspace%get_last_dof_owned()\n" in code)
+    assert ("      !$omp task depend(inout: f3)\n"
+            "      IF (f3_proxy%is_dirty(depth=1)) THEN\n"
+            "        CALL f3_proxy%halo_exchange(depth=1)\n"
+            "      END IF\n"
+            "      !\n"
+            "      !$omp end task\n"
+            "      !$omp task depend(inout: f2)\n"
+            "      CALL f2_proxy%halo_exchange(depth=1)\n" in code)
+    assert ("      !$omp task depend(in: f2), depend(inout: f3)\n"
+            "      DO cell=1,mesh%get_last_halo_cell(1)\n"
+            "        !\n"
+            "        CALL testkern_w2_only_code(" in code)
+    assert ("      !$omp task depend(in: f2,f3,f4,scalar), "
+            "depend(inout: f1)\n" in code)
+    assert "      CALL f1_proxy%set_dirty()\n" in code
+    assert "omp master" not in code
+    assert ("      !$omp end task\n"
+            "      !$omp end single\n"
+            "      !$omp end parallel\n" in code)
+    assert LFRicBuild(tmpdir).code_compiles(psy)
+
+
+def test_omp_taskloop_trans(tmpdir, dist_mem):
+    ''' Test that OMPTaskloopTrans can be applied to a coloured loop in
+    an OpenMP parallel region and that it requires colouring. '''
+    psy, invoke = get_invoke("1_single_invoke.f90", TEST_API,
+                             name="invoke_0_testkern_type",
+                             dist_mem=dist_mem)
+    schedule = invoke.schedule
+    index = 4 if dist_mem else 0
+    ttrans = OMPTaskloopTrans()
+
+    with pytest.raises(TransformationError) as excinfo:
+        ttrans.apply(schedule[index])
+    assert ("The kernel has an argument with INC access. Colouring is "
+            "required." in str(excinfo.value))
+
+    Dynamo0p3ColourTrans().apply(schedule[index])
+    ttrans.apply(schedule[index].loop_body[0], {"num_tasks": 16})
+    OMPParallelTrans().apply(schedule[index].loop_body[0])
+    code = str(psy.gen)
+    assert ("        !$omp parallel default(shared), private(cell)\n"
+            "        !$omp single\n"
+            "        !$omp taskloop num_tasks(16)\n"
+            "        DO cell=1," in code)
+    assert ("        END DO\n"
+            "        !$omp end taskloop\n"
+            "        !$omp end single\n"
+            "        !$omp end parallel\n" in code)
+    assert LFRicBuild(tmpdir).code_compiles(psy)
+
+
 def test_omp_parallel_colouring_needed(monkeypatch, annexed, dist_mem):
     '''Test that we raise an error when applying an OpenMP PARALLEL DO
     transformation to a loop that requires colouring (i.e. has a field
@@ -3022,6 +3130,71 @@ def test_reprod_reduction_real_do(tmpdir, dist_mem):
             "      DEALLOCATE (l_asum)\n") in code
 
 
+def test_reprod_reduction_tree(monkeypatch, tmpdir, dist_mem):
+    ''' Test that we generate a correct reproducible OpenMP DO reduction
+    using the "tree" strategy: a padded partial result per block of
+    iterations (each executed by a single thread) combined in a
+    fixed-order pairwise tree. We use an inner product in this case.
+
+    '''
+    config = Config.get()
+    monkeypatch.setattr(config, "_reprod_reduction_strategy", "tree")
+    monkeypatch.setattr(config, "_reprod_block_size", 256)
+    psy, invoke = get_invoke("15.9.1_X_innerproduct_Y_builtin.f90",
+                             TEST_API, idx=0, dist_mem=dist_mem)
+    schedule = invoke.schedule
+    otrans = Dynamo0p3OMPLoopTrans()
+    rtrans = OMPParallelTrans()
+    otrans.apply(schedule.children[0], {"reprod": True})
+    rtrans.apply(schedule.children[0])
+    code = str(psy.gen)
+
+    assert LFRicBuild(tmpdir).code_compiles(psy)
+
+    # The number of threads is not required
+    assert "omp_get_max_threads" not in code
+    assert "th_idx" not in code
+    assert "      INTEGER red_level, red_block\n" in code
+    assert "      INTEGER nblocks_asum\n" in code
+    if dist_mem:
+        upper_bound = "f1_proxy%vspace%get_last_dof_owned()"
+    else:
+        upper_bound = "undf_aspc1_f1"
+    assert (
+        "      asum = 0.0_r_def\n"
+        "      nblocks_asum = ({0}-1)/256+1\n"
+        "      ALLOCATE (l_asum(8,nblocks_asum))\n"
+        "      l_asum = 0.0_r_def\n"
+        "      !\n"
+        "      !$omp parallel default(shared), private(df)\n"
+        "      !$omp do schedule(static,256)\n"
+        "      DO df=1,{0}\n"
+        "        l_asum(1,(df-1)/256+1) = l_asum(1,(df-1)/256+1) + "
+        "f1_proxy%data(df)*f2_proxy%data(df)\n"
+        "      END DO\n"
+        "      !$omp end do\n"
+        "      !$omp end parallel\n"
+        "      !\n"
+        "      ! combine the partial results in a fixed-order pairwise tree\n"
+        "      !\n"
+        "      DO red_level=1,bit_size(nblocks_asum)-leadz(nblocks_asum-1)\n"
+        "        DO red_block=1,nblocks_asum-2**(red_level-1),"
+        "2**red_level\n"
+        "          l_asum(1,red_block) = l_asum(1,red_block)+"
+        "l_asum(1,red_block+2**(red_level-1))\n"
+        "        END DO\n"
+        "      END DO\n"
+        "      asum = asum+l_asum(1,1)\n"
+        "      DEALLOCATE (l_asum)\n".format(upper_bound)) in code
+
+    # A lower bound that is an expression is parenthesised
+    kern = schedule.walk(BuiltIn)[0]
+    loop = kern.ancestor(Loop)
+    monkeypatch.setattr(loop, "_lower_bound_fortran", lambda: "n+1")
+    # pylint: disable=protected-access
+    assert kern._reduction_block("df") == "(df-(n+1))/256+1"
+
+
 def test_no_global_sum_in_parallel_region():
     '''test that we raise an error if we try to put a parallel region
     around loops with a global sum. '''
@@ -6735,6 +6908,74 @@ def test_rc_redund_async_halo_exchange(monkeypatch, tmpdir):
     assert LFRicBuild(tmpdir).code_compiles(psy)
 
 
+def test_auto_rc_validate(monkeypatch):
+    ''' Test the checks performed by the validate method of
+    Dynamo0p3AutoRedundantComputationTrans. '''
+    _, invoke = get_invoke("15.1.2_builtin_and_normal_kernel_invoke.f90",
+                           TEST_API, idx=0, dist_mem=True)
+    schedule = invoke.schedule
+    trans = Dynamo0p3AutoRedundantComputationTrans()
+    assert trans.name == "Dynamo0p3AutoRedundantComputationTrans"
+    assert "Automatically select loops" in str(trans)
+    with pytest.raises(TransformationError) as err:
+        trans.apply(schedule.children[0])
+    assert ("supplied node must be a DynInvokeSchedule but found "
+            "'DynLoop'" in str(err.value))
+    for options in [{"max_depth": 0}, {"max_depth": "2"}]:
+        with pytest.raises(TransformationError) as err:
+            trans.apply(schedule, options)
+        assert "'max_depth' option must be a positive integer" in \
+            str(err.value)
+    with pytest.raises(TransformationError) as err:
+        trans.apply(schedule, {"compute_cost": -1.0})
+    assert ("'compute_cost' option must be a non-negative number but found "
+            "'-1.0'" in str(err.value))
+    # Directives are not permitted
+    otrans = Dynamo0p3OMPLoopTrans()
+    ptrans = OMPParallelTrans()
+    otrans.apply(schedule.children[0])
+    ptrans.apply(schedule.children[0])
+    with pytest.raises(TransformationError) as err:
+        trans.apply(schedule)
+    assert "already contains directives" in str(err.value)
+    monkeypatch.setattr(Config.get(), "_distributed_mem", False)
+    with pytest.raises(TransformationError) as err:
+        trans.apply(schedule)
+    assert "distributed memory must be switched on" in str(err.value)
+
+
+def test_auto_rc_apply(tmpdir):
+    ''' Test that Dynamo0p3AutoRedundantComputationTrans extends a
+    builtin loop into the halo when this removes a halo exchange and
+    that the schedule is left unchanged when the cost of computing in
+    the halo outweighs the cost of the halo exchange. '''
+    psy, invoke = get_invoke("15.1.2_builtin_and_normal_kernel_invoke.f90",
+                             TEST_API, idx=0, dist_mem=True)
+    schedule = invoke.schedule
+    trans = Dynamo0p3AutoRedundantComputationTrans()
+    before = schedule.children[:]
+    bounds = [loop.upper_bound_name for loop in schedule.loops()]
+    trans.apply(schedule, {"compute_cost": 10.0})
+    assert schedule.children == before
+    assert [loop.upper_bound_name for loop in schedule.loops()] == bounds
+
+    trans.apply(schedule)
+    assert ([loop.upper_bound_name for loop in schedule.loops()] ==
+            ["ndofs", "dof_halo", "cell_halo", "ncells", "cell_halo"])
+    assert schedule.children[1].upper_bound_halo_depth == 1
+    hexes = [node.field.name for node in schedule.walk(DynHaloExchange)]
+    assert "f2" not in hexes
+    result = str(psy.gen)
+    assert "CALL f2_proxy%halo_exchange(depth=1)" not in result
+    assert "DO df=1,f2_proxy%vspace%get_last_dof_halo(1)" in result
+    assert LFRicBuild(tmpdir).code_compiles(psy)
+
+    # Applying the transformation again makes no further changes
+    before = schedule.children[:]
+    trans.apply(schedule, {"max_depth": 1})
+    assert schedule.children == before
+
+
 @pytest.mark.xfail(reason="dependence analysis thinks independent vectors "
                    "depend on each other")
 def test_move_vector_halo_exchange():
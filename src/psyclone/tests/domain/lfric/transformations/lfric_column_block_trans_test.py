@@ -0,0 +1,248 @@
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2021, Science and Technology Facilities Council.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+# -----------------------------------------------------------------------------
+
+''' Module containing tests for the LFRicColumnBlockTrans transformation.
+'''
+
+from __future__ import absolute_import
+
+import pytest
+
+from psyclone.domain.lfric.transformations import LFRicColumnBlockTrans, \
+    LFRicLoopFuseTrans
+from psyclone.psyir.nodes import ArrayReference, Assignment, Literal, Loop, \
+    Reference
+from psyclone.psyir.symbols import INTEGER_TYPE
+from psyclone.psyir.transformations import TransformationError
+from psyclone.tests.lfric_build import LFRicBuild
+from psyclone.tests.utilities import get_invoke
+from psyclone.transformations import Dynamo0p3ColourTrans, \
+    DynamoOMPParallelLoopTrans
+
+# API names
+TEST_API = "dynamo0.3"
+
+
+def test_col_block_str_name():
+    ''' Check the __str__ and name properties of LFRicColumnBlockTrans. '''
+    trans = LFRicColumnBlockTrans()
+    assert str(trans) == ("Make each kernel call in a loop over cells "
+                          "process a block of consecutive cell columns")
+    assert trans.name == "LFRicColumnBlockTrans"
+
+
+def test_cell_block_size_setter():
+    ''' Check the DynKern cell_block_size setter rejects invalid values. '''
+    _, invoke = get_invoke("1_single_invoke.f90", TEST_API, idx=0,
+                           dist_mem=False)
+    kernel = invoke.schedule.kernels()[0]
+    assert kernel.cell_block_size is None
+    for value in [0, 2.0, True]:
+        with pytest.raises(TypeError) as err:
+            kernel.cell_block_size = value
+        assert ("The cell-block size of kernel 'testkern_code' must be a "
+                "positive integer or None but got '{0}'".format(value)
+                in str(err.value))
+    kernel.cell_block_size = 2
+    assert kernel.cell_block_size == 2
+    kernel.cell_block_size = None
+    assert kernel.cell_block_size is None
+
+
+def test_col_block_validate(monkeypatch):
+    ''' Check the validation checks of LFRicColumnBlockTrans. '''
+    trans = LFRicColumnBlockTrans()
+    _, invoke = get_invoke("1_single_invoke.f90", TEST_API, idx=0,
+                           dist_mem=False)
+    loop = invoke.schedule[0]
+    with pytest.raises(TransformationError) as err:
+        trans.validate(loop.loop_body[0])
+    assert ("the supplied node must be a DynLoop but got 'DynKern'"
+            in str(err.value))
+    for block_size in [1, "4", True]:
+        with pytest.raises(TransformationError) as err:
+            trans.validate(loop, {"block_size": block_size})
+        assert ("the 'block_size' option must be an integer greater than "
+                "one but got '{0}'".format(block_size) in str(err.value))
+    trans.validate(loop, {"block_size": 16})
+
+    # A kernel that has already been blocked
+    monkeypatch.setattr(loop.loop_body[0], "_cell_block_size", 4)
+    with pytest.raises(TransformationError) as err:
+        trans.validate(loop)
+    assert ("kernel 'testkern_code' already processes blocks of 4 columns"
+            in str(err.value))
+    monkeypatch.undo()
+
+    # A kernel that does not operate on cell columns
+    monkeypatch.setattr(loop.loop_body[0], "_iterates_over", "domain")
+    with pytest.raises(TransformationError) as err:
+        trans.validate(loop)
+    assert ("only kernels that operate on a single cell column can be "
+            "blocked but kernel 'testkern_code' operates on 'domain'"
+            in str(err.value))
+    monkeypatch.undo()
+
+    # A coloured loop
+    Dynamo0p3ColourTrans().apply(loop)
+    with pytest.raises(TransformationError) as err:
+        trans.validate(invoke.schedule[0])
+    assert ("only loops over cells can be blocked but this loop has a loop "
+            "type of 'colours'" in str(err.value))
+    with pytest.raises(TransformationError) as err:
+        trans.validate(invoke.schedule[0].loop_body[0])
+    assert ("only loops over cells can be blocked but this loop has a loop "
+            "type of 'colour'" in str(err.value))
+
+    # A loop over dofs
+    _, invoke = get_invoke("15.1.2_builtin_and_normal_kernel_invoke.f90",
+                           TEST_API, idx=0, dist_mem=False)
+    with pytest.raises(TransformationError) as err:
+        trans.validate(invoke.schedule[0])
+    assert ("only loops over cells can be blocked but this loop has a loop "
+            "type of 'dof'" in str(err.value))
+
+
+def test_col_block_validate_kernel():
+    ''' Check that LFRicColumnBlockTrans rejects kernels with arguments that
+    are specific to a single column and kernels that use their dofmaps in
+    an unsupported way. '''
+    trans = LFRicColumnBlockTrans()
+    _, invoke = get_invoke("10_operator.f90", TEST_API, idx=0,
+                           dist_mem=False)
+    with pytest.raises(TransformationError) as err:
+        trans.validate(invoke.schedule[0])
+    assert ("kernel 'testkern_operator_code' requires arguments (operators, "
+            "stencils, inter-grid or mesh properties) that are specific to "
+            "a single cell column" in str(err.value))
+
+    _, invoke = get_invoke("1_single_invoke.f90", TEST_API, idx=0,
+                           dist_mem=False)
+    loop = invoke.schedule[0]
+    kernel_schedule = loop.loop_body[0].get_kernel_schedule()
+    symbol_table = kernel_schedule.symbol_table
+    # Pass the whole dofmap to another routine
+    call = Assignment.create(
+        Reference(symbol_table.lookup("nlayers")),
+        Reference(symbol_table.lookup("map_w2")))
+    kernel_schedule.addchild(call)
+    with pytest.raises(TransformationError) as err:
+        trans.validate(loop)
+    assert ("dofmap argument 'map_w2' of kernel 'testkern_code' must only be "
+            "accessed by indexing a single element" in str(err.value))
+
+
+def test_col_block_apply(kernel_outputdir, dist_mem):
+    ''' Check that LFRicColumnBlockTrans blocks the loop, modifies the
+    kernel call and modifies the kernel itself. '''
+    psy, invoke = get_invoke("1_single_invoke.f90", TEST_API, idx=0,
+                             dist_mem=dist_mem)
+    schedule = invoke.schedule
+    loop = schedule.walk(Loop)[0]
+    kernel = loop.loop_body[0]
+    kernel_schedule = kernel.get_kernel_schedule()
+    symbol_table = kernel_schedule.symbol_table
+    # Give the kernel a body that uses a dofmap
+    fld1 = symbol_table.lookup("fld1")
+    map_w1 = symbol_table.lookup("map_w1")
+    kernel_schedule.addchild(Assignment.create(
+        ArrayReference.create(
+            fld1, [ArrayReference.create(
+                map_w1, [Literal("1", INTEGER_TYPE)])]),
+        Reference(symbol_table.lookup("ascalar"))))
+
+    new_schedule, _ = LFRicColumnBlockTrans().apply(loop, {"block_size": 8})
+    assert new_schedule is loop.root
+    assert kernel.cell_block_size == 8
+    assert kernel.modified
+    assert loop.step_expr.value == "8"
+
+    # The kernel takes the number of columns after nlayers
+    args = [sym.name for sym in symbol_table.argument_list]
+    assert args[:3] == ["nlayers", "ncell_block", "ascalar"]
+    assert len(map_w1.shape) == 2
+    assert map_w1.shape[1].symbol.name == "ncell_block"
+    # The kernel body is wrapped in a loop over the columns in the block
+    assert len(kernel_schedule.children) == 1
+    col_loop = kernel_schedule.children[0]
+    assert isinstance(col_loop, Loop)
+    assert col_loop.variable.name == "column"
+    assert col_loop.stop_expr.symbol.name == "ncell_block"
+    map_ref = col_loop.loop_body[0].lhs.children[0]
+    assert map_ref.symbol is map_w1
+    assert map_ref.children[1].symbol is col_loop.variable
+
+    code = str(psy.gen).lower()
+    if dist_mem:
+        upper = "mesh%get_last_halo_cell(1)"
+    else:
+        upper = "f1_proxy%vspace%get_ncell()"
+    assert "do cell=1,{0},8\n".format(upper) in code
+    assert ("ncell_block = min(8, {0} - cell + 1)".format(upper) in code)
+    assert ("call testkern_0_code(nlayers, ncell_block, a, f1_proxy%data, "
+            "f2_proxy%data, m1_proxy%data, m2_proxy%data, ndf_w1, undf_w1, "
+            "map_w1(:,cell:cell+ncell_block-1), ndf_w2, undf_w2, "
+            "map_w2(:,cell:cell+ncell_block-1), ndf_w3, undf_w3, "
+            "map_w3(:,cell:cell+ncell_block-1))" in code)
+    assert LFRicBuild(kernel_outputdir).code_compiles(psy)
+
+
+def test_col_block_omp(kernel_outputdir):
+    ''' Check that a blocked loop can be parallelised with OpenMP and that
+    the number of columns in a block is then private. '''
+    psy, invoke = get_invoke("1_single_invoke_w3.f90", TEST_API, idx=0,
+                             dist_mem=False)
+    loop = invoke.schedule[0]
+    LFRicColumnBlockTrans().apply(loop)
+    DynamoOMPParallelLoopTrans().apply(loop)
+    code = str(psy.gen).lower()
+    assert "private(cell,ncell_block)" in code
+    assert "ncell_block = min(4, m2_proxy%vspace%get_ncell() - cell + 1)" \
+        in code
+    assert LFRicBuild(kernel_outputdir).code_compiles(psy)
+
+
+def test_col_block_loop_fuse(kernel_outputdir):
+    ''' Check that loops whose kernels process different numbers of
+    columns cannot be fused. '''
+    _, invoke = get_invoke("4_multikernel_invokes.f90", TEST_API, idx=0,
+                           dist_mem=False)
+    schedule = invoke.schedule
+    LFRicColumnBlockTrans().apply(schedule[0])
+    with pytest.raises(TransformationError) as err:
+        LFRicLoopFuseTrans().apply(schedule[0], schedule[1])
+    assert ("The loops process different numbers of cell columns per "
+            "kernel call (cell-block sizes). Found [4, None]."
+            in str(err.value))
@@ -0,0 +1,166 @@
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2021, Science and Technology Facilities Council.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+
+'''Module containing tests for the NemoArrayContractionTrans
+transformation.'''
+
+from __future__ import absolute_import
+
+import pytest
+
+from psyclone.domain.nemo.transformations import NemoArrayContractionTrans
+from psyclone.psyir.nodes import Loop, Routine
+from psyclone.psyir.transformations import TransformationError
+from psyclone.tests.utilities import Compile
+
+
+def test_array_contraction_str_name():
+    ''' Check the __str__ and name methods. '''
+    trans = NemoArrayContractionTrans()
+    assert (str(trans) == "Contract the local arrays of a routine that are "
+            "only used within one loop iteration")
+    assert trans.name == "NemoArrayContractionTrans"
+    assert trans.contracted_arrays == []
+
+
+def test_array_contraction_validate(fortran_reader):
+    ''' Check that the transformation rejects a node that is not a
+    Routine. '''
+    psyir = fortran_reader.psyir_from_source(
+        "subroutine sub()\n"
+        "  integer :: ji\n"
+        "  real :: a(10)\n"
+        "  do ji = 1, 10\n"
+        "    a(ji) = 0.0\n"
+        "  end do\n"
+        "end subroutine sub\n")
+    with pytest.raises(TransformationError) as err:
+        NemoArrayContractionTrans().apply(psyir.walk(Loop)[0])
+    assert ("Error in NemoArrayContractionTrans transformation. The supplied "
+            "node should be a PSyIR Routine but found 'Loop'."
+            in str(err.value))
+
+
+def test_array_contraction(tmpdir, fortran_reader, fortran_writer):
+    ''' Check that local arrays are contracted to scalars or to arrays of
+    lower rank and that their declarations are updated. '''
+    psyir = fortran_reader.psyir_from_source(
+        "subroutine sub(a, b)\n"
+        "  integer, parameter :: jpi = 10, jpj = 20, jpk = 30\n"
+        "  real, dimension(jpi,jpj,jpk), intent(in) :: a\n"
+        "  real, dimension(jpi,jpj,jpk), intent(out) :: b\n"
+        "  integer :: ji, jj, jk\n"
+        "  real, dimension(jpi,jpj,jpk) :: zwx, zwy\n"
+        "  do jk = 1, jpk\n"
+        "    do jj = 1, jpj\n"
+        "      do ji = 1, jpi\n"
+        "        zwx(ji,jj,jk) = a(ji,jj,jk) + 1.0\n"
+        "        b(ji,jj,jk) = zwx(ji,jj,jk) * zwx(ji,jj,jk)\n"
+        "      end do\n"
+        "    end do\n"
+        "    do jj = 1, jpj\n"
+        "      do ji = 1, jpi\n"
+        "        zwy(ji,jj,jk) = 2.0 * a(ji,jj,jk)\n"
+        "      end do\n"
+        "    end do\n"
+        "    do jj = 2, jpj\n"
+        "      do ji = 1, jpi\n"
+        "        b(ji,jj,jk) = zwy(ji,jj,jk) - zwy(ji,jj-1,jk)\n"
+        "      end do\n"
+        "    end do\n"
+        "  end do\n"
+        "end subroutine sub\n")
+    routine = psyir.walk(Routine)[0]
+    trans = NemoArrayContractionTrans()
+    trans.apply(routine)
+    assert trans.contracted_arrays == ["zwx", "zwy"]
+    assert routine.symbol_table.lookup("zwx").is_scalar
+    assert len(routine.symbol_table.lookup("zwy").shape) == 2
+    out = fortran_writer(psyir)
+    assert "real :: zwx\n" in out
+    assert "real, dimension(jpi,jpj) :: zwy\n" in out
+    assert ("        zwx = a(ji,jj,jk) + 1.0\n"
+            "        b(ji,jj,jk) = zwx * zwx\n" in out)
+    assert "        zwy(ji,jj) = 2.0 * a(ji,jj,jk)\n" in out
+    assert "        b(ji,jj,jk) = zwy(ji,jj) - zwy(ji,jj - 1)\n" in out
+    assert Compile(tmpdir).string_compiles(out)
+
+
+def test_array_contraction_not_contracted(fortran_reader, fortran_writer):
+    ''' Check that arrays are not contracted if a loop that encloses all
+    their accesses does not index them, if they are accessed in the
+    dimension of a loop with an offset, if they are accessed as a whole,
+    outside a loop or in a Call or if they are not local. '''
+    code = (
+        "subroutine sub(b, c, zarg)\n"
+        "  integer, parameter :: jpi = 10, jpk = 30\n"
+        "  real, dimension(jpi,jpk), intent(inout) :: b, zarg\n"
+        "  real, intent(out) :: c\n"
+        "  integer :: ji, jk, jn\n"
+        "  real, dimension(jpi,jpk) :: zwa, zwb, zwc, zwd, zwe\n"
+        "  do jn = 1, 2\n"
+        "    do jk = 1, jpk\n"
+        "      do ji = 1, jpi\n"
+        "        zwa(ji,jk) = zwa(ji,jk) + b(ji,jk)\n"
+        "      end do\n"
+        "    end do\n"
+        "  end do\n"
+        "  do jk = 2, jpk\n"
+        "    do ji = 1, jpi\n"
+        "      zwb(ji,jk) = b(ji,jk)\n"
+        "      b(ji,jk) = zwb(ji,jk-1)\n"
+        "    end do\n"
+        "  end do\n"
+        "  zwc = 0.0\n"
+        "  do jk = 1, jpk\n"
+        "    do ji = 1, jpi\n"
+        "      zwc(ji,jk) = b(ji,jk)\n"
+        "    end do\n"
+        "  end do\n"
+        "  zwd(1,1) = 1.0\n"
+        "  do jk = 1, jpk\n"
+        "    do ji = 1, jpi\n"
+        "      zwe(ji,jk) = 1.0\n"
+        "      call random_number(zwe(ji,jk))\n"
+        "      zarg(ji,jk) = 1.0\n"
+        "    end do\n"
+        "  end do\n"
+        "  c = zwd(1,1)\n"
+        "end subroutine sub\n")
+    psyir = fortran_reader.psyir_from_source(code)
+    trans = NemoArrayContractionTrans()
+    trans.apply(psyir.walk(Routine)[0])
+    assert trans.contracted_arrays == []
+    assert (fortran_writer(psyir) ==
+            fortran_writer(fortran_reader.psyir_from_source(code)))
@@ -0,0 +1,192 @@
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2021, Science and Technology Facilities Council.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+
+'''Module containing tests for the NemoRoutineLoopFuseTrans
+transformation.'''
+
+from __future__ import absolute_import
+
+import pytest
+
+from psyclone.domain.nemo.transformations import NemoRoutineLoopFuseTrans
+from psyclone.psyir.nodes import Loop, Routine
+from psyclone.psyir.transformations import TransformationError
+from psyclone.tests.utilities import Compile
+
+
+def test_routine_loop_fuse_str_name():
+    ''' Check the __str__ and name methods. '''
+    trans = NemoRoutineLoopFuseTrans()
+    assert (str(trans) ==
+            "Fuse all adjacent loops of a routine that can be fused")
+    assert trans.name == "NemoRoutineLoopFuseTrans"
+    assert trans.fusion_decisions == []
+
+
+def test_routine_loop_fuse_validate(fortran_reader):
+    ''' Check that the transformation rejects a node that is not a
+    Routine. '''
+    psyir = fortran_reader.psyir_from_source(
+        "subroutine sub()\n"
+        "  integer :: ji\n"
+        "  real :: a(10)\n"
+        "  do ji = 1, 10\n"
+        "    a(ji) = 0.0\n"
+        "  end do\n"
+        "end subroutine sub\n")
+    with pytest.raises(TransformationError) as err:
+        NemoRoutineLoopFuseTrans().apply(psyir.walk(Loop)[0])
+    assert ("Error in NemoRoutineLoopFuseTrans transformation. The supplied "
+            "node should be a PSyIR Routine but found 'Loop'."
+            in str(err.value))
+
+
+def test_routine_loop_fuse_chain(tmpdir, fortran_reader, fortran_writer):
+    ''' Check that a chain of adjacent loop nests is fused, including the
+    inner loops, and that the fusion decisions are reported. '''
+    psyir = fortran_reader.psyir_from_source(
+        "subroutine sub(n)\n"
+        "  integer, intent(in) :: n\n"
+        "  integer :: ji, jj\n"
+        "  real, dimension(10,n) :: a, b, c, ztmp\n"
+        "  do jj = 1, n\n"
+        "    do ji = 1, 10\n"
+        "      ztmp(ji,jj) = a(ji,jj) + 1.0\n"
+        "    end do\n"
+        "  end do\n"
+        "  do jj = 1, n\n"
+        "    do ji = 1, 10\n"
+        "      b(ji,jj) = 2.0 * ztmp(ji,jj)\n"
+        "    end do\n"
+        "  end do\n"
+        "  do jj = 1, n\n"
+        "    do ji = 1, 10\n"
+        "      c(ji,jj) = ztmp(ji,jj) - b(ji,jj)\n"
+        "    end do\n"
+        "  end do\n"
+        "end subroutine sub\n")
+    routine = psyir.walk(Routine)[0]
+    trans = NemoRoutineLoopFuseTrans()
+    trans.apply(routine)
+    assert len(routine.children) == 1
+    assert len(routine.walk(Loop)) == 2
+    assert trans.fusion_decisions == [
+        "Fused 'do jj = 1, n, 1' and 'do jj = 1, n, 1'.",
+        "Fused 'do jj = 1, n, 1' and 'do jj = 1, n, 1'.",
+        "Fused 'do ji = 1, 10, 1' and 'do ji = 1, 10, 1'.",
+        "Fused 'do ji = 1, 10, 1' and 'do ji = 1, 10, 1'."]
+    out = fortran_writer(psyir)
+    assert ("  do jj = 1, n, 1\n"
+            "    do ji = 1, 10, 1\n"
+            "      ztmp(ji,jj) = a(ji,jj) + 1.0\n"
+            "      b(ji,jj) = 2.0 * ztmp(ji,jj)\n"
+            "      c(ji,jj) = ztmp(ji,jj) - b(ji,jj)\n"
+            "    enddo\n"
+            "  enddo\n" in out)
+    assert Compile(tmpdir).string_compiles(out)
+
+
+def test_routine_loop_fuse_not_fused(fortran_reader, fortran_writer):
+    ''' Check that loops are not fused if their bounds differ, if an array
+    is accessed at a different index in the fused dimension or if a loop
+    contains a call, and that the loops inside an if block are fused. '''
+    psyir = fortran_reader.psyir_from_source(
+        "subroutine sub(n)\n"
+        "  integer, intent(in) :: n\n"
+        "  integer :: ji\n"
+        "  real, dimension(20) :: a, b, c\n"
+        "  do ji = 1, n\n"
+        "    a(ji) = 1.0\n"
+        "  end do\n"
+        "  do ji = 2, n\n"
+        "    b(ji) = a(ji)\n"
+        "  end do\n"
+        "  do ji = 2, n\n"
+        "    c(ji) = b(ji+1)\n"
+        "  end do\n"
+        "  do ji = 2, n\n"
+        "    call random_number(a(ji))\n"
+        "  end do\n"
+        "  if (n > 2) then\n"
+        "    do ji = 1, n\n"
+        "      a(ji) = 1.0\n"
+        "    end do\n"
+        "    do ji = 1, n\n"
+        "      b(ji) = a(ji)\n"
+        "    end do\n"
+        "  end if\n"
+        "end subroutine sub\n")
+    routine = psyir.walk(Routine)[0]
+    trans = NemoRoutineLoopFuseTrans()
+    trans.apply(routine)
+    decisions = trans.fusion_decisions
+    assert len(decisions) == 4
+    assert ("Not fused 'do ji = 1, n, 1' and 'do ji = 2, n, 1': "
+            "Transformation Error: Lower loop bounds must be identical"
+            in decisions[0])
+    assert ("Not fused 'do ji = 2, n, 1' and 'do ji = 2, n, 1': "
+            "Transformation Error: Array 'b' is written in one of the loops "
+            "and not always accessed with the same index in the dimension "
+            "indexed by 'ji'." == decisions[1])
+    assert ("Not fused 'do ji = 2, n, 1' and 'do ji = 2, n, 1': "
+            "Transformation Error: The loop over 'ji' contains a CodeBlock "
+            "or a Call." == decisions[2])
+    assert decisions[3] == "Fused 'do ji = 1, n, 1' and 'do ji = 1, n, 1'."
+    out = fortran_writer(psyir)
+    assert out.count("do ji =") == 5
+
+
+def test_routine_loop_fuse_whole_array(fortran_reader, fortran_writer):
+    ''' Check that two loops are not fused if an array written in one of
+    them is accessed as a whole in the other one. '''
+    psyir = fortran_reader.psyir_from_source(
+        "subroutine sub(n)\n"
+        "  integer, intent(in) :: n\n"
+        "  integer :: ji\n"
+        "  real, dimension(20) :: a, c\n"
+        "  do ji = 1, n\n"
+        "    a(ji) = 1.0\n"
+        "  end do\n"
+        "  do ji = 1, n\n"
+        "    c(ji) = sum(a)\n"
+        "  end do\n"
+        "end subroutine sub\n")
+    trans = NemoRoutineLoopFuseTrans()
+    trans.apply(psyir.walk(Routine)[0])
+    assert trans.fusion_decisions == [
+        "Not fused 'do ji = 1, n, 1' and 'do ji = 1, n, 1': "
+        "Transformation Error: Array 'a' is written in one of the loops "
+        "and not always accessed with the same index in the dimension "
+        "indexed by 'ji'."]
+    assert fortran_writer(psyir).count("do ji =") == 2
@@ -49,7 +49,7 @@ from psyclone.configuration import Config
 from psyclone.domain.lfric import LFRicConstants
 from psyclone.dynamo0p3 import DynKernMetadata, DynKern, DynBasisFunctions, \
     qr_basis_alloc_args
-from psyclone.errors import InternalError
+from psyclone.errors import GenerationError, InternalError
 from psyclone.f2pygen import ModuleGen
 from psyclone.parse.algorithm import KernelCall, parse
 from psyclone.psyGen import CodedKern, PSyFactory
@@ -666,6 +666,93 @@ def test_dynbasisfns_dealloc(monkeypatch):
             "one of 'basis' or 'diff-basis'" in str(err.value))
 
 
+def test_shared_basis_fns_xyoz(monkeypatch, dist_mem):
+    ''' Check that, when the SHARE_BASIS_FUNCTIONS configuration option
+    is set, the basis arrays required by an invoke are declared at module
+    level, are only (re-)computed when they have not already been computed
+    for the same function space and quadrature object and are not
+    deallocated at the end of the invoke. '''
+    api_config = Config.get().api_conf(API)
+    monkeypatch.setattr(api_config, "_share_basis_functions", True)
+    _, invoke_info = parse(os.path.join(BASE_PATH,
+                                        "1.1.10_multi_invoke_xyoz_qr.f90"),
+                           api=API)
+    psy = PSyFactory(API, distributed_memory=dist_mem).create(invoke_info)
+    code = str(psy.gen)
+    module_decls = (
+        "    IMPLICIT NONE\n"
+        "    REAL(KIND=r_def), allocatable :: basis_w1_qr(:,:,:,:), "
+        "diff_basis_w2_qr(:,:,:,:), basis_w3_qr(:,:,:,:), "
+        "diff_basis_w3_qr(:,:,:,:)\n")
+    assert module_decls in code
+    assert ("    INTEGER(KIND=i_def) :: basis_w1_qr_fs_id=0, "
+            "diff_basis_w2_qr_fs_id=0, basis_w3_qr_fs_id=0, "
+            "diff_basis_w3_qr_fs_id=0\n" in code)
+    assert ("    REAL(KIND=r_def), pointer :: basis_w1_qr_weights(:) => "
+            "null(), diff_basis_w2_qr_weights(:) => null(), "
+            "basis_w3_qr_weights(:) => null(), diff_basis_w3_qr_weights(:) "
+            "=> null()\n" in code)
+    # The arrays are declared once (at module level) only
+    assert code.count("allocatable :: basis_w1_qr") == 1
+    guard = (
+        "      IF (.NOT. ALLOCATED(basis_w1_qr) .OR. basis_w1_qr_fs_id /= "
+        "f1_proxy%vspace%get_id() .OR. .NOT. ASSOCIATED("
+        "basis_w1_qr_weights, weights_xy_qr)) THEN\n"
+        "        IF (ALLOCATED(basis_w1_qr)) THEN\n"
+        "          DEALLOCATE (basis_w1_qr)\n"
+        "        END IF\n"
+        "        ALLOCATE (basis_w1_qr(dim_w1, ndf_w1, np_xy_qr, np_z_qr))\n"
+        "        CALL qr%compute_function(BASIS, f1_proxy%vspace, dim_w1, "
+        "ndf_w1, basis_w1_qr)\n"
+        "        basis_w1_qr_fs_id = f1_proxy%vspace%get_id()\n"
+        "        basis_w1_qr_weights => weights_xy_qr\n"
+        "      END IF\n")
+    # Both invokes contain the guarded computation
+    assert code.count(guard) == 2
+    assert ("      IF (.NOT. ALLOCATED(diff_basis_w3_qr) .OR. "
+            "diff_basis_w3_qr_fs_id /= m2_proxy%vspace%get_id() .OR. "
+            ".NOT. ASSOCIATED(diff_basis_w3_qr_weights, weights_xy_qr)) "
+            "THEN\n" in code)
+    assert "Compute basis/diff-basis arrays" not in code
+    assert "DEALLOCATE (basis_w1_qr, " not in code
+
+
+def test_shared_basis_fns_face_qr(monkeypatch):
+    ''' Check that the weights pointer recording the quadrature object for
+    which a shared basis array was computed has the right rank for face
+    quadrature. '''
+    api_config = Config.get().api_conf(API)
+    monkeypatch.setattr(api_config, "_share_basis_functions", True)
+    _, invoke_info = parse(os.path.join(BASE_PATH, "1.1.6_face_qr.f90"),
+                           api=API)
+    psy = PSyFactory(API, distributed_memory=False).create(invoke_info)
+    code = str(psy.gen)
+    assert "basis_w1_qr_weights(:,:) => null()" in code
+    assert ("ASSOCIATED(basis_w1_qr_weights, weights_xyz_qr)"
+            in code)
+    assert "basis_w1_qr_weights => weights_xyz_qr\n" in code
+
+
+def test_shared_basis_fns_shape_clash(monkeypatch):
+    ''' Check that an error is raised if shared basis arrays are required
+    by two invokes that pass quadrature objects with the same name but of
+    different shapes, as the module variables would be declared twice. '''
+    api_config = Config.get().api_conf(API)
+    monkeypatch.setattr(api_config, "_share_basis_functions", True)
+    _, invoke_info = parse(os.path.join(BASE_PATH,
+                                        "1.1.11_multi_invoke_qr_shapes.f90"),
+                           api=API)
+    psy = PSyFactory(API, distributed_memory=False).create(invoke_info)
+    with pytest.raises(GenerationError) as err:
+        _ = psy.gen
+    assert ("The basis/diff-basis arrays are shared between invokes "
+            "(SHARE_BASIS_FUNCTIONS) but the module variable "
+            "'basis_w1_qr_weights' is required as both 'basis_w1_qr_weights"
+            "(:) => null()' and 'basis_w1_qr_weights(:,:) => null()'. "
+            "Quadrature objects of different shapes must have different "
+            "names." in str(err.value))
+
+
 def test_dynkern_setup(monkeypatch):
     ''' Check that internal-consistency checks in DynKern._setup() work
     as expected. '''
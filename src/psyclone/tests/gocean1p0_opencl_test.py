@@ -65,6 +65,16 @@ def setup():
     Config._instance = None
 
 
+@pytest.fixture(autouse=True)
+def restore_dist_mem():
+    '''Creating a PSy object with get_invoke(..., dist_mem=False) sets the
+    distributed-memory flag of the global Config. Restore it after each
+    test so that it does not leak into other tests.'''
+    dist_mem = Config.get().distributed_memory
+    yield()
+    Config.get().distributed_memory = dist_mem
+
+
 # ----------------------------------------------------------------------------
 def test_opencl_compiler_works(kernel_outputdir):
     ''' Check that the specified compiler works for a hello-world
@@ -123,8 +133,11 @@ def test_invoke_use_stmts_and_decls(kernel_outputdir, monkeypatch, debug_mode):
       integer(kind=c_size_t), target :: localsize(2)
       integer(kind=c_size_t), target :: globalsize(2)
       integer(kind=c_intptr_t) u_fld_cl_mem
+      logical u_fld_on_device
       integer(kind=c_intptr_t) p_fld_cl_mem
+      logical p_fld_on_device
       integer(kind=c_intptr_t) cu_fld_cl_mem
+      logical cu_fld_on_device
       integer(kind=c_intptr_t), target, save :: kernel_compute_cu_code
       logical, save :: first_time=.true.
       integer ierr
@@ -156,8 +169,11 @@ def test_invoke_opencl_initialisation(kernel_outputdir):
       integer(kind=c_size_t), target :: localsize(2)
       integer(kind=c_size_t), target :: globalsize(2)
       integer(kind=c_intptr_t) u_fld_cl_mem
+      logical u_fld_on_device
       integer(kind=c_intptr_t) p_fld_cl_mem
+      logical p_fld_on_device
       integer(kind=c_intptr_t) cu_fld_cl_mem
+      logical cu_fld_on_device
       integer(kind=c_intptr_t), target, save :: kernel_compute_cu_code
       logical, save :: first_time=.true.
       integer ierr
@@ -182,8 +198,11 @@ def test_invoke_opencl_initialisation(kernel_outputdir):
         num_cmd_queues = get_num_cmd_queues()
         cmd_queues => get_cmd_queues()
         kernel_compute_cu_code = get_kernel_by_name("compute_cu_code")
+        cu_fld_on_device = cu_fld%data_on_device
         call initialise_device_buffer(cu_fld)
+        p_fld_on_device = p_fld%data_on_device
         call initialise_device_buffer(p_fld)
+        u_fld_on_device = u_fld%data_on_device
         call initialise_device_buffer(u_fld)
         xstart = cu_fld%internal%xstart
         xstop = cu_fld%internal%xstop
@@ -194,9 +213,15 @@ def test_invoke_opencl_initialisation(kernel_outputdir):
       u_fld_cl_mem = transfer(u_fld%device_ptr, u_fld_cl_mem)
         call compute_cu_code_set_args(kernel_compute_cu_code, cu_fld_cl_mem, \
 p_fld_cl_mem, u_fld_cl_mem, xstart - 1, xstop - 1, ystart - 1, ystop - 1)
-        call cu_fld%write_to_device()
-        call p_fld%write_to_device()
-        call u_fld%write_to_device()
+        if (.not. cu_fld_on_device) then
+          call cu_fld%write_to_device()
+        end if
+        if (.not. p_fld_on_device) then
+          call p_fld%write_to_device()
+        end if
+        if (.not. u_fld_on_device) then
+          call u_fld%write_to_device()
+        end if
       end if'''
 
     assert expected in generated_code
@@ -288,10 +313,15 @@ c_sizeof(field%grid%area_t(1,1))'''
         num_cmd_queues = get_num_cmd_queues()
         cmd_queues => get_cmd_queues()
         kernel_compute_kernel_code = get_kernel_by_name("compute_kernel_code")
+        out_fld_on_device = out_fld%data_on_device
         call initialise_device_buffer(out_fld)
+        in_out_fld_on_device = in_out_fld%data_on_device
         call initialise_device_buffer(in_out_fld)
+        in_fld_on_device = in_fld%data_on_device
         call initialise_device_buffer(in_fld)
+        dx_on_device = dx%data_on_device
         call initialise_device_buffer(dx)
+        grid_on_device = c_associated(in_fld%grid%tmask_device)
         call initialise_grid_device_buffers(in_fld)
         xstart = out_fld%internal%xstart
         xstop = out_fld%internal%xstop
@@ -305,17 +335,91 @@ c_sizeof(field%grid%area_t(1,1))'''
         call compute_kernel_code_set_args(kernel_compute_kernel_code, \
 out_fld_cl_mem, in_out_fld_cl_mem, in_fld_cl_mem, dx_cl_mem, in_fld%grid%dx, \
 gphiu_cl_mem, xstart - 1, xstop - 1, ystart - 1, ystop - 1)
-        call out_fld%write_to_device()
-        call in_out_fld%write_to_device()
-        call in_fld%write_to_device()
-        call dx%write_to_device()
-        call write_grid_buffers(in_fld)
+        if (.not. out_fld_on_device) then
+          call out_fld%write_to_device()
+        end if
+        if (.not. in_out_fld_on_device) then
+          call in_out_fld%write_to_device()
+        end if
+        if (.not. in_fld_on_device) then
+          call in_fld%write_to_device()
+        end if
+        if (.not. dx_on_device) then
+          call dx%write_to_device()
+        end if
+        if (.not. grid_on_device) then
+          call write_grid_buffers(in_fld)
+        end if
       end if'''
     assert expected in generated_code
     # TODO 284: Currently this example cannot be compiled because it needs to
     # import a module which won't be found on kernel_outputdir
 
 
+def test_ocl_device_writes():
+    ''' Test the device-residency analysis of the GOInvokeSchedule that
+    decides which fields need to be written to the device before each
+    kernel. '''
+    psy, _ = get_invoke("single_invoke_three_kernels_deps.f90", API, idx=0,
+                        dist_mem=False)
+    sched = psy.invokes.invoke_list[0].schedule
+    kernels = sched.coded_kernels()
+    writes = sched.ocl_device_writes()
+    assert list(writes.keys()) == kernels
+    # Every field is only written once, before the first kernel using it
+    assert writes[kernels[0]] == (["cu_fld", "p_fld", "u_fld"], False)
+    assert writes[kernels[1]] == (["cv_fld", "v_fld"], False)
+    assert writes[kernels[2]] == (["uold_fld"], False)
+
+    # A field that is first completely overwritten by a kernel iterating
+    # over all points does not need to be written to the device at all
+    psy, _ = get_invoke("single_invoke_copy_write_first.f90", API, idx=0,
+                        dist_mem=False)
+    sched = psy.invokes.invoke_list[0].schedule
+    kernels = sched.coded_kernels()
+    writes = sched.ocl_device_writes()
+    assert writes[kernels[0]] == (["vfld"], False)
+    assert writes[kernels[1]] == ([], False)
+
+    # The grid buffers are only written before the first kernel using them
+    psy, _ = get_invoke("driver_test.f90", API, idx=0, dist_mem=False)
+    sched = psy.invokes.invoke_list[0].schedule
+    kernel = sched.coded_kernels()[0]
+    assert sched.ocl_device_writes()[kernel] == \
+        (["out_fld", "in_out_fld", "in_fld", "dx"], True)
+
+
+def test_invoke_opencl_initial_write_once(kernel_outputdir):
+    ''' Test that the OpenCL first time initialisation code only writes
+    each field to the device once, and only if its data was not already on
+    the device when the invoke was first called. '''
+    psy, _ = get_invoke("single_invoke_copy_write_first.f90", API, idx=0,
+                        dist_mem=False)
+    sched = psy.invokes.invoke_list[0].schedule
+    trans = GOMoveIterationBoundariesInsideKernelTrans()
+    for kernel in sched.coded_kernels():
+        trans.apply(kernel)
+    OCLTrans().apply(sched)
+    generated_code = str(psy.gen).lower()
+
+    assert "logical vfld_on_device\n" in generated_code
+    assert "voldfld_on_device" not in generated_code
+    expected = '''\
+        vfld_on_device = vfld%data_on_device
+        call initialise_device_buffer(vfld)
+'''
+    assert expected in generated_code
+    expected = '''\
+        if (.not. vfld_on_device) then
+          call vfld%write_to_device()
+        end if
+'''
+    assert expected in generated_code
+    assert generated_code.count("call vfld%write_to_device()") == 1
+    assert "call voldfld%write_to_device()" not in generated_code
+    assert GOcean1p0OpenCLBuild(kernel_outputdir).code_compiles(psy)
+
+
 def test_opencl_routines_initialisation(kernel_outputdir):
     # pylint: disable=unused-argument
     ''' Test that an OpenCL invoke file has the necessary routines
@@ -700,6 +804,12 @@ def test_opencl_options_validation():
     assert "CodedKern OpenCL option 'queue_number' should be an integer." \
         in str(err.value)
 
+    # local_memory must be a boolean
+    with pytest.raises(TypeError) as err:
+        sched.coded_kernels()[0].set_opencl_options({'local_memory': 1})
+    assert "CodedKern OpenCL option 'local_memory' should be a boolean." \
+        in str(err.value)
+
 
 @pytest.mark.usefixtures("kernel_outputdir")
 @pytest.mark.parametrize("option_to_check", ['enable_profiling',
@@ -779,6 +889,182 @@ def test_opencl_options_effects():
     assert "ierr = clFinish(cmd_queues(2))" not in generated_code
 
 
+def _multi_queue_invoke(alg_file, options, dist_mem=False):
+    ''' Applies OCLTrans (with the supplied options) to the first invoke
+    in the supplied algorithm file.
+
+    :param str alg_file: the name of the algorithm file.
+    :param options: the options to pass to OCLTrans.
+    :type options: dict of str: bool
+    :param bool dist_mem: whether or not distributed memory is enabled.
+
+    :returns: the PSy object and the transformed InvokeSchedule.
+    :rtype: (:py:class:`psyclone.gocean1p0.GOPSy`, \
+             :py:class:`psyclone.gocean1p0.GOInvokeSchedule`)
+
+    '''
+    psy, _ = get_invoke(alg_file, API, idx=0, dist_mem=dist_mem)
+    sched = psy.invokes.invoke_list[0].schedule
+    trans = GOMoveIterationBoundariesInsideKernelTrans()
+    for kernel in sched.coded_kernels():
+        trans.apply(kernel)
+    OCLTrans().apply(sched, options=options)
+    return psy, sched
+
+
+@pytest.mark.usefixtures("kernel_outputdir")
+def test_opencl_multi_queue_independent_kernels():
+    ''' Check that independent kernels are placed on different command
+    queues and that only the kernels not on the first queue wait for the
+    work already enqueued on that queue. '''
+    psy, sched = _multi_queue_invoke("single_invoke_three_kernels.f90",
+                                     {"multi_queue": True})
+    kernels = sched.coded_kernels()
+    assert [kern.opencl_options["queue_number"] for kern in kernels] == \
+        [1, 2, 3]
+    assert all(not deps for deps in sched.kernel_dependencies().values())
+    code = str(psy.gen)
+    assert ("      INTEGER(KIND=c_intptr_t), target :: kernel_events(0:3)\n"
+            in code)
+    assert "wait_list" not in code
+    assert ("ierr = clEnqueueMarkerWithWaitList(cmd_queues(1), 0, "
+            "C_NULL_PTR, C_LOC(kernel_events(0)))" in code)
+    assert ("ierr = clEnqueueNDRangeKernel(cmd_queues(1), "
+            "kernel_compute_cu_code, 2, C_NULL_PTR, C_LOC(globalsize), "
+            "C_LOC(localsize), 0, C_NULL_PTR, C_NULL_PTR)" in code)
+    assert ("ierr = clEnqueueNDRangeKernel(cmd_queues(2), "
+            "kernel_compute_cv_code, 2, C_NULL_PTR, C_LOC(globalsize_1), "
+            "C_LOC(localsize_1), 1, C_LOC(kernel_events(0)), C_NULL_PTR)"
+            in code)
+    assert ("ierr = clEnqueueNDRangeKernel(cmd_queues(3), "
+            "kernel_time_smooth_code, 2, C_NULL_PTR, C_LOC(globalsize_2), "
+            "C_LOC(localsize_2), 1, C_LOC(kernel_events(0)), C_NULL_PTR)"
+            in code)
+    # The end barrier finishes all three queues and the (only) event
+    # is released afterwards
+    assert ("      ierr = clFinish(cmd_queues(3))\n"
+            "      ierr = clReleaseEvent(kernel_events(0))\n" in code)
+    assert "clEnqueueBarrierWithWaitList" not in code
+    # psy_init creates the three queues
+    assert "CALL ocl_env_init(3, " in code
+
+
+@pytest.mark.usefixtures("kernel_outputdir")
+def test_opencl_multi_queue_dependences():
+    ''' Check that a kernel waits (via an event) for a kernel it depends
+    upon on another command queue, is placed on the queue of the last
+    kernel it depends upon and that, without an end barrier, the first
+    queue waits for the last kernel on the other queue. '''
+    psy, sched = _multi_queue_invoke("single_invoke_three_kernels_deps.f90",
+                                     {"multi_queue": True,
+                                      "end_barrier": False})
+    kernels = sched.coded_kernels()
+    deps = sched.kernel_dependencies()
+    assert deps[kernels[2]] == [kernels[0], kernels[1]]
+    assert [kern.opencl_options["queue_number"] for kern in kernels] == \
+        [1, 2, 2]
+    waits, last_events = sched.opencl_event_waits()
+    assert list(waits.values()) == [[], [0], [1]]
+    assert last_events == [3]
+    code = str(psy.gen)
+    assert ("kernel_compute_cu_code, 2, C_NULL_PTR, C_LOC(globalsize), "
+            "C_LOC(localsize), 0, C_NULL_PTR, C_LOC(kernel_events(1)))"
+            in code)
+    assert ("ierr = clEnqueueNDRangeKernel(cmd_queues(2), "
+            "kernel_time_smooth_code, 2, C_NULL_PTR, C_LOC(globalsize_2), "
+            "C_LOC(localsize_2), 1, C_LOC(kernel_events(1)), "
+            "C_LOC(kernel_events(3)))" in code)
+    assert ("      ierr = clEnqueueBarrierWithWaitList(cmd_queues(1), 1, "
+            "C_LOC(kernel_events(3)), C_NULL_PTR)\n"
+            "      ierr = clReleaseEvent(kernel_events(0))\n"
+            "      ierr = clReleaseEvent(kernel_events(1))\n"
+            "      ierr = clReleaseEvent(kernel_events(3))\n" in code)
+    assert "clFinish" not in code.split("SUBROUTINE invoke_0")[1]
+
+
+@pytest.mark.usefixtures("kernel_outputdir")
+def test_opencl_multi_queue_wait_list():
+    ''' Check that a list of events is set-up when a kernel must wait for
+    more than one event. '''
+    psy, sched = _multi_queue_invoke("single_invoke_three_kernels.f90",
+                                     {"multi_queue": True,
+                                      "end_barrier": False})
+    code = str(psy.gen)
+    assert ("      INTEGER(KIND=c_intptr_t), target :: wait_list(2)\n"
+            in code)
+    assert ("      wait_list(1:2) = (/kernel_events(2), kernel_events(3)/)\n"
+            "      ierr = clEnqueueBarrierWithWaitList(cmd_queues(1), 2, "
+            "C_LOC(wait_list), C_NULL_PTR)\n" in code)
+    # Without the multi_queue option no events are used
+    OCLTrans().apply(sched, options={"multi_queue": False})
+    code = str(psy.gen)
+    assert "kernel_events" not in code
+    assert "clEnqueueMarkerWithWaitList" not in code
+
+
+@pytest.mark.usefixtures("kernel_outputdir")
+def test_opencl_multi_queue_validation():
+    ''' Check that the multi_queue option is rejected if it is not a
+    boolean, if combined with out-of-order queues or if the invoke
+    contains halo exchanges. '''
+    with pytest.raises(TransformationError) as err:
+        _multi_queue_invoke("single_invoke.f90", {"multi_queue": 1})
+    assert ("InvokeSchedule OpenCL option 'multi_queue' should be a "
+            "boolean." in str(err.value))
+    with pytest.raises(TransformationError) as err:
+        _multi_queue_invoke("single_invoke.f90", {"multi_queue": True,
+                                                  "out_of_order": True})
+    assert ("The 'multi_queue' OpenCL option relies upon in-order command "
+            "queues and cannot be combined with the 'out_of_order' option."
+            in str(err.value))
+    with pytest.raises(TransformationError) as err:
+        _multi_queue_invoke("single_invoke_three_kernels.f90",
+                            {"multi_queue": True}, dist_mem=True)
+    assert ("The 'multi_queue' OpenCL option is not supported for invokes "
+            "containing halo exchanges but invoke 'invoke_0' has 1."
+            in str(err.value))
+
+
+@pytest.mark.usefixtures("kernel_outputdir")
+def test_opencl_tuning_file(tmpdir):
+    ''' Check that OCLTrans sets the local size of the kernels from the
+    file written by the tuning driver of GOceanExtractTrans. '''
+    tuning_file = tmpdir.join("local_size_tuning.txt")
+    tuning_file.write('compute_cu_code  16\n\n'
+                      'compute_cv_code 0\n'
+                      'compute_cu_code 32\n')
+    psy, sched = _multi_queue_invoke(
+        "single_invoke_two_kernels.f90",
+        {"tuning_file": str(tuning_file)})
+    kernels = sched.coded_kernels()
+    # The last entry of a kernel is used
+    assert kernels[0].opencl_options["local_size"] == 32
+    # A local size of zero means that no value was found by the tuning
+    assert kernels[1].opencl_options["local_size"] == 64
+    assert "localsize = (/32, 1/)" in str(psy.gen)
+
+
+def test_opencl_tuning_file_errors(tmpdir):
+    ''' Check the errors raised by OCLTrans for a tuning file that does
+    not exist or cannot be parsed. '''
+    psy, _ = get_invoke("single_invoke.f90", API, idx=0)
+    sched = psy.invokes.invoke_list[0].schedule
+    otrans = OCLTrans()
+
+    missing_file = str(tmpdir.join("does_not_exist.txt"))
+    with pytest.raises(TransformationError) as err:
+        otrans.apply(sched, options={"tuning_file": missing_file})
+    assert ("Cannot read the OpenCL tuning file '{0}'".format(missing_file)
+            in str(err.value))
+
+    tuning_file = tmpdir.join("local_size_tuning.txt")
+    tuning_file.write("compute_cu_code 16 32\n")
+    with pytest.raises(TransformationError) as err:
+        otrans.apply(sched, options={"tuning_file": str(tuning_file)})
+    assert ("Invalid line 'compute_cu_code 16 32' in the OpenCL tuning "
+            "file" in str(err.value))
+
+
 def test_set_kern_args(kernel_outputdir):
     ''' Check that we generate the necessary code to set kernel arguments. '''
     psy, _ = get_invoke("single_invoke_two_kernels.f90", API, idx=0)
@@ -1023,6 +1309,45 @@ def test_opencl_code_generation_with_boundary_mask():
     assert expected_code == openclwriter(kschedule)
 
 
+def test_opencl_kernel_local_memory_tiles():
+    ''' Tests that the read-only fields with a stencil access are loaded
+    into __local memory tiles when the 'local_memory' OpenCL option of the
+    kernel is set. '''
+    psy, _ = get_invoke("single_invoke.f90", API, idx=0)
+    sched = psy.invokes.invoke_list[0].schedule
+    kernel = sched.coded_kernels()[0]  # compute_cu kernel
+    GOMoveIterationBoundariesInsideKernelTrans().apply(kernel)
+    # Only the 'p' field is read with a stencil (one point to the East)
+    assert kernel.opencl_local_memory_tiles() == {"p": (1, 0)}
+
+    OCLTrans().apply(sched)
+    assert "__local" not in kernel._transformed_code()
+    kernel.set_opencl_options({'local_memory': True, 'local_size': 4})
+    code = kernel._transformed_code()
+    assert (
+        "  int i = get_global_id(0);\n"
+        "  int j = get_global_id(1);\n"
+        "  int i_local = get_local_id(0);\n"
+        "  __local double p_tile[6];\n"
+        "  for (int tile_j = 0; tile_j < 1; tile_j++) {\n"
+        "    for (int tile_i = i_local; tile_i < 6; tile_i += 4) {\n"
+        "      int tile_gi = i - i_local - 1 + tile_i;\n"
+        "      int tile_gj = j - 0 + tile_j;\n"
+        "      if (tile_gi >= 0 && tile_gi < pLEN1 && tile_gj >= 0 && "
+        "tile_gj < pLEN2) {\n"
+        "        p_tile[tile_j * 6 + tile_i] = p[tile_gj * pLEN1 + tile_gi];\n"
+        "      }\n"
+        "    }\n"
+        "  }\n"
+        "  barrier(CLK_LOCAL_MEM_FENCE);\n"
+        "  if ((((i < xstart) || (i > xstop)) || ((j < ystart) ||"
+        " (j > ystop)))) {\n"
+        "    return;\n"
+        "  }\n"
+        "  cu[j * cuLEN1 + i] = ((0.5e0 * (p_tile[2 + i_local] + "
+        "p_tile[1 + i_local])) * u[j * uLEN1 + i]);\n" in code)
+
+
 @pytest.mark.usefixtures("kernel_outputdir")
 def test_opencl_kernel_missing_boundary_symbol():
     '''Check that an OpenCL file named modulename_kernelname_0 is generated.
@@ -0,0 +1,165 @@
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2021, Science and Technology Facilities Council.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+
+'''Module containing py.test tests for the assignment of the OpenACC
+   regions of NEMO code to asynchronous queues.
+
+'''
+
+from __future__ import print_function, absolute_import
+import pytest
+from fparser.common.readfortran import FortranStringReader
+from psyclone.psyGen import PSyFactory, ACCWaitDirective
+from psyclone.psyir.nodes import Loop, Schedule
+from psyclone.psyir.transformations import TransformationError
+from psyclone.transformations import ACCAsyncTrans, ACCKernelsTrans
+
+
+# The PSyclone API under test
+API = "nemo"
+
+ASYNC_CODE = '''program test
+  integer, parameter :: jpi = 10, jpj = 10
+  integer :: ji, jj
+  real :: a(jpi,jpj), b(jpi,jpj), c(jpi,jpj), d(jpi,jpj)
+  do jj = 1, jpj
+    do ji = 1, jpi
+      a(ji,jj) = 1.0
+    end do
+  end do
+  do jj = 1, jpj
+    do ji = 1, jpi
+      b(ji,jj) = 2.0
+    end do
+  end do
+  do jj = 1, jpj
+    do ji = 1, jpi
+      c(ji,jj) = a(ji,jj) + b(ji,jj)
+    end do
+  end do
+  write(*,*) d(1,1)
+  do jj = 1, jpj
+    do ji = 1, jpi
+      d(ji,jj) = 3.0
+    end do
+  end do
+  b(1,1) = d(1,1)
+end program test
+'''
+
+
+def test_async_trans_validate():
+    ''' Check the validation of the options of ACCAsyncTrans. '''
+    trans = ACCAsyncTrans()
+    assert trans.name == "ACCAsyncTrans"
+    assert str(trans) == ("Assigns independent OpenACC kernels and parallel "
+                          "regions to different asynchronous queues")
+    with pytest.raises(TransformationError) as err:
+        trans.validate(Loop())
+    assert ("Error in ACCAsyncTrans: the supplied node must be a Schedule "
+            "but found 'Loop'." in str(err.value))
+    schedule = Schedule()
+    for value in [0, "2", True]:
+        with pytest.raises(TransformationError) as err:
+            trans.validate(schedule, {"num_queues": value})
+        assert ("the 'num_queues' option must be a positive integer but got "
+                "'{0}'.".format(value) in str(err.value))
+    with pytest.raises(TransformationError) as err:
+        trans.validate(schedule, {"first_queue": -1})
+    assert ("the 'first_queue' option must be a non-negative integer but got "
+            "'-1'." in str(err.value))
+
+
+def test_async_trans(parser):
+    ''' Check that independent kernels regions are executed on different
+    queues, that dependent regions use the queue of the region they depend
+    on and wait for any others, and that the host waits for the queues
+    before it accesses their data and at the end of the Schedule. '''
+    code = parser(FortranStringReader(ASYNC_CODE))
+    psy = PSyFactory(API, distributed_memory=False).create(code)
+    schedule = psy.invokes.invoke_list[0].schedule
+    ktrans = ACCKernelsTrans()
+    for child in schedule.children[:]:
+        if isinstance(child, Loop):
+            ktrans.apply(child, {"default_present": True})
+    ACCAsyncTrans().apply(schedule, {"num_queues": 2})
+
+    # A wait is required before the CodeBlock (whose accesses are not
+    # known) and before the assignment that reads d. No region is then
+    # executing at the end of the Schedule.
+    assert isinstance(schedule[3], ACCWaitDirective)
+    assert schedule[3].wait_queues == [1, 2]
+    assert isinstance(schedule[6], ACCWaitDirective)
+    assert schedule[6].wait_queues == [1]
+    assert len(schedule.children) == 8
+
+    gen_code = str(psy.gen)
+    assert ("  !$ACC KERNELS ASYNC(1) DEFAULT(PRESENT)\n"
+            "  DO jj = 1, jpj\n"
+            "    DO ji = 1, jpi\n"
+            "      a(ji, jj) = 1.0\n" in gen_code)
+    assert ("  !$ACC KERNELS ASYNC(2) DEFAULT(PRESENT)\n"
+            "  DO jj = 1, jpj\n"
+            "    DO ji = 1, jpi\n"
+            "      b(ji, jj) = 2.0\n" in gen_code)
+    assert ("  !$ACC KERNELS ASYNC(2) WAIT(1) DEFAULT(PRESENT)\n"
+            "  DO jj = 1, jpj\n"
+            "    DO ji = 1, jpi\n"
+            "      c(ji, jj) = a(ji, jj) + b(ji, jj)\n" in gen_code)
+    assert ("  !$ACC END KERNELS\n"
+            "  !$ACC WAIT(1,2)\n"
+            "  WRITE(*, *) d(1, 1)\n"
+            "  !$ACC KERNELS ASYNC(1) DEFAULT(PRESENT)\n" in gen_code)
+    assert ("  !$ACC END KERNELS\n"
+            "  !$ACC WAIT(1)\n"
+            "  b(1, 1) = d(1, 1)\n"
+            "END PROGRAM test" in gen_code)
+
+    # Without the final assignment the host waits at the end
+    code = parser(FortranStringReader(ASYNC_CODE.replace(
+        "  b(1,1) = d(1,1)\n", "")))
+    psy = PSyFactory(API, distributed_memory=False).create(code)
+    schedule = psy.invokes.invoke_list[0].schedule
+    for child in schedule.children[:]:
+        if isinstance(child, Loop):
+            ktrans.apply(child, {"default_present": True})
+    # By default four queues are used
+    ACCAsyncTrans().apply(schedule, {"first_queue": 0})
+    assert [schedule[idx].async_queue for idx in [0, 1, 2, 5]] == \
+        [0, 1, 1, 2]
+    assert isinstance(schedule[6], ACCWaitDirective)
+    assert schedule[6].wait_queues == [2]
+    assert ("  !$ACC END KERNELS\n"
+            "  !$ACC WAIT(2)\n"
+            "END PROGRAM test" in str(psy.gen))
@@ -46,6 +46,7 @@ from psyclone.psyGen import PSyFactory, TransInfo, ACCDataDirective
 from psyclone.errors import InternalError
 from psyclone.psyir.transformations import TransformationError
 from psyclone.tests.utilities import get_invoke, Compile
+from psyclone.transformations import ACCDataTrans, ACCDataMergeTrans
 
 
 # Constants
@@ -543,3 +544,54 @@ def test_missed_array_case(parser):
         _ = str(psy.gen)
     assert ("ArrayReference 'ice_mask' present in source code ("
             "'ice_mask(ji, jj)') but not identified" in str(err.value))
+
+
+def test_data_merge(parser):
+    ''' Check that ACCDataMergeTrans merges adjacent data regions that
+    access the same arrays (including regions that only overlap after an
+    earlier merge) but not regions with no arrays in common or with
+    different async clauses. '''
+    code = ("program merge\n"
+            "  integer, parameter :: jpi = 10\n"
+            "  integer :: ji\n"
+            "  real :: a(jpi), b(jpi), c(jpi), d(jpi)\n"
+            "  do ji = 1, jpi\n"
+            "    a(ji) = 1.0\n"
+            "  end do\n"
+            "  do ji = 1, jpi\n"
+            "    b(ji) = 2.0\n"
+            "  end do\n"
+            "  do ji = 1, jpi\n"
+            "    c(ji) = a(ji) + b(ji)\n"
+            "  end do\n"
+            "  do ji = 1, jpi\n"
+            "    d(ji) = 3.0\n"
+            "  end do\n"
+            "  do ji = 1, jpi\n"
+            "    d(ji) = 2.0 * d(ji)\n"
+            "  end do\n"
+            "end program merge\n")
+    psy = PSyFactory(API, distributed_memory=False).create(
+        parser(FortranStringReader(code)))
+    schedule = psy.invokes.invoke_list[0].schedule
+    dtrans = ACCDataTrans()
+    for child in schedule.children[:]:
+        dtrans.apply(child)
+    schedule[4].async_queue = 1
+    trans = ACCDataMergeTrans()
+    assert trans.name == "ACCDataMergeTrans"
+    assert str(trans) == ("Merges adjacent OpenACC data regions that access "
+                          "the same arrays")
+    with pytest.raises(TransformationError) as err:
+        trans.apply(schedule[0])
+    assert ("Error in ACCDataMergeTrans: the supplied node must be a "
+            "Schedule but found 'ACCDataDirective'." in str(err.value))
+    trans.apply(schedule)
+
+    assert len(schedule.children) == 3
+    assert len(schedule[0].dir_body.children) == 3
+    gen_code = str(psy.gen)
+    assert gen_code.count("!$ACC DATA") == 3
+    assert "  !$ACC DATA COPYOUT(a,b,c)\n" in gen_code
+    assert "  !$ACC DATA COPYOUT(d)\n" in gen_code
+    assert "  !$ACC DATA ASYNC(1) COPY(d)\n" in gen_code
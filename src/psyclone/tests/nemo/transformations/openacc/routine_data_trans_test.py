@@ -0,0 +1,249 @@
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2021, Science and Technology Facilities Council.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+
+'''Module containing py.test tests for the enclosing of NEMO routines
+   within an OpenACC data region with explicit data movement.
+
+'''
+
+from __future__ import print_function, absolute_import
+import pytest
+from fparser.common.readfortran import FortranStringReader
+from psyclone.psyGen import PSyFactory, ACCDataDirective, \
+    ACCUpdateDirective
+from psyclone.psyir.nodes import Return
+from psyclone.psyir.transformations import TransformationError
+from psyclone.transformations import ACCKernelsTrans, ACCRoutineDataTrans, \
+    ACCDataMergeTrans
+
+
+# The PSyclone API under test
+API = "nemo"
+
+ROUTINE_CODE = '''subroutine sub(a, b, c)
+  integer, parameter :: jpi = 10
+  integer :: ji, jt
+  real, intent(inout) :: a(jpi), b(jpi), c(jpi)
+  real :: wrk(jpi)
+  do ji = 1, jpi
+    wrk(ji) = a(ji) + 1.0
+  end do
+  do ji = 1, jpi
+    b(ji) = wrk(ji)
+  end do
+  write(*,*) b(1)
+  c(1) = 0.0
+  do jt = 1, 3
+    do ji = 1, jpi
+      c(ji) = c(ji) + b(ji)
+    end do
+    if (c(1) > 0.0) then
+      print *, "positive"
+    end if
+  end do
+  do ji = 1, jpi
+    a(ji) = c(ji)
+  end do
+end subroutine sub
+'''
+
+
+def _get_schedule(parser, code):
+    ''' Create the NEMO PSy layer for the supplied code and return it
+    together with its (first) Schedule. '''
+    psy = PSyFactory(API, distributed_memory=False).create(
+        parser(FortranStringReader(code)))
+    return psy, psy.invokes.invoke_list[0].schedule
+
+
+def test_routine_data_validate(parser):
+    ''' Check the validation checks of ACCRoutineDataTrans. '''
+    trans = ACCRoutineDataTrans()
+    assert trans.name == "ACCRoutineDataTrans"
+    assert str(trans) == ("Encloses a routine in an OpenACC data region "
+                          "with the minimum of data movement")
+    _, schedule = _get_schedule(parser, ROUTINE_CODE)
+    with pytest.raises(TransformationError) as err:
+        trans.validate(schedule[0])
+    assert ("Error in ACCRoutineDataTrans: the supplied node must be a "
+            "Routine or a NEMO InvokeSchedule but found 'NemoLoop'."
+            in str(err.value))
+    with pytest.raises(TransformationError) as err:
+        trans.validate(schedule)
+    assert ("routine 'sub' does not contain any OpenACC kernels or parallel "
+            "regions." in str(err.value))
+
+    ACCKernelsTrans().apply(schedule[0])
+    with pytest.raises(TransformationError) as err:
+        trans.validate(schedule, {"present": "a"})
+    assert ("the 'present' option must be a list of str but got 'a'."
+            in str(err.value))
+    schedule[0].async_queue = 1
+    with pytest.raises(TransformationError) as err:
+        trans.validate(schedule)
+    assert ("routine 'sub' contains asynchronous OpenACC regions."
+            in str(err.value))
+    schedule[0].async_queue = None
+    schedule.addchild(ACCUpdateDirective("host", ["a"]))
+    with pytest.raises(TransformationError) as err:
+        trans.validate(schedule)
+    assert ("routine 'sub' already contains OpenACC data directives."
+            in str(err.value))
+    schedule[-1].replace_with(Return())
+    with pytest.raises(TransformationError) as err:
+        trans.validate(schedule)
+    assert ("routine 'sub' contains a Return statement which would exit the "
+            "data region." in str(err.value))
+
+    _, schedule = _get_schedule(parser,
+                                "subroutine alloc()\n"
+                                "  integer :: ji\n"
+                                "  real, allocatable :: a(:)\n"
+                                "  allocate(a(10))\n"
+                                "  do ji = 1, 10\n"
+                                "    a(ji) = 0.0\n"
+                                "  end do\n"
+                                "end subroutine alloc\n")
+    ACCKernelsTrans().apply(schedule[1])
+    with pytest.raises(TransformationError) as err:
+        trans.validate(schedule)
+    assert ("routine 'alloc' allocates or deallocates arrays that are "
+            "accessed on the accelerator: 'ALLOCATE(a(10))'."
+            in str(err.value))
+
+
+def test_routine_data(parser):
+    ''' Check that ACCRoutineDataTrans adds a data region with the minimal
+    data clauses and the required update directives around the host code,
+    including within a loop containing both host and accelerator code. '''
+    psy, schedule = _get_schedule(parser, ROUTINE_CODE)
+    ktrans = ACCKernelsTrans()
+    for node in [schedule[0], schedule[1], schedule[4].loop_body[0],
+                 schedule[5]]:
+        ktrans.apply(node, {"default_present": True})
+    ACCRoutineDataTrans().apply(schedule)
+    assert len(schedule.children) == 1
+    assert isinstance(schedule[0], ACCDataDirective)
+    # The arguments a and c are read on the accelerator before any host
+    # access and a is last written on the accelerator. The host copy of b
+    # is updated for the output statement. wrk is a local array.
+    assert schedule[0].clauses == {"copy": ["a"],
+                                   "create": ["b", "c", "wrk"]}
+    # The merging of data regions does not alter explicit clauses.
+    ACCDataMergeTrans().apply(schedule)
+    gen_code = str(psy.gen)
+    assert ("  !$ACC DATA COPY(a) CREATE(b,c,wrk)\n"
+            "  !$ACC KERNELS DEFAULT(PRESENT)\n" in gen_code)
+    assert ("  !$ACC END KERNELS\n"
+            "  !$ACC UPDATE HOST(b)\n"
+            "  WRITE(*, *) b(1)\n"
+            "  c(1) = 0.0\n"
+            "  !$ACC UPDATE DEVICE(c)\n"
+            "  DO jt = 1, 3\n" in gen_code)
+    assert ("    !$ACC END KERNELS\n"
+            "    !$ACC UPDATE HOST(c)\n"
+            "    IF (c(1) > 0.0) THEN\n" in gen_code)
+    assert ("  !$ACC END KERNELS\n"
+            "  !$ACC END DATA\n"
+            "END SUBROUTINE sub" in gen_code)
+
+
+def test_routine_data_present(parser):
+    ''' Check the data clauses for arrays that are present on the
+    accelerator or only written on the accelerator and that an array passed
+    to a call is assumed to be written by it. '''
+    code = ("subroutine sub(a, b, c)\n"
+            "  use some_mod, only: work\n"
+            "  integer, parameter :: jpi = 10\n"
+            "  integer :: ji\n"
+            "  real, intent(inout) :: a(jpi), b(jpi), c(jpi)\n"
+            "  do ji = 1, jpi\n"
+            "    a(ji) = 1.0\n"
+            "    c(ji) = b(ji)\n"
+            "  end do\n"
+            "  call work(b)\n"
+            "  do ji = 1, jpi\n"
+            "    a(ji) = a(ji) + b(ji)\n"
+            "  end do\n"
+            "end subroutine sub\n")
+    psy, schedule = _get_schedule(parser, code)
+    ACCKernelsTrans().apply(schedule[0])
+    ACCKernelsTrans().apply(schedule[2])
+    ACCRoutineDataTrans().apply(schedule, {"present": ["B"]})
+    assert schedule[0].clauses == {"copyout": ["a", "c"],
+                                   "present": ["b"]}
+    gen_code = str(psy.gen)
+    assert "  !$ACC DATA COPYOUT(a,c) PRESENT(b)\n" in gen_code
+    # The host and accelerator copies of b are both valid on entry so
+    # only the accelerator copy must be updated after the call.
+    assert ("  !$ACC END KERNELS\n"
+            "  CALL work(b)\n"
+            "  !$ACC UPDATE DEVICE(b)\n" in gen_code)
+
+
+def test_routine_data_device_only(parser):
+    ''' Check that no update directives are added around a loop containing
+    both host and accelerator code for an array that is only accessed on
+    the accelerator. '''
+    code = ("subroutine sub(a)\n"
+            "  integer, parameter :: jpi = 10\n"
+            "  integer :: ji, jt\n"
+            "  real, intent(inout) :: a(jpi)\n"
+            "  real :: wrk(jpi)\n"
+            "  do jt = 1, 3\n"
+            "    do ji = 1, jpi\n"
+            "      wrk(ji) = a(ji) * 2.0\n"
+            "    end do\n"
+            "    do ji = 1, jpi\n"
+            "      a(ji) = wrk(ji) + 1.0\n"
+            "    end do\n"
+            "    write(*,*) a(1)\n"
+            "  end do\n"
+            "end subroutine sub\n")
+    psy, schedule = _get_schedule(parser, code)
+    ktrans = ACCKernelsTrans()
+    ktrans.apply(schedule[0].loop_body[0:2], {"default_present": True})
+    ACCRoutineDataTrans().apply(schedule)
+    assert schedule[0].clauses == {"copyin": ["a"], "create": ["wrk"]}
+    gen_code = str(psy.gen)
+    assert ("  !$ACC DATA COPYIN(a) CREATE(wrk)\n"
+            "  DO jt = 1, 3\n"
+            "    !$ACC KERNELS DEFAULT(PRESENT)\n" in gen_code)
+    assert ("    !$ACC END KERNELS\n"
+            "    !$ACC UPDATE HOST(a)\n"
+            "    WRITE(*, *) a(1)\n"
+            "  END DO\n"
+            "  !$ACC END DATA\n" in gen_code)
+    # The only update is for the host code within the loop
+    assert len(schedule.walk(ACCUpdateDirective)) == 1
@@ -43,7 +43,8 @@ from psyclone.psyGen import TransInfo, PSyFactory
 from psyclone.errors import InternalError, GenerationError
 from psyclone.tests.utilities import get_invoke
 from psyclone import nemo
-from psyclone.transformations import OMPLoopTrans, OMPParallelTrans
+from psyclone.transformations import OMPLoopTrans, OMPNowaitTrans, \
+    OMPParallelLoopTrans, OMPParallelTrans, TransformationError
 from psyclone.psyGen import OMPDoDirective
 from psyclone.psyir.nodes import Statement
 
@@ -316,3 +317,209 @@ def test_omp_do_within_if():
         "      !$omp end parallel do\n"
         "    end if\n")
     assert expected in gen
+
+
+def test_omp_do_auto_schedule(parser):
+    ''' Check that the 'auto_schedule' option of OMPLoopTrans collapses
+    shallow NEMO loop nests and that the collapse clause is added to the
+    fparser2 parse tree. '''
+    reader = FortranStringReader("program do_loop\n"
+                                 "use par_oce, only: jpi, jpj, jpk\n"
+                                 "integer :: ji, jj, jk\n"
+                                 "real :: tmp(jpi,jpj,jpk)\n"
+                                 "do jk = 1, jpk\n"
+                                 "  do jj = 1, jpj\n"
+                                 "    do ji = 1, jpi\n"
+                                 "      tmp(ji,jj,jk) = 1.0d0\n"
+                                 "    end do\n"
+                                 "  end do\n"
+                                 "end do\n"
+                                 "end program do_loop\n")
+    code = parser(reader)
+    psy = PSyFactory(API, distributed_memory=False).create(code)
+    schedule = psy.invokes.invoke_list[0].schedule
+    OMPLoopTrans().apply(schedule[0], {"auto_schedule": True})
+    OMPParallelTrans().apply(schedule[0])
+    gen_code = str(psy.gen).lower()
+    # The number of levels is not known but the vertical loop is assumed
+    # to be too short on its own while the latitude loop is not
+    assert ("  !$omp do schedule(static), collapse(2)\n"
+            "  do jk = 1, jpk" in gen_code)
+
+    # With known loop bounds all three loops are collapsed
+    psy, invoke = get_invoke("explicit_do.f90", api=API, idx=0)
+    schedule = invoke.schedule
+    OMPLoopTrans().apply(schedule[0], {"auto_schedule": True,
+                                       "num_threads": 8})
+    OMPParallelTrans().apply(schedule[0])
+    assert ("  !$omp do schedule(static), collapse(3)\n"
+            "  do jk = 1, jpk" in str(psy.gen).lower())
+
+
+def test_omp_do_auto_schedule_dependence(parser):
+    ''' Check that the 'auto_schedule' option of OMPLoopTrans does not
+    collapse an inner loop that carries a dependence. '''
+    reader = FortranStringReader("program do_loop\n"
+                                 "use par_oce, only: jpi, jpj, jpk\n"
+                                 "integer :: ji, jj, jk\n"
+                                 "real :: a(jpi,jpj,jpk)\n"
+                                 "do jk = 1, jpk\n"
+                                 "  do jj = 2, jpj\n"
+                                 "    do ji = 1, jpi\n"
+                                 "      a(ji,jj,jk) = a(ji,jj-1,jk) + 1.0\n"
+                                 "    end do\n"
+                                 "  end do\n"
+                                 "end do\n"
+                                 "end program do_loop\n")
+    code = parser(reader)
+    psy = PSyFactory(API, distributed_memory=False).create(code)
+    schedule = psy.invokes.invoke_list[0].schedule
+    otrans = OMPLoopTrans()
+    assert otrans.select_collapse_and_schedule(schedule[0]) == \
+        (1, "static")
+    otrans.apply(schedule[0], {"auto_schedule": True})
+    OMPParallelTrans().apply(schedule[0])
+    gen_code = str(psy.gen).lower()
+    assert ("  !$omp do schedule(static)\n"
+            "  do jk = 1, jpk" in gen_code)
+    assert "collapse(2)" not in gen_code
+
+
+def test_omp_do_collapse_invalid_nest(parser):
+    ''' Check that OMPLoopTrans rejects a 'collapse' option for loop nests
+    that are not perfectly nested or whose inner bounds depend on an outer
+    loop, and that 'auto_schedule' does not collapse such nests. '''
+    reader = FortranStringReader("program do_loop\n"
+                                 "use par_oce, only: jpi, jpj, jpk\n"
+                                 "integer :: ji, jj, jk\n"
+                                 "real :: tmp(jpi,jpj,jpk)\n"
+                                 "do jk = 1, jpk\n"
+                                 "  do jj = 1, jpj\n"
+                                 "    tmp(1,jj,jk) = 1.0d0\n"
+                                 "  end do\n"
+                                 "  tmp(1,1,jk) = 0.0d0\n"
+                                 "end do\n"
+                                 "do jk = 1, jpk\n"
+                                 "  do jj = jk, jpj\n"
+                                 "    tmp(1,jj,jk) = 1.0d0\n"
+                                 "  end do\n"
+                                 "end do\n"
+                                 "end program do_loop\n")
+    code = parser(reader)
+    psy = PSyFactory(API, distributed_memory=False).create(code)
+    schedule = psy.invokes.invoke_list[0].schedule
+    otrans = OMPLoopTrans()
+
+    with pytest.raises(TransformationError) as err:
+        otrans.apply(schedule[0], {"collapse": 2})
+    assert ("Cannot apply COLLAPSE(2) clause to this loop nest because it "
+            "is not perfectly nested: the body of the loop over 'jk' "
+            "contains 2 statements instead of just the inner loop."
+            in str(err.value))
+    with pytest.raises(TransformationError) as err:
+        otrans.apply(schedule[1], {"collapse": 2})
+    assert ("Cannot apply COLLAPSE(2) clause to this loop nest because the "
+            "bounds of the loop over 'jj' depend on the variable 'jk' of an "
+            "enclosing loop." in str(err.value))
+
+    # The automatic choice only parallelises the outer loop of these nests
+    otrans.apply(schedule[0], {"auto_schedule": True})
+    otrans.apply(schedule[1], {"auto_schedule": True})
+    for directive in schedule.walk(OMPDoDirective):
+        assert directive.collapse is None
+
+
+def test_omp_parallel_do_collapse(parser):
+    ''' Check that OMPParallelLoopTrans adds a collapse clause to the
+    fparser2 parse tree and that it rejects loop nests that are not
+    perfectly nested or whose inner bounds depend on an outer loop. '''
+    reader = FortranStringReader("program do_loop\n"
+                                 "use par_oce, only: jpi, jpj, jpk\n"
+                                 "integer :: ji, jj, jk\n"
+                                 "real :: tmp(jpi,jpj,jpk)\n"
+                                 "do jk = 1, jpk\n"
+                                 "  do jj = 1, jpj\n"
+                                 "    do ji = 1, jpi\n"
+                                 "      tmp(ji,jj,jk) = 1.0d0\n"
+                                 "    end do\n"
+                                 "  end do\n"
+                                 "end do\n"
+                                 "do jk = 1, jpk\n"
+                                 "  do jj = 1, jpj\n"
+                                 "    tmp(1,jj,jk) = 1.0d0\n"
+                                 "  end do\n"
+                                 "  tmp(1,1,jk) = 0.0d0\n"
+                                 "end do\n"
+                                 "do jj = 1, jpj\n"
+                                 "  do ji = jj, jpi\n"
+                                 "    tmp(ji,jj,1) = 1.0d0\n"
+                                 "  end do\n"
+                                 "end do\n"
+                                 "end program do_loop\n")
+    code = parser(reader)
+    psy = PSyFactory(API, distributed_memory=False).create(code)
+    schedule = psy.invokes.invoke_list[0].schedule
+    otrans = OMPParallelLoopTrans()
+
+    with pytest.raises(TransformationError) as err:
+        otrans.apply(schedule[1], {"collapse": 2})
+    assert ("Cannot apply COLLAPSE(2) clause to this loop nest because it "
+            "is not perfectly nested: the body of the loop over 'jk' "
+            "contains 2 statements instead of just the inner loop."
+            in str(err.value))
+    with pytest.raises(TransformationError) as err:
+        otrans.apply(schedule[2], {"collapse": 2})
+    assert ("Cannot apply COLLAPSE(2) clause to this loop nest because the "
+            "bounds of the loop over 'ji' depend on the variable 'jj' of an "
+            "enclosing loop." in str(err.value))
+    # Collapsing only the outer loop of these nests is fine
+    otrans.apply(schedule[2])
+
+    otrans.apply(schedule[0], {"collapse": 3})
+    gen_code = str(psy.gen).lower()
+    assert ("  !$omp parallel do default(shared), private(ji,jj,jk), "
+            "schedule(static), collapse(3)\n"
+            "  do jk = 1, jpk" in gen_code)
+    assert ("  !$omp parallel do default(shared), private(ji,jj), "
+            "schedule(static)\n"
+            "  do jj = 1, jpj\n"
+            "    do ji = jj, jpi" in gen_code)
+
+
+def test_omp_do_nowait(parser):
+    ''' Check that OMPNowaitTrans removes the barrier at the end of a NEMO
+    loop when the following loops do not access the array that it writes
+    and that the nowait clause is added to the fparser2 parse tree. '''
+    reader = FortranStringReader("program do_loop\n"
+                                 "use par_oce, only: jpi, jpj\n"
+                                 "integer :: ji, jj\n"
+                                 "real :: a(jpi,jpj), b(jpi,jpj)\n"
+                                 "do jj = 1, jpj\n"
+                                 "  do ji = 1, jpi\n"
+                                 "    a(ji,jj) = 1.0d0\n"
+                                 "  end do\n"
+                                 "end do\n"
+                                 "do jj = 1, jpj\n"
+                                 "  do ji = 1, jpi\n"
+                                 "    b(ji,jj) = 2.0d0\n"
+                                 "  end do\n"
+                                 "end do\n"
+                                 "do jj = 1, jpj\n"
+                                 "  do ji = 1, jpi\n"
+                                 "    b(ji,jj) = b(ji,jj) + a(ji,jj)\n"
+                                 "  end do\n"
+                                 "end do\n"
+                                 "end program do_loop\n")
+    code = parser(reader)
+    psy = PSyFactory(API, distributed_memory=False).create(code)
+    schedule = psy.invokes.invoke_list[0].schedule
+    for loop in schedule.children:
+        OMPLoopTrans().apply(loop)
+    OMPParallelTrans().apply(schedule.children)
+    OMPNowaitTrans().apply(schedule[0])
+    assert [child.nowait for child in schedule[0].dir_body.children] == \
+        [False, False, True]
+    gen_code = str(psy.gen).lower()
+    assert gen_code.count("  !$omp end do\n") == 2
+    assert ("  !$omp end do nowait\n"
+            "  !$omp end parallel\n" in gen_code)
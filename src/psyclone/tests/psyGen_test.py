@@ -47,6 +47,7 @@
 # PSyFactory, TransInfo, Transformation
 from __future__ import absolute_import, print_function
 import os
+import re
 import pytest
 
 from fparser import api as fpapi, logging
@@ -68,7 +69,9 @@ from psyclone.psyGen import TransInfo, Transformation, PSyFactory, \
     OMPParallelDirective, OMPDoDirective, OMPDirective, Directive, \
     ACCEnterDataDirective, ACCKernelsDirective, HaloExchange, Invoke, \
     DataAccess, Kern, Arguments, CodedKern, Argument, GlobalSum, \
-    InvokeSchedule
+    InvokeSchedule, OMPSimdDirective, OMPSingleDirective, OMPTaskDirective, \
+    OMPTaskloopDirective, ACCWaitDirective, ACCUpdateDirective, \
+    ACCDataDirective
 from psyclone.psyir.nodes import Assignment, BinaryOperation, \
     Literal, Node, Schedule, KernelSchedule, Call, Loop, colored
 from psyclone.psyir.symbols import DataSymbol, RoutineSymbol, REAL_TYPE, \
@@ -82,7 +85,7 @@ from psyclone.transformations import OMPParallelLoopTrans, \
     Dynamo0p3RedundantComputationTrans, Dynamo0p3KernelConstTrans, \
     ACCEnterDataTrans, ACCParallelTrans, ACCLoopTrans, ACCKernelsTrans, \
     Dynamo0p3OMPLoopTrans, OMPParallelTrans, DynamoOMPParallelLoopTrans, \
-    Dynamo0p3ColourTrans
+    Dynamo0p3ColourTrans, OMPTaskloopTrans, OMPTaskTrans
 
 
 BASE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
@@ -813,6 +816,30 @@ def test_ompdo_constructor():
     assert len(ompdo.dir_body.children) == 1
 
 
+def test_ompdo_nowait():
+    ''' Check the nowait property of an OMPDoDirective and that it is
+    reflected in the node_str and end_string methods. '''
+    ompdo = OMPDoDirective()
+    assert ompdo.nowait is False
+    assert ompdo.end_string() == "omp end do"
+    with pytest.raises(TypeError) as err:
+        ompdo.nowait = "yes"
+    assert ("The nowait property of an OMPDoDirective must be a bool but "
+            "got 'str'." in str(err.value))
+    ompdo.nowait = True
+    assert ompdo.end_string() == "omp end do nowait"
+    assert "[OMP do][nowait]" in ompdo.node_str(colour=False)
+    assert OMPDoDirective(nowait=True).nowait is True
+
+    ompdo = OMPParallelDoDirective()
+    ompdo.nowait = False
+    with pytest.raises(GenerationError) as err:
+        ompdo.nowait = True
+    assert ("An OpenMP PARALLEL DO cannot have a nowait clause because the "
+            "end of the parallel region is always a barrier."
+            in str(err.value))
+
+
 def test_ompdo_directive_class_node_str(dist_mem):
     '''Tests the node_str method in the OMPDoDirective class. We create a
     sub-class object then call this method from it.
@@ -853,6 +880,152 @@ def test_ompdo_directive_class_node_str(dist_mem):
         assert expected_output in out
 
 
+def test_ompsimd_directive():
+    ''' Check the properties, node_str, dag_name and gen_code of an
+    OMPSimdDirective. '''
+    psy, invoke = get_invoke("single_invoke.f90", "gocean1.0",
+                             idx=0, dist_mem=False)
+    schedule = invoke.schedule
+    inner = schedule[0].loop_body[0]
+    ompsimd = OMPSimdDirective(parent=schedule[0].loop_body,
+                               children=[inner.detach()], simdlen=4,
+                               alignment=32)
+    schedule[0].loop_body.addchild(ompsimd)
+    assert ompsimd.collapse is None
+    assert ompsimd.simdlen == 4
+    assert ompsimd.aligned is None
+    assert ompsimd.alignment == 32
+    _, position = ompsimd._find_position(schedule)
+    assert ompsimd.dag_name == "OMP_simd_{0}".format(position)
+    directive = colored("Directive", Directive._colour)
+    assert ompsimd.node_str() == directive + "[OMP simd]"
+    # No aligned clause is added unless the arrays are named
+    assert ompsimd.begin_string() == "omp simd simdlen(4)"
+    assert ompsimd.end_string() == "omp end simd"
+
+    code = str(psy.gen).lower()
+    assert ("        !$omp simd simdlen(4)\n"
+            "        do i=cu_fld%internal%xstart,cu_fld%internal%xstop\n"
+            in code)
+    assert ("        end do\n"
+            "        !$omp end simd\n"
+            "      end do" in code)
+
+
+def test_ompsimd_directive_update():
+    ''' Check that update() adds the simd directive to the fparser2 parse
+    tree of a NEMO loop and rejects a directive with more than one child.
+    '''
+    psy, invoke = get_invoke("explicit_do.f90", "nemo", idx=0)
+    schedule = invoke.schedule
+    loops = schedule.walk(Loop)
+    inner = loops[2]
+    ompsimd = OMPSimdDirective(parent=inner.parent,
+                               children=[inner.detach()])
+    loops[1].loop_body.addchild(ompsimd)
+    ompsimd.update()
+    code = str(psy.gen).lower()
+    assert ("      !$omp simd\n"
+            "      do ji = 1, jpi\n" in code)
+    assert ("      end do\n"
+            "      !$omp end simd\n" in code)
+
+    ompsimd.dir_body.addchild(ompsimd.dir_body[0].copy())
+    with pytest.raises(GenerationError) as err:
+        ompsimd.update()
+    assert ("An OpenMP SIMD can only be applied to a single loop but this "
+            "Node has 2 children:" in str(err.value))
+
+
+def test_omp_task_directives():
+    ''' Check the node_str, dag_name, clauses and the code-generation
+    constraints of the OMPSingleDirective, OMPTaskDirective and
+    OMPTaskloopDirective classes. '''
+    _, invoke = get_invoke("single_invoke_three_kernels.f90", "gocean1.0",
+                           idx=0, dist_mem=False)
+    schedule = invoke.schedule
+    task = OMPTaskDirective(children=[schedule[2].detach()])
+    taskloop = OMPTaskloopDirective(children=[schedule[1].detach()],
+                                    grainsize=8)
+    single = OMPSingleDirective(children=[task, taskloop], nowait=True)
+    schedule.addchild(single, index=1)
+
+    directive = colored("Directive", Directive._colour)
+    for node, text, name in [(single, "single", "single"),
+                             (task, "task", "task"),
+                             (taskloop, "taskloop", "taskloop")]:
+        assert node.node_str() == directive + "[OMP {0}]".format(text)
+        _, position = node._find_position(schedule)
+        assert node.dag_name == "OMP_{0}_{1}".format(name, position)
+
+    assert single.nowait
+    assert single.begin_string() == "omp single"
+    assert single.end_string() == "omp end single nowait"
+    assert task.get_dependences() == {"in": ["u_fld", "unew_fld"],
+                                      "out": [], "inout": ["uold_fld"]}
+    assert task.begin_string() == ("omp task depend(in: u_fld,unew_fld), "
+                                   "depend(inout: uold_fld)")
+    assert task.end_string() == "omp end task"
+    assert taskloop.grainsize == 8
+    assert taskloop.num_tasks is None
+    assert taskloop.begin_string() == "omp taskloop grainsize(8)"
+    assert taskloop.end_string() == "omp end taskloop"
+    assert OMPTaskDirective().begin_string() == "omp task"
+    assert OMPTaskloopDirective(num_tasks=2).begin_string() == \
+        "omp taskloop num_tasks(2)"
+    assert OMPTaskloopDirective().begin_string() == "omp taskloop"
+
+    with pytest.raises(GenerationError) as err:
+        OMPTaskloopDirective(grainsize=2, num_tasks=4)
+    assert ("An OpenMP TASKLOOP can have a 'grainsize' or a 'num_tasks' "
+            "clause but not both." in str(err.value))
+
+    # None of the directives is within a parallel region
+    with pytest.raises(GenerationError) as err:
+        single.validate_global_constraints()
+    assert ("OMPSingleDirective must be inside an OMP parallel region but "
+            "could not find an ancestor OMPParallelDirective node"
+            in str(err.value))
+    with pytest.raises(GenerationError) as err:
+        task.validate_global_constraints()
+    assert ("OMPTaskDirective must be inside an OMP parallel region but "
+            "could not find an ancestor OMPParallelDirective node"
+            in str(err.value))
+    with pytest.raises(GenerationError) as err:
+        schedule.addchild(taskloop.detach())
+        taskloop.validate_global_constraints()
+    assert ("OMPTaskloopDirective must be inside an OMP single region but "
+            "could not find an ancestor OMPSingleDirective node"
+            in str(err.value))
+
+
+def test_omp_taskloop_update():
+    ''' Check that the OpenMP single and taskloop directives are added to
+    the fparser2 parse tree of NEMO code and that a taskloop with more
+    than one child is rejected. '''
+    psy, invoke = get_invoke("explicit_do.f90", "nemo", idx=0)
+    schedule = invoke.schedule
+    OMPTaskloopTrans().apply(schedule[0], {"grainsize": 2})
+    OMPParallelTrans().apply(schedule[0])
+    code = str(psy.gen).lower()
+    assert ("  !$omp parallel default(shared), private(ji,jj,jk)\n"
+            "  !$omp single\n"
+            "  !$omp taskloop grainsize(2)\n"
+            "  do jk = 1, jpk\n" in code)
+    assert ("  end do\n"
+            "  !$omp end taskloop\n"
+            "  !$omp end single\n"
+            "  !$omp end parallel\n" in code)
+
+    taskloop = schedule.walk(OMPTaskloopDirective)[0]
+    taskloop.ast = None
+    taskloop.dir_body.addchild(taskloop.dir_body[0].copy())
+    with pytest.raises(GenerationError) as err:
+        taskloop.update()
+    assert ("An OpenMP TASKLOOP can only be applied to a single loop but "
+            "this Node has 2 children:" in str(err.value))
+
+
 def test_acc_dir_node_str():
     ''' Test the node_str() method of OpenACC directives '''
 
@@ -1752,6 +1925,27 @@ def test_directive_get_private(monkeypatch):
             "not set" in str(err.value))
 
 
+def test_directive_get_private_tasks():
+    ''' Check that the _get_private_list() method of OMPParallelDirective
+    only treats kernel arguments as shared if the parallel region contains
+    OpenMP tasks. The field 'f4' is written by one kernel and then read by
+    the next one. '''
+    _, invoke = get_invoke("15.1.2_builtin_and_normal_kernel_invoke.f90",
+                           "dynamo0.3", idx=0, dist_mem=False)
+    schedule = invoke.schedule
+    OMPParallelTrans().apply(schedule.children[3:5])
+    directive = schedule.children[3]
+    assert directive._get_private_list() == ["cell", "f4"]
+
+    _, invoke = get_invoke("15.1.2_builtin_and_normal_kernel_invoke.f90",
+                           "dynamo0.3", idx=0, dist_mem=False)
+    schedule = invoke.schedule
+    OMPTaskTrans().apply(schedule.children[3:5])
+    directive = schedule.children[3]
+    assert isinstance(directive, OMPParallelDirective)
+    assert directive._get_private_list() == ["cell"]
+
+
 def test_directive_children_validation():
     '''Test that children added to Directive are validated. Directive accepts
     1 Schedule as child.
@@ -1946,6 +2140,49 @@ def test_acckernelsdirective_update(parser, default_present):
             "  sto_tmp(:, :) = 0.0_wp\n"
             "  !$ACC END KERNELS\n".format(string) in gen_code)
 
+
+def test_acckernelsdirective_async():
+    '''Check the 'async' and 'wait' clauses of an ACCKernelsDirective (as
+    provided by ACCAsyncMixin) and that they are included in the
+    generated code.
+
+    '''
+    directive = ACCKernelsDirective(async_queue=2, wait_queues=[1, 3])
+    assert directive.async_queue == 2
+    assert directive.wait_queues == [1, 3]
+    assert directive.begin_string() == ("acc kernels default(present) "
+                                        "async(2) wait(1,3)")
+    directive.wait_queues = []
+    assert directive.begin_string().endswith("async(2) wait")
+    directive.async_queue = None
+    directive.wait_queues = None
+    assert directive.begin_string() == "acc kernels default(present)"
+
+    with pytest.raises(TypeError) as err:
+        directive.async_queue = "1"
+    assert ("An OpenACC queue must be specified as an int but got 'str'."
+            in str(err.value))
+    with pytest.raises(ValueError) as err:
+        directive.wait_queues = [1, -1]
+    assert ("An OpenACC queue must be a non-negative integer but got '-1'."
+            in str(err.value))
+    with pytest.raises(TypeError) as err:
+        directive.wait_queues = 1
+    assert ("The queues to wait for must be supplied as a list but got "
+            "'int'." in str(err.value))
+
+    _, info = parse(os.path.join(BASE_PATH, "1_single_invoke.f90"))
+    psy = PSyFactory(distributed_memory=False).create(info)
+    sched = psy.invokes.get('invoke_0_testkern_type').schedule
+    ACCKernelsTrans().apply(sched, {"default_present": True})
+    sched[0].async_queue = 1
+    sched.addchild(ACCWaitDirective([1]))
+    code = str(psy.gen)
+    assert ("      !$acc kernels default(present) async(1)\n"
+            "      DO cell=1,f1_proxy%vspace%get_ncell()\n" in code)
+    assert ("      !$acc end kernels\n"
+            "      !$acc wait(1)\n" in code)
+
 # Class ACCKernelsDirective end
 
 # Class ACCEnterDataDirective start
@@ -2065,6 +2302,119 @@ def test_accenterdatadirective_gencode_4(trans1, trans2):
 
 # Class ACCEnterDataDirective end
 
+# Class ACCWaitDirective start
+
+
+def test_accwaitdirective(parser):
+    '''Check the node_str, dag_name, begin_string and end_string methods
+    of an ACCWaitDirective and that update() requires a sibling to locate
+    the directive in the fparser2 parse tree.
+
+    '''
+    directive = ACCWaitDirective()
+    assert directive.wait_queues is None
+    assert directive.begin_string() == "acc wait"
+    assert directive.end_string() == ""
+    assert "[ACC wait]" in directive.node_str(colour=False)
+    with pytest.raises(ValueError) as err:
+        ACCWaitDirective([-2])
+    assert "non-negative integer but got '-2'" in str(err.value)
+
+    reader = FortranStringReader("program implicit_loop\n"
+                                 "real(kind=wp) :: sto_tmp(5,5)\n"
+                                 "sto_tmp(:,:) = 0.0_wp\n"
+                                 "end program implicit_loop\n")
+    code = parser(reader)
+    psy = PSyFactory("nemo", distributed_memory=False).create(code)
+    schedule = psy.invokes.invoke_list[0].schedule
+    directive = ACCWaitDirective([2, 1])
+    assert directive.begin_string() == "acc wait(2,1)"
+    schedule.addchild(directive, index=0)
+    assert directive.dag_name == "ACC_wait_1"
+    assert ("  !$ACC WAIT(2,1)\n"
+            "  sto_tmp(:, :) = 0.0_wp\n" in str(psy.gen))
+
+    schedule[1].detach()
+    directive.ast = None
+    with pytest.raises(GenerationError) as err:
+        directive.update()
+    assert ("Cannot add the OpenACC directive 'acc wait(2,1)' to the parse "
+            "tree as there is no other node in its Schedule."
+            in str(err.value))
+
+# Class ACCWaitDirective end
+
+# Class ACCUpdateDirective start
+
+
+def test_accupdatedirective(parser):
+    '''Check the constructor checks and the node_str, begin_string and
+    gen_code methods of an ACCUpdateDirective.
+
+    '''
+    with pytest.raises(ValueError) as err:
+        ACCUpdateDirective("both", ["a"])
+    assert ("The direction of an OpenACC update must be one of ['host', "
+            "'device'] but got 'both'." in str(err.value))
+    with pytest.raises(TypeError) as err:
+        ACCUpdateDirective("host", [])
+    assert ("The variables to update must be supplied as a non-empty list "
+            "of str but got '[]'." in str(err.value))
+    names = ["a", "b"]
+    directive = ACCUpdateDirective("host", names)
+    names.append("c")
+    assert directive.direction == "host"
+    assert directive.names == ["a", "b"]
+    assert directive.begin_string() == "acc update host(a,b)"
+    assert directive.end_string() == ""
+    assert "[ACC update host]" in directive.node_str(colour=False)
+
+    reader = FortranStringReader("program implicit_loop\n"
+                                 "real(kind=wp) :: sto_tmp(5,5)\n"
+                                 "sto_tmp(:,:) = 0.0_wp\n"
+                                 "end program implicit_loop\n")
+    psy = PSyFactory("nemo", distributed_memory=False).create(
+        parser(reader))
+    schedule = psy.invokes.invoke_list[0].schedule
+    schedule.addchild(ACCUpdateDirective("device", ["sto_tmp"]))
+    assert schedule[1].dag_name == "ACC_update_20"
+    assert ("  sto_tmp(:, :) = 0.0_wp\n"
+            "  !$ACC UPDATE DEVICE(sto_tmp)\n" in str(psy.gen))
+
+    # f2pygen
+    _, info = parse(os.path.join(BASE_PATH, "1_single_invoke.f90"))
+    psy = PSyFactory(distributed_memory=False).create(info)
+    schedule = psy.invokes.invoke_list[0].schedule
+    schedule.addchild(ACCUpdateDirective("host", ["f1_proxy"]))
+    assert "      !$acc update host(f1_proxy)\n" in str(psy.gen)
+
+# Class ACCUpdateDirective end
+
+# Class ACCDataDirective start
+
+
+def test_accdatadirective_clauses():
+    '''Check that the data clauses of an ACCDataDirective may be specified
+    explicitly and are then used by begin_string.
+
+    '''
+    with pytest.raises(TypeError) as err:
+        ACCDataDirective(clauses=["copyin"])
+    assert ("The clauses of an OpenACC data region must be supplied as a "
+            "dict but got 'list'." in str(err.value))
+    with pytest.raises(ValueError) as err:
+        ACCDataDirective(clauses={"copyin": ["a"], "private": ["b"]})
+    assert ("The clauses of an OpenACC data region must be one of ['copyin', "
+            "'copyout', 'copy', 'create', 'present'] but got 'private'."
+            in str(err.value))
+    directive = ACCDataDirective(async_queue=2, clauses={
+        "present": ["d"], "copyin": ["a", "b"], "create": []})
+    assert directive.clauses == {"present": ["d"], "copyin": ["a", "b"]}
+    assert (directive.begin_string() ==
+            "acc data copyin(a,b) present(d) async(2)")
+
+# Class ACCDataDirective end
+
 
 def test_haloexchange_halo_depth_get_set():
     '''test that the halo_exchange getter and setter work correctly '''
@@ -2592,11 +2942,17 @@ def test_modified_kern_line_length(kernel_outputdir, monkeypatch):
     _, _ = ktrans.apply(kernels[0], {"number_of_layers": 100})
     # Generate the code (this triggers the generation of new kernels)
     _ = str(psy.gen)
-    filepath = os.path.join(str(kernel_outputdir), "testkern_0_mod.f90")
+    # The specialised kernel is named after a hash of its specialisation
+    assert re.match("testkern_[0-9a-f]{10}_mod$", kernels[0].module_name)
+    filepath = os.path.join(str(kernel_outputdir),
+                            kernels[0].module_name + ".f90")
     assert os.path.isfile(filepath)
     # Check that the argument list is line wrapped as it is longer
     # than 132 characters.
-    assert "map_w2, &\n&ndf_w3" in open(filepath).read()
+    assert ("  subroutine {0}_code(nlayers_dummy, ascalar, fld1, fld2, fld3, "
+            "fld4, ndf_w1, undf_w1, map_w1, ndf_w2, undf_w2, &\n"
+            "&map_w2, ndf_w3, undf_w3, map_w3)\n".format(
+                kernels[0].module_name[:-4]) in open(filepath).read())
 
 
 def test_walk():
@@ -681,6 +681,32 @@ def test_gen_decls(fortran_writer):
             "'unknown'" in str(excinfo.value))
 
 
+def test_gen_decls_argument_order(fortran_writer):
+    '''Check that the FortranWriter class gen_decls method declares an
+    array argument after any argument that is used to specify its extent,
+    even if the latter was added to the symbol table later.
+
+    '''
+    symbol_table = SymbolTable()
+    ndf = DataSymbol("ndf", INTEGER_TYPE, interface=ArgumentInterface())
+    symbol_table.add(ndf)
+    ncol = DataSymbol("ncol", INTEGER_TYPE, interface=ArgumentInterface())
+    dofmap = DataSymbol(
+        "dofmap", ArrayType(INTEGER_TYPE, [Reference(ndf), Reference(ncol)]),
+        interface=ArgumentInterface())
+    symbol_table.add(dofmap)
+    scalar = DataSymbol("scalar", INTEGER_TYPE, interface=ArgumentInterface())
+    symbol_table.add(scalar)
+    symbol_table.add(ncol)
+    symbol_table.specify_argument_list([ndf, ncol, dofmap, scalar])
+    result = fortran_writer.gen_decls(symbol_table)
+    assert (result ==
+            "integer :: ndf\n"
+            "integer :: scalar\n"
+            "integer :: ncol\n"
+            "integer, dimension(ndf,ncol) :: dofmap\n")
+
+
 def test_gen_decls_nested_scope(fortran_writer):
     ''' Test that gen_decls() correctly checks for potential wildcard imports
     of an unresolved symbol in an outer scope.
@@ -41,7 +41,8 @@ from __future__ import absolute_import
 import pytest
 from psyclone.psyir.backend.visitor import VisitorError
 from psyclone.psyir.backend.opencl import OpenCLWriter
-from psyclone.psyir.nodes import Return, KernelSchedule
+from psyclone.psyir.nodes import Return, KernelSchedule, Assignment, \
+    ArrayReference, BinaryOperation, Literal, Reference
 from psyclone.psyir.symbols import DataSymbol, SymbolTable, \
     ArgumentInterface, UnresolvedInterface, ArrayType, REAL_TYPE, \
     INTEGER_TYPE
@@ -68,6 +69,22 @@ def test_oclw_initialization():
     oclwriter = OpenCLWriter(kernels_local_size=4)
     assert oclwriter._kernels_local_size == 4
 
+    # Pass a kernels_local_memory parameter
+    assert oclwriter._kernels_local_memory == {}
+    with pytest.raises(TypeError) as error:
+        oclwriter = OpenCLWriter(kernels_local_memory=['a'])
+    assert "kernels_local_memory should be a dict but found 'list'." \
+        in str(error.value)
+
+    with pytest.raises(ValueError) as error:
+        oclwriter = OpenCLWriter(kernels_local_memory={'a': (1, -1)})
+    assert "kernels_local_memory should map each array name to a pair of " \
+        "non-negative stencil depths but found (1, -1) for 'a'." \
+        in str(error.value)
+
+    oclwriter = OpenCLWriter(kernels_local_memory={'a': (1, 0)})
+    assert oclwriter._kernels_local_memory == {'a': (1, 0)}
+
 
 def test_oclw_gen_id_variable():
     '''Check the OpenCLWriter class gen_id_variables method produces
@@ -245,3 +262,100 @@ def test_oclw_kernelschedule():
     assert ("symbol table contains unresolved data entries (i.e. that have no "
             "defined Interface) which are not used purely to define the "
             "precision of other symbols: 'broken'" in str(err.value))
+
+
+def test_oclw_local_memory_tiles():
+    '''Check that the OpenCLWriter loads the requested arrays into __local
+    memory tiles and that only the stencil accesses within the tile use
+    them.
+
+    '''
+    class MockSymbolTable(SymbolTable):
+        ''' Mock needed abstract methods of the Symbol Table '''
+        @property
+        def iteration_indices(self):
+            return self.argument_list[:2]
+
+        @property
+        def data_arguments(self):
+            return self.argument_list[2:]
+    kschedule = KernelSchedule("kname")
+    kschedule.symbol_table.__class__ = MockSymbolTable
+
+    interface = ArgumentInterface(ArgumentInterface.Access.UNKNOWN)
+    i = DataSymbol('i', INTEGER_TYPE, interface=interface)
+    j = DataSymbol('j', INTEGER_TYPE, interface=interface)
+    array_type = ArrayType(REAL_TYPE, [10, 10])
+    data1 = DataSymbol('data1', array_type, interface=interface)
+    data2 = DataSymbol('data2', array_type, interface=interface)
+    for symbol in [i, j, data1, data2]:
+        kschedule.symbol_table.add(symbol)
+    kschedule.symbol_table.specify_argument_list([i, j, data1, data2])
+
+    def offset(symbol, operator, value):
+        return BinaryOperation.create(operator, Reference(symbol),
+                                      Literal(str(value), INTEGER_TYPE))
+    add = BinaryOperation.Operator.ADD
+    sub = BinaryOperation.Operator.SUB
+    mul = BinaryOperation.Operator.MUL
+    accesses = [
+        ArrayReference.create(data2, [offset(i, sub, 1), offset(j, add, 1)]),
+        ArrayReference.create(data2, [BinaryOperation.create(
+            add, Literal("1", INTEGER_TYPE), Reference(i)), Reference(j)]),
+        # Outside the stencil depth
+        ArrayReference.create(data2, [offset(i, add, 2), Reference(j)]),
+        # Not an offset of the iteration index
+        ArrayReference.create(data2, [offset(i, mul, 2), Reference(j)])]
+    rhs = accesses[0]
+    for access in accesses[1:]:
+        rhs = BinaryOperation.create(add, rhs, access)
+    kschedule.addchild(Assignment.create(
+        ArrayReference.create(data1, [Reference(i), Reference(j)]), rhs))
+
+    oclwriter = OpenCLWriter(kernels_local_size=4,
+                             kernels_local_memory={'data2': (1, 1)})
+    result = oclwriter(kschedule)
+    assert (
+        "  int i = get_global_id(0);\n"
+        "  int j = get_global_id(1);\n"
+        "  int i_local = get_local_id(0);\n"
+        "  __local double data2_tile[18];\n"
+        "  for (int tile_j = 0; tile_j < 3; tile_j++) {\n"
+        "    for (int tile_i = i_local; tile_i < 6; tile_i += 4) {\n"
+        "      int tile_gi = i - i_local - 1 + tile_i;\n"
+        "      int tile_gj = j - 1 + tile_j;\n"
+        "      if (tile_gi >= 0 && tile_gi < data2LEN1 && tile_gj >= 0 && "
+        "tile_gj < data2LEN2) {\n"
+        "        data2_tile[tile_j * 6 + tile_i] = data2[tile_gj * data2LEN1 "
+        "+ tile_gi];\n"
+        "      }\n"
+        "    }\n"
+        "  }\n"
+        "  barrier(CLK_LOCAL_MEM_FENCE);\n"
+        "  data1[j * data1LEN1 + i] = (((data2_tile[12 + i_local] + "
+        "data2_tile[8 + i_local]) + data2[j * data2LEN1 + (i + 2)]) + "
+        "data2[j * data2LEN1 + (i * 2)]);\n" in result)
+    # The tiles are only used while generating the kernel
+    assert oclwriter(kschedule.children[0]).startswith(
+        "data1[j * data1LEN1 + i] = (((data2[")
+
+    # Arrays that are not 2D arguments or that are written cannot be tiled
+    oclwriter = OpenCLWriter(kernels_local_memory={'data3': (1, 1)})
+    with pytest.raises(VisitorError) as err:
+        _ = oclwriter(kschedule)
+    assert ("Cannot load 'data3' into local memory because it is not a 2D "
+            "array argument of kernel 'kname'." in str(err.value))
+    oclwriter = OpenCLWriter(kernels_local_memory={'data1': (1, 1)})
+    with pytest.raises(VisitorError) as err:
+        _ = oclwriter(kschedule)
+    assert ("Cannot load 'data1' into local memory because it is written to "
+            "by kernel 'kname'." in str(err.value))
+
+    # The names of the generated variables must not clash
+    kschedule.symbol_table.add(DataSymbol('i_local', INTEGER_TYPE))
+    oclwriter = OpenCLWriter(kernels_local_memory={'data2': (1, 1)})
+    with pytest.raises(VisitorError) as err:
+        _ = oclwriter(kschedule)
+    assert ("Unable to declare the variable 'i_local' to access the local "
+            "memory tiles because the Symbol Table already contains a symbol "
+            "with the same name." in str(err.value))
@@ -45,7 +45,8 @@ from psyclone.psyir.symbols import DataSymbol, REAL_TYPE
 from psyclone.psyir.backend.c import CWriter
 from psyclone.psyir.backend.fortran import FortranWriter
 from psyclone.tests.utilities import get_invoke
-from psyclone.transformations import OMPParallelTrans, OMPLoopTrans
+from psyclone.transformations import OMPParallelTrans, OMPLoopTrans, \
+    OMPSimdTrans, OMPTaskloopTrans
 
 
 # ----------------------------------------------------------------------------
@@ -244,3 +245,94 @@ a = b
   a = b;
 }'''
     assert correct in result
+
+
+# ----------------------------------------------------------------------------
+def test_omp_simd(fortran_reader):
+    '''Tests that an OpenMP simd directive is output correctly by the
+    Fortran and C backends.
+
+    '''
+    code = '''
+        module test
+        contains
+        subroutine tmp(n, a, b)
+          integer :: i, n
+          real :: tmp1
+          real, dimension(n) :: a, b
+          do i = 1, n
+            tmp1 = 2.0 * b(i)
+            a(i) = b(i+1) + tmp1
+          enddo
+        end subroutine tmp
+        end module test'''
+    schedule = fortran_reader.psyir_from_source(code).children[0]
+    OMPSimdTrans().apply(schedule[0], {"simdlen": 8, "aligned": ["a", "b"],
+                                       "alignment": 64})
+
+    # No enclosing parallel region is required for a simd directive
+    result = FortranWriter()(schedule)
+    correct = '''  !$omp simd simdlen(8), private(tmp1), aligned(a,b:64)
+  do i = 1, n, 1
+    tmp1 = 2.0 * b(i)
+    a(i) = b(i + 1) + tmp1
+  enddo
+  !$omp end simd'''
+    assert correct in result
+
+    result = CWriter()(schedule[0])
+    correct = '''#pragma omp simd simdlen(8), private(tmp1), aligned(a,b:64)
+for(i=1; i<=n; i+=1)
+{
+  tmp1 = (2.0 * b[i]);
+  a[i] = (b[(i + 1)] + tmp1);
+}'''
+    assert correct in result
+
+
+# ----------------------------------------------------------------------------
+def test_omp_taskloop(fortran_reader):
+    '''Tests that OpenMP single and taskloop directives are output
+    correctly by the Fortran and C backends.
+
+    '''
+    code = '''
+        module test
+        contains
+        subroutine tmp(n, a)
+          integer :: i, n
+          real, dimension(n) :: a
+          do i = 1, n
+            a(i) = 0.0
+          enddo
+        end subroutine tmp
+        end module test'''
+    schedule = fortran_reader.psyir_from_source(code).children[0]
+    OMPTaskloopTrans().apply(schedule[0], {"num_tasks": 4})
+    OMPParallelTrans().apply(schedule[0])
+
+    result = FortranWriter()(schedule)
+    correct = '''  !$omp parallel private(i)
+  !$omp single
+  !$omp taskloop num_tasks(4)
+  do i = 1, n, 1
+    a(i) = 0.0
+  enddo
+  !$omp end taskloop
+  !$omp end single
+  !$omp end parallel'''
+    assert correct in result
+
+    result = CWriter()(schedule[0])
+    correct = '''#pragma omp parallel private(i)
+{
+#pragma omp single
+{
+#pragma omp taskloop num_tasks(4)
+    for(i=1; i<=n; i+=1)
+    {
+      a[i] = 0.0;
+    }
+}
+}'''
+    assert correct in result
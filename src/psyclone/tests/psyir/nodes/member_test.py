@@ -39,6 +39,7 @@
 from __future__ import absolute_import
 import pytest
 from psyclone.psyir import nodes
+from psyclone.psyir.symbols import INTEGER_TYPE
 
 
 def test_member_constructor():
@@ -71,3 +72,11 @@ def test_member_can_be_copied():
     member1._component_name = "name2"
     assert member1.name == "name2"
     assert member.name == "name1"
+
+
+def test_member_math_equal():
+    ''' Test that Members are only math_equal if they have the same name. '''
+    member = nodes.Member("name1")
+    assert member.math_equal(nodes.Member("name1"))
+    assert not member.math_equal(nodes.Member("name2"))
+    assert not member.math_equal(nodes.Literal("1", INTEGER_TYPE))
@@ -0,0 +1,121 @@
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2021, Science and Technology Facilities Council.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+
+'''This module tests the CommonSubexpressionEliminationTrans
+transformation.
+'''
+
+from __future__ import absolute_import
+
+import pytest
+
+from psyclone.psyir.nodes import Loop, Routine
+from psyclone.psyir.transformations import \
+    CommonSubexpressionEliminationTrans, TransformationError
+from psyclone.tests.utilities import Compile
+
+CODE = '''subroutine sub(a, b, c, d, e3t, rdt, n)
+  integer, parameter :: wp = 8
+  integer, intent(in) :: n
+  real(kind=wp), intent(inout) :: a(n,n), b(n,n), c(n,n), d(n,n)
+  real(kind=wp), intent(in) :: e3t(n,n), rdt
+  integer :: ji, jj
+  do jj = 1, n
+    do ji = 1, n
+      a(ji,jj) = b(ji,jj) * (rdt / e3t(ji,jj)) + c(ji,jj) * rdt
+      d(ji,jj) = c(ji,jj) * (rdt / e3t(ji,jj)) + rdt * c(ji,jj)
+      c(ji,jj) = 2.0_wp * (rdt / e3t(ji,jj))
+      b(ji,jj) = c(ji,jj) * rdt + (ji + 1) * (jj + 1) + (1 + ji) * (jj + 1)
+    end do
+  end do
+end subroutine sub
+'''
+
+
+def test_cse_str_name():
+    '''Test the __str__ and name properties of the transformation.'''
+    trans = CommonSubexpressionEliminationTrans()
+    assert str(trans) == ("Replace the repeated expressions in the basic "
+                          "blocks of a Schedule by temporaries")
+    assert trans.name == "CommonSubexpressionEliminationTrans"
+
+
+def test_cse_validate(fortran_reader):
+    '''Test that the transformation can only be applied to a Schedule.'''
+    psyir = fortran_reader.psyir_from_source(CODE)
+    with pytest.raises(TransformationError) as err:
+        CommonSubexpressionEliminationTrans().validate(psyir.walk(Loop)[0])
+    assert ("Error in CommonSubexpressionEliminationTrans transformation. "
+            "This transformation can only be applied to a 'Schedule' but "
+            "found 'Loop'." in str(err.value))
+
+
+def test_cse_apply(fortran_reader, fortran_writer, tmpdir):
+    '''Test that repeated expressions are replaced by temporaries, that
+    the largest expressions and commuted operands are handled and that an
+    expression is not reused after one of its variables is written.'''
+    psyir = fortran_reader.psyir_from_source(CODE)
+    CommonSubexpressionEliminationTrans().apply(psyir.walk(Routine)[0])
+    result = fortran_writer(psyir)
+    assert "  integer :: cse_tmp\n" in result
+    assert "  real(kind=wp) :: cse_tmp_1\n" in result
+    assert "  real(kind=wp) :: cse_tmp_2\n" in result
+    assert ("      cse_tmp_1 = rdt / e3t(ji,jj)\n"
+            "      cse_tmp_2 = c(ji,jj) * rdt\n"
+            "      a(ji,jj) = b(ji,jj) * cse_tmp_1 + cse_tmp_2\n"
+            "      d(ji,jj) = c(ji,jj) * cse_tmp_1 + cse_tmp_2\n"
+            "      c(ji,jj) = 2.0_wp * cse_tmp_1\n"
+            "      cse_tmp = (ji + 1) * (jj + 1)\n"
+            "      b(ji,jj) = c(ji,jj) * rdt + cse_tmp + cse_tmp\n"
+            in result)
+    assert Compile(tmpdir).string_compiles(result)
+
+
+def test_cse_basic_blocks(fortran_reader, fortran_writer):
+    '''Test that expressions are not shared between basic blocks and that
+    expressions that are only computed once are left alone.'''
+    psyir = fortran_reader.psyir_from_source(
+        "subroutine sub(a, b, n)\n"
+        "  integer :: n, ji\n"
+        "  real :: a(n), b\n"
+        "  a(1) = b * 2.0\n"
+        "  do ji = 1, n\n"
+        "    a(ji) = b * 2.0 + b\n"
+        "  end do\n"
+        "  a(2) = b * 2.0 + a(1) * a(1)\n"
+        "end subroutine sub\n")
+    before = fortran_writer(psyir)
+    CommonSubexpressionEliminationTrans().apply(psyir.walk(Routine)[0])
+    result = fortran_writer(psyir)
+    assert result == before
@@ -0,0 +1,170 @@
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2021, Science and Technology Facilities Council.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+
+'''Module containing tests for the StrengthReductionTrans transformation.'''
+
+from __future__ import absolute_import
+
+import pytest
+
+from psyclone.psyir.nodes import Assignment, Loop, Routine
+from psyclone.psyir.transformations import StrengthReductionTrans, \
+    TransformationError
+from psyclone.tests.utilities import Compile
+
+CODE = '''subroutine sub(a, b, e3t, rdt, n)
+  integer, parameter :: wp = 8
+  integer, intent(in) :: n
+  real(kind=wp), intent(inout) :: a(n,n), b(n,n)
+  real(kind=wp), intent(in) :: e3t(n), rdt
+  integer :: ji, jj, k
+  do jj = 1, n
+    do ji = 1, n
+      k = ji**3 + ji**5 + (ji + 1)**2
+      a(ji,jj) = b(ji,jj)**2 / e3t(jj) + b(ji,jj)**3 + b(ji,jj) / rdt
+      if (e3t(jj) > 0.0_wp) then
+        a(ji,jj) = a(ji,jj) / e3t(jj)
+      end if
+      a(ji,jj) = a(ji,jj) / (rdt * real(k, wp)) + b(ji,jj) / e3t(jj)
+      k = k / n
+    end do
+  end do
+end subroutine sub
+'''
+
+
+def test_strength_reduction_str_name():
+    '''Test the __str__, name and rewrites properties of the
+    transformation.'''
+    trans = StrengthReductionTrans()
+    assert str(trans) == ("Replace intrinsic power and division operations "
+                          "by cheaper operations")
+    assert trans.name == "StrengthReductionTrans"
+    assert trans.rewrites == []
+
+
+def test_strength_reduction_validate(fortran_reader):
+    '''Test the checks of the validate method.'''
+    trans = StrengthReductionTrans()
+    psyir = fortran_reader.psyir_from_source(CODE)
+    with pytest.raises(TransformationError) as err:
+        trans.validate(psyir.walk(Assignment)[0])
+    assert ("Error in StrengthReductionTrans transformation. This "
+            "transformation can only be applied to a 'Schedule' or a 'Loop' "
+            "but found 'Assignment'." in str(err.value))
+    routine = psyir.walk(Routine)[0]
+    with pytest.raises(TransformationError) as err:
+        trans.validate(routine, {"relaxed_fp": "yes"})
+    assert ("Error in StrengthReductionTrans transformation. The "
+            "'relaxed_fp' option must be a bool but found 'str'."
+            in str(err.value))
+    for max_power in [0, True, 2.0]:
+        with pytest.raises(TransformationError) as err:
+            trans.validate(routine, {"max_power": max_power})
+        assert ("Error in StrengthReductionTrans transformation. The "
+                "'max_power' option must be a positive integer but found "
+                "'{0}'.".format(max_power) in str(err.value))
+    trans.validate(psyir.walk(Loop)[0], {"relaxed_fp": True, "max_power": 8})
+
+
+def test_strength_reduction_powers(fortran_reader, fortran_writer):
+    '''Test that only the powers which do not change the rounding of the
+    result are replaced by default.'''
+    psyir = fortran_reader.psyir_from_source(CODE)
+    trans = StrengthReductionTrans()
+    trans.apply(psyir.walk(Routine)[0])
+    result = fortran_writer(psyir)
+    # An integer power is exact but the exponent must not exceed
+    # max_power and the base must be a variable or literal
+    assert "k = ji * ji * ji + ji ** 5 + (ji + 1) ** 2\n" in result
+    # Only the square of a real value is exact. No division is replaced.
+    assert ("a(ji,jj) = b(ji,jj) * b(ji,jj) / e3t(jj) + b(ji,jj) ** 3 + "
+            "b(ji,jj) / rdt\n" in result)
+    assert "reciprocal" not in result
+    assert trans.rewrites == [
+        "Replaced 'ji ** 3' by 'ji * ji * ji'.",
+        "Replaced 'b(ji,jj) ** 2' by 'b(ji,jj) * b(ji,jj)'."]
+
+
+def test_strength_reduction_relaxed(fortran_reader, fortran_writer, tmpdir):
+    '''Test that with the 'relaxed_fp' option real powers are replaced and
+    the reciprocals of loop-invariant denominators are hoisted out of the
+    loops, except for integer divisions, divisions within an IfBlock and
+    divisions by expressions that are modified in the loop.'''
+    psyir = fortran_reader.psyir_from_source(CODE)
+    trans = StrengthReductionTrans()
+    trans.apply(psyir.walk(Routine)[0], {"relaxed_fp": True, "max_power": 5})
+    result = fortran_writer(psyir)
+    assert "  real(kind=wp) :: reciprocal\n" in result
+    assert "  real(kind=wp) :: reciprocal_1\n" in result
+    assert ("  reciprocal = 1.0_wp / rdt\n"
+            "  do jj = 1, n, 1\n"
+            "    reciprocal_1 = 1.0_wp / e3t(jj)\n"
+            "    do ji = 1, n, 1\n"
+            "      k = ji * ji * ji + ji * ji * ji * ji * ji + (ji + 1) ** 2\n"
+            "      a(ji,jj) = b(ji,jj) * b(ji,jj) * reciprocal_1 + "
+            "b(ji,jj) * b(ji,jj) * b(ji,jj) + b(ji,jj) * reciprocal\n"
+            "      if (e3t(jj) > 0.0_wp) then\n"
+            "        a(ji,jj) = a(ji,jj) / e3t(jj)\n"
+            "      end if\n"
+            "      a(ji,jj) = a(ji,jj) / (rdt * REAL(k, wp)) + "
+            "b(ji,jj) * reciprocal_1\n"
+            "      k = k / n\n" in result)
+    assert len(trans.rewrites) == 7
+    assert ("Replaced 'b(ji,jj) / rdt' by 'b(ji,jj) * reciprocal' with the "
+            "reciprocal computed before the loop over 'jj'." in
+            trans.rewrites)
+    assert Compile(tmpdir).string_compiles(result)
+
+    # The rewrites of the previous call are discarded
+    trans.apply(psyir.walk(Routine)[0])
+    assert trans.rewrites == []
+
+
+def test_strength_reduction_codeblock(fortran_reader, fortran_writer):
+    '''Test that divisions are not replaced in a loop containing a
+    CodeBlock, since the variables it modifies are not known.'''
+    psyir = fortran_reader.psyir_from_source(
+        "subroutine sub(a, b, n)\n"
+        "  integer :: n, ji\n"
+        "  real :: a(n), b\n"
+        "  do ji = 1, n\n"
+        "    a(ji) = a(ji) / b\n"
+        "    read(*,*) b\n"
+        "  end do\n"
+        "end subroutine sub\n")
+    trans = StrengthReductionTrans()
+    trans.apply(psyir.walk(Routine)[0], {"relaxed_fp": True})
+    assert "a(ji) = a(ji) / b\n" in fortran_writer(psyir)
+    assert trans.rewrites == []
@@ -290,8 +290,10 @@ def test_kern_case_insensitive(mod_name, sub_name, kernel_outputdir,
     monkeypatch.setattr(kern, "_name", sub_name)
     # Generate the code - this should not raise an exception.
     kern.rename_and_write()
-    filename = os.path.join(str(kernel_outputdir), mod_name[:8]+"_0_mod.f90")
-    assert os.path.isfile(filename)
+    # The kernel has been specialised so its name is derived from a hash
+    out_files = os.listdir(str(kernel_outputdir))
+    assert len(out_files) == 1
+    assert re.match(mod_name[:8] + "_[0-9a-f]{10}_mod.f90", out_files[0])
 
 
 def test_new_kern_single_error(kernel_outputdir, monkeypatch):
@@ -351,6 +353,194 @@ def test_new_same_kern_single(kernel_outputdir, monkeypatch):
     assert out_files == [new_kernels[1].module_name+".f90"]
 
 
+def test_specialised_kern_shared(kernel_outputdir, monkeypatch):
+    ''' Check that kernels specialised in the same way by
+    Dynamo0p3KernelConstTrans share a single generated module, both
+    within a PSyclone run and across runs. '''
+    config = Config.get()
+    monkeypatch.setattr(config, "_kernel_naming", "multiple")
+    ktrans = Dynamo0p3KernelConstTrans()
+    psy, invoke = get_invoke("4_multikernel_invokes.f90", api="dynamo0.3",
+                             idx=0)
+    kernels = invoke.schedule.coded_kernels()
+    for kern in kernels:
+        ktrans.apply(kern, {"number_of_layers": 100})
+    assert kernels[0].specialisation == kernels[1].specialisation
+    assert kernels[0].specialisation == (
+        "Dynamo0p3KernelConstTrans", "testkern_mod", "testkern_code",
+        (1, 100))
+    code = str(psy.gen).lower()
+    assert kernels[0].module_name == kernels[1].module_name
+    mod_name = kernels[0].module_name.lower()
+    assert mod_name != "testkern_mod"
+    assert code.count("use {0}, only: ".format(mod_name)) == 1
+    assert code.count("call {0}_code(".format(mod_name[:-4])) == 2
+    assert os.listdir(str(kernel_outputdir)) == [mod_name + ".f90"]
+    filepath = os.path.join(str(kernel_outputdir), mod_name + ".f90")
+    assert "nlayers = 100" in open(filepath).read()
+
+    # A different specialisation gets a different module
+    _, invoke = get_invoke("4_multikernel_invokes.f90", api="dynamo0.3",
+                           idx=0)
+    kern = invoke.schedule.coded_kernels()[0]
+    ktrans.apply(kern, {"number_of_layers": 50})
+    kern.rename_and_write()
+    assert kern.module_name.lower() != mod_name
+    assert len(os.listdir(str(kernel_outputdir))) == 2
+
+    # A later run re-uses the existing file rather than writing it again
+    os.chmod(filepath, 0o444)
+    _, invoke = get_invoke("4_multikernel_invokes.f90", api="dynamo0.3",
+                           idx=0)
+    kern = invoke.schedule.coded_kernels()[0]
+    ktrans.apply(kern, {"number_of_layers": 100})
+    kern.rename_and_write()
+    assert kern.module_name.lower() == mod_name
+    assert len(os.listdir(str(kernel_outputdir))) == 2
+
+    # An existing file with different content is an error
+    os.chmod(filepath, 0o644)
+    with open(filepath, "w") as ffile:
+        ffile.write("some code")
+    _, invoke = get_invoke("4_multikernel_invokes.f90", api="dynamo0.3",
+                           idx=0)
+    kern = invoke.schedule.coded_kernels()[0]
+    ktrans.apply(kern, {"number_of_layers": 100})
+    with pytest.raises(GenerationError) as err:
+        kern.rename_and_write()
+    assert ("A version of Kernel '{0}' with the same hash already exists "
+            "in the kernel-output directory ({1}) but is not the same as the "
+            "current, transformed kernel.".format(
+                mod_name[:-4] + "_code", str(kernel_outputdir))
+            in str(err.value))
+
+
+def test_specialised_kern_cleaned_dir(kernel_outputdir):
+    ''' Check that the record of the kernels written is not shared between
+    generations of the PSy layer, so a specialised kernel is written again
+    if the kernel-output directory has been cleaned in the meantime. '''
+    ktrans = Dynamo0p3KernelConstTrans()
+    for _ in range(2):
+        psy, invoke = get_invoke("4_multikernel_invokes.f90",
+                                 api="dynamo0.3", idx=0)
+        kernels = invoke.schedule.coded_kernels()
+        for kern in kernels:
+            ktrans.apply(kern, {"number_of_layers": 100})
+        _ = str(psy.gen)
+        out_files = os.listdir(str(kernel_outputdir))
+        assert out_files == [kernels[0].module_name + ".f90"]
+        assert invoke.invokes.written_kernel_files == set(
+            [os.path.join(str(kernel_outputdir), out_files[0])])
+        os.remove(os.path.join(str(kernel_outputdir), out_files[0]))
+
+
+def test_specialisation_key():
+    ''' Check that the specialisation key of a kernel is extended by
+    repeated applications of Dynamo0p3KernelConstTrans and is discarded
+    when the kernel is otherwise modified. '''
+    _, invoke = get_invoke("1_single_invoke.f90", api="dynamo0.3", idx=0)
+    kern = invoke.schedule.coded_kernels()[0]
+    assert kern.specialisation is None
+    with pytest.raises(TypeError) as err:
+        kern.specialisation = "key"
+    assert ("specialisation key of a kernel must be a tuple or None but "
+            "found 'str'" in str(err.value))
+    ktrans = Dynamo0p3KernelConstTrans()
+    ktrans.apply(kern, {"number_of_layers": 20})
+    ktrans.apply(kern, {"element_order": 0})
+    key = kern.specialisation
+    assert key[:4] == ("Dynamo0p3KernelConstTrans", "testkern_mod",
+                       "testkern_code", (1, 20))
+    assert len(key) > 4
+    ACCRoutineTrans().apply(kern)
+    assert kern.specialisation is None
+    # Once modified by another transformation, the kernel can no longer be
+    # specialised
+    ktrans.apply(kern, {"number_of_layers": 30})
+    assert kern.specialisation is None
+
+
+def test_new_kern_index(kernel_outputdir, monkeypatch):
+    ''' Check that the "multiple" kernel-naming scheme uses an index of
+    the kernel-output directory to choose the name of a new kernel. '''
+    config = Config.get()
+    monkeypatch.setattr(config, "_kernel_naming", "multiple")
+    for fname in ["testkern_0_mod.f90", "testkern_5_mod.f90",
+                  "testkern_other_7.cl", "testkern_mod.f90", "README"]:
+        with open(os.path.join(str(kernel_outputdir), fname), "w") as ffile:
+            ffile.write("some code")
+    _, invoke = get_invoke("4_multikernel_invokes.f90", api="dynamo0.3",
+                           idx=0)
+    rtrans = ACCRoutineTrans()
+    kernels = invoke.schedule.coded_kernels()
+    assert kernels[0]._first_free_index("testkern", "_mod.f90") == 6
+    assert kernels[0]._first_free_index("testkern_other", ".cl") == 8
+    assert kernels[0]._first_free_index("testkern_other", "_mod.f90") == 0
+    for kern in kernels:
+        rtrans.apply(kern)
+        kern.rename_and_write()
+    assert kernels[0].module_name == "testkern_6_mod"
+    assert kernels[1].module_name == "testkern_7_mod"
+    assert kernels[0]._first_free_index("testkern", "_mod.f90") == 8
+    # The index belongs to the Invokes whose code is being generated
+    assert invoke.invokes.kernel_dir_index == {
+        str(kernel_outputdir): {"testkern_mod.f90": 8,
+                                "testkern_other.cl": 8}}
+    # A file created by another process is not in the index but is not
+    # overwritten.
+    with open(os.path.join(str(kernel_outputdir), "testkern_8_mod.f90"),
+              "w") as ffile:
+        ffile.write("some code")
+    _, invoke = get_invoke("4_multikernel_invokes.f90", api="dynamo0.3",
+                           idx=0)
+    kern = invoke.schedule.coded_kernels()[0]
+    rtrans.apply(kern)
+    kern.rename_and_write()
+    assert kern.module_name == "testkern_9_mod"
+
+
+def test_new_kern_hash(kernel_outputdir, monkeypatch):
+    ''' Check that the "hash" kernel-naming scheme gives identical
+    transformed kernels the same name and writes them only once. '''
+    config = Config.get()
+    monkeypatch.setattr(config, "_kernel_naming", "hash")
+    rtrans = ACCRoutineTrans()
+    psy, invoke = get_invoke("4_multikernel_invokes.f90", api="dynamo0.3",
+                             idx=0)
+    kernels = invoke.schedule.coded_kernels()
+    for kern in kernels:
+        rtrans.apply(kern)
+    code = str(psy.gen).lower()
+    mod_name = kernels[0].module_name.lower()
+    assert re.match("testkern_[0-9a-f]{10}_mod$", mod_name)
+    assert kernels[1].module_name.lower() == mod_name
+    assert code.count("call {0}_code(".format(mod_name[:-4])) == 2
+    out_files = os.listdir(str(kernel_outputdir))
+    assert out_files == [mod_name + ".f90"]
+    assert "!$acc routine" in open(os.path.join(
+        str(kernel_outputdir), out_files[0])).read().lower()
+    assert LFRicBuild(kernel_outputdir).code_compiles(psy)
+
+    # A later run re-uses the same file
+    _, invoke = get_invoke("4_multikernel_invokes.f90", api="dynamo0.3",
+                           idx=0)
+    kern = invoke.schedule.coded_kernels()[0]
+    rtrans.apply(kern)
+    kern.rename_and_write()
+    assert kern.module_name.lower() == mod_name
+    assert os.listdir(str(kernel_outputdir)) == out_files
+
+    # A kernel transformed differently gets a different name
+    _, invoke = get_invoke("4_multikernel_invokes.f90", api="dynamo0.3",
+                           idx=0)
+    kern = invoke.schedule.coded_kernels()[0]
+    Dynamo0p3KernelConstTrans().apply(kern, {"number_of_layers": 10})
+    rtrans.apply(kern)
+    kern.rename_and_write()
+    assert kern.module_name.lower() != mod_name
+    assert len(os.listdir(str(kernel_outputdir))) == 2
+
+
 def test_1kern_trans(kernel_outputdir):
     ''' Check that we generate the correct code when an invoke contains
     the same kernel more than once but only one of them is transformed. '''
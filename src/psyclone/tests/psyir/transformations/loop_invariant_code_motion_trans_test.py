@@ -0,0 +1,163 @@
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2021, Science and Technology Facilities Council.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+
+'''This module tests the LoopInvariantCodeMotionTrans transformation.
+'''
+
+from __future__ import absolute_import
+
+import pytest
+
+from psyclone.psyir.nodes import Assignment, BinaryOperation, Literal, Loop
+from psyclone.psyir.symbols import INTEGER_TYPE, ScalarType
+from psyclone.psyir.tools import get_expression_datatype
+from psyclone.psyir.transformations import LoopInvariantCodeMotionTrans, \
+    TransformationError
+from psyclone.tests.utilities import Compile
+
+CODE = '''subroutine sub(a, b, e3t, rdt, n)
+  integer, parameter :: wp = 8
+  integer, intent(in) :: n
+  real(kind=wp), intent(inout) :: a(n,n), b(n,n)
+  real(kind=wp), intent(in) :: e3t(n), rdt
+  integer :: ji, jj
+  real(kind=wp) :: zt
+  do jj = 1, n
+    do ji = 1, n
+      zt = b(ji,jj) * (1.0_wp / e3t(jj)) + rdt * b(ji,jj)
+      a(ji,jj) = zt * (1.0_wp / e3t(jj)) + zt * 2.0_wp
+      if (e3t(jj) > 0.0_wp) then
+        a(ji,jj) = a(ji,jj) / e3t(jj)
+      end if
+    end do
+  end do
+end subroutine sub
+'''
+
+
+def test_licm_str_name():
+    '''Test the __str__ and name properties of the transformation.'''
+    trans = LoopInvariantCodeMotionTrans()
+    assert str(trans) == ("Hoist the loop-invariant expressions of a loop "
+                          "into temporaries computed before the loop")
+    assert trans.name == "LoopInvariantCodeMotionTrans"
+
+
+def test_licm_validate(fortran_reader):
+    '''Test that the transformation rejects loops that contain a call or a
+    CodeBlock.'''
+    trans = LoopInvariantCodeMotionTrans()
+    with pytest.raises(TransformationError) as err:
+        trans.validate(Assignment())
+    assert "Target of LoopInvariantCodeMotionTrans transformation must " \
+        "be a sub-class of Loop" in str(err.value)
+
+    psyir = fortran_reader.psyir_from_source(
+        "subroutine sub(a, n)\n"
+        "  integer :: n, ji\n"
+        "  real :: a(n)\n"
+        "  do ji = 1, n\n"
+        "    call my_sub(a(ji))\n"
+        "  end do\n"
+        "end subroutine sub\n")
+    with pytest.raises(TransformationError) as err:
+        trans.validate(psyir.walk(Loop)[0])
+    assert ("Error in LoopInvariantCodeMotionTrans transformation. The loop "
+            "contains a CodeBlock or a Call so the variables it modifies are "
+            "not known." in str(err.value))
+
+
+def test_licm_apply(fortran_reader, fortran_writer, tmpdir):
+    '''Test that the invariant expressions of the inner loop are hoisted,
+    that identical expressions share a temporary and that expressions
+    inside an IfBlock or using a variable written in the loop are left
+    alone.'''
+    psyir = fortran_reader.psyir_from_source(CODE)
+    inner = psyir.walk(Loop)[1]
+    LoopInvariantCodeMotionTrans().apply(inner)
+    result = fortran_writer(psyir)
+    assert "real(kind=wp) :: licm_tmp\n" in result
+    assert "licm_tmp_1" not in result
+    assert ("    licm_tmp = 1.0_wp / e3t(jj)\n"
+            "    do ji = 1, n, 1\n"
+            "      zt = b(ji,jj) * licm_tmp + rdt * b(ji,jj)\n"
+            "      a(ji,jj) = zt * licm_tmp + zt * 2.0_wp\n"
+            "      if (e3t(jj) > 0.0_wp) then\n"
+            "        a(ji,jj) = a(ji,jj) / e3t(jj)\n" in result)
+    assert Compile(tmpdir).string_compiles(result)
+
+    # Nothing is invariant in the outer loop apart from the hoisted
+    # expression, which is an assignment to a scalar written in the loop.
+    outer = psyir.walk(Loop)[0]
+    LoopInvariantCodeMotionTrans().apply(outer)
+    assert fortran_writer(psyir) == result
+
+
+def test_licm_unknown_type(fortran_reader, fortran_writer):
+    '''Test that expressions whose type can not be determined are not
+    hoisted.'''
+    psyir = fortran_reader.psyir_from_source(
+        "subroutine sub(a, n)\n"
+        "  use some_mod, only: b, c\n"
+        "  integer :: n, ji\n"
+        "  real :: a(n)\n"
+        "  do ji = 1, n\n"
+        "    a(ji) = b * c + 2.0 * n\n"
+        "  end do\n"
+        "end subroutine sub\n")
+    LoopInvariantCodeMotionTrans().apply(psyir.walk(Loop)[0])
+    result = fortran_writer(psyir)
+    assert "licm_tmp = 2.0 * n\n" in result
+    assert "a(ji) = b * c + licm_tmp\n" in result
+
+
+def test_get_expression_datatype():
+    '''Test the get_expression_datatype function for some simple
+    expressions.'''
+    one = Literal("1", INTEGER_TYPE)
+    assert get_expression_datatype(one) is INTEGER_TYPE
+    real_type = ScalarType(ScalarType.Intrinsic.REAL, 8)
+    two = Literal("2.0", real_type)
+    add = BinaryOperation.create(BinaryOperation.Operator.ADD, one, two)
+    datatype = get_expression_datatype(add)
+    assert datatype.intrinsic == ScalarType.Intrinsic.REAL
+    assert datatype.precision == 8
+    # Mismatched precisions can not be combined
+    other = Literal("3.0", ScalarType(ScalarType.Intrinsic.REAL, 4))
+    mul = BinaryOperation.create(BinaryOperation.Operator.MUL, add, other)
+    assert get_expression_datatype(mul) is None
+    comparison = BinaryOperation.create(BinaryOperation.Operator.GT,
+                                        one.copy(), two.copy())
+    assert get_expression_datatype(comparison).intrinsic == \
+        ScalarType.Intrinsic.BOOLEAN
@@ -0,0 +1,122 @@
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2021, Science and Technology Facilities Council.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+
+'''This module tests the LoopUnrollAndJamTrans transformation.
+'''
+
+from __future__ import absolute_import
+
+import pytest
+
+from psyclone.psyir.nodes import Loop
+from psyclone.psyir.transformations import LoopUnrollAndJamTrans, \
+    TransformationError
+from psyclone.tests.utilities import Compile
+
+CODE = '''subroutine sub(a, b, n)
+  integer, intent(in) :: n
+  real, intent(inout) :: a(n,n), b(n,n+1)
+  integer :: ji, jk
+  do jk = 1, n
+    do ji = {0}
+      {1}
+    end do
+  end do
+end subroutine sub
+'''
+
+
+def test_unroll_jam_str_name():
+    '''Test the __str__ and name properties of the transformation.'''
+    trans = LoopUnrollAndJamTrans()
+    assert str(trans) == ("Unroll the outer loop of a loop nest and jam the "
+                          "inner loops")
+    assert trans.name == "LoopUnrollAndJamTrans"
+
+
+def test_unroll_jam_validate(fortran_reader):
+    '''Test the checks of the validate method.'''
+    trans = LoopUnrollAndJamTrans()
+    psyir = fortran_reader.psyir_from_source(
+        CODE.format("1, n", "a(ji,jk) = 0.0"))
+    outer, inner = psyir.walk(Loop)
+    # The checks of LoopUnrollTrans are performed
+    with pytest.raises(TransformationError) as err:
+        trans.validate(outer, {"unroll_factor": 1})
+    assert ("Error in LoopUnrollAndJamTrans transformation. The "
+            "'unroll_factor' option must be an integer larger than 1"
+            in str(err.value))
+    with pytest.raises(TransformationError) as err:
+        trans.validate(inner)
+    assert ("Error in LoopUnrollAndJamTrans transformation. The body of the "
+            "loop must consist of a single loop but found ['Assignment']."
+            in str(err.value))
+    trans.validate(outer)
+
+    psyir = fortran_reader.psyir_from_source(
+        CODE.format("jk, n", "a(ji,jk) = 0.0"))
+    with pytest.raises(TransformationError) as err:
+        trans.validate(psyir.walk(Loop)[0])
+    assert ("Error in LoopUnrollAndJamTrans transformation. The bounds of "
+            "the inner loop over 'ji' depend on the variable 'jk' of the "
+            "outer loop." in str(err.value))
+
+    psyir = fortran_reader.psyir_from_source(
+        CODE.format("1, n", "a(ji,jk) = b(ji,jk) + a(ji,jk-1)"))
+    with pytest.raises(TransformationError) as err:
+        trans.validate(psyir.walk(Loop)[0])
+    assert ("Error in LoopUnrollAndJamTrans transformation. The iterations "
+            "of the loop over 'jk' can not be reordered: " in str(err.value))
+    assert "Variable a is written" in str(err.value)
+
+
+def test_unroll_jam_apply(fortran_reader, fortran_writer, tmpdir):
+    '''Test that the outer loop is unrolled, the inner loops are jammed and
+    a remainder loop nest is created.'''
+    psyir = fortran_reader.psyir_from_source(
+        CODE.format("1, n", "a(ji,jk) = b(ji,jk) + b(ji,jk+1)"))
+    LoopUnrollAndJamTrans().apply(psyir.walk(Loop)[0])
+    result = fortran_writer(psyir)
+    assert ("  do jk = 1, n - 1, 2\n"
+            "    do ji = 1, n, 1\n"
+            "      a(ji,jk) = b(ji,jk) + b(ji,jk + 1)\n"
+            "      a(ji,jk + 1) = b(ji,jk + 1) + b(ji,jk + 1 + 1)\n"
+            "    enddo\n"
+            "  enddo\n"
+            "  do jk = jk, n, 1\n"
+            "    do ji = 1, n, 1\n"
+            "      a(ji,jk) = b(ji,jk) + b(ji,jk + 1)\n"
+            "    enddo\n"
+            "  enddo\n" in result)
+    assert Compile(tmpdir).string_compiles(result)
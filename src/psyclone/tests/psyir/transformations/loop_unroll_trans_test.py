@@ -0,0 +1,142 @@
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2021, Science and Technology Facilities Council.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+
+'''This module tests the LoopUnrollTrans transformation.
+'''
+
+from __future__ import absolute_import
+
+import pytest
+
+from psyclone.psyir.nodes import Loop, Routine
+from psyclone.psyir.transformations import LoopUnrollTrans, \
+    TransformationError
+from psyclone.tests.utilities import Compile
+
+CODE = '''subroutine sub(a, b, n)
+  integer, intent(in) :: n
+  real, intent(inout) :: a(n), b(n)
+  integer :: jk
+  do jk = {0}
+    a(jk) = b(jk) * 2.0
+  end do
+end subroutine sub
+'''
+
+
+def test_unroll_str_name():
+    '''Test the __str__ and name properties of the transformation.'''
+    trans = LoopUnrollTrans()
+    assert str(trans) == "Unroll a loop"
+    assert trans.name == "LoopUnrollTrans"
+
+
+def test_unroll_validate(fortran_reader):
+    '''Test the checks of the validate method.'''
+    trans = LoopUnrollTrans()
+    psyir = fortran_reader.psyir_from_source(CODE.format("1, n"))
+    loop = psyir.walk(Loop)[0]
+    with pytest.raises(TransformationError) as err:
+        trans.validate(psyir.walk(Routine)[0])
+    assert ("Target of LoopUnrollTrans transformation must be a sub-class "
+            "of Loop but got 'Routine'" in str(err.value))
+    for factor in [1, "2", True]:
+        with pytest.raises(TransformationError) as err:
+            trans.validate(loop, {"unroll_factor": factor})
+        assert ("Error in LoopUnrollTrans transformation. The "
+                "'unroll_factor' option must be an integer larger than 1 but "
+                "found '{0}'.".format(factor) in str(err.value))
+    trans.validate(loop, {"unroll_factor": 8})
+
+    psyir = fortran_reader.psyir_from_source(CODE.format("1, n, n"))
+    with pytest.raises(TransformationError) as err:
+        trans.validate(psyir.walk(Loop)[0])
+    assert ("Error in LoopUnrollTrans transformation. The step of the loop "
+            "must be a non-zero integer constant but found 'Reference'."
+            in str(err.value))
+
+    psyir = fortran_reader.psyir_from_source(
+        CODE.format("1, n\n    write(*,*) jk"))
+    with pytest.raises(TransformationError) as err:
+        trans.validate(psyir.walk(Loop)[0])
+    assert ("Error in LoopUnrollTrans transformation. The loop contains a "
+            "'CodeBlock' within which the loop variable can not be updated."
+            in str(err.value))
+
+
+def test_unroll_variable_bounds(fortran_reader, fortran_writer, tmpdir):
+    '''Test that a loop with variable bounds is unrolled and followed by a
+    remainder loop.'''
+    psyir = fortran_reader.psyir_from_source(CODE.format("2, n"))
+    LoopUnrollTrans().apply(psyir.walk(Loop)[0], {"unroll_factor": 3})
+    result = fortran_writer(psyir)
+    assert ("  do jk = 2, n - 2, 3\n"
+            "    a(jk) = b(jk) * 2.0\n"
+            "    a(jk + 1) = b(jk + 1) * 2.0\n"
+            "    a(jk + 2) = b(jk + 2) * 2.0\n"
+            "  enddo\n"
+            "  do jk = jk, n, 1\n"
+            "    a(jk) = b(jk) * 2.0\n"
+            "  enddo\n" in result)
+    assert Compile(tmpdir).string_compiles(result)
+
+
+@pytest.mark.parametrize("bounds, expected", [
+    ("1, 8", "  do jk = 1, 7, 2\n"
+             "    a(jk) = b(jk) * 2.0\n"
+             "    a(jk + 1) = b(jk + 1) * 2.0\n"
+             "  enddo\n\n"),
+    ("1, 9", "  do jk = 1, 7, 2\n"
+             "    a(jk) = b(jk) * 2.0\n"
+             "    a(jk + 1) = b(jk + 1) * 2.0\n"
+             "  enddo\n"
+             "  do jk = 9, 9, 1\n"),
+    ("9, 1, -1", "  do jk = 9, 3, -2\n"
+                 "    a(jk) = b(jk) * 2.0\n"
+                 "    a(jk - 1) = b(jk - 1) * 2.0\n"
+                 "  enddo\n"
+                 "  do jk = 1, 1, -1\n"),
+    ("n, 1, -1", "  do jk = n, 1 + 1, -2\n"
+                 "    a(jk) = b(jk) * 2.0\n"
+                 "    a(jk - 1) = b(jk - 1) * 2.0\n"
+                 "  enddo\n"
+                 "  do jk = jk, 1, -1\n")])
+def test_unroll_bounds(fortran_reader, fortran_writer, bounds, expected):
+    '''Test that the bounds of the unrolled and remainder loops are correct
+    for constant bounds and negative steps, and that no remainder loop is
+    created if the number of iterations is a multiple of the unroll
+    factor.'''
+    psyir = fortran_reader.psyir_from_source(CODE.format(bounds))
+    LoopUnrollTrans().apply(psyir.walk(Loop)[0])
+    assert expected in fortran_writer(psyir)
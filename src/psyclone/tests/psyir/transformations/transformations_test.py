@@ -43,15 +43,18 @@ from __future__ import absolute_import, print_function
 import pytest
 
 from psyclone.errors import InternalError
-from psyclone.psyGen import ACCLoopDirective
-from psyclone.psyir.nodes import CodeBlock, IfBlock, Literal, Loop, Node, \
-    Reference, Schedule, Statement
-from psyclone.psyir.symbols import DataSymbol, INTEGER_TYPE, BOOLEAN_TYPE
+from psyclone.psyGen import ACCLoopDirective, OMPSimdDirective, \
+    OMPSingleDirective, OMPTaskloopDirective
+from psyclone.psyir.nodes import CodeBlock, IfBlock, Literal, Loop, \
+    Reference, Routine, Schedule, Statement
+from psyclone.psyir.symbols import DataSymbol, INTEGER_TYPE, BOOLEAN_TYPE, \
+    REAL_TYPE
 from psyclone.psyir.transformations import ProfileTrans, RegionTrans, \
     TransformationError
 from psyclone.tests.utilities import get_invoke
 from psyclone.transformations import ACCEnterDataTrans, ACCLoopTrans, \
-    ACCParallelTrans, OMPLoopTrans, OMPParallelLoopTrans, OMPParallelTrans
+    ACCParallelTrans, OMPLoopTrans, OMPParallelLoopTrans, OMPParallelTrans, \
+    OMPNowaitTrans, OMPSimdTrans, OMPTaskTrans, OMPTaskloopTrans
 
 
 def test_accloop():
@@ -90,15 +93,18 @@ def test_accenterdata_internalerr(monkeypatch):
             in str(err.value))
 
 
-def test_omploop_no_collapse():
-    ''' Check that the OMPLoopTrans.directive() method rejects the
-    collapse argument '''
+def test_omploop_collapse():
+    ''' Check that the OMPLoopTrans._directive() method passes the
+    collapse argument on to the directive. '''
     trans = OMPLoopTrans()
-    cnode = Node()
-    with pytest.raises(NotImplementedError) as err:
-        _ = trans._directive(cnode, collapse=2)
-    assert ("The COLLAPSE clause is not yet supported for '!$omp do' "
-            "directives" in str(err.value))
+    cnode = Statement()
+    directive = trans._directive([cnode], collapse=2)
+    assert directive.collapse == 2
+    assert directive.begin_string() == \
+        "omp do schedule(static), collapse(2)"
+    directive = trans._directive([cnode.detach()])
+    assert directive.collapse is None
+    assert directive.begin_string() == "omp do schedule(static)"
 
 
 def test_ifblock_children_region():
@@ -224,3 +230,401 @@ def test_profile_trans_invalid_name(value):
         _ = profile_trans.apply(node, options={"region_name": value})
     assert ("User-supplied region name must be a tuple containing "
             "two non-empty strings." in str(excinfo.value))
+
+
+def test_ompsimd():
+    ''' Generic tests for the OMPSimdTrans transformation class '''
+    trans = OMPSimdTrans()
+    assert trans.name == "OMPSimdTrans"
+    assert str(trans) == "Adds an 'OpenMP SIMD' directive to a loop"
+
+    cnode = Statement()
+    tdir = trans._directive([cnode], collapse=2)
+    assert isinstance(tdir, OMPSimdDirective)
+    assert tdir.collapse == 2
+    assert tdir.simdlen is None
+    assert tdir.aligned is None
+    assert tdir.alignment is None
+
+
+SIMD_CODE = '''
+subroutine kern(n, a, b, c)
+  integer :: n, i, j
+  real, dimension(n,n) :: a, b, c
+  real :: tmp
+  do j = 1, n
+    do i = 1, n
+      tmp = b(i, j) * 2.0
+      a(i, j) = tmp + c(i+1, j) - c(i-1, j) + b(2+i, j)
+    end do
+  end do
+  do j = 1, n
+    do i = 1, n, 2
+      a(i, j) = b(i, j)
+    end do
+  end do
+  do j = 1, n
+    do i = 1, n
+      a(i, j) = b(j, i)
+    end do
+  end do
+  do j = 1, n
+    do i = 1, n
+      a(i, j) = b(2*i, j)
+    end do
+  end do
+  do j = 1, n
+    do i = 2, n
+      a(i, j) = a(i-1, j)
+    end do
+  end do
+  do j = 1, n
+    do i = 1, n
+      a(i, j) = b(n-i, j)
+    end do
+  end do
+end subroutine kern
+'''
+
+
+def test_ompsimd_validate(fortran_reader):
+    ''' Check the validation of the OMPSimdTrans transformation. '''
+    trans = OMPSimdTrans()
+    psyir = fortran_reader.psyir_from_source(SIMD_CODE)
+    loops = psyir.walk(Loop)
+
+    # A valid innermost loop and a valid (collapsed) loop nest
+    trans.validate(loops[1], {"simdlen": 4, "aligned": ["a", "B"],
+                              "alignment": 64})
+    trans.validate(loops[0], {"collapse": 2})
+
+    for key in ["simdlen", "alignment"]:
+        for value in [0, "8", True]:
+            with pytest.raises(TransformationError) as err:
+                trans.validate(loops[1], {key: value, "aligned": ["a"]})
+            assert ("The '{0}' option must be a positive integer but got "
+                    "'{1}'.".format(key, value) in str(err.value))
+
+    # The arrays to assert as aligned must be named explicitly
+    with pytest.raises(TransformationError) as err:
+        trans.validate(loops[1], {"alignment": 64})
+    assert ("The 'alignment' option requires the 'aligned' option to name "
+            "the arrays that are aligned." in str(err.value))
+    for value in ["a", [1]]:
+        with pytest.raises(TransformationError) as err:
+            trans.validate(loops[1], {"aligned": value})
+        assert ("The 'aligned' option must be a list of str but got "
+                "'{0}'.".format(value) in str(err.value))
+    with pytest.raises(TransformationError) as err:
+        trans.validate(loops[1], {"aligned": ["a", "d"]})
+    assert ("The array 'd' in the 'aligned' option is not accessed in the "
+            "loop." in str(err.value))
+
+    with pytest.raises(TransformationError) as err:
+        trans.validate(loops[0])
+    assert ("The loop to vectorise must not contain another loop."
+            in str(err.value))
+
+    with pytest.raises(TransformationError) as err:
+        trans.validate(loops[3])
+    assert "The loop over 'i' must have a unit step." in str(err.value)
+
+    # The loop variable is used in the non-contiguous index, with a
+    # non-unit multiplier or with a negative stride
+    for loop in [loops[5], loops[7], loops[11]]:
+        with pytest.raises(TransformationError) as err:
+            trans.validate(loop)
+        assert ("Array 'b' is not accessed with unit stride in the loop "
+                "variable 'i'." in str(err.value))
+
+    # A loop-carried dependence, unless the analysis is skipped
+    with pytest.raises(TransformationError) as err:
+        trans.validate(loops[9])
+    assert ("The loop over 'i' cannot be vectorised: Warning: Variable a is "
+            "written and is accessed using indices i - 1 and i"
+            in str(err.value))
+    trans.validate(loops[9], {"force": True})
+
+
+def test_ompsimd_apply(fortran_reader):
+    ''' Check that OMPSimdTrans encloses the loop with a directive that
+    has the requested clauses. '''
+    trans = OMPSimdTrans()
+    psyir = fortran_reader.psyir_from_source(SIMD_CODE)
+    loops = psyir.walk(Loop)
+    trans.apply(loops[1], {"simdlen": 8, "aligned": ["a", "c"],
+                           "alignment": 64})
+    directive = loops[1].parent.parent
+    assert isinstance(directive, OMPSimdDirective)
+    assert directive.simdlen == 8
+    assert directive.aligned == ["a", "c"]
+    assert directive.alignment == 64
+    assert directive.collapse is None
+    assert directive.begin_string() == \
+        "omp simd simdlen(8), private(tmp), aligned(a,c:64)"
+    # Without an alignment the default of the implementation is used
+    psyir = fortran_reader.psyir_from_source(SIMD_CODE)
+    loop = psyir.walk(Loop)[1]
+    trans.apply(loop, {"aligned": ["b"]})
+    assert loop.parent.parent.begin_string() == \
+        "omp simd private(tmp), aligned(b)"
+
+    psyir = fortran_reader.psyir_from_source(SIMD_CODE)
+    loop = psyir.walk(Loop)[0]
+    trans.apply(loop, {"collapse": 2})
+    directive = loop.parent.parent
+    assert directive.begin_string() == "omp simd collapse(2), private(tmp)"
+    # The options of a previous application are not kept
+    assert directive.simdlen is None
+    assert directive.aligned is None
+    assert directive.alignment is None
+
+
+AUTO_SCHEDULE_CODE = '''
+subroutine kern(n, a)
+  integer, parameter :: jpk = 3, nx = 100
+  integer :: n, i, j, k
+  real :: a(nx, nx, jpk)
+  do k = 1, jpk
+    do j = 1, nx
+      do i = 1, nx
+        a(i, j, k) = 0.0
+      end do
+    end do
+  end do
+  do k = 1, 10
+    do j = 1, k
+      a(1, j, k) = 0.0
+    end do
+  end do
+  do k = 1, n
+    if (k > 3) then
+      a(1, 1, k) = 0.0
+    end if
+  end do
+  do k = 2 * jpk - 1, -jpk + 40, nx / 50
+    do j = 1, n
+      a(1, j, k) = 0.0
+    end do
+  end do
+end subroutine kern
+'''
+
+
+def test_omploop_trip_count(fortran_reader):
+    ''' Check that OMPLoopTrans._get_trip_count() evaluates the bounds
+    of a loop when they are known at code-generation time. '''
+    psyir = fortran_reader.psyir_from_source(AUTO_SCHEDULE_CODE)
+    loops = psyir.walk(Loop)
+    assert OMPLoopTrans._get_trip_count(loops[0]) == 3
+    assert OMPLoopTrans._get_trip_count(loops[1]) == 100
+    assert OMPLoopTrans._get_trip_count(loops[3]) == 10
+    # Bounds that depend on a variable or that use a division
+    assert OMPLoopTrans._get_trip_count(loops[4]) is None
+    assert OMPLoopTrans._get_trip_count(loops[5]) is None
+    assert OMPLoopTrans._get_trip_count(loops[6]) is None
+    loops[6].step_expr = Literal("-2", INTEGER_TYPE)
+    assert OMPLoopTrans._get_trip_count(loops[6]) == 0
+    loops[6].step_expr = Literal("0", INTEGER_TYPE)
+    assert OMPLoopTrans._get_trip_count(loops[6]) is None
+    loops[6].step_expr = Literal("1", INTEGER_TYPE)
+    assert OMPLoopTrans._get_trip_count(loops[6]) == 33
+    assert OMPLoopTrans._get_integer_value(Literal("1.0", REAL_TYPE)) is None
+
+
+def test_omploop_select_collapse_and_schedule(fortran_reader, monkeypatch):
+    ''' Check that OMPLoopTrans.select_collapse_and_schedule() chooses
+    the number of loops to collapse and the schedule from the loop nest. '''
+    trans = OMPLoopTrans()
+    psyir = fortran_reader.psyir_from_source(AUTO_SCHEDULE_CODE)
+    loops = psyir.walk(Loop)
+    # 3 iterations are not enough but 300 are for 8 threads
+    assert trans.select_collapse_and_schedule(loops[0], 8) == (2, "static")
+    assert trans.select_collapse_and_schedule(loops[0]) == (2, "static")
+    # 300 are not enough for 128 threads either
+    assert trans.select_collapse_and_schedule(loops[0], 128) == \
+        (3, "static")
+    assert trans.select_collapse_and_schedule(loops[1], 1) == (1, "static")
+    # A triangular loop nest can not be collapsed and its iterations
+    # perform different amounts of work
+    assert (trans.select_collapse_and_schedule(loops[3], 2) ==
+            (1, "dynamic,1"))
+    # A conditional and an unknown number of iterations
+    assert trans.select_collapse_and_schedule(loops[5], 2) == (1, "guided")
+    # An unknown number of iterations is assumed to be enough unless the
+    # loop is of a shallow type
+    assert trans.select_collapse_and_schedule(loops[6], 2) == (1, "static")
+    monkeypatch.setattr(trans, "SHALLOW_LOOP_TYPES", (None,))
+    assert trans.select_collapse_and_schedule(loops[6], 2) == (2, "static")
+
+
+def test_omploop_auto_schedule(fortran_reader):
+    ''' Check the 'auto_schedule' and 'num_threads' options of
+    OMPLoopTrans. '''
+    trans = OMPLoopTrans(omp_schedule="dynamic")
+    psyir = fortran_reader.psyir_from_source(AUTO_SCHEDULE_CODE)
+    loops = psyir.walk(Loop)
+    for value in [0, "8", True]:
+        with pytest.raises(TransformationError) as err:
+            trans.apply(loops[0], {"auto_schedule": True,
+                                   "num_threads": value})
+        assert ("The 'num_threads' option must be a positive integer but "
+                "got '{0}'.".format(value) in str(err.value))
+
+    trans.apply(loops[0], {"auto_schedule": True, "num_threads": 8})
+    assert loops[0].parent.parent.begin_string() == \
+        "omp do schedule(static), collapse(2)"
+    # An explicit collapse takes precedence
+    trans.apply(loops[6], {"auto_schedule": True, "collapse": 2})
+    assert loops[6].parent.parent.begin_string() == \
+        "omp do schedule(static), collapse(2)"
+    # The schedule of the transformation is used without the option
+    trans.apply(loops[5])
+    assert loops[5].parent.parent.begin_string() == "omp do schedule(dynamic)"
+    assert trans.omp_schedule == "dynamic"
+
+
+def test_omptask_trans_validate():
+    ''' Check the validation of the OMPTaskTrans transformation. '''
+    trans = OMPTaskTrans()
+    assert trans.name == "OMPTaskTrans"
+    assert str(trans) == ("Execute each of the supplied nodes as an OpenMP "
+                          "task with dependences on the kernel arguments")
+
+    # The dependences cannot be derived for NEMO code
+    _, invoke = get_invoke("explicit_do.f90", "nemo", idx=0)
+    with pytest.raises(TransformationError) as err:
+        trans.validate(invoke.schedule[0])
+    assert ("the dependences between tasks are derived from kernel arguments "
+            "so the nodes must be within the InvokeSchedule of an API with "
+            "kernel metadata." in str(err.value))
+
+    _, invoke = get_invoke("single_invoke_three_kernels.f90", "gocean1.0",
+                           idx=0, dist_mem=False)
+    schedule = invoke.schedule
+    trans.validate(schedule.children)
+
+    # Only loops, halo exchanges and global sums can become tasks
+    with pytest.raises(TransformationError) as err:
+        trans.validate(schedule[0].loop_body[0].loop_body[0])
+    assert ("only loops, halo exchanges and global sums can be executed as "
+            "tasks but found 'GOKern'." in str(err.value))
+
+    OMPLoopTrans().apply(schedule[1])
+    with pytest.raises(TransformationError) as err:
+        trans.validate(schedule.children)
+    assert "'OMPDoDirective'" in str(err.value)
+    with pytest.raises(TransformationError) as err:
+        trans.validate(schedule[1].dir_body[0])
+    assert ("cannot create OpenMP tasks within another OpenMP region."
+            in str(err.value))
+
+
+def test_omptaskloop_trans(fortran_reader):
+    ''' Check the validation and application of the OMPTaskloopTrans
+    transformation. '''
+    trans = OMPTaskloopTrans()
+    assert trans.name == "OMPTaskloopTrans"
+    assert str(trans) == "Adds an 'OpenMP TASKLOOP' directive to a loop"
+    psyir = fortran_reader.psyir_from_source(AUTO_SCHEDULE_CODE)
+    loops = psyir.walk(Loop)
+
+    with pytest.raises(TransformationError) as err:
+        trans.validate(loops[0], {"collapse": 2})
+    assert ("The COLLAPSE clause is not supported for '!$omp taskloop' "
+            "directives." in str(err.value))
+    for key in ["grainsize", "num_tasks"]:
+        for value in [0, "8", True]:
+            with pytest.raises(TransformationError) as err:
+                trans.validate(loops[0], {key: value})
+            assert ("The '{0}' option must be a positive integer but got "
+                    "'{1}'.".format(key, value) in str(err.value))
+    with pytest.raises(TransformationError) as err:
+        trans.validate(loops[0], {"grainsize": 2, "num_tasks": 4})
+    assert ("The 'grainsize' and 'num_tasks' options cannot both be "
+            "supplied." in str(err.value))
+
+    trans.apply(loops[0], {"num_tasks": 4})
+    single = loops[0].parent.parent.parent.parent
+    assert isinstance(single, OMPSingleDirective)
+    taskloop = loops[0].parent.parent
+    assert isinstance(taskloop, OMPTaskloopDirective)
+    assert taskloop.num_tasks == 4
+    assert taskloop.grainsize is None
+    # The options of a previous application are not kept
+    trans.apply(loops[3])
+    assert loops[3].parent.parent.num_tasks is None
+
+
+def test_omptaskloop_trans_reduction():
+    ''' Check that OMPTaskloopTrans rejects a loop containing a
+    reduction. '''
+    _, invoke = get_invoke("15.17.2_one_standard_builtin_one_reduction.f90",
+                           "dynamo0.3", idx=0, dist_mem=False)
+    with pytest.raises(TransformationError) as err:
+        OMPTaskloopTrans().validate(invoke.schedule[1])
+    assert ("The loop contains a kernel that performs a reduction which is "
+            "not supported within an OpenMP taskloop." in str(err.value))
+
+
+NOWAIT_CODE = '''
+subroutine kern(n, a, b, c)
+  integer :: n, i
+  real :: a(n), b(n), c(n), tmp
+  do i = 1, n
+    a(i) = 1.0
+  end do
+  do i = 1, n
+    b(i) = c(i)
+  end do
+  do i = 1, n
+    c(i) = 2.0 * a(i)
+  end do
+  do i = 1, n
+    tmp = a(i)
+  end do
+  do i = 1, n
+    tmp = b(i)
+  end do
+end subroutine kern
+'''
+
+
+def test_omp_nowait_trans(fortran_reader):
+    ''' Check the validation and application of the OMPNowaitTrans
+    transformation using the variable accesses of generic PSyIR. '''
+    trans = OMPNowaitTrans()
+    assert trans.name == "OMPNowaitTrans"
+    assert str(trans) == ("Adds a 'nowait' clause to the OpenMP DO "
+                          "directives in a parallel region when it is safe "
+                          "to do so")
+    psyir = fortran_reader.psyir_from_source(NOWAIT_CODE)
+    routine = psyir.walk(Routine)[0]
+    with pytest.raises(TransformationError) as err:
+        trans.apply(routine[0])
+    assert ("Error in OMPNowaitTrans transformation: the supplied node must "
+            "be an OMPParallelDirective but found 'Loop'." in str(err.value))
+
+    # Loops that are not within a parallel region are never changed
+    OMPLoopTrans().apply(routine[0])
+    assert not trans.nowait_is_safe(routine[0])
+
+    for loop in routine.children[1:]:
+        OMPLoopTrans().apply(loop)
+    OMPParallelTrans().apply(routine.children)
+    trans.apply(routine[0])
+    # The first loop writes 'a' which is read by the third and fourth, the
+    # second reads 'c' which is written by the third and the fourth and
+    # fifth both write 'tmp'. The loop variable is private.
+    assert [child.nowait for child in routine[0].dir_body.children] == \
+        [False, False, True, False, True]
+    assert routine[0].dir_body[2].end_string() == "omp end do nowait"
+
+    # An OpenMP parallel do always ends with a barrier
+    psyir = fortran_reader.psyir_from_source(NOWAIT_CODE)
+    routine = psyir.walk(Routine)[0]
+    OMPParallelLoopTrans().apply(routine[0])
+    with pytest.raises(TransformationError) as err:
+        trans.validate(routine[0])
+    assert "found 'OMPParallelDoDirective'" in str(err.value)
+    assert not trans.nowait_is_safe(routine[0])
@@ -0,0 +1,47 @@
+!-------------------------------------------------------------------------------
+! BSD 3-Clause License
+!
+! Copyright (c) 2021, Science and Technology Facilities Council
+! All rights reserved.
+!
+! Redistribution and use in source and binary forms, with or without
+! modification, are permitted provided that the following conditions are met:
+!
+! * Redistributions of source code must retain the above copyright notice, this
+!   list of conditions and the following disclaimer.
+!
+! * Redistributions in binary form must reproduce the above copyright notice,
+!   this list of conditions and the following disclaimer in the documentation
+!   and/or other materials provided with the distribution.
+!
+! * Neither the name of the copyright holder nor the names of its
+!   contributors may be used to endorse or promote products derived from
+!   this software without specific prior written permission.
+!
+! -----------------------------------------------------------------------------
+
+program multi_invoke_qr
+
+  ! Description: two invokes, each containing a kernel that requires
+  ! XYoZ quadrature, which use the same quadrature object and fields.
+  use constants_mod,       only: r_def, i_def
+  use field_mod,           only: field_type
+  use quadrature_xyoz_mod, only: quadrature_xyoz_type
+  use testkern_qr,         only: testkern_qr_type
+
+  implicit none
+
+  type(field_type)           :: f1, f2, m1, m2
+  type(quadrature_xyoz_type) :: qr
+  real(r_def)                :: a
+  integer(i_def)             :: istp
+
+  call invoke(                                       &
+       testkern_qr_type(f1, f2, m1, a, m2, istp, qr) &
+          )
+
+  call invoke(                                       &
+       testkern_qr_type(f1, f2, m1, a, m2, istp, qr) &
+          )
+
+end program multi_invoke_qr
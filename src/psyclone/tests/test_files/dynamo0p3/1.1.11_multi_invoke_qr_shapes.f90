@@ -0,0 +1,59 @@
+!-------------------------------------------------------------------------------
+! BSD 3-Clause License
+!
+! Copyright (c) 2021, Science and Technology Facilities Council
+! All rights reserved.
+!
+! Redistribution and use in source and binary forms, with or without
+! modification, are permitted provided that the following conditions are met:
+!
+! * Redistributions of source code must retain the above copyright notice, this
+!   list of conditions and the following disclaimer.
+!
+! * Redistributions in binary form must reproduce the above copyright notice,
+!   this list of conditions and the following disclaimer in the documentation
+!   and/or other materials provided with the distribution.
+!
+! * Neither the name of the copyright holder nor the names of its
+!   contributors may be used to endorse or promote products derived from
+!   this software without specific prior written permission.
+!
+! -----------------------------------------------------------------------------
+
+module multi_invoke_qr_shapes
+
+  ! Description: two invokes in different subroutines that pass quadrature
+  ! objects of different shapes but with the same name to kernels that
+  ! require basis functions on the same function space.
+  use constants_mod,         only: r_def, i_def
+  use field_mod,             only: field_type
+  use quadrature_xyoz_mod,   only: quadrature_xyoz_type
+  use quadrature_face_mod,   only: quadrature_face_type
+  use testkern_qr,           only: testkern_qr_type
+  use testkern_qr_faces_mod, only: testkern_qr_faces_type
+
+  implicit none
+
+contains
+
+  subroutine xyoz_step(f1, f2, m1, m2, a, istp, qr)
+
+    type(field_type),           intent(inout) :: f1, f2, m1, m2
+    real(r_def),                intent(in)    :: a
+    integer(i_def),             intent(in)    :: istp
+    type(quadrature_xyoz_type), intent(in)    :: qr
+
+    call invoke( testkern_qr_type(f1, f2, m1, a, m2, istp, qr) )
+
+  end subroutine xyoz_step
+
+  subroutine face_step(f1, f2, m1, m2, qr)
+
+    type(field_type),           intent(inout) :: f1, f2, m1, m2
+    type(quadrature_face_type), intent(in)    :: qr
+
+    call invoke( testkern_qr_faces_type(f1, f2, m1, m2, qr) )
+
+  end subroutine face_step
+
+end module multi_invoke_qr_shapes
@@ -0,0 +1,72 @@
+!-------------------------------------------------------------------------------
+! BSD 3-Clause License
+!
+! Copyright (c) 2021, Science and Technology Facilities Council
+! All rights reserved.
+!
+! Redistribution and use in source and binary forms, with or without
+! modification, are permitted provided that the following conditions are met:
+!
+! * Redistributions of source code must retain the above copyright notice, this
+!   list of conditions and the following disclaimer.
+!
+! * Redistributions in binary form must reproduce the above copyright notice,
+!   this list of conditions and the following disclaimer in the documentation
+!   and/or other materials provided with the distribution.
+!
+! * Neither the name of the copyright holder nor the names of its
+!   contributors may be used to endorse or promote products derived from
+!   this software without specific prior written permission.
+!
+! THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+! "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+! LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+! FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+! COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+! INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+! BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+! LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+! CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+! LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY
+! WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY
+! OF SUCH DAMAGE.
+!-------------------------------------------------------------------------------
+
+PROGRAM single_invoke_test
+
+  ! Fake Fortran program for testing the OpenCL device-residency
+  ! analysis: voldfld is completely overwritten by the first kernel and
+  ! vfld is accessed by both kernels.
+
+  use kind_params_mod
+  use grid_mod
+  use field_mod
+  use kernel_field_copy_mod, only: copy
+  implicit none
+
+  type(grid_type), target :: model_grid
+  !> Vel in y direction at current time step
+  type(r2d_field) :: vfld, voldfld
+
+  !> Loop counter for time-stepping loop
+  INTEGER :: ncycle
+
+  ! Create the model grid
+  model_grid = grid_type(GO_ARAKAWA_C,                        &
+                         (/GO_BC_PERIODIC,GO_BC_PERIODIC,GO_BC_NONE/) )
+
+  ! Create fields on this grid
+  vfld    = r2d_field(model_grid, GO_V_POINTS)
+  voldfld = r2d_field(model_grid, GO_V_POINTS)
+
+  !  ** Start of time loop ** 
+  DO ncycle=1,100
+    
+    call invoke( copy(voldfld, vfld), &
+                 copy(vfld, voldfld) )
+
+  END DO
+
+  !===================================================
+
+END PROGRAM single_invoke_test
@@ -0,0 +1,80 @@
+!-------------------------------------------------------------------------------
+! BSD 3-Clause License
+!
+! Copyright (c) 2021, Science and Technology Facilities Council
+! All rights reserved.
+!
+! Redistribution and use in source and binary forms, with or without
+! modification, are permitted provided that the following conditions are met:
+!
+! * Redistributions of source code must retain the above copyright notice, this
+!   list of conditions and the following disclaimer.
+!
+! * Redistributions in binary form must reproduce the above copyright notice,
+!   this list of conditions and the following disclaimer in the documentation
+!   and/or other materials provided with the distribution.
+!
+! * Neither the name of the copyright holder nor the names of its
+!   contributors may be used to endorse or promote products derived from
+!   this software without specific prior written permission.
+!
+! THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+! "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+! LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+! FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+! COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+! INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+! BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+! LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+! CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+! LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY
+! WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY
+! OF SUCH DAMAGE.
+!-------------------------------------------------------------------------------
+
+PROGRAM single_invoke_fuse_kernels
+
+  ! Fake Fortran program for testing the fusion of GOcean kernels
+  ! into a single OpenCL kernel.
+
+  use kind_params_mod
+  use grid_mod
+  use field_mod
+  use compute_cu_mod,  only: compute_cu
+  use time_smooth_mod, only: time_smooth
+  implicit none
+
+  type(grid_type), target :: model_grid
+  type(r2d_field) :: p_fld, u_fld, unew_fld, uold_fld, v_fld, vold_fld
+  type(r2d_field) :: cu_fld, cv_fld
+
+  !> Loop counter for time-stepping loop
+  INTEGER :: ncycle
+
+  ! Create the model grid
+  model_grid = grid_type(GO_ARAKAWA_C,                        &
+                         (/GO_BC_PERIODIC,GO_BC_PERIODIC,GO_BC_NONE/) )
+
+  ! Create fields on this grid
+  p_fld    = r2d_field(model_grid, GO_T_POINTS)
+  u_fld    = r2d_field(model_grid, GO_U_POINTS)
+  unew_fld = r2d_field(model_grid, GO_U_POINTS)
+  uold_fld = r2d_field(model_grid, GO_U_POINTS)
+  v_fld    = r2d_field(model_grid, GO_U_POINTS)
+  vold_fld = r2d_field(model_grid, GO_U_POINTS)
+  cu_fld   = r2d_field(model_grid, GO_U_POINTS)
+  cv_fld   = r2d_field(model_grid, GO_U_POINTS)
+
+  DO ncycle=1,100
+
+    ! The second kernel reads the field updated by the first one
+    call invoke( time_smooth(u_fld, unew_fld, uold_fld), &
+                 time_smooth(uold_fld, unew_fld, vold_fld) )
+
+    ! Both kernels read p_fld with a stencil
+    call invoke( compute_cu(cu_fld, p_fld, u_fld), &
+                 compute_cu(cv_fld, p_fld, v_fld) )
+
+  END DO
+
+END PROGRAM single_invoke_fuse_kernels
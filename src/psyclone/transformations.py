@@ -45,6 +45,7 @@ from __future__ import absolute_import, print_function
 import abc
 import six
 
+from fparser.two import Fortran2003
 from fparser.two.utils import walk
 from fparser.common.readfortran import FortranStringReader
 from fparser.two.Fortran2003 import Subroutine_Subprogram, \
@@ -53,16 +54,19 @@ from fparser.two.Fortran2003 import Subroutine_Subprogram, \
 
 from psyclone import psyGen
 from psyclone.configuration import Config
+from psyclone.core import AccessType, Signature, VariablesAccessInfo
 from psyclone.domain.lfric import LFRicConstants
 from psyclone.dynamo0p3 import DynInvokeSchedule
 from psyclone.errors import InternalError
 from psyclone.gocean1p0 import GOLoop
 from psyclone.psyGen import Transformation, Kern, InvokeSchedule, \
-    ACCLoopDirective, OMPDoDirective
+    ACCLoopDirective, OMPDoDirective, OMPSimdDirective, OMPSingleDirective, \
+    OMPTaskloopDirective
 from psyclone.psyir import nodes
 from psyclone.psyir.nodes import CodeBlock, Loop, Assignment, Schedule
 from psyclone.psyir.symbols import SymbolError, ScalarType, DeferredType, \
     INTEGER_TYPE, DataSymbol, Symbol
+from psyclone.psyir.tools.dependency_tools import DependencyTools
 from psyclone.psyir.transformations import RegionTrans, LoopTrans, \
     TransformationError
 from psyclone.undoredo import Memento
@@ -100,6 +104,82 @@ def check_intergrid(node):
                 "such a kernel.".format(kern.name))
 
 
+def accessed_arrays(node):
+    '''
+    :param node: the PSyIR node to examine.
+    :type node: :py:class:`psyclone.psyir.nodes.Node`
+
+    :returns: the arrays accessed within the supplied node.
+    :rtype: set of :py:class:`psyclone.core.Signature`
+    '''
+    arrays = set()
+    for ref in node.walk(nodes.ArrayReference):
+        arrays.add(Signature(ref.name))
+    table = node.scope.symbol_table
+    for signature in VariablesAccessInfo(node).all_signatures:
+        try:
+            symbol = table.lookup(str(signature))
+        except KeyError:
+            continue
+        if isinstance(symbol, DataSymbol) and symbol.is_array:
+            arrays.add(signature)
+    return arrays
+
+
+def has_data_dependence(node, other_nodes):
+    '''
+    Determines whether there is a data dependence between the supplied node
+    and any of the other supplied nodes, i.e. whether one of them writes
+    data that the other reads or writes. This uses the argument dependence
+    information of kernels with metadata and the variable accesses
+    reported by :py:class:`psyclone.core.VariablesAccessInfo`. Loop
+    variables are ignored as they are private to each loop.
+
+    :param node: the node whose accesses are checked.
+    :type node: :py:class:`psyclone.psyir.nodes.Node`
+    :param other_nodes: the nodes to check against.
+    :type other_nodes: list of :py:class:`psyclone.psyir.nodes.Node`
+
+    :returns: True if there is (or may be) a dependence, False otherwise.
+    :rtype: bool
+
+    '''
+    if not other_nodes:
+        return False
+
+    def kernel_args(node_list):
+        # Argument dependence information is only available for kernels
+        # with metadata (i.e. not the inlined kernels of the NEMO API).
+        args = []
+        for check_node in node_list:
+            for kern in check_node.walk(Kern):
+                if not isinstance(kern, psyGen.InlinedKern):
+                    args.extend(kern.args)
+        return args
+
+    other_args = kernel_args(other_nodes)
+    for arg in kernel_args([node]):
+        for other in other_args:
+            # pylint: disable=protected-access
+            if arg._depends_on(other):
+                return True
+
+    private = set()
+    for check_node in [node] + other_nodes:
+        for loop in check_node.walk(Loop):
+            private.add(Signature(loop.variable.name))
+
+    node_accesses = VariablesAccessInfo(node)
+    other_accesses = VariablesAccessInfo(other_nodes)
+    for signature in node_accesses.all_signatures:
+        if signature in private or signature not in other_accesses:
+            continue
+        if node_accesses.is_written(signature) or \
+           other_accesses.is_written(signature):
+            return True
+    return False
+
+
 class KernelTrans(Transformation):
     '''
     Base class for all Kernel transformations.
@@ -212,6 +292,9 @@ class ParallelLoopTrans(LoopTrans):
                 colours.
         :raises TransformationError: if 'collapse' is supplied with an \
                 invalid number of loops.
+        :raises TransformationError: if the loops to collapse are not \
+                perfectly nested or the bounds of one of them depend on \
+                the variable of an enclosing loop.
 
         '''
         # Check that the supplied node is a Loop and does not contain any
@@ -251,6 +334,35 @@ class ParallelLoopTrans(LoopTrans):
                 raise TransformationError(
                     "Cannot apply COLLAPSE({0}) clause to a loop nest "
                     "containing only {1} loops".format(collapse, loop_count))
+            # The collapsed loops must be perfectly nested and the bounds
+            # of each of them must not depend on the variables of the
+            # loops that enclose it.
+            loop_vars = []
+            cnode = node
+            for depth in range(collapse):
+                bound_names = [ref.name for expr in
+                               [cnode.start_expr, cnode.stop_expr,
+                                cnode.step_expr]
+                               for ref in expr.walk(nodes.Reference)]
+                for name in bound_names:
+                    if name in loop_vars:
+                        raise TransformationError(
+                            "Cannot apply COLLAPSE({0}) clause to this loop "
+                            "nest because the bounds of the loop over '{1}' "
+                            "depend on the variable '{2}' of an enclosing "
+                            "loop.".format(collapse, cnode.variable.name,
+                                           name))
+                loop_vars.append(cnode.variable.name)
+                if depth < collapse - 1:
+                    if len(cnode.loop_body.children) != 1:
+                        raise TransformationError(
+                            "Cannot apply COLLAPSE({0}) clause to this loop "
+                            "nest because it is not perfectly nested: the "
+                            "body of the loop over '{1}' contains {2} "
+                            "statements instead of just the inner loop."
+                            "".format(collapse, cnode.variable.name,
+                                      len(cnode.loop_body.children)))
+                    cnode = cnode.loop_body[0]
 
     def apply(self, node, options=None):
         '''
@@ -321,6 +433,12 @@ class OMPLoopTrans(ParallelLoopTrans):
     reproducible) or whether a manual reproducible reproduction is
     to be used.
 
+    Instead of using the schedule given to the constructor, the
+    'auto_schedule' option of the apply method makes the transformation
+    choose the number of loops to collapse and the OpenMP schedule from an
+    analysis of the loop nest (see
+    :py:meth:`OMPLoopTrans.select_collapse_and_schedule`).
+
     :param str omp_schedule: the OpenMP schedule to use.
 
     For example:
@@ -358,11 +476,26 @@ class OMPLoopTrans(ParallelLoopTrans):
     >>>
 
     '''
+    # The number of threads that is assumed when the number of loops to
+    # collapse and the schedule are chosen automatically and the
+    # 'num_threads' option is not supplied.
+    DEFAULT_NUM_THREADS = 16
+    # The minimum number of iterations per thread for which a (collapsed)
+    # loop nest is considered to have enough parallelism.
+    MIN_ITERATIONS_PER_THREAD = 4
+    # The types of loop that, when their trip count cannot be determined,
+    # are assumed to be too short to keep all threads busy on their own
+    # (e.g. the vertical and tracer loops of NEMO).
+    SHALLOW_LOOP_TYPES = ("levels", "tracers")
+
     def __init__(self, omp_schedule="static"):
         # Whether or not to generate code for (run-to-run on n threads)
         # reproducible OpenMP reductions. This setting can be overridden
         # via the `reprod` argument to the apply() method.
         self._reprod = Config.get().reproducible_reductions
+        # The schedule chosen by the 'auto_schedule' option of the
+        # apply() method (if any) for the directive being created.
+        self._auto_omp_schedule = None
 
         self._omp_schedule = ""
         # Although we create the _omp_schedule attribute above (so that
@@ -407,6 +540,229 @@ class OMPLoopTrans(ParallelLoopTrans):
 
         self._omp_schedule = value
 
+    @staticmethod
+    def _get_integer_value(expr):
+        '''
+        Evaluates the supplied expression if it is an integer expression
+        made of literals, constant symbols, additions, subtractions,
+        multiplications and negations.
+
+        :param expr: the expression to evaluate.
+        :type expr: :py:class:`psyclone.psyir.nodes.Node`
+
+        :returns: the value of the expression or None if it cannot be \
+                  determined at code-generation time.
+        :rtype: int or NoneType
+
+        '''
+        # pylint: disable=too-many-return-statements
+        if isinstance(expr, nodes.Literal):
+            if expr.datatype.intrinsic != ScalarType.Intrinsic.INTEGER:
+                return None
+            try:
+                return int(expr.value)
+            except ValueError:
+                # e.g. the placeholder bounds of a GOLoop
+                return None
+        if type(expr) is nodes.Reference:
+            symbol = expr.symbol
+            if isinstance(symbol, DataSymbol) and symbol.is_constant:
+                return OMPLoopTrans._get_integer_value(symbol.constant_value)
+            return None
+        if isinstance(expr, nodes.UnaryOperation):
+            value = OMPLoopTrans._get_integer_value(expr.children[0])
+            if value is None:
+                return None
+            if expr.operator == nodes.UnaryOperation.Operator.MINUS:
+                return -value
+            if expr.operator == nodes.UnaryOperation.Operator.PLUS:
+                return value
+            return None
+        if isinstance(expr, nodes.BinaryOperation):
+            lhs = OMPLoopTrans._get_integer_value(expr.children[0])
+            rhs = OMPLoopTrans._get_integer_value(expr.children[1])
+            if lhs is None or rhs is None:
+                return None
+            oper = nodes.BinaryOperation.Operator
+            if expr.operator == oper.ADD:
+                return lhs + rhs
+            if expr.operator == oper.SUB:
+                return lhs - rhs
+            if expr.operator == oper.MUL:
+                return lhs * rhs
+        return None
+
+    @staticmethod
+    def _get_trip_count(loop):
+        '''
+        :param loop: the loop to examine.
+        :type loop: :py:class:`psyclone.psyir.nodes.Loop`
+
+        :returns: the number of iterations of the supplied loop or None \
+                  if it cannot be determined at code-generation time.
+        :rtype: int or NoneType
+
+        '''
+        values = [OMPLoopTrans._get_integer_value(expr) for expr in
+                  [loop.start_expr, loop.stop_expr, loop.step_expr]]
+        if None in values or values[2] == 0:
+            return None
+        start, stop, step = values
+        return max(0, (stop - start) // step + 1)
+
+    def select_collapse_and_schedule(self, node, num_threads=None):
+        '''
+        Analyses the loop nest starting at the supplied loop and chooses
+        the number of loops to collapse and the OpenMP schedule so that
+        there are enough iterations for the number of threads and the
+        load imbalance between threads is reduced:
+
+        * The outer loop is collapsed with the loops that are perfectly
+          nested within it (whose bounds do not depend on the variables
+          of the enclosing loops and which do not carry a dependence
+          according to the DependencyTools) for as long as the collapsed
+          iteration space has fewer than MIN_ITERATIONS_PER_THREAD
+          iterations per thread. The number of iterations of a loop is
+          taken from its bounds if they are known at code-generation
+          time. Otherwise loops of a type in SHALLOW_LOOP_TYPES (e.g.
+          the vertical loops of NEMO) are assumed to be too short and
+          any other loop (e.g. the loops over the horizontal domain in
+          GOcean and LFRic) is assumed to be long enough.
+        * A 'static' schedule is used if all iterations perform the same
+          amount of work. If they do not (the body of the collapsed loops
+          contains a conditional or a loop with bounds that depend on
+          their loop variables) a 'dynamic' schedule with a chunk size
+          giving MIN_ITERATIONS_PER_THREAD chunks per thread is used when
+          the number of iterations is known and a 'guided' schedule
+          otherwise.
+
+        :param node: the outermost loop of the loop nest.
+        :type node: :py:class:`psyclone.psyir.nodes.Loop`
+        :param int num_threads: the number of OpenMP threads to assume. \
+                                Defaults to DEFAULT_NUM_THREADS.
+
+        :returns: the number of loops to collapse (1 if no collapse \
+                  clause is required) and the OpenMP schedule.
+        :rtype: (int, str)
+
+        '''
+        if num_threads is None:
+            num_threads = self.DEFAULT_NUM_THREADS
+        min_iterations = num_threads * self.MIN_ITERATIONS_PER_THREAD
+
+        # Find the loops that can be collapsed with the outer loop
+        nest = [node]
+        loop_vars = [node.variable.name]
+        while (len(nest[-1].loop_body.children) == 1 and
+               isinstance(nest[-1].loop_body[0], Loop)):
+            inner = nest[-1].loop_body[0]
+            bound_names = [ref.name for expr in
+                           [inner.start_expr, inner.stop_expr,
+                            inner.step_expr]
+                           for ref in expr.walk(nodes.Reference)]
+            if any(name in loop_vars for name in bound_names):
+                break
+            nest.append(inner)
+            loop_vars.append(inner.variable.name)
+
+        def too_short(count, loops):
+            ''' Whether the iteration space of the supplied (collapsed)
+            loops is considered to have too few iterations. '''
+            if count is not None:
+                return count < min_iterations
+            return all(loop.loop_type in self.SHALLOW_LOOP_TYPES
+                       for loop in loops)
+
+        collapse = 1
+        count = self._get_trip_count(node)
+        while collapse < len(nest) and too_short(count, nest[:collapse]):
+            # The nest stops at the first inner loop that carries a
+            # dependence. This is only checked for the loops that would be
+            # collapsed, as it requires a dependence analysis.
+            inner = nest[collapse]
+            if not DependencyTools([inner.loop_type]).\
+                    can_loop_be_parallelised(inner, only_nested_loops=False):
+                break
+            inner_count = self._get_trip_count(inner)
+            if count is not None and inner_count is not None:
+                count *= inner_count
+            else:
+                count = None
+            collapse += 1
+
+        # Check whether all iterations of the collapsed loops perform the
+        # same amount of work
+        collapsed_vars = loop_vars[:collapse]
+        uniform = not nest[collapse-1].loop_body.walk(nodes.IfBlock)
+        for loop in nest[collapse-1].loop_body.walk(Loop):
+            bound_names = [ref.name for expr in
+                           [loop.start_expr, loop.stop_expr, loop.step_expr]
+                           for ref in expr.walk(nodes.Reference)]
+            if any(name in collapsed_vars for name in bound_names):
+                uniform = False
+
+        if uniform:
+            schedule = "static"
+        elif count is not None:
+            schedule = "dynamic,{0}".format(
+                max(1, count // min_iterations))
+        else:
+            schedule = "guided"
+        return collapse, schedule
+
+    def validate(self, node, options=None):
+        '''
+        Perform validation checks before applying the transformation.
+
+        :param node: the node we are checking.
+        :type node: :py:class:`psyclone.psyir.nodes.Node`
+        :param options: a dictionary with options for transformations.
+        :type options: dictionary of string:values or None
+        :param int options["num_threads"]: the number of threads assumed \
+                                           by the 'auto_schedule' option.
+
+        :raises TransformationError: if the 'num_threads' option is not \
+                                     a positive integer.
+
+        '''
+        super(OMPLoopTrans, self).validate(node, options=options)
+        if not options:
+            options = {}
+        num_threads = options.get("num_threads", self.DEFAULT_NUM_THREADS)
+        if (not isinstance(num_threads, int) or
+                isinstance(num_threads, bool) or num_threads < 1):
+            raise TransformationError(
+                "Error in {0} transformation. The 'num_threads' option must "
+                "be a positive integer but got '{1}'.".format(
+                    self.name, num_threads))
+
+    def _auto_options(self, node, options):
+        '''
+        Chooses the number of loops to collapse and the OpenMP schedule
+        for the supplied loop if the "auto_schedule" option is set. The
+        chosen schedule is stored for use by :py:meth:`_directive`.
+
+        :param node: the loop to which the transformation is applied.
+        :type node: :py:class:`psyclone.psyir.nodes.Loop`
+        :param options: the options supplied to the apply() method.
+        :type options: dictionary of string:values
+
+        :returns: the options with the number of loops to collapse \
+                  added if it was chosen automatically.
+        :rtype: dictionary of string:values
+
+        '''
+        self._auto_omp_schedule = None
+        if options.get("auto_schedule", False):
+            self.validate(node, options=options)
+            collapse, self._auto_omp_schedule = \
+                self.select_collapse_and_schedule(
+                    node, options.get("num_threads"))
+            if collapse > 1 and not options.get("collapse"):
+                options = options.copy()
+                options["collapse"] = collapse
+        return options
+
     def _directive(self, children, collapse=None):
         '''
         Creates the type of directive needed for this sub-class of
@@ -415,19 +771,16 @@ class OMPLoopTrans(ParallelLoopTrans):
         :param children: list of Nodes that will be the children of \
                          the created directive.
         :type children: list of :py:class:`psyclone.psyir.nodes.Node`
-        :param int collapse: currently un-used but required to keep \
-                             interface the same as in base class.
+        :param int collapse: the number of tightly-nested loops to which \
+                             this directive applies or None.
         :returns: the new node representing the directive in the AST
         :rtype: :py:class:`psyclone.psyGen.OMPDoDirective`
-        :raises NotImplementedError: if a collapse argument is supplied
         '''
-        if collapse:
-            raise NotImplementedError(
-                "The COLLAPSE clause is not yet supported for '!$omp do' "
-                "directives.")
+        omp_schedule = self._auto_omp_schedule or self.omp_schedule
         _directive = OMPDoDirective(children=children,
-                                    omp_schedule=self.omp_schedule,
-                                    reprod=self._reprod)
+                                    omp_schedule=omp_schedule,
+                                    reprod=self._reprod,
+                                    collapse=collapse)
         return _directive
 
     def apply(self, node, options=None):
@@ -463,16 +816,33 @@ class OMPLoopTrans(ParallelLoopTrans):
         :param bool options["reprod"]:
                 indicating whether reproducible reductions should be used. \
                 By default the value from the config file will be used.
+        :param int options["collapse"]: the number of loops to collapse \
+                into a single iteration space or None. The loops must be \
+                perfectly nested and their bounds must not depend on the \
+                variables of the loops that enclose them.
+        :param bool options["auto_schedule"]: whether to choose the \
+                number of loops to collapse and the OpenMP schedule \
+                automatically (see :py:meth:`select_collapse_and_schedule`) \
+                instead of using the schedule of this transformation. An \
+                explicit "collapse" option takes precedence.
+        :param int options["num_threads"]: the number of OpenMP threads \
+                assumed by the "auto_schedule" option.
 
         :returns: (:py:class:`psyclone.psyir.nodes.Schedule`, \
         :py:class:`psyclone.undoredo.Memento`)
 
+        :raises TransformationError: if the loops to collapse are not \
+                perfectly nested or the bounds of one of them depend on \
+                the variable of an enclosing loop.
+
         '''
         if not options:
             options = {}
         self._reprod = options.get("reprod",
                                    Config.get().reproducible_reductions)
 
+        options = self._auto_options(node, options)
+
         # Add variable names for OMP functions into the InvokeSchedule (root)
         # symboltable if they don't already exist
         if not isinstance(node.root, NemoInvokeSchedule):
@@ -606,7 +976,10 @@ class ACCLoopTrans(ParallelLoopTrans):
 
 class OMPParallelLoopTrans(OMPLoopTrans):
 
-    ''' Adds an OpenMP PARALLEL DO directive to a loop.
+    ''' Adds an OpenMP PARALLEL DO directive to a loop. The 'collapse'
+        and 'auto_schedule' options of the apply method may be used to
+        parallelise a perfectly-nested loop nest as a single iteration
+        space (see :py:class:`OMPLoopTrans`).
 
         For example:
 
@@ -646,6 +1019,24 @@ class OMPParallelLoopTrans(OMPLoopTrans):
                                       "The requested loop is over colours and "
                                       "must be computed serially.")
 
+    def _directive(self, children, collapse=None):
+        '''
+        Creates the type of directive needed for this sub-class of
+        transformation.
+
+        :param children: list of Nodes that will be the children of \
+                         the created directive.
+        :type children: list of :py:class:`psyclone.psyir.nodes.Node`
+        :param int collapse: the number of tightly-nested loops to which \
+                             this directive applies or None.
+        :returns: the new node representing the directive in the AST
+        :rtype: :py:class:`psyclone.psyGen.OMPParallelDoDirective`
+        '''
+        omp_schedule = self._auto_omp_schedule or self.omp_schedule
+        return psyGen.OMPParallelDoDirective(children=children,
+                                             omp_schedule=omp_schedule,
+                                             collapse=collapse)
+
     def apply(self, node, options=None):
         ''' Apply an OMPParallelLoop Transformation to the supplied node
         (which must be a Loop). In the generated code this corresponds to
@@ -664,33 +1055,27 @@ class OMPParallelLoopTrans(OMPLoopTrans):
         :param options: a dictionary with options for transformations\
                         and validation.
         :type options: dictionary of string:values or None
+        :param int options["collapse"]: the number of loops to collapse \
+                into a single iteration space or None.
+        :param bool options["auto_schedule"]: whether to choose the \
+                number of loops to collapse and the OpenMP schedule \
+                automatically (see :py:meth:`select_collapse_and_schedule`) \
+                instead of using the schedule of this transformation. An \
+                explicit "collapse" option takes precedence.
+        :param int options["num_threads"]: the number of OpenMP threads \
+                assumed by the "auto_schedule" option.
 
         :returns: two-tuple of transformed schedule and a record of the \
                   transformation.
         :rtype: (:py:class:`psyclone.psyir.nodes.Schedule, \
                  :py:class:`psyclone.undoredo.Memento`)
         '''
-        self.validate(node, options=options)
-
-        schedule = node.root
-        # create a memento of the schedule and the proposed transformation
-        keep = Memento(schedule, self, [node])
-
-        # keep a reference to the node's original parent and its index as these
-        # are required and will change when we change the node's location
-        node_parent = node.parent
-        node_position = node.position
-
-        # add our OpenMP loop directive setting its parent to the node's
-        # parent and its children to the node
-        from psyclone.psyGen import OMPParallelDoDirective
-        directive = OMPParallelDoDirective(children=[node.detach()],
-                                           omp_schedule=self.omp_schedule)
-
-        # add the OpenMP loop directive as a child of the node's parent
-        node_parent.addchild(directive, index=node_position)
-
-        return schedule, keep
+        if not options:
+            options = {}
+        options = self._auto_options(node, options)
+        # Reproducible reductions are not supported by a parallel do so
+        # we bypass OMPLoopTrans.apply()
+        return ParallelLoopTrans.apply(self, node, options)
 
 
 class DynamoOMPParallelLoopTrans(OMPParallelLoopTrans):
@@ -737,7 +1122,7 @@ class DynamoOMPParallelLoopTrans(OMPParallelLoopTrans):
                     "argument with INC access. Colouring is required.".
                     format(self.name))
 
-        return OMPParallelLoopTrans.apply(self, node)
+        return OMPParallelLoopTrans.apply(self, node, options)
 
 
 class GOceanOMPParallelLoopTrans(OMPParallelLoopTrans):
@@ -780,7 +1165,7 @@ class GOceanOMPParallelLoopTrans(OMPParallelLoopTrans):
                 "Error in "+self.name+" transformation.  The requested loop"
                 " is not of type inner or outer.")
 
-        return OMPParallelLoopTrans.apply(self, node)
+        return OMPParallelLoopTrans.apply(self, node, options)
 
 
 class Dynamo0p3OMPLoopTrans(OMPLoopTrans):
@@ -884,6 +1269,374 @@ class GOceanOMPLoopTrans(OMPLoopTrans):
         return OMPLoopTrans.apply(self, node, options)
 
 
+class OMPSimdTrans(ParallelLoopTrans):
+    '''
+    Adds an OpenMP SIMD directive to a loop in order to have it
+    vectorised. Unlike the other OpenMP loop transformations, the
+    directive does not need to be within a parallel region. This is
+    mainly intended for the loops of kernels that are lowered to C
+    (where the directive becomes a `#pragma omp simd`). For example:
+
+    >>> from psyclone.psyir.backend.c import CWriter
+    >>> from psyclone.transformations import OMPSimdTrans
+    >>> kschedule = kernel.get_kernel_schedule()
+    >>> inner_loop = kschedule.walk(Loop)[1]
+    >>> OMPSimdTrans().apply(inner_loop, {"aligned": ["a", "b"],
+    ...                                   "alignment": 64})
+    >>> print(CWriter()(kschedule))
+
+    The loop to vectorise (or the innermost loop of the collapsed loop
+    nest) must not contain any other loop or call, all of the loops must
+    have a unit step, all arrays must be accessed with unit stride in the
+    loop variable of the vectorised loop (i.e. the loop variable only
+    appears in the first, contiguous, index of an array and only as
+    `var +/- offset`) and there must not be any loop-carried dependence.
+
+    An 'aligned' clause is only added for the arrays named in the
+    "aligned" option. It is the responsibility of the caller to ensure
+    that they really are aligned since a wrong assertion results in
+    undefined behaviour.
+
+    '''
+    excluded_node_types = ParallelLoopTrans.excluded_node_types + \
+        (Kern, nodes.Call)
+
+    def __init__(self):
+        self._simdlen = None
+        self._aligned = None
+        self._alignment = None
+        super(OMPSimdTrans, self).__init__()
+
+    def __str__(self):
+        return "Adds an 'OpenMP SIMD' directive to a loop"
+
+    def _directive(self, children, collapse=None):
+        '''
+        Creates the type of directive needed for this sub-class of
+        transformation.
+
+        :param children: list of Nodes that will be the children of \
+                         the created directive.
+        :type children: list of :py:class:`psyclone.psyir.nodes.Node`
+        :param int collapse: the number of tightly-nested loops to which \
+                             this directive applies or None.
+
+        :returns: the new node representing the directive in the AST.
+        :rtype: :py:class:`psyclone.psyGen.OMPSimdDirective`
+
+        '''
+        return OMPSimdDirective(children=children, collapse=collapse,
+                                simdlen=self._simdlen, aligned=self._aligned,
+                                alignment=self._alignment)
+
+    @staticmethod
+    def _is_unit_stride(index, variable):
+        '''
+        :param index: an array-index expression.
+        :type index: :py:class:`psyclone.psyir.nodes.Node`
+        :param str variable: the name of the loop variable.
+
+        :returns: whether the index expression is the loop variable plus \
+            or minus an offset that does not depend on the loop variable.
+        :rtype: bool
+
+        '''
+        def uses_variable(expr):
+            ''' Whether the expression references the loop variable. '''
+            return any(ref.name.lower() == variable
+                       for ref in expr.walk(nodes.Reference))
+
+        if type(index) is nodes.Reference:
+            return index.name.lower() == variable
+        if isinstance(index, nodes.BinaryOperation):
+            lhs, rhs = index.children
+            if index.operator == nodes.BinaryOperation.Operator.ADD:
+                return ((OMPSimdTrans._is_unit_stride(lhs, variable) and
+                         not uses_variable(rhs)) or
+                        (OMPSimdTrans._is_unit_stride(rhs, variable) and
+                         not uses_variable(lhs)))
+            if index.operator == nodes.BinaryOperation.Operator.SUB:
+                return (OMPSimdTrans._is_unit_stride(lhs, variable) and
+                        not uses_variable(rhs))
+        return False
+
+    def validate(self, node, options=None):
+        '''
+        Checks that the supplied loop (nest) can be vectorised.
+
+        :param node: the loop to vectorise.
+        :type node: :py:class:`psyclone.psyir.nodes.Loop`
+        :param options: a dictionary with options for transformations.
+        :type options: dict of str:values or None
+        :param int options["collapse"]: the number of tightly-nested \
+            loops to vectorise together or None.
+        :param int options["simdlen"]: the preferred number of iterations \
+            to execute concurrently or None.
+        :param options["aligned"]: the names of the arrays accessed in \
+            the loop that are asserted to be aligned or None.
+        :type options["aligned"]: list of str
+        :param int options["alignment"]: the alignment (in bytes) of the \
+            arrays in "aligned" or None.
+        :param bool options["force"]: if True, the dependence analysis is \
+            skipped (default False).
+
+        :raises TransformationError: if 'simdlen' or 'alignment' is not a \
+            positive integer.
+        :raises TransformationError: if 'aligned' is not a list of str or \
+            names an array that is not accessed in the loop.
+        :raises TransformationError: if 'alignment' is supplied without \
+            'aligned'.
+        :raises TransformationError: if the loop (nest) contains another \
+            loop.
+        :raises TransformationError: if a loop does not have a unit step.
+        :raises TransformationError: if an array is not accessed with unit \
+            stride.
+        :raises TransformationError: if the loop has a loop-carried \
+            dependence.
+
+        '''
+        super(OMPSimdTrans, self).validate(node, options=options)
+        if not options:
+            options = {}
+
+        for key in ["simdlen", "alignment"]:
+            value = options.get(key)
+            if value is not None and (not isinstance(value, int) or
+                                      isinstance(value, bool) or value < 1):
+                raise TransformationError(
+                    "Error in {0} transformation. The '{1}' option must be a "
+                    "positive integer but got '{2}'."
+                    "".format(self.name, key, value))
+
+        aligned = options.get("aligned")
+        if aligned is None:
+            if options.get("alignment") is not None:
+                raise TransformationError(
+                    "Error in {0} transformation. The 'alignment' option "
+                    "requires the 'aligned' option to name the arrays that "
+                    "are aligned.".format(self.name))
+        elif not (isinstance(aligned, list) and
+                  all(isinstance(name, six.string_types)
+                      for name in aligned)):
+            raise TransformationError(
+                "Error in {0} transformation. The 'aligned' option must be "
+                "a list of str but got '{1}'.".format(self.name, aligned))
+        else:
+            arrays = set(array.name.lower() for array in
+                         node.walk(nodes.ArrayReference))
+            for name in aligned:
+                if name.lower() not in arrays:
+                    raise TransformationError(
+                        "Error in {0} transformation. The array '{1}' in the "
+                        "'aligned' option is not accessed in the loop."
+                        "".format(self.name, name))
+
+        loops = [node]
+        for _ in range(1, options.get("collapse") or 1):
+            loops.append(loops[-1].loop_body[0])
+        innermost = loops[-1]
+        if innermost.loop_body.walk(Loop):
+            raise TransformationError(
+                "Error in {0} transformation. The loop to vectorise must not "
+                "contain another loop.".format(self.name))
+
+        for loop in loops:
+            if not (isinstance(loop.step_expr, nodes.Literal) and
+                    loop.step_expr.value == "1"):
+                raise TransformationError(
+                    "Error in {0} transformation. The loop over '{1}' must "
+                    "have a unit step.".format(self.name, loop.variable.name))
+
+        variable = innermost.variable.name.lower()
+        for array in innermost.loop_body.walk(nodes.ArrayReference):
+            for position, index in enumerate(array.children):
+                if not any(ref.name.lower() == variable
+                           for ref in index.walk(nodes.Reference)):
+                    continue
+                if position != 0 or \
+                        not self._is_unit_stride(index, variable):
+                    raise TransformationError(
+                        "Error in {0} transformation. Array '{1}' is not "
+                        "accessed with unit stride in the loop variable "
+                        "'{2}'.".format(self.name, array.name, variable))
+
+        if options.get("force", False):
+            return
+        for loop in loops:
+            dep_tools = DependencyTools([loop.loop_type])
+            if not dep_tools.can_loop_be_parallelised(
+                    loop, only_nested_loops=False):
+                raise TransformationError(
+                    "Error in {0} transformation. The loop over '{1}' cannot "
+                    "be vectorised: {2}".format(
+                        self.name, loop.variable.name,
+                        " ".join(dep_tools.get_all_messages())))
+
+    def apply(self, node, options=None):
+        '''
+        Encloses the supplied loop with an OpenMP SIMD directive.
+
+        :param node: the loop to vectorise.
+        :type node: :py:class:`psyclone.psyir.nodes.Loop`
+        :param options: a dictionary with options for transformations.
+        :type options: dict of str:values or None
+        :param int options["collapse"]: the number of tightly-nested \
+            loops to vectorise together or None.
+        :param int options["simdlen"]: the preferred number of iterations \
+            to execute concurrently or None.
+        :param options["aligned"]: the names of the arrays accessed in \
+            the loop that are asserted to be aligned (in an 'aligned' \
+            clause) or None. A wrong assertion results in undefined \
+            behaviour.
+        :type options["aligned"]: list of str
+        :param int options["alignment"]: the alignment (in bytes) of the \
+            arrays in "aligned" or None to use the default alignment of \
+            the implementation.
+        :param bool options["force"]: if True, the dependence analysis is \
+            skipped (default False).
+
+        :returns: (:py:class:`psyclone.psyir.nodes.Schedule`, \
+                   :py:class:`psyclone.undoredo.Memento`)
+
+        '''
+        if not options:
+            options = {}
+        self._simdlen = options.get("simdlen")
+        self._aligned = options.get("aligned")
+        self._alignment = options.get("alignment")
+        return super(OMPSimdTrans, self).apply(node, options)
+
+
+class OMPTaskloopTrans(ParallelLoopTrans):
+    '''
+    Divides the iterations of a loop into OpenMP tasks by enclosing it
+    within an OpenMP SINGLE region and adding an OpenMP TASKLOOP
+    directive to it. The SINGLE region must itself be inside some OpenMP
+    PARALLEL region (see :py:class:`OMPParallelTrans`). This condition is
+    tested at code-generation time. For example:
+
+    >>> from psyclone.transformations import OMPParallelTrans, \
+    ...     OMPTaskloopTrans
+    >>> schedule = psy.invokes.get('invoke_0').schedule
+    >>> OMPTaskloopTrans().apply(schedule[0], {"grainsize": 32})
+    >>> OMPParallelTrans().apply(schedule[0])
+
+    '''
+    def __init__(self):
+        self._grainsize = None
+        self._num_tasks = None
+        super(OMPTaskloopTrans, self).__init__()
+
+    def __str__(self):
+        return "Adds an 'OpenMP TASKLOOP' directive to a loop"
+
+    def _directive(self, children, collapse=None):
+        '''
+        Creates the type of directive needed for this sub-class of
+        transformation.
+
+        :param children: list of Nodes that will be the children of \
+                         the created directive.
+        :type children: list of :py:class:`psyclone.psyir.nodes.Node`
+        :param int collapse: currently un-used but required to keep \
+                             interface the same as in base class.
+
+        :returns: the new OpenMP single region containing the taskloop.
+        :rtype: :py:class:`psyclone.psyGen.OMPSingleDirective`
+
+        '''
+        taskloop = OMPTaskloopDirective(children=children,
+                                        grainsize=self._grainsize,
+                                        num_tasks=self._num_tasks)
+        return OMPSingleDirective(children=[taskloop])
+
+    def validate(self, node, options=None):
+        '''
+        Perform validation checks before applying the transformation.
+
+        :param node: the loop to which the transformation is applied.
+        :type node: :py:class:`psyclone.psyir.nodes.Loop`
+        :param options: a dictionary with options for transformations.
+        :type options: dictionary of string:values or None
+        :param int options["grainsize"]: the minimum number of loop \
+            iterations per task.
+        :param int options["num_tasks"]: the number of tasks to create.
+
+        :raises TransformationError: if the 'collapse' option is supplied.
+        :raises TransformationError: if the 'grainsize' or 'num_tasks' \
+            option is not a positive integer or both are supplied.
+        :raises TransformationError: if the loop contains a reduction.
+        :raises TransformationError: if the loop is not coloured but has \
+            a kernel argument with INC access.
+
+        '''
+        super(OMPTaskloopTrans, self).validate(node, options=options)
+        if not options:
+            options = {}
+
+        if options.get("collapse"):
+            raise TransformationError(
+                "Error in {0} transformation. The COLLAPSE clause is not "
+                "supported for '!$omp taskloop' directives.".format(
+                    self.name))
+        for key in ["grainsize", "num_tasks"]:
+            value = options.get(key)
+            if value is not None and (not isinstance(value, int) or
+                                      isinstance(value, bool) or value < 1):
+                raise TransformationError(
+                    "Error in {0} transformation. The '{1}' option must be "
+                    "a positive integer but got '{2}'.".format(
+                        self.name, key, value))
+        if options.get("grainsize") and options.get("num_tasks"):
+            raise TransformationError(
+                "Error in {0} transformation. The 'grainsize' and "
+                "'num_tasks' options cannot both be supplied.".format(
+                    self.name))
+
+        if node.reductions():
+            raise TransformationError(
+                "Error in {0} transformation. The loop contains a kernel "
+                "that performs a reduction which is not supported within an "
+                "OpenMP taskloop.".format(self.name))
+        if node.loop_type != "colour" and node.has_inc_arg():
+            raise TransformationError(
+                "Error in {0} transformation. The kernel has an argument "
+                "with INC access. Colouring is required.".format(self.name))
+
+    def apply(self, node, options=None):
+        '''
+        Apply the OMPTaskloopTrans transformation to the supplied loop.
+        In the generated code this corresponds to:
+
+        .. code-block:: fortran
+
+          !$OMP SINGLE
+          !$OMP TASKLOOP
+          do ...
+             ...
+          end do
+          !$OMP END TASKLOOP
+          !$OMP END SINGLE
+
+        :param node: the loop to which the transformation is applied.
+        :type node: :py:class:`psyclone.psyir.nodes.Loop`
+        :param options: a dictionary with options for transformations.
+        :type options: dictionary of string:values or None
+        :param int options["grainsize"]: the minimum number of loop \
+            iterations per task.
+        :param int options["num_tasks"]: the number of tasks to create.
+
+        :returns: (:py:class:`psyclone.psyir.nodes.Schedule`, \
+                   :py:class:`psyclone.undoredo.Memento`)
+
+        '''
+        if not options:
+            options = {}
+        self._grainsize = options.get("grainsize")
+        self._num_tasks = options.get("num_tasks")
+        return super(OMPTaskloopTrans, self).apply(node, options)
+
+
 class ColourTrans(LoopTrans):
     '''
     Apply a colouring transformation to a loop (in order to permit a
@@ -1332,45 +2085,42 @@ class OMPParallelTrans(ParallelRegionTrans):
         super(OMPParallelTrans, self).validate(node_list, options)
 
 
-class ACCParallelTrans(ParallelRegionTrans):
+class OMPNowaitTrans(Transformation):
     '''
-    Create an OpenACC parallel region by inserting directives. This parallel
-    region *must* come after an enter-data directive (see `ACCEnterDataTrans`)
-    or within a data region (see `ACCDataTrans`). For example:
+    Adds a 'nowait' clause to each OpenMP DO directive within the supplied
+    OpenMP PARALLEL region for which it is safe to do so, thereby removing
+    the implied barrier at the end of the loop. For example:
 
     >>> from psyclone.parse.algorithm import parse
     >>> from psyclone.psyGen import PSyFactory
     >>> api = "gocean1.0"
-    >>> filename = "nemolite2d_alg.f90"
-    >>> ast, invokeInfo = parse(filename, api=api, invoke_name="invoke")
+    >>> ast, invokeInfo = parse("nemolite2d_alg.f90", api=api)
     >>> psy = PSyFactory(api).create(invokeInfo)
-    >>>
-    >>> from psyclone.psyGen import TransInfo
-    >>> t = TransInfo()
-    >>> ptrans = t.get_trans_name('ACCParallelTrans')
-    >>> dtrans = t.get_trans_name('ACCDataTrans')
-    >>>
     >>> schedule = psy.invokes.get('invoke_0').schedule
-    >>> schedule.view()
     >>>
-    >>> # Enclose everything within a single OpenACC PARALLEL region
-    >>> ptrans.apply(schedule.children)
-    >>> # Add an enter-data directive
-    >>> dtrans.apply(schedule)
+    >>> from psyclone.transformations import GOceanOMPLoopTrans, \\
+    ...     OMPParallelTrans, OMPNowaitTrans
+    >>> for child in schedule.children:
+    ...     GOceanOMPLoopTrans().apply(child)
+    >>> OMPParallelTrans().apply(schedule.children)
+    >>> OMPNowaitTrans().apply(schedule.children[0])
     >>> schedule.view()
 
-    '''
-    excluded_node_types = (nodes.CodeBlock, nodes.Return, nodes.PSyDataNode,
-                           psyGen.ACCDataDirective,
-                           psyGen.ACCEnterDataDirective)
-
-    def __init__(self):
-        super(ACCParallelTrans, self).__init__()
-        # Set the type of directive that the base class will use
-        self._pdirective = psyGen.ACCParallelDirective
+    A barrier may only be removed if none of the nodes that follow the
+    loop within the parallel region access any of the data that the loop
+    writes, or write any of the data that the loop reads. This is
+    determined using the argument dependence information (for APIs with
+    kernel metadata) and the variable accesses reported by
+    :py:class:`psyclone.core.VariablesAccessInfo`. The barrier at the end
+    of the parallel region itself is never removed so the last loop in
+    the region can always have a 'nowait' clause. Loops that perform
+    reductions keep their barrier as the result of the reduction is only
+    defined after it.
 
+    '''
     def __str__(self):
-        return "Insert an OpenACC Parallel region"
+        return ("Adds a 'nowait' clause to the OpenMP DO directives in a "
+                "parallel region when it is safe to do so")
 
     @property
     def name(self):
@@ -1378,7 +2128,254 @@ class ACCParallelTrans(ParallelRegionTrans):
         :returns: the name of this transformation as a string.
         :rtype: str
         '''
-        return "ACCParallelTrans"
+        return "OMPNowaitTrans"
+
+    def validate(self, node, options=None):
+        '''
+        Checks that the supplied node is an OpenMP PARALLEL region.
+
+        :param node: the OpenMP parallel region to transform.
+        :type node: :py:class:`psyclone.psyGen.OMPParallelDirective`
+        :param options: a dictionary with options for transformations.
+        :type options: dictionary of string:values or None
+
+        :raises TransformationError: if the supplied node is not an \
+            OMPParallelDirective or is an OMPParallelDoDirective.
+
+        '''
+        if not isinstance(node, psyGen.OMPParallelDirective) or \
+           isinstance(node, psyGen.OMPParallelDoDirective):
+            raise TransformationError(
+                "Error in {0} transformation: the supplied node must be an "
+                "OMPParallelDirective but found '{1}'.".format(
+                    self.name, type(node).__name__))
+
+    def nowait_is_safe(self, directive):
+        '''
+        Determines whether the implied barrier at the end of the supplied
+        OpenMP DO directive can be removed.
+
+        :param directive: the OpenMP DO directive to check.
+        :type directive: :py:class:`psyclone.psyGen.OMPDoDirective`
+
+        :returns: whether or not a 'nowait' clause can be added.
+        :rtype: bool
+
+        '''
+        if isinstance(directive, psyGen.OMPParallelDoDirective):
+            return False
+        parallel = directive.ancestor(psyGen.OMPParallelDirective)
+        if not parallel or directive.parent is not parallel.dir_body:
+            # Only loops that are directly within the parallel region
+            # are considered.
+            return False
+        for kern in directive.walk(Kern):
+            if not isinstance(kern, psyGen.InlinedKern) and \
+               kern.is_reduction:
+                return False
+        following = directive.parent.children[directive.position+1:]
+        return not has_data_dependence(directive, following)
+
+    def apply(self, node, options=None):
+        '''
+        Adds a 'nowait' clause to every OpenMP DO directive that is a
+        direct child of the supplied OpenMP PARALLEL region and for which
+        it is safe to do so.
+
+        :param node: the OpenMP parallel region to transform.
+        :type node: :py:class:`psyclone.psyGen.OMPParallelDirective`
+        :param options: a dictionary with options for transformations.
+        :type options: dictionary of string:values or None
+
+        :returns: 2-tuple of new schedule and memento of transform.
+        :rtype: (:py:class:`psyclone.psyir.nodes.Node`, \
+                 :py:class:`psyclone.undoredo.Memento`)
+
+        '''
+        self.validate(node, options=options)
+
+        changed = []
+        for child in node.dir_body.children:
+            if isinstance(child, OMPDoDirective) and not child.nowait and \
+               self.nowait_is_safe(child):
+                child.nowait = True
+                changed.append(child)
+
+        keep = Memento(node, self, changed)
+        return node, keep
+
+
+class OMPTaskTrans(RegionTrans):
+    '''
+    Executes each of the supplied nodes (kernel loops, halo exchanges and
+    global sums) of an InvokeSchedule as a separate OpenMP task. The tasks
+    are created by a single thread of a new OpenMP PARALLEL region and
+    have 'depend' clauses derived from the accesses to the arguments of
+    the enclosed nodes (see
+    :py:meth:`psyclone.psyGen.OMPTaskDirective.get_dependences`). As a
+    result, the OpenMP runtime can run independent kernels and halo
+    exchanges concurrently instead of one after another. For example:
+
+    >>> from psyclone.transformations import OMPTaskTrans
+    >>> schedule = psy.invokes.get('invoke_0').schedule
+    >>> OMPTaskTrans().apply(schedule.children)
+    >>> schedule.view()
+
+    Note that executing halo exchanges or global sums within tasks
+    requires an MPI library with full thread support
+    (MPI_THREAD_MULTIPLE).
+
+    '''
+    # The types of node that this transformation cannot enclose
+    excluded_node_types = (nodes.CodeBlock, nodes.Return,
+                           psyGen.ACCDirective, psyGen.OMPDirective)
+
+    def __str__(self):
+        return ("Execute each of the supplied nodes as an OpenMP task with "
+                "dependences on the kernel arguments")
+
+    @property
+    def name(self):
+        '''
+        :returns: the name of this transformation as a string.
+        :rtype: str
+        '''
+        return "OMPTaskTrans"
+
+    def validate(self, node_list, options=None):
+        '''
+        Check that the supplied nodes can be executed as OpenMP tasks.
+
+        :param node_list: the nodes to execute as tasks.
+        :type node_list: list of :py:class:`psyclone.psyir.nodes.Node`
+        :param options: a dictionary with options for transformations.
+        :type options: dictionary of string:values or None
+
+        :raises TransformationError: if the nodes are not within the \
+            InvokeSchedule of a PSy layer using kernel arguments.
+        :raises TransformationError: if the nodes are already within an \
+            OpenMP region.
+        :raises TransformationError: if one of the nodes is not a loop, a \
+            halo exchange or a global sum.
+
+        '''
+        node_list = self.get_node_list(node_list)
+        super(OMPTaskTrans, self).validate(node_list, options)
+
+        invoke_schedule = node_list[0].ancestor(InvokeSchedule)
+        if (not invoke_schedule or
+                isinstance(invoke_schedule, NemoInvokeSchedule)):
+            raise TransformationError(
+                "Error in {0} transformation: the dependences between tasks "
+                "are derived from kernel arguments so the nodes must be "
+                "within the InvokeSchedule of an API with kernel "
+                "metadata.".format(self.name))
+
+        if node_list[0].ancestor(psyGen.OMPDirective):
+            raise TransformationError(
+                "Error in {0} transformation: cannot create OpenMP tasks "
+                "within another OpenMP region.".format(self.name))
+
+        for node in node_list:
+            if not isinstance(node, (Loop, psyGen.HaloExchange,
+                                     psyGen.GlobalSum)):
+                raise TransformationError(
+                    "Error in {0} transformation: only loops, halo exchanges "
+                    "and global sums can be executed as tasks but found "
+                    "'{1}'.".format(self.name, type(node).__name__))
+
+    def apply(self, node_list, options=None):
+        '''
+        Enclose each of the supplied nodes within an OpenMP task and all
+        of the tasks within an OpenMP single region inside a new OpenMP
+        parallel region:
+
+        .. code-block:: fortran
+
+          !$OMP PARALLEL ...
+          !$OMP SINGLE
+          !$OMP TASK DEPEND(IN: a), DEPEND(OUT: b)
+          do ...
+          end do
+          !$OMP END TASK
+          ...
+          !$OMP END SINGLE
+          !$OMP END PARALLEL
+
+        :param node_list: a single Node or a list of Nodes.
+        :type node_list: (list of) :py:class:`psyclone.psyir.nodes.Node`
+        :param options: a dictionary with options for transformations.
+        :type options: dictionary of string:values or None
+
+        :returns: 2-tuple of new schedule and memento of transform.
+        :rtype: (:py:class:`psyclone.psyGen.InvokeSchedule`, \
+                 :py:class:`psyclone.undoredo.Memento`)
+
+        '''
+        node_list = self.get_node_list(node_list)
+        self.validate(node_list, options)
+
+        node_parent = node_list[0].parent
+        node_position = node_list[0].position
+        schedule = node_list[0].root
+        keep = Memento(schedule, self)
+
+        tasks = [psyGen.OMPTaskDirective(children=[node.detach()])
+                 for node in node_list]
+        single = OMPSingleDirective(children=tasks)
+        directive = psyGen.OMPParallelDirective(children=[single])
+        node_parent.addchild(directive, index=node_position)
+
+        return schedule, keep
+
+
+class ACCParallelTrans(ParallelRegionTrans):
+    '''
+    Create an OpenACC parallel region by inserting directives. This parallel
+    region *must* come after an enter-data directive (see `ACCEnterDataTrans`)
+    or within a data region (see `ACCDataTrans`). For example:
+
+    >>> from psyclone.parse.algorithm import parse
+    >>> from psyclone.psyGen import PSyFactory
+    >>> api = "gocean1.0"
+    >>> filename = "nemolite2d_alg.f90"
+    >>> ast, invokeInfo = parse(filename, api=api, invoke_name="invoke")
+    >>> psy = PSyFactory(api).create(invokeInfo)
+    >>>
+    >>> from psyclone.psyGen import TransInfo
+    >>> t = TransInfo()
+    >>> ptrans = t.get_trans_name('ACCParallelTrans')
+    >>> dtrans = t.get_trans_name('ACCDataTrans')
+    >>>
+    >>> schedule = psy.invokes.get('invoke_0').schedule
+    >>> schedule.view()
+    >>>
+    >>> # Enclose everything within a single OpenACC PARALLEL region
+    >>> ptrans.apply(schedule.children)
+    >>> # Add an enter-data directive
+    >>> dtrans.apply(schedule)
+    >>> schedule.view()
+
+    '''
+    excluded_node_types = (nodes.CodeBlock, nodes.Return, nodes.PSyDataNode,
+                           psyGen.ACCDataDirective,
+                           psyGen.ACCEnterDataDirective)
+
+    def __init__(self):
+        super(ACCParallelTrans, self).__init__()
+        # Set the type of directive that the base class will use
+        self._pdirective = psyGen.ACCParallelDirective
+
+    def __str__(self):
+        return "Insert an OpenACC Parallel region"
+
+    @property
+    def name(self):
+        '''
+        :returns: the name of this transformation as a string.
+        :rtype: str
+        '''
+        return "ACCParallelTrans"
 
 
 class GOConstLoopBoundsTrans(Transformation):
@@ -1820,6 +2817,247 @@ class Dynamo0p3RedundantComputationTrans(LoopTrans):
         return schedule, keep
 
 
+class Dynamo0p3AutoRedundantComputationTrans(Transformation):
+    '''Automatically selects the loops in an LFRic (Dynamo0.3)
+    InvokeSchedule that should perform redundant computation (and the
+    halo depth to which they should do so) in order to minimise an
+    estimated cost. The cost of a schedule is the sum of the cost of its
+    halo exchanges (a fixed per-message cost plus a cost per halo level
+    exchanged) and the extra computation performed by loops that
+    iterate into the halo (a cost per halo level per kernel in the
+    loop). For example:
+
+    >>> from psyclone.parse.algorithm import parse
+    >>> from psyclone.psyGen import PSyFactory
+    >>> api = "dynamo0.3"
+    >>> ast, invokeInfo = parse("file.f90", api=api)
+    >>> psy = PSyFactory(api).create(invokeInfo)
+    >>> schedule = psy.invokes.get('invoke_0').schedule
+    >>>
+    >>> from psyclone.transformations import \\
+    ...     Dynamo0p3AutoRedundantComputationTrans
+    >>> trans = Dynamo0p3AutoRedundantComputationTrans()
+    >>> trans.apply(schedule, {"max_depth": 2})
+    >>> schedule.view()
+
+    The selection is greedy: at each step every candidate (the loop
+    that last wrote a field before one of its halo exchanges, extended
+    to the depth that the halo exchange would provide) is trialled
+    using :py:class:`Dynamo0p3RedundantComputationTrans`, the schedule
+    is restored and the candidate giving the lowest cost is then
+    applied. This is repeated until no candidate reduces the cost.
+    Only loops that are direct children of the InvokeSchedule are
+    considered and redundant computation to the maximum halo depth is
+    never chosen.
+
+    '''
+    def __str__(self):
+        return ("Automatically select loops and depths for redundant "
+                "computation to minimise halo-exchange cost")
+
+    @property
+    def name(self):
+        '''
+        :returns: the name of this transformation as a string.
+        :rtype: str
+        '''
+        return "Dynamo0p3AutoRedundantComputationTrans"
+
+    def validate(self, node, options=None):
+        '''Perform checks to ensure that it is valid to apply this
+        transformation to the supplied node.
+
+        :param node: the schedule to transform.
+        :type node: :py:class:`psyclone.dynamo0p3.DynInvokeSchedule`
+        :param options: a dictionary with options for transformations.
+        :type options: dictionary of string:values or None
+
+        :raises TransformationError: if the supplied node is not a \
+            DynInvokeSchedule.
+        :raises TransformationError: if distributed memory is not \
+            switched on.
+        :raises TransformationError: if the schedule contains directives.
+        :raises TransformationError: if an option is not a number or \
+            the "max_depth" option is not a positive integer.
+
+        '''
+        if not isinstance(node, DynInvokeSchedule):
+            raise TransformationError(
+                "In the Dynamo0p3AutoRedundantComputation transformation "
+                "the supplied node must be a DynInvokeSchedule but found "
+                "'{0}'.".format(type(node).__name__))
+        if not Config.get().distributed_memory:
+            raise TransformationError(
+                "In the Dynamo0p3AutoRedundantComputation transformation "
+                "distributed memory must be switched on")
+        if node.walk(psyGen.Directive):
+            raise TransformationError(
+                "In the Dynamo0p3AutoRedundantComputation transformation "
+                "the supplied schedule already contains directives. "
+                "Redundant computation must be applied before directives "
+                "are added.")
+        if not options:
+            options = {}
+        max_depth = options.get("max_depth")
+        if max_depth is not None and (not isinstance(max_depth, int) or
+                                      max_depth < 1):
+            raise TransformationError(
+                "In the Dynamo0p3AutoRedundantComputation transformation "
+                "the 'max_depth' option must be a positive integer but "
+                "found '{0}'.".format(max_depth))
+        for key in ["halo_exchange_cost", "halo_depth_cost",
+                    "compute_cost"]:
+            value = options.get(key)
+            if value is not None and (not isinstance(value, (int, float))
+                                      or value < 0):
+                raise TransformationError(
+                    "In the Dynamo0p3AutoRedundantComputation transformation "
+                    "the '{0}' option must be a non-negative number but "
+                    "found '{1}'.".format(key, value))
+
+    @staticmethod
+    def _cost(schedule, costs):
+        '''
+        Estimate the cost of the supplied schedule.
+
+        :param schedule: the schedule to estimate the cost of.
+        :type schedule: :py:class:`psyclone.dynamo0p3.DynInvokeSchedule`
+        :param costs: the per-message cost of a halo exchange, the cost \
+            per halo level exchanged and the cost of computing one halo \
+            level for one kernel.
+        :type costs: 3-tuple of float
+
+        :returns: the estimated cost of the schedule.
+        :rtype: float
+
+        '''
+        from psyclone.dynamo0p3 import DynHaloExchange, DynLoop
+        message_cost, depth_cost, compute_cost = costs
+        const = LFRicConstants()
+        total = 0.0
+        for hex_node in schedule.walk(DynHaloExchange):
+            # pylint: disable=protected-access
+            depths = [info.literal_depth for info in
+                      hex_node._compute_halo_read_depth_info()]
+            total += message_cost + depth_cost * max(depths + [1])
+        for loop in schedule.children:
+            if isinstance(loop, DynLoop) and \
+               loop.upper_bound_name in const.HALO_ACCESS_LOOP_BOUNDS and \
+               loop.upper_bound_halo_depth:
+                total += (compute_cost * loop.upper_bound_halo_depth *
+                          len(loop.kernels()))
+        return total
+
+    @staticmethod
+    def _candidates(schedule, max_depth):
+        '''
+        Construct the list of (loop, depth) pairs that might remove a halo
+        exchange in the supplied schedule if redundant computation were
+        applied to them.
+
+        :param schedule: the schedule to examine.
+        :type schedule: :py:class:`psyclone.dynamo0p3.DynInvokeSchedule`
+        :param max_depth: the maximum halo depth to consider or None.
+        :type max_depth: int or NoneType
+
+        :returns: candidate loops and depths.
+        :rtype: list of (:py:class:`psyclone.dynamo0p3.DynLoop`, int)
+
+        '''
+        from psyclone.dynamo0p3 import DynHaloExchange, DynLoop
+        candidates = []
+        for hex_node in schedule.walk(DynHaloExchange):
+            writers = hex_node.field.backward_write_dependencies()
+            if not writers or isinstance(writers[0].call, DynHaloExchange):
+                continue
+            loop = writers[0].call.ancestor(DynLoop)
+            if loop is None or loop.parent is not schedule:
+                continue
+            # pylint: disable=protected-access
+            infos = hex_node._compute_halo_read_depth_info()
+            if any(info.max_depth or info.max_depth_m1 or info.var_depth
+                   for info in infos):
+                # The required depth is not known at compile time.
+                continue
+            depth = max([info.literal_depth for info in infos] + [1])
+            # A continuous field written in a loop over cells leaves its
+            # outermost halo level dirty so also try one level deeper.
+            for trial in [depth, depth + 1]:
+                if max_depth is not None and trial > max_depth:
+                    continue
+                if (loop, trial) not in candidates:
+                    candidates.append((loop, trial))
+        return candidates
+
+    def apply(self, node, options=None):
+        '''Apply redundant computation to the loops of the supplied
+        schedule that minimise its estimated cost. The halo exchanges
+        are updated accordingly.
+
+        :param node: the schedule to transform.
+        :type node: :py:class:`psyclone.dynamo0p3.DynInvokeSchedule`
+        :param options: a dictionary with options for transformations.
+        :type options: dictionary of string:values or None
+        :param int options["max_depth"]: the maximum halo depth to which \
+            redundant computation may be performed. Defaults to None \
+            (no limit).
+        :param float options["halo_exchange_cost"]: the estimated cost \
+            of one halo-exchange message. Defaults to 1.0.
+        :param float options["halo_depth_cost"]: the estimated cost of \
+            exchanging one level of halo. Defaults to 0.1.
+        :param float options["compute_cost"]: the estimated cost of \
+            computing one level of halo for one kernel. Defaults to 0.2.
+
+        :returns: 2-tuple of new schedule and memento of transform.
+        :rtype: (:py:class:`psyclone.dynamo0p3.DynInvokeSchedule`, \
+                 :py:class:`psyclone.undoredo.Memento`)
+
+        '''
+        self.validate(node, options=options)
+        if not options:
+            options = {}
+        max_depth = options.get("max_depth")
+        costs = (options.get("halo_exchange_cost", 1.0),
+                 options.get("halo_depth_cost", 0.1),
+                 options.get("compute_cost", 0.2))
+        rc_trans = Dynamo0p3RedundantComputationTrans()
+
+        chosen = []
+        current_cost = self._cost(node, costs)
+        while True:
+            best = None
+            best_cost = current_cost
+            for loop, depth in self._candidates(node, max_depth):
+                try:
+                    rc_trans.validate(loop, {"depth": depth})
+                except TransformationError:
+                    continue
+                # Trial the candidate and then restore the schedule.
+                saved_children = node.children[:]
+                saved_bound = (loop.upper_bound_name,
+                               loop.upper_bound_halo_depth)
+                rc_trans.apply(loop, {"depth": depth})
+                cost = self._cost(node, costs)
+                loop.set_upper_bound(*saved_bound)
+                node.children = saved_children
+                if cost < best_cost:
+                    best = (loop, depth)
+                    best_cost = cost
+            if not best:
+                break
+            rc_trans.apply(best[0], {"depth": best[1]})
+            chosen.append(best)
+            current_cost = best_cost
+
+        # Make sure the halo exchanges are consistent with the final loop
+        # bounds.
+        for loop, _ in chosen:
+            loop.update_halo_exchanges()
+
+        keep = Memento(node, self, chosen)
+        return node, keep
+
+
 class GOLoopSwapTrans(LoopTrans):
     ''' Provides a loop-swap transformation, e.g.:
 
@@ -1988,6 +3226,13 @@ class OCLTrans(Transformation):
         :type options: dictionary of string:values or None
         :param bool options["opencl"]: whether or not to enable OpenCL \
                                        generation.
+        :param bool options["multi_queue"]: whether or not to spread the \
+            kernels over multiple command queues (so that independent \
+            kernels may execute concurrently) ordered by OpenCL events \
+            derived from their data dependences.
+        :param str options["tuning_file"]: the name of a file (as created \
+            by the tuning driver of GOceanExtractTrans) that gives the \
+            OpenCL local size to use for each kernel.
 
         :returns: 2-tuple of new schedule and memento of transform.
         :rtype: (:py:class:`psyclone.dynamo0p3.DynInvokeSchedule`, \
@@ -2006,6 +3251,10 @@ class OCLTrans(Transformation):
         # flag is True PSyclone produces OpenCL at code-generation time.
         sched.opencl = opencl
 
+        # The tuning file is not an option of the InvokeSchedule
+        options = dict(options)
+        tuning_file = options.pop("tuning_file", None)
+
         try:
             # Store the provided OpenCL options in the InvokeSchedule.
             sched.set_opencl_options(options)
@@ -2014,8 +3263,86 @@ class OCLTrans(Transformation):
         except (TypeError, AttributeError) as error:
             raise TransformationError(str(error))
 
+        if opencl and sched.get_opencl_option("multi_queue"):
+            self._assign_queues(sched)
+
+        if opencl and tuning_file:
+            local_sizes = self._read_tuning_file(tuning_file)
+            for kern in sched.coded_kernels():
+                if local_sizes.get(kern.name.lower()):
+                    kern.set_opencl_options(
+                        {"local_size": local_sizes[kern.name.lower()]})
+
         return sched, keep
 
+    @staticmethod
+    def _read_tuning_file(filename):
+        '''
+        Reads an OpenCL tuning file. Each line of the file contains the name
+        of a kernel followed by its local size, where a local size of zero
+        means that no tuned value is available. If a kernel appears more
+        than once the last value is used.
+
+        :param str filename: the name of the tuning file.
+
+        :returns: the local size of each kernel in the file.
+        :rtype: dict of str: int
+
+        :raises TransformationError: if the file cannot be read.
+        :raises TransformationError: if a line of the file is not a kernel \
+            name followed by a non-negative integer.
+        '''
+        try:
+            with open(filename, "r") as tuning:
+                lines = tuning.readlines()
+        except IOError as err:
+            six.raise_from(TransformationError(
+                "Cannot read the OpenCL tuning file '{0}': {1}"
+                "".format(filename, str(err))), err)
+
+        local_sizes = {}
+        for line in lines:
+            fields = line.split()
+            if not fields:
+                continue
+            if len(fields) != 2 or not fields[1].isdigit():
+                raise TransformationError(
+                    "Invalid line '{0}' in the OpenCL tuning file '{1}'. Each "
+                    "line must contain a kernel name followed by its local "
+                    "size.".format(line.strip(), filename))
+            local_sizes[fields[0].lower()] = int(fields[1])
+        return local_sizes
+
+    @staticmethod
+    def _assign_queues(sched):
+        '''
+        Assigns a command queue to each kernel in the supplied schedule.
+        A kernel is placed on the queue of the latest kernel it depends
+        upon that is still the last kernel on its queue (so that the
+        in-order queue provides the required ordering without any event).
+        Otherwise (e.g. a kernel without dependences) it is placed on a
+        new queue so that it may execute concurrently with the kernels on
+        the existing queues.
+
+        :param sched: the InvokeSchedule whose kernels are to be assigned \
+            to command queues.
+        :type sched: :py:class:`psyclone.psyGen.InvokeSchedule`
+
+        '''
+        queue_of = {}
+        last_on_queue = {}
+        for kern, preceding in sched.kernel_dependencies().items():
+            queue = None
+            for pre in reversed(preceding):
+                if last_on_queue[queue_of[pre]] is pre:
+                    queue = queue_of[pre]
+                    break
+            if queue is None:
+                queue = len(last_on_queue) + 1
+            kern.set_opencl_options({"queue_number": queue})
+            queue_of[kern] = queue
+            last_on_queue[queue] = kern
+
     def validate(self, sched, options=None):
         '''
         Checks that the supplied InvokeSchedule is valid and that an OpenCL
@@ -2028,6 +3355,11 @@ class OCLTrans(Transformation):
 
         :raises TransformationError: if the InvokeSchedule is not for the \
                                      GOcean1.0 API.
+        :raises TransformationError: if the kernels are to be spread over \
+            multiple command queues and the queues are out-of-order or \
+            the InvokeSchedule contains halo exchanges.
+        :raises TransformationError: if the OpenCL tuning file cannot be \
+            read or is invalid.
         :raises NotImplementedError: if any of the kernels have arguments \
                                      passed by value.
         '''
@@ -2045,6 +3377,25 @@ class OCLTrans(Transformation):
                 "Error in OCLTrans: the supplied node must be a (sub-class "
                 "of) InvokeSchedule but got {0}".format(type(sched)))
 
+        if options and options.get("multi_queue"):
+            # The ordering of the kernels relies upon in-order queues and
+            # upon the host not accessing the data during the invoke.
+            if options.get("out_of_order",
+                           sched.get_opencl_option("out_of_order")):
+                raise TransformationError(
+                    "The 'multi_queue' OpenCL option relies upon in-order "
+                    "command queues and cannot be combined with the "
+                    "'out_of_order' option.")
+            if sched.walk(psyGen.HaloExchange):
+                raise TransformationError(
+                    "The 'multi_queue' OpenCL option is not supported for "
+                    "invokes containing halo exchanges but invoke '{0}' "
+                    "has {1}.".format(sched.name,
+                                      len(sched.walk(psyGen.HaloExchange))))
+
+        if options and options.get("tuning_file"):
+            self._read_tuning_file(options["tuning_file"])
+
         # Now we need to check the arguments of all the kernels
         args = args_filter(sched.args, arg_types=["scalar"], is_literal=True)
         for arg in args:
@@ -2326,6 +3677,7 @@ class Dynamo0p3KernelConstTrans(Transformation):
                                       constant_value=value)
             symbol_table.add(local_symbol)
             symbol_table.swap_symbol_properties(symbol, local_symbol)
+            constants.append((arg_position, value))
 
             if function_space:
                 print("    Modified {0}, arg position {1}, function space "
@@ -2345,6 +3697,8 @@ class Dynamo0p3KernelConstTrans(Transformation):
         element_order = options.get("element_order", None)
         schedule = node.root
         kernel = node
+        # The (argument position, value) pairs of the arguments made constant
+        constants = []
 
         # create a memento of the schedule and the proposed transformation
         keep = Memento(schedule, self, [kernel])
@@ -2408,8 +3762,18 @@ class Dynamo0p3KernelConstTrans(Transformation):
                     make_constant(symbol_table, info.position, ndofs,
                                   function_space=info.function_space)
 
+        # Record how the kernel has been specialised so that call sites
+        # specialised in the same way can share one generated module. This
+        # is only possible if the kernel has not been otherwise transformed.
+        if kernel.modified and kernel.specialisation is None:
+            key = None
+        else:
+            key = kernel.specialisation or (self.name, kernel.module_name,
+                                            kernel.name)
+            key += tuple(constants)
         # Flag that the kernel has been modified
         kernel.modified = True
+        kernel.specialisation = key
 
         return schedule, keep
 
@@ -2978,6 +4342,639 @@ class ACCDataTrans(RegionTrans):
                 "already contains an 'enter data' directive.")
 
 
+class ACCAsyncTrans(Transformation):
+    '''
+    Assigns the OpenACC kernels and parallel regions that are children of
+    the supplied Schedule to asynchronous queues so that independent
+    regions are no longer serialised on the default queue. For example:
+
+    >>> from psyclone.psyGen import PSyFactory
+    >>> psy = PSyFactory("nemo").create(parse_tree)
+    >>> schedule = psy.invokes.invoke_list[0].schedule
+    >>>
+    >>> from psyclone.transformations import ACCKernelsTrans, ACCAsyncTrans
+    >>> for child in schedule.children:
+    ...     ACCKernelsTrans().apply(child)
+    >>> ACCAsyncTrans().apply(schedule, {"num_queues": 2})
+    >>> schedule.view()
+
+    A region that depends on earlier regions (it reads or writes data that
+    one of them writes, or writes data that one of them reads) is placed
+    on the queue of the last of those regions and waits for the queues of
+    any others (via a 'wait' clause). Regions without such a dependence
+    are distributed over the queues in turn. An
+    :py:class:`psyclone.psyGen.ACCWaitDirective` is inserted before any
+    other node that depends on a region that is still executing (or whose
+    accesses are not known, e.g. a CodeBlock) and at the end of the
+    Schedule.
+
+    '''
+    # Nodes for which the variable accesses are not known and before which
+    # all queues must therefore have completed.
+    _unknown_access_types = (CodeBlock, nodes.Call, nodes.Return,
+                             nodes.PSyDataNode, psyGen.Directive,
+                             psyGen.HaloExchange, psyGen.GlobalSum)
+
+    def __str__(self):
+        return ("Assigns independent OpenACC kernels and parallel regions "
+                "to different asynchronous queues")
+
+    @property
+    def name(self):
+        '''
+        :returns: the name of this transformation.
+        :rtype: str
+        '''
+        return "ACCAsyncTrans"
+
+    def validate(self, node, options=None):
+        '''
+        Checks that the supplied node is a Schedule and that the options
+        are valid.
+
+        :param node: the Schedule containing the OpenACC regions.
+        :type node: :py:class:`psyclone.psyir.nodes.Schedule`
+        :param options: a dictionary with options for transformations.
+        :type options: dictionary of string:values or None
+
+        :raises TransformationError: if the supplied node is not a Schedule.
+        :raises TransformationError: if the "num_queues" or "first_queue" \
+            options are not (positive and non-negative, respectively) \
+            integers.
+
+        '''
+        if not isinstance(node, Schedule):
+            raise TransformationError(
+                "Error in {0}: the supplied node must be a Schedule but "
+                "found '{1}'.".format(self.name, type(node).__name__))
+        if not options:
+            options = {}
+        num_queues = options.get("num_queues", 4)
+        if not isinstance(num_queues, int) or \
+           isinstance(num_queues, bool) or num_queues < 1:
+            raise TransformationError(
+                "Error in {0}: the 'num_queues' option must be a positive "
+                "integer but got '{1}'.".format(self.name, num_queues))
+        first_queue = options.get("first_queue", 1)
+        if not isinstance(first_queue, int) or \
+           isinstance(first_queue, bool) or first_queue < 0:
+            raise TransformationError(
+                "Error in {0}: the 'first_queue' option must be a "
+                "non-negative integer but got '{1}'.".format(self.name,
+                                                             first_queue))
+
+    def apply(self, node, options=None):
+        '''
+        Assigns the OpenACC kernels and parallel regions that are children
+        of the supplied Schedule to asynchronous queues and adds the
+        required waits.
+
+        :param node: the Schedule containing the OpenACC regions.
+        :type node: :py:class:`psyclone.psyir.nodes.Schedule`
+        :param options: a dictionary with options for transformations.
+        :type options: dictionary of string:values or None
+        :param int options["num_queues"]: the number of asynchronous \
+            queues to use. Defaults to 4.
+        :param int options["first_queue"]: the number of the first queue \
+            to use. Defaults to 1.
+
+        :returns: 2-tuple of new schedule and memento of transform.
+        :rtype: (:py:class:`psyclone.psyir.nodes.Schedule`, \
+                 :py:class:`psyclone.undoredo.Memento`)
+
+        '''
+        self.validate(node, options)
+        if not options:
+            options = {}
+        num_queues = options.get("num_queues", 4)
+        first_queue = options.get("first_queue", 1)
+        keep = Memento(node, self)
+
+        # The regions that have been launched but not yet waited for, as
+        # a list of (region, queue) tuples.
+        pending = []
+        next_queue = 0
+        for child in node.children[:]:
+            if isinstance(child, (psyGen.ACCKernelsDirective,
+                                  psyGen.ACCParallelDirective)):
+                depends = [(region, queue) for region, queue in pending
+                           if has_data_dependence(region, [child])]
+                if depends:
+                    queue = depends[-1][1]
+                    waits = sorted(set(dep_queue for _, dep_queue in depends)
+                                   - set([queue]))
+                else:
+                    queue = first_queue + next_queue % num_queues
+                    next_queue += 1
+                    waits = []
+                child.async_queue = queue
+                child.wait_queues = waits if waits else None
+                pending.append((child, queue))
+                continue
+
+            if not pending:
+                continue
+            if child.walk(self._unknown_access_types):
+                queues = set(queue for _, queue in pending)
+            else:
+                queues = set(queue for region, queue in pending
+                             if has_data_dependence(region, [child]))
+            if queues:
+                node.addchild(psyGen.ACCWaitDirective(sorted(queues)),
+                              index=child.position)
+                pending = [(region, queue) for region, queue in pending
+                           if queue not in queues]
+
+        if pending:
+            node.addchild(psyGen.ACCWaitDirective(
+                sorted(set(queue for _, queue in pending))))
+        return node, keep
+
+
+class ACCDataMergeTrans(Transformation):
+    '''
+    Merges adjacent OpenACC data regions that are children of the supplied
+    Schedule when they access some of the same arrays, so that the data
+    is only moved between the host and the accelerator once. For example:
+
+    >>> from psyclone.transformations import ACCDataTrans, \\
+    ...     ACCDataMergeTrans
+    >>> for child in schedule.children:
+    ...     ACCDataTrans().apply(child)
+    >>> ACCDataMergeTrans().apply(schedule)
+    >>> schedule.view()
+
+    The clauses of the merged region are derived from the accesses of all
+    of the nodes that it contains. Regions with different 'async' or
+    'wait' clauses, or with explicitly-specified data clauses, are not
+    merged.
+
+    '''
+    def __str__(self):
+        return ("Merges adjacent OpenACC data regions that access the same "
+                "arrays")
+
+    @property
+    def name(self):
+        '''
+        :returns: the name of this transformation.
+        :rtype: str
+        '''
+        return "ACCDataMergeTrans"
+
+    def validate(self, node, options=None):
+        '''
+        Checks that the supplied node is a Schedule.
+
+        :param node: the Schedule containing the OpenACC data regions.
+        :type node: :py:class:`psyclone.psyir.nodes.Schedule`
+        :param options: a dictionary with options for transformations.
+        :type options: dictionary of string:values or None
+
+        :raises TransformationError: if the supplied node is not a Schedule.
+
+        '''
+        if not isinstance(node, Schedule):
+            raise TransformationError(
+                "Error in {0}: the supplied node must be a Schedule but "
+                "found '{1}'.".format(self.name, type(node).__name__))
+
+    def apply(self, node, options=None):
+        '''
+        Merges each pair of adjacent OpenACC data regions within the
+        supplied Schedule that access at least one array in common.
+
+        :param node: the Schedule containing the OpenACC data regions.
+        :type node: :py:class:`psyclone.psyir.nodes.Schedule`
+        :param options: a dictionary with options for transformations.
+        :type options: dictionary of string:values or None
+
+        :returns: 2-tuple of new schedule and memento of transform.
+        :rtype: (:py:class:`psyclone.psyir.nodes.Schedule`, \
+                 :py:class:`psyclone.undoredo.Memento`)
+
+        '''
+        self.validate(node, options)
+        keep = Memento(node, self)
+
+        index = 0
+        while index < len(node.children) - 1:
+            first = node.children[index]
+            second = node.children[index + 1]
+            if isinstance(first, psyGen.ACCDataDirective) and \
+               isinstance(second, psyGen.ACCDataDirective) and \
+               first.async_queue == second.async_queue and \
+               first.wait_queues == second.wait_queues and \
+               first.clauses is None and second.clauses is None and \
+               accessed_arrays(first).intersection(accessed_arrays(second)):
+                for child in second.dir_body.pop_all_children():
+                    first.dir_body.addchild(child)
+                second.detach()
+                # The merged region may now overlap with the one before it
+                index = max(index - 1, 0)
+            else:
+                index += 1
+        return node, keep
+
+
+class ACCRoutineDataTrans(Transformation):
+    '''
+    Encloses the body of a routine that contains OpenACC kernels or
+    parallel regions within a single OpenACC data region and adds the
+    'update' directives required to keep the host and accelerator copies
+    of the arrays consistent. For example:
+
+    >>> from psyclone.psyGen import PSyFactory
+    >>> psy = PSyFactory("nemo").create(parse_tree)
+    >>> schedule = psy.invokes.invoke_list[0].schedule
+    >>>
+    >>> from psyclone.transformations import ACCKernelsTrans, \\
+    ...     ACCRoutineDataTrans
+    >>> ACCKernelsTrans().apply(schedule[0], {"default_present": True})
+    >>> ACCRoutineDataTrans().apply(schedule)
+    >>> schedule.view()
+
+    The data clauses are determined by following the accesses to each
+    array that is used on the accelerator through the routine. An array
+    whose values on entry are read on the accelerator is copied in, one
+    whose values are last written on the accelerator is copied out and
+    any other array (and any local array) is only created on the
+    accelerator. Arrays named in the "present" option are assumed to be
+    on the accelerator already.
+
+    The code that remains on the host (including CodeBlocks and calls,
+    which are assumed to read and write all of the arrays that they
+    reference unless they are output statements) is preceded by an
+    'update host' directive if the accelerator holds newer values of the
+    arrays that it accesses.
+    An 'update device' directive follows host code that writes to an array
+    that is subsequently read on the accelerator. At the beginning and end
+    of the body of a loop or if block that contains both host and
+    accelerator code, the two copies of the arrays that its host code
+    accesses are made consistent.
+
+    As for :py:class:`psyclone.psyGen.ACCDataDirective`, a region that
+    writes to an array without first reading it is assumed to write all
+    of its elements.
+
+    '''
+    _compute_types = (psyGen.ACCKernelsDirective, psyGen.ACCParallelDirective)
+
+    def __str__(self):
+        return ("Encloses a routine in an OpenACC data region with the "
+                "minimum of data movement")
+
+    @property
+    def name(self):
+        '''
+        :returns: the name of this transformation.
+        :rtype: str
+        '''
+        return "ACCRoutineDataTrans"
+
+    def validate(self, node, options=None):
+        '''
+        Checks that the supplied node is a routine containing OpenACC
+        compute regions to which a data region can be added.
+
+        :param node: the routine to enclose in a data region.
+        :type node: :py:class:`psyclone.psyir.nodes.Routine`
+        :param options: a dictionary with options for transformations.
+        :type options: dictionary of string:values or None
+        :param options["present"]: the names of the arrays that are \\
+            already present on the accelerator.
+        :type options["present"]: list of str
+
+        :raises TransformationError: if the supplied node is not a Routine \\
+            or is an InvokeSchedule of an API other than NEMO.
+        :raises TransformationError: if the routine does not contain any \\
+            OpenACC kernels or parallel regions.
+        :raises TransformationError: if any of these regions is asynchronous.
+        :raises TransformationError: if the routine already contains OpenACC \\
+            data directives.
+        :raises TransformationError: if the routine contains a Return.
+        :raises TransformationError: if the routine allocates or deallocates \\
+            an array that is accessed on the accelerator.
+        :raises TransformationError: if a structure is accessed on the \\
+            accelerator (TODO #1028).
+        :raises TransformationError: if the "present" option is not a list \\
+            of str.
+
+        '''
+        if not isinstance(node, nodes.Routine) or (
+                isinstance(node, InvokeSchedule) and
+                not isinstance(node, NemoInvokeSchedule)):
+            raise TransformationError(
+                "Error in {0}: the supplied node must be a Routine or a NEMO "
+                "InvokeSchedule but found '{1}'.".format(
+                    self.name, type(node).__name__))
+        regions = node.walk(self._compute_types)
+        if not regions:
+            raise TransformationError(
+                "Error in {0}: routine '{1}' does not contain any OpenACC "
+                "kernels or parallel regions.".format(self.name, node.name))
+        if any(region.async_queue is not None for region in regions):
+            raise TransformationError(
+                "Error in {0}: routine '{1}' contains asynchronous OpenACC "
+                "regions.".format(self.name, node.name))
+        if node.walk((psyGen.ACCDataDirective, psyGen.ACCEnterDataDirective,
+                      psyGen.ACCUpdateDirective)):
+            raise TransformationError(
+                "Error in {0}: routine '{1}' already contains OpenACC data "
+                "directives.".format(self.name, node.name))
+        if node.walk(nodes.Return):
+            raise TransformationError(
+                "Error in {0}: routine '{1}' contains a Return statement "
+                "which would exit the data region.".format(
+                    self.name, node.name))
+        arrays = self._device_arrays(node)
+        for block in node.walk(CodeBlock):
+            for stmt in walk(block.get_ast_nodes,
+                             (Fortran2003.Allocate_Stmt,
+                              Fortran2003.Deallocate_Stmt)):
+                names = set(str(name).lower() for name in
+                            walk(stmt, Fortran2003.Name))
+                if names.intersection(arrays):
+                    raise TransformationError(
+                        "Error in {0}: routine '{1}' allocates or "
+                        "deallocates arrays that are accessed on the "
+                        "accelerator: '{2}'.".format(
+                            self.name, node.name, str(stmt)))
+        for region in regions:
+            if region.walk(nodes.StructureReference):
+                # TODO #1028. Dependence analysis does not yet work for
+                # structure references.
+                raise TransformationError(
+                    "Error in {0}: structure (derived-type) references are "
+                    "not yet supported within OpenACC regions.".format(
+                        self.name))
+        present = options.get("present", []) if options else []
+        if not (isinstance(present, list) and
+                all(isinstance(name, six.string_types) for name in present)):
+            raise TransformationError(
+                "Error in {0}: the 'present' option must be a list of str "
+                "but got '{1}'.".format(self.name, present))
+
+    def _device_arrays(self, node):
+        '''
+        :param node: the routine to examine.
+        :type node: :py:class:`psyclone.psyir.nodes.Routine`
+
+        :returns: the (lower-case) names of the arrays that are accessed \\
+                  within the OpenACC compute regions of the routine.
+        :rtype: set of str
+        '''
+        arrays = set()
+        for region in node.walk(self._compute_types):
+            arrays.update(str(signature).lower() for signature in
+                          accessed_arrays(region))
+        return arrays
+
+    @staticmethod
+    def _accesses(node, arrays):
+        '''
+        Determines how the supplied node accesses each of the given arrays.
+        The accesses within CodeBlocks and calls are not known so all of the
+        arrays that they reference are assumed to be both read and written.
+
+        :param node: the PSyIR node to examine.
+        :type node: :py:class:`psyclone.psyir.nodes.Node`
+        :param arrays: the names of the arrays of interest.
+        :type arrays: set of str
+
+        :returns: for each array that is accessed, whether the node uses its \\
+            existing values (i.e. its first access is not a write) and \\
+            whether the node writes to it.
+        :rtype: dict of str: (bool, bool)
+        '''
+        result = {}
+        var_accesses = VariablesAccessInfo(node)
+        for signature in var_accesses.all_signatures:
+            name = str(signature).lower()
+            if name in arrays:
+                accesses = var_accesses[signature]
+                result[name] = (
+                    accesses[0].access_type != AccessType.WRITE,
+                    accesses.is_written())
+        for unknown in node.walk((CodeBlock, nodes.Call)):
+            written = True
+            if isinstance(unknown, CodeBlock):
+                names = [str(name) for name in
+                         walk(unknown.get_ast_nodes, Fortran2003.Name)]
+                # Output statements only read the variables that they
+                # reference.
+                written = not all(
+                    isinstance(ast, (Fortran2003.Write_Stmt,
+                                     Fortran2003.Print_Stmt))
+                    for ast in unknown.get_ast_nodes)
+            else:
+                names = [ref.name for ref in unknown.walk(nodes.Reference)]
+            for name in names:
+                if name.lower() in arrays:
+                    _, writes = result.get(name.lower(), (True, False))
+                    result[name.lower()] = (True, writes or written)
+        return result
+
+    def _host_arrays(self, node, arrays):
+        '''
+        :param node: the PSyIR node to examine.
+        :type node: :py:class:`psyclone.psyir.nodes.Node`
+        :param arrays: the names of the arrays of interest.
+        :type arrays: set of str
+
+        :returns: the names of the arrays that are accessed by the host \
+                  code of the supplied node, i.e. outside of any OpenACC \
+                  compute region.
+        :rtype: set of str
+        '''
+        if isinstance(node, self._compute_types):
+            return set()
+        if not node.walk(self._compute_types):
+            return set(self._accesses(node, arrays))
+        result = set()
+        for child in node.children:
+            result.update(self._host_arrays(child, arrays))
+        return result
+
+    def _process(self, schedule, arrays, state, copyin, updates):
+        '''
+        Follows the accesses to the arrays through the supplied Schedule,
+        recording where their values are valid and the data movement that
+        is required.
+
+        :param schedule: the Schedule to process.
+        :type schedule: :py:class:`psyclone.psyir.nodes.Schedule`
+        :param arrays: the names of the arrays accessed on the accelerator.
+        :type arrays: set of str
+        :param state: for each array, whether its host copy is valid, \\
+            the state of its accelerator copy ("entry" if it still holds \\
+            the values on entry to the routine, "valid" or "stale") and the \\
+            last host node to write to it. Updated by this method.
+        :type state: dict of str: dict
+        :param copyin: the arrays whose values on entry to the routine are \\
+            required on the accelerator. Updated by this method.
+        :type copyin: set of str
+        :param updates: the update directives that are required as \\
+            (node, whether after the node, direction, array) tuples. \\
+            Updated by this method.
+        :type updates: list of (:py:class:`psyclone.psyir.nodes.Node`, \\
+            bool, str, str)
+
+        '''
+        for child in schedule.children:
+            accesses = self._accesses(child, arrays)
+            if isinstance(child, self._compute_types):
+                for name, (reads, writes) in accesses.items():
+                    var = state[name]
+                    if reads:
+                        if var["device"] == "entry":
+                            copyin.add(name)
+                        elif var["device"] == "stale":
+                            updates.append(
+                                (var["writer"], True, "device", name))
+                    var["device"] = "valid"
+                    if writes:
+                        var["host"] = False
+            elif not child.walk(self._compute_types):
+                for name, (_, writes) in accesses.items():
+                    var = state[name]
+                    if not var["host"]:
+                        # Partial writes on the host would be overwritten
+                        # by a subsequent update so always update the host.
+                        updates.append((child, False, "host", name))
+                        var["host"] = True
+                    if writes:
+                        var["device"] = "stale"
+                        var["writer"] = child
+            else:
+                # A loop, if block or other node containing both host and
+                # accelerator code. Its bodies may be executed any number of
+                # times so both copies of the arrays that its host code
+                # accesses must be valid at their beginning and end.
+                host_arrays = sorted(self._host_arrays(child, arrays))
+                for name in host_arrays:
+                    self._synchronise(name, child, False, state, copyin,
+                                      updates)
+                for body in child.children:
+                    if isinstance(body, Schedule) and body.children:
+                        self._process(body, arrays, state, copyin, updates)
+                        for name in host_arrays:
+                            self._synchronise(name, body.children[-1], True,
+                                              state, copyin, updates)
+
+    @staticmethod
+    def _synchronise(name, node, after, state, copyin, updates):
+        '''
+        Makes the host and accelerator copies of the named array
+        consistent at the supplied node.
+
+        :param str name: the name of the array.
+        :param node: the node before or after which the copies must be \\
+            consistent.
+        :type node: :py:class:`psyclone.psyir.nodes.Node`
+        :param bool after: whether the copies must be consistent after \\
+            (rather than before) the node.
+        :param state: the state of each array (see _process).
+        :type state: dict of str: dict
+        :param copyin: the arrays whose values on entry to the routine are \\
+            required on the accelerator.
+        :type copyin: set of str
+        :param updates: the update directives that are required.
+        :type updates: list of (:py:class:`psyclone.psyir.nodes.Node`, \\
+            bool, str, str)
+
+        '''
+        var = state[name]
+        if not var["host"]:
+            updates.append((node, after, "host", name))
+        if var["device"] == "entry":
+            copyin.add(name)
+        elif var["device"] == "stale":
+            updates.append((var["writer"], True, "device", name))
+        var["host"] = True
+        var["device"] = "valid"
+
+    def apply(self, node, options=None):
+        '''
+        Encloses the body of the supplied routine within an OpenACC data
+        region with the minimum of data movement and inserts the required
+        'update' directives.
+
+        :param node: the routine to enclose in a data region.
+        :type node: :py:class:`psyclone.psyir.nodes.Routine`
+        :param options: a dictionary with options for transformations.
+        :type options: dictionary of string:values or None
+        :param options["present"]: the names of the arrays that are \\
+            already present on the accelerator (e.g. because they are in \\
+            the data region of a caller). Their accelerator copies are \\
+            assumed to be valid on entry and are kept valid on exit.
+        :type options["present"]: list of str
+
+        :returns: 2-tuple of new schedule and memento of transform.
+        :rtype: (:py:class:`psyclone.psyir.nodes.Routine`, \\
+                 :py:class:`psyclone.undoredo.Memento`)
+
+        '''
+        self.validate(node, options)
+        keep = Memento(node, self)
+        present = set()
+        if options:
+            present = set(name.lower() for name in options.get("present", []))
+
+        arrays = self._device_arrays(node)
+        state = {}
+        for name in arrays:
+            state[name] = {"host": True, "writer": None,
+                           "device": "valid" if name in present else "entry"}
+        copyin = set()
+        updates = []
+        self._process(node, arrays, state, copyin, updates)
+
+        clauses = {}
+        table = node.symbol_table
+        for name in sorted(arrays):
+            var = state[name]
+            try:
+                local = table.lookup(name, scope_limit=node).is_local
+            except KeyError:
+                local = False
+            if name in present:
+                clause = "present"
+                if var["device"] == "stale":
+                    updates.append((var["writer"], True, "device", name))
+            elif local:
+                clause = "create"
+            elif name in copyin:
+                clause = "copyin" if var["host"] else "copy"
+            else:
+                clause = "create" if var["host"] else "copyout"
+            clauses.setdefault(clause, []).append(name)
+
+        # Insert the update directives, combining those for the same
+        # location and direction.
+        combined = []
+        for target, after, direction, name in updates:
+            for entry in combined:
+                if entry[0] is target and entry[1:3] == [after, direction]:
+                    if name not in entry[3]:
+                        entry[3].append(name)
+                    break
+            else:
+                combined.append([target, after, direction, [name]])
+        for target, after, direction, names in combined:
+            parent = target.parent
+            parent.children.insert(
+                target.position + (1 if after else 0),
+                psyGen.ACCUpdateDirective(direction, sorted(names),
+                                          parent=parent))
+
+        directive = psyGen.ACCDataDirective(
+            parent=node, children=[child.detach() for child in
+                                   node.children[:]], clauses=clauses)
+        node.children.append(directive)
+        return node, keep
+
+
 class KernelGlobalsToArguments(Transformation):
     '''
     Transformation that removes any accesses of global data from the supplied
@@ -3151,15 +5148,20 @@ __all__ = ["KernelTrans",
            "GOceanOMPParallelLoopTrans",
            "Dynamo0p3OMPLoopTrans",
            "GOceanOMPLoopTrans",
+           "OMPSimdTrans",
+           "OMPTaskloopTrans",
            "ColourTrans",
            "KernelModuleInlineTrans",
            "Dynamo0p3ColourTrans",
            "ParallelRegionTrans",
            "OMPParallelTrans",
+           "OMPNowaitTrans",
+           "OMPTaskTrans",
            "ACCParallelTrans",
            "GOConstLoopBoundsTrans",
            "MoveTrans",
            "Dynamo0p3RedundantComputationTrans",
+           "Dynamo0p3AutoRedundantComputationTrans",
            "GOLoopSwapTrans",
            "OCLTrans",
            "Dynamo0p3AsyncHaloExchangeTrans",
@@ -3168,4 +5170,7 @@ __all__ = ["KernelTrans",
            "ACCRoutineTrans",
            "ACCKernelsTrans",
            "ACCDataTrans",
+           "ACCAsyncTrans",
+           "ACCDataMergeTrans",
+           "ACCRoutineDataTrans",
            "KernelGlobalsToArguments"]